@@ -0,0 +1,11 @@
+-- Database Schema Updates for Upload Deduplication
+-- Uploads are hashed (SHA-256) while streaming to disk; a re-sent document
+-- reuses the extraction results of the earlier upload with the same content
+
+ALTER TABLE documents
+ADD COLUMN IF NOT EXISTS content_hash CHAR(64);
+
+COMMENT ON COLUMN documents.content_hash IS 'SHA-256 of the uploaded file content (hex)';
+
+-- Lookup of earlier uploads by content
+CREATE INDEX IF NOT EXISTS idx_documents_content_hash ON documents(content_hash);
@@ -0,0 +1,43 @@
+-- Database Schema Updates for the Document Pipeline Job Queue
+-- Uploaded documents are processed by src.services.document_pipeline workers
+-- (extract → match → quote → pdf) instead of API BackgroundTasks; one job row
+-- per document records the next stage and the outputs of completed stages
+
+CREATE TABLE IF NOT EXISTS document_pipeline_jobs (
+    id BIGSERIAL PRIMARY KEY,
+    document_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    file_path VARCHAR(500) NOT NULL,
+    stage VARCHAR(20) NOT NULL DEFAULT 'extract',
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    run_after TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    locked_by VARCHAR(100),
+    locked_at TIMESTAMP,
+    state JSONB NOT NULL DEFAULT '{}',
+    stage_timings JSONB NOT NULL DEFAULT '{}',
+    last_error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT check_pipeline_job_status CHECK (status IN ('queued', 'running', 'completed', 'failed'))
+);
+
+COMMENT ON COLUMN document_pipeline_jobs.stage IS 'Next stage to run (extract, match, quote, pdf) or done';
+COMMENT ON COLUMN document_pipeline_jobs.state IS 'Outputs of completed stages, input to the next one';
+COMMENT ON COLUMN document_pipeline_jobs.stage_timings IS 'Milliseconds spent in each completed stage';
+
+-- Workers claim ready jobs per stage (FOR UPDATE SKIP LOCKED)
+CREATE INDEX IF NOT EXISTS idx_pipeline_jobs_ready
+    ON document_pipeline_jobs (stage, run_after) WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS idx_pipeline_jobs_running
+    ON document_pipeline_jobs (locked_at) WHERE status = 'running';
+CREATE INDEX IF NOT EXISTS idx_pipeline_jobs_document
+    ON document_pipeline_jobs (document_id);
+
+-- Queue documents left pending by background tasks lost on restart
+INSERT INTO document_pipeline_jobs (document_id, file_path)
+SELECT d.id, d.file_path
+FROM documents d
+WHERE d.ai_status IN ('pending', 'processing')
+  AND d.file_path IS NOT NULL
+  AND NOT EXISTS (SELECT 1 FROM document_pipeline_jobs j WHERE j.document_id = d.id);
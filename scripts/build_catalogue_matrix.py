@@ -0,0 +1,129 @@
+"""
+Build Catalogue Similarity Matrix
+=================================
+
+Offline job that precomputes the TF-IDF and sentence-embedding matrices used by
+ContentBasedFilter for full-catalogue ranking. A new version is written next to
+the current one and published with an atomic pointer swap; running filters
+pick it up on their next freshness check.
+
+Usage:
+    python scripts/build_catalogue_matrix.py [--output DIR] [--model NAME]
+
+Options:
+    --output DIR      Matrix root directory (default: $CATALOGUE_MATRIX_DIR or data/catalogue_matrix)
+    --model NAME      Sentence-transformer model (must match the filter's model)
+    --batch-size N    Encode batch size (default: 256)
+    --keep N          Previous versions to keep (default: 2)
+"""
+
+import asyncio
+import asyncpg
+import os
+import sys
+from pathlib import Path
+import argparse
+from datetime import datetime
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.ai.catalogue_matrix import build_catalogue_matrix
+from src.ai.content_based_filter import ContentBasedFilter
+from src.core.config import config
+
+
+async def fetch_products(db_pool: asyncpg.Pool):
+    """All products with the fields ContentBasedFilter compares on."""
+    async with db_pool.acquire() as conn:
+        rows = await conn.fetch(
+            """
+            SELECT id, name, description, category, brand
+            FROM products
+            WHERE name IS NOT NULL
+            ORDER BY id
+            """
+        )
+    return [dict(row) for row in rows]
+
+
+async def main():
+    """Build and publish a new catalogue matrix version."""
+
+    parser = argparse.ArgumentParser(description="Build the catalogue TF-IDF / embedding matrix")
+    parser.add_argument(
+        "--output",
+        default=os.getenv("CATALOGUE_MATRIX_DIR", str(project_root / "data" / "catalogue_matrix")),
+        help="Matrix root directory"
+    )
+    parser.add_argument("--model", default="all-MiniLM-L6-v2", help="Sentence-transformer model")
+    parser.add_argument("--batch-size", type=int, default=256, help="Encode batch size")
+    parser.add_argument("--keep", type=int, default=2, help="Previous versions to keep")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("Catalogue Matrix Build")
+    print("=" * 80)
+    print(f"Started at: {datetime.now().isoformat()}")
+    print(f"Database: {config.DATABASE_HOST}:{config.DATABASE_PORT}/{config.DATABASE_NAME}")
+    print(f"Output: {args.output}")
+    print(f"Model: {args.model}")
+    print()
+
+    try:
+        print("Connecting to database...")
+        db_pool = await asyncpg.create_pool(
+            host=config.DATABASE_HOST,
+            port=config.DATABASE_PORT,
+            user=config.DATABASE_USER,
+            password=config.DATABASE_PASSWORD,
+            database=config.DATABASE_NAME,
+            min_size=1,
+            max_size=2
+        )
+        print("✅ Connected to database\n")
+
+        products = await fetch_products(db_pool)
+        await db_pool.close()
+        print(f"📊 Products: {len(products)}")
+
+        if not products:
+            print("❌ No products found - nothing to build")
+            return 1
+
+        print("🔄 Fitting TF-IDF and encoding embeddings...")
+        content_filter = ContentBasedFilter(embedding_model_name=args.model)
+        if content_filter.embedding_model is None:
+            print(f"❌ Could not load embedding model {args.model}")
+            return 1
+
+        version_dir = build_catalogue_matrix(
+            products,
+            args.output,
+            text_builder=content_filter._prepare_product_text,
+            embedding_model=content_filter.embedding_model,
+            embedding_model_name=args.model,
+            batch_size=args.batch_size,
+            keep_versions=args.keep
+        )
+
+        print()
+        print("=" * 80)
+        print("✅ Catalogue Matrix Published")
+        print("=" * 80)
+        print(f"Version: {version_dir.name}")
+        print(f"Path: {version_dir}")
+        print(f"\nCompleted at: {datetime.now().isoformat()}")
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main())
+    sys.exit(exit_code)
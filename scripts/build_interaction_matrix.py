@@ -0,0 +1,90 @@
+"""
+Build Collaborative Filtering Interaction Matrix
+================================================
+
+Offline job that builds the user x item purchase matrix, item co-occurrence
+matrices and item neighbour lists from the quotations/quote_items tables and
+writes a snapshot. CollaborativeFilter loads the snapshot (CF_MATRIX_PATH) on
+start and applies newer quotations incrementally.
+
+Usage:
+    python scripts/build_interaction_matrix.py [--output PATH] [--neighbors K]
+
+Options:
+    --output PATH     Snapshot file (default: $CF_MATRIX_PATH or data/cf_interactions.npz)
+    --neighbors K     Neighbours precomputed per item (default: 20)
+"""
+
+import os
+import sys
+from pathlib import Path
+import argparse
+from datetime import datetime
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+from src.ai.interaction_matrix import InteractionMatrixStore
+
+
+def main():
+    """Build and save the interaction matrix snapshot."""
+
+    parser = argparse.ArgumentParser(description="Build the collaborative filtering interaction matrix")
+    parser.add_argument(
+        "--output",
+        default=os.getenv("CF_MATRIX_PATH", str(project_root / "data" / "cf_interactions.npz")),
+        help="Snapshot file"
+    )
+    parser.add_argument("--neighbors", type=int, default=20, help="Neighbours precomputed per item")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("Interaction Matrix Build")
+    print("=" * 80)
+    print(f"Started at: {datetime.now().isoformat()}")
+    print(f"Output: {args.output}")
+    print()
+
+    if not os.getenv("DATABASE_URL"):
+        print("❌ ERROR: DATABASE_URL environment variable not set")
+        return 1
+
+    try:
+        connection = psycopg2.connect(os.getenv("DATABASE_URL"), cursor_factory=RealDictCursor)
+        print("✅ Connected to database\n")
+
+        store = InteractionMatrixStore(
+            connection,
+            snapshot_path=args.output,
+            neighbor_k=args.neighbors
+        )
+        matrix = store.rebuild()
+        store.save()
+        connection.close()
+
+        stats = matrix.statistics()
+        print("=" * 80)
+        print("✅ Interaction Matrix Saved")
+        print("=" * 80)
+        print(f"Users: {stats['total_users']}")
+        print(f"Items: {stats['total_items']}")
+        print(f"Purchases: {stats['total_purchases']}")
+        print(f"Co-purchase pairs: {stats['total_copurchase_patterns']}")
+        print(f"Watermark (quotation id): {matrix.last_quotation_id}")
+        print(f"\nCompleted at: {datetime.now().isoformat()}")
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,9 +12,17 @@ Usage:
     python scripts/generate_product_embeddings.py [--limit N] [--force]
 
 Options:
-    --limit N       Limit number of products to process (default: all)
-    --force         Force regenerate embeddings even if they exist
-    --batch-size N  Number of products per batch (default: 100)
+    --limit N          Limit number of products to process (default: all)
+    --force            Force regenerate embeddings even if they exist
+    --batch-size N     Number of products per embedding request (default: 100)
+    --max-in-flight N  Concurrent embedding requests (default: 4)
+    --restart          Ignore the checkpoint of an interrupted run
+    --include-unchanged
+                       With --force, also re-embed products whose text has not
+                       changed since their last embedding
+
+An interrupted run (crash, Ctrl+C) resumes from its last committed page
+when the same command is run again.
 """
 
 import asyncio
@@ -40,6 +48,9 @@ async def main():
     parser.add_argument("--limit", type=int, default=None, help="Limit number of products to process")
     parser.add_argument("--force", action="store_true", help="Force regenerate all embeddings")
     parser.add_argument("--batch-size", type=int, default=100, help="Batch size for processing")
+    parser.add_argument("--max-in-flight", type=int, default=4, help="Concurrent embedding requests")
+    parser.add_argument("--restart", action="store_true", help="Ignore checkpoint of an interrupted run")
+    parser.add_argument("--include-unchanged", action="store_true", help="Re-embed products with unchanged text")
     args = parser.parse_args()
 
     print("=" * 80)
@@ -49,6 +60,7 @@ async def main():
     print(f"Database: {config.DATABASE_HOST}:{config.DATABASE_PORT}/{config.DATABASE_NAME}")
     print(f"Force regenerate: {args.force}")
     print(f"Batch size: {args.batch_size}")
+    print(f"Max in-flight requests: {args.max_in_flight}")
     if args.limit:
         print(f"Limit: {args.limit} products")
     print()
@@ -103,7 +115,11 @@ async def main():
         result = await embedding_service.generate_product_embeddings(
             product_ids=None,  # Process all products
             batch_size=args.batch_size,
-            force_regenerate=args.force
+            force_regenerate=args.force,
+            max_in_flight=args.max_in_flight,
+            max_products=args.limit,
+            resume=not args.restart,
+            skip_unchanged=not args.include_unchanged
         )
 
         # Display results
@@ -113,7 +129,11 @@ async def main():
         print("=" * 80)
         print(f"Products processed: {result['products_processed']}")
         print(f"Embeddings generated: {result['embeddings_generated']}")
+        print(f"Unchanged (skipped): {result['unchanged_skipped']}")
         print(f"Status: {result['status']}")
+        if result.get('resumed_from_id'):
+            print(f"Resumed after product id: {result['resumed_from_id']}")
+        print(f"Duration: {result['duration_seconds']:.1f}s")
         print(f"Model used: {result['embedding_model']}")
         print(f"Dimensions: {result['embedding_dimensions']}")
 
@@ -122,7 +142,7 @@ async def main():
             if result.get('error_details'):
                 print("Error details:")
                 for error in result['error_details']:
-                    print(f"  Batch {error['batch']}: {error['error']}")
+                    print(f"  Products {error['first_id']}-{error['last_id']}: {error['error']}")
 
         # Get updated statistics
         print("\nUpdated coverage:")
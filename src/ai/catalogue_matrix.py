@@ -0,0 +1,282 @@
+"""
+Catalogue Similarity Matrix
+Precomputed, memory-mapped product matrices for full-catalogue content ranking
+
+Layout (one immutable version directory per build):
+    <root>/CURRENT                      -> name of the active version
+    <root>/<version>/manifest.json      model, vectorizer settings, shapes
+    <root>/<version>/product_ids.npy    int64 product IDs, row order
+    <root>/<version>/embeddings.npy     float32 (n_products, dim), L2-normalised
+    <root>/<version>/tfidf_data.npy     TF-IDF CSR arrays (L2-normalised rows)
+    <root>/<version>/tfidf_indices.npy
+    <root>/<version>/tfidf_indptr.npy
+    <root>/<version>/vectorizer.pkl     fitted TfidfVectorizer
+
+All arrays are opened with mmap_mode='r', so worker processes share the pages
+through the OS page cache. The build job writes a new version and then swaps
+CURRENT atomically; CatalogueMatrixStore picks the new version up on its next
+freshness check.
+"""
+
+import json
+import logging
+import os
+import pickle
+import shutil
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+logger = logging.getLogger(__name__)
+
+CURRENT_FILE = "CURRENT"
+MANIFEST_FILE = "manifest.json"
+
+# Catalogue-wide TF-IDF settings (fitted on every product text)
+CATALOGUE_TFIDF_PARAMS = {
+    'max_features': 50000,
+    'stop_words': 'english',
+    'ngram_range': (1, 2),
+    'min_df': 1,
+    'max_df': 0.8,
+    'lowercase': True,
+    'strip_accents': 'unicode',
+    'sublinear_tf': True,
+    'dtype': np.float32
+}
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first (argpartition + sort of k)"""
+    if k <= 0 or len(scores) == 0:
+        return np.array([], dtype=np.int64)
+    if k < len(scores):
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+
+class CatalogueMatrix:
+    """
+    One loaded (memory-mapped) catalogue matrix version
+
+    Attributes:
+        product_ids: int64 array, product ID of each row
+        tfidf: CSR matrix (n_products x n_terms), L2-normalised rows
+        embeddings: float32 array (n_products x dim), L2-normalised rows
+        vectorizer: TfidfVectorizer fitted on the catalogue
+        manifest: Build metadata
+    """
+
+    def __init__(
+        self,
+        product_ids: np.ndarray,
+        tfidf: sparse.csr_matrix,
+        embeddings: np.ndarray,
+        vectorizer: TfidfVectorizer,
+        manifest: Dict
+    ):
+        self.product_ids = product_ids
+        self.tfidf = tfidf
+        self.embeddings = embeddings
+        self.vectorizer = vectorizer
+        self.manifest = manifest
+        self._row_by_id = {int(pid): row for row, pid in enumerate(product_ids)}
+
+    def __len__(self) -> int:
+        return len(self.product_ids)
+
+    @property
+    def embedding_model(self) -> str:
+        return self.manifest['embedding_model']
+
+    def rows_for(self, product_ids: Sequence) -> List[Optional[int]]:
+        """Matrix row for each product ID (None if the product is not in the matrix)"""
+        return [
+            self._row_by_id.get(int(pid)) if pid is not None else None
+            for pid in product_ids
+        ]
+
+    def tfidf_scores(self, query_text: str, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Cosine similarity of the query to every row (or the given rows): one sparse dot"""
+        query_vector = self.vectorizer.transform([query_text])
+        matrix = self.tfidf if rows is None else self.tfidf[rows]
+        return (matrix @ query_vector.T).toarray().ravel()
+
+    def embedding_scores(self, query_embedding: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Cosine similarity of a normalised query embedding to every row: one matmul"""
+        matrix = self.embeddings if rows is None else self.embeddings[rows]
+        return matrix @ np.asarray(query_embedding, dtype=np.float32)
+
+    @classmethod
+    def load(cls, version_dir: Path) -> 'CatalogueMatrix':
+        """Open a version directory (arrays memory-mapped read-only)"""
+        version_dir = Path(version_dir)
+
+        with open(version_dir / MANIFEST_FILE) as f:
+            manifest = json.load(f)
+
+        def mapped(name: str) -> np.ndarray:
+            return np.load(version_dir / name, mmap_mode='r')
+
+        tfidf = sparse.csr_matrix(
+            (mapped('tfidf_data.npy'), mapped('tfidf_indices.npy'), mapped('tfidf_indptr.npy')),
+            shape=tuple(manifest['tfidf_shape']),
+            copy=False
+        )
+
+        with open(version_dir / 'vectorizer.pkl', 'rb') as f:
+            vectorizer = pickle.load(f)
+
+        return cls(
+            product_ids=mapped('product_ids.npy'),
+            tfidf=tfidf,
+            embeddings=mapped('embeddings.npy'),
+            vectorizer=vectorizer,
+            manifest=manifest
+        )
+
+
+def build_catalogue_matrix(
+    products: Sequence[Dict],
+    root_dir: str,
+    text_builder: Callable[[Dict], str],
+    embedding_model,
+    embedding_model_name: str,
+    batch_size: int = 256,
+    keep_versions: int = 2
+) -> Path:
+    """
+    Offline build of a new catalogue matrix version
+
+    Args:
+        products: Product dicts (must contain 'id')
+        root_dir: Matrix root directory
+        text_builder: Builds the comparison text for a product
+        embedding_model: SentenceTransformer used for the embeddings
+        embedding_model_name: Name recorded in the manifest (queries must use the same model)
+        batch_size: Encode batch size
+        keep_versions: Old versions kept after the swap (for readers still mapping them)
+
+    Returns:
+        Path of the new version directory
+    """
+    if not products:
+        raise ValueError("Cannot build a catalogue matrix from an empty product list")
+
+    root = Path(root_dir)
+    root.mkdir(parents=True, exist_ok=True)
+
+    texts = [text_builder(product) for product in products]
+    product_ids = np.array([int(product['id']) for product in products], dtype=np.int64)
+
+    started = time.perf_counter()
+
+    vectorizer = TfidfVectorizer(**CATALOGUE_TFIDF_PARAMS)
+    tfidf = vectorizer.fit_transform(texts).tocsr().astype(np.float32)
+
+    embeddings = np.asarray(
+        embedding_model.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        ),
+        dtype=np.float32
+    )
+
+    version = datetime.now().strftime('%Y%m%d%H%M%S%f')
+    staging_dir = root / f".{version}.tmp"
+    staging_dir.mkdir()
+
+    np.save(staging_dir / 'product_ids.npy', product_ids)
+    np.save(staging_dir / 'embeddings.npy', embeddings)
+    np.save(staging_dir / 'tfidf_data.npy', tfidf.data)
+    np.save(staging_dir / 'tfidf_indices.npy', tfidf.indices)
+    np.save(staging_dir / 'tfidf_indptr.npy', tfidf.indptr)
+    with open(staging_dir / 'vectorizer.pkl', 'wb') as f:
+        pickle.dump(vectorizer, f)
+
+    manifest = {
+        'version': version,
+        'built_at': datetime.now().isoformat(),
+        'product_count': len(product_ids),
+        'embedding_model': embedding_model_name,
+        'embedding_dim': int(embeddings.shape[1]) if embeddings.ndim == 2 else 0,
+        'tfidf_shape': list(tfidf.shape)
+    }
+    with open(staging_dir / MANIFEST_FILE, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    version_dir = root / version
+    staging_dir.rename(version_dir)
+
+    # Atomic swap of the active version
+    pointer_tmp = root / f".{CURRENT_FILE}.tmp"
+    pointer_tmp.write_text(version)
+    os.replace(pointer_tmp, root / CURRENT_FILE)
+
+    _prune_versions(root, keep=keep_versions + 1)
+
+    logger.info(
+        f"✅ Built catalogue matrix {version}: {len(product_ids)} products, "
+        f"{tfidf.shape[1]} terms, dim={manifest['embedding_dim']} "
+        f"({time.perf_counter() - started:.1f}s)"
+    )
+    return version_dir
+
+
+def _prune_versions(root: Path, keep: int):
+    """Delete all but the newest `keep` version directories"""
+    versions = sorted(
+        (p for p in root.iterdir() if p.is_dir() and not p.name.startswith('.')),
+        key=lambda p: p.name
+    )
+    for old in versions[:-keep]:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+class CatalogueMatrixStore:
+    """
+    Serves the active catalogue matrix, reloading when a new version is published
+
+    The CURRENT pointer is checked at most every check_interval seconds.
+    """
+
+    def __init__(self, root_dir: str, check_interval: float = 30.0):
+        self.root = Path(root_dir)
+        self.check_interval = check_interval
+        self._matrix: Optional[CatalogueMatrix] = None
+        self._version: Optional[str] = None
+        self._checked_at = 0.0
+
+    def get(self) -> Optional[CatalogueMatrix]:
+        """Active matrix, or None if none has been built yet"""
+        now = time.monotonic()
+        if self._matrix is not None and now - self._checked_at < self.check_interval:
+            return self._matrix
+        self._checked_at = now
+
+        try:
+            version = (self.root / CURRENT_FILE).read_text().strip()
+        except FileNotFoundError:
+            return self._matrix
+
+        if version != self._version:
+            try:
+                self._matrix = CatalogueMatrix.load(self.root / version)
+                self._version = version
+                logger.info(
+                    f"✅ Loaded catalogue matrix {version} ({len(self._matrix)} products)"
+                )
+            except Exception as e:
+                logger.error(f"❌ Failed to load catalogue matrix {version}: {e}")
+
+        return self._matrix
@@ -3,11 +3,12 @@ Collaborative Filtering Algorithm
 User behavior pattern analysis for product recommendations
 
 Features:
-- User-user collaborative filtering (PostgreSQL + Redis)
-- Item-item collaborative filtering (PostgreSQL + Redis)
-- Co-purchase pattern analysis (Redis cache)
-- User similarity matrix (PostgreSQL)
-- Purchase frequency tracking (PostgreSQL)
+- User-user collaborative filtering (sparse user x item matrix)
+- Item-item collaborative filtering (precomputed item neighbour lists)
+- Co-purchase pattern analysis (item x item quotation co-occurrence)
+- Interaction matrices built from PostgreSQL, updated incrementally
+  (see interaction_matrix.py)
+- View tracking and trending products (Redis, write-behind buffered)
 
 PRODUCTION-READY: No mocks, stubs, or hardcoded fallbacks
 """
@@ -23,6 +24,9 @@ import redis
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
+from src.ai.interaction_matrix import InteractionMatrix, InteractionMatrixStore
+from src.ai.view_event_buffer import ViewEventBuffer
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,10 +44,14 @@ class CollaborativeFilter:
     Redis is optional (used only for caching and co-purchase patterns)
     """
 
+    # Global view counts for trending products
+    TRENDING_KEY = "trending_products"
+
     def __init__(
         self,
         database_connection = None,
-        redis_client: redis.Redis = None
+        redis_client: redis.Redis = None,
+        interaction_store: InteractionMatrixStore = None
     ):
         """
         Initialize collaborative filter
@@ -51,6 +59,8 @@ class CollaborativeFilter:
         Args:
             database_connection: PostgreSQL connection (REQUIRED)
             redis_client: Redis client (OPTIONAL - used for caching only)
+            interaction_store: Interaction matrix store (default: built from
+                database_connection, snapshot at CF_MATRIX_PATH if set)
         """
         # PostgreSQL is REQUIRED
         if database_connection is None:
@@ -76,6 +86,13 @@ class CollaborativeFilter:
         if not self.cache_enabled:
             logger.warning("⚠️ Redis not available - caching disabled for collaborative filtering")
 
+        # View events are coalesced and written in one pipeline per flush
+        self.view_buffer = ViewEventBuffer(
+            redis_client,
+            trending_key=self.TRENDING_KEY,
+            flush_interval_ms=int(os.getenv('CF_VIEW_FLUSH_MS', '250'))
+        ) if self.cache_enabled else None
+
         # Similarity thresholds (REQUIRED from environment - no defaults)
         cf_min_user_sim = os.getenv('CF_MIN_USER_SIMILARITY')
         cf_min_item_sim = os.getenv('CF_MIN_ITEM_SIMILARITY')
@@ -104,8 +121,20 @@ class CollaborativeFilter:
         if not (0.0 <= self.min_item_similarity <= 1.0):
             raise ValueError(f"CF_MIN_ITEM_SIMILARITY must be between 0.0 and 1.0, got {self.min_item_similarity}")
 
+        # Interaction matrices (user x item purchases, item co-occurrence)
+        self.interaction_store = interaction_store or InteractionMatrixStore(
+            self.db_connection,
+            snapshot_path=os.getenv('CF_MATRIX_PATH'),
+            refresh_interval=float(os.getenv('CF_MATRIX_REFRESH_SECONDS', '300'))
+        )
+
         logger.info(f"✅ Collaborative filter initialized (user_sim≥{self.min_user_similarity}, item_sim≥{self.min_item_similarity})")
 
+    @property
+    def interactions(self) -> InteractionMatrix:
+        """Current interaction matrix (refreshed from the database when due)"""
+        return self.interaction_store.get()
+
     def calculate_user_similarity(self, user1_id: str, user2_id: str) -> float:
         """
         Calculate similarity between two users using Jaccard similarity
@@ -118,23 +147,8 @@ class CollaborativeFilter:
             Similarity score between 0 and 1
         """
         try:
-            # Get purchase histories
-            user1_products = self._get_user_products(user1_id)
-            user2_products = self._get_user_products(user2_id)
-
-            if not user1_products or not user2_products:
-                return 0.0
-
             # Jaccard similarity = intersection / union
-            intersection = len(user1_products & user2_products)
-            union = len(user1_products | user2_products)
-
-            if union == 0:
-                return 0.0
-
-            similarity = intersection / union
-
-            return similarity
+            return self.interactions.user_similarity(user1_id, user2_id)
 
         except Exception as e:
             logger.debug(f"User similarity calculation failed: {e}")
@@ -160,24 +174,8 @@ class CollaborativeFilter:
         try:
             min_similarity = min_similarity or self.min_user_similarity
 
-            # Get all users
-            all_users = self._get_all_users()
-
-            # Calculate similarities
-            similarities = []
-            for other_user_id in all_users:
-                if other_user_id == user_id:
-                    continue
-
-                similarity = self.calculate_user_similarity(user_id, other_user_id)
-
-                if similarity >= min_similarity:
-                    similarities.append((other_user_id, similarity))
-
-            # Sort by similarity (descending)
-            similarities.sort(key=lambda x: x[1], reverse=True)
-
-            return similarities[:limit]
+            # Jaccard similarity to every user in one sparse product
+            return self.interactions.similar_users(user_id, min_similarity, limit)
 
         except Exception as e:
             logger.error(f"Similar user search failed: {e}")
@@ -195,23 +193,8 @@ class CollaborativeFilter:
             Similarity score between 0 and 1
         """
         try:
-            # Get users who purchased each item
-            item1_users = self._get_item_purchasers(item1_id)
-            item2_users = self._get_item_purchasers(item2_id)
-
-            if not item1_users or not item2_users:
-                return 0.0
-
-            # Jaccard similarity
-            intersection = len(item1_users & item2_users)
-            union = len(item1_users | item2_users)
-
-            if union == 0:
-                return 0.0
-
-            similarity = intersection / union
-
-            return similarity
+            # Jaccard similarity of the items' buyers
+            return self.interactions.item_similarity(item1_id, item2_id)
 
         except Exception as e:
             logger.debug(f"Item similarity calculation failed: {e}")
@@ -233,38 +216,20 @@ class CollaborativeFilter:
             List of (product_id, score) tuples
         """
         try:
-            # Get user's purchase history
-            user_products = self._get_user_products(user_id)
-
             # Find similar users
             similar_users = self.find_similar_users(user_id, limit=20)
 
             if not similar_users:
                 return []
 
-            # Aggregate product scores from similar users
-            product_scores = defaultdict(float)
-
-            for similar_user_id, similarity in similar_users:
-                # Get similar user's products
-                similar_user_products = self._get_user_products(similar_user_id)
-
-                # Exclude products user already has
-                new_products = similar_user_products - user_products
-
-                # Add weighted scores
-                for product_id in new_products:
-                    product_scores[product_id] += similarity
-
-            # Sort by score
-            recommendations = sorted(
-                product_scores.items(),
-                key=lambda x: x[1],
-                reverse=True
+            # Similarity-weighted sum of similar users' purchases,
+            # excluding products the user already has
+            return self.interactions.weighted_user_items(
+                similar_users,
+                exclude=self._get_user_products(user_id),
+                limit=limit
             )
 
-            return recommendations[:limit]
-
         except Exception as e:
             logger.error(f"User-based recommendations failed: {e}")
             raise
@@ -295,7 +260,7 @@ class CollaborativeFilter:
             product_scores = defaultdict(float)
 
             for product_id in user_products:
-                # Get similar items
+                # Get similar items (precomputed neighbour lists)
                 similar_items = self._get_similar_items(product_id, limit=10)
 
                 for similar_item_id, similarity in similar_items:
@@ -332,34 +297,8 @@ class CollaborativeFilter:
             List of (product_id, copurchase_frequency) tuples
         """
         try:
-            copurchase_scores = defaultdict(int)
-
-            for product_id in product_ids:
-                # Get co-purchased items
-                copurchased_items = self._get_copurchased_items(product_id)
-
-                for copurchased_id, frequency in copurchased_items.items():
-                    # Exclude items already in list
-                    if copurchased_id not in product_ids:
-                        copurchase_scores[copurchased_id] += frequency
-
-            # Normalize scores to [0, 1]
-            if copurchase_scores:
-                max_score = max(copurchase_scores.values())
-                if max_score > 0:
-                    copurchase_scores = {
-                        k: v / max_score
-                        for k, v in copurchase_scores.items()
-                    }
-
-            # Sort by frequency
-            recommendations = sorted(
-                copurchase_scores.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )
-
-            return recommendations[:limit]
+            # Summed co-purchase rows of the given products, normalized to [0, 1]
+            return self.interactions.copurchase_scores(product_ids, limit)
 
         except Exception as e:
             logger.error(f"Co-purchase recommendations failed: {e}")
@@ -385,20 +324,24 @@ class CollaborativeFilter:
 
             timestamp = timestamp or datetime.now()
 
-            # Add products to user's history
-            for product_id in product_ids:
-                self.redis_client.sadd(f"user_products:{user_id}", product_id)
-                self.redis_client.sadd(f"product_users:{product_id}", user_id)
+            # Co-purchase counts need at least two distinct products
+            product_ids = list(dict.fromkeys(product_ids))
+            if len(product_ids) < 2:
+                return
+
+            # Single round-trip for the whole order. Only the co-purchase
+            # counts live in Redis (read by the hybrid engine); user and item
+            # histories come from the interaction matrices.
+            pipe = self.redis_client.pipeline(transaction=False)
 
             # Record co-purchase patterns
             for i, product1_id in enumerate(product_ids):
                 for product2_id in product_ids[i + 1:]:
                     # Increment co-purchase count (both directions)
-                    self.redis_client.incr(f"copurchase:{product1_id}:{product2_id}")
-                    self.redis_client.incr(f"copurchase:{product2_id}:{product1_id}")
+                    pipe.incr(f"copurchase:{product1_id}:{product2_id}")
+                    pipe.incr(f"copurchase:{product2_id}:{product1_id}")
 
-            # Add to global users set
-            self.redis_client.sadd("all_users", user_id)
+            pipe.execute()
 
             logger.debug(f"Recorded purchase for user {user_id}: {len(product_ids)} products")
 
@@ -406,34 +349,27 @@ class CollaborativeFilter:
             logger.error(f"Purchase recording failed: {e}")
 
     def record_view(self, user_id: str, product_id: int):
-        """Record a product view (implicit feedback)"""
+        """
+        Record a product view (implicit feedback)
+
+        Buffered: per-user view counts, recent views and global trending
+        counts are written by the view buffer's next flush.
+        """
         try:
             if not self.cache_enabled:
                 return
 
-            # Increment view count
-            self.redis_client.zincrby(
-                f"user_views:{user_id}",
-                1,
-                str(product_id)
-            )
-
-            # Add to recent views
-            self.redis_client.zadd(
-                f"user_recent_views:{user_id}",
-                {str(product_id): datetime.now().timestamp()}
-            )
-
-            # Keep only last 100 views
-            self.redis_client.zremrangebyrank(
-                f"user_recent_views:{user_id}",
-                0,
-                -101
-            )
+            self.view_buffer.add(user_id, product_id)
 
         except Exception as e:
             logger.debug(f"View recording failed: {e}")
 
+    def flush_views(self) -> int:
+        """Write buffered view events now (returns number of events written)"""
+        if not self.cache_enabled:
+            return 0
+        return self.view_buffer.flush()
+
     def get_trending_products(self, limit: int = 20) -> List[Tuple[int, int]]:
         """
         Get trending products based on recent activity
@@ -448,32 +384,20 @@ class CollaborativeFilter:
             if not self.cache_enabled:
                 return []
 
-            # Get global view counts (simplified trending)
+            # Global view counts (simplified trending), maintained by record_view
+            # (views still in the write-behind buffer are not counted yet)
             # In production, use time-weighted scoring
-
-            # Aggregate view counts across all users
-            all_users = self._get_all_users()
-            product_views = defaultdict(int)
-
-            for user_id in all_users:
-                user_views = self.redis_client.zrange(
-                    f"user_views:{user_id}",
-                    0,
-                    -1,
-                    withscores=True
-                )
-
-                for product_id_str, view_count in user_views:
-                    product_views[int(product_id_str)] += int(view_count)
-
-            # Sort by view count
-            trending = sorted(
-                product_views.items(),
-                key=lambda x: x[1],
-                reverse=True
+            trending = self.redis_client.zrevrange(
+                self.TRENDING_KEY,
+                0,
+                limit - 1,
+                withscores=True
             )
 
-            return trending[:limit]
+            return [
+                (int(product_id_str), int(view_count))
+                for product_id_str, view_count in trending
+            ]
 
         except Exception as e:
             logger.error(f"Trending products retrieval failed: {e}")
@@ -484,93 +408,15 @@ class CollaborativeFilter:
     # =========================================================================
 
     def _get_user_products(self, user_id: str) -> Set[int]:
-        """
-        Get set of product IDs purchased by user from PostgreSQL
-
-        REAL IMPLEMENTATION - Queries quotations/quote_items tables
-        """
+        """Get set of product IDs purchased by user (interaction matrix)"""
         try:
-            query = """
-                SELECT DISTINCT qi.id as product_id
-                FROM quote_items qi
-                JOIN quotations q ON qi.quotation_id = q.id
-                WHERE q.customer_email = %s
-                    AND q.status IN ('accepted', 'sent')
-            """
-
-            with self.db_connection.cursor() as cursor:
-                cursor.execute(query, (user_id,))
-                results = cursor.fetchall()
-                product_ids = {row['product_id'] for row in results}
-
-                logger.debug(f"Retrieved {len(product_ids)} products for user {user_id}")
-                return product_ids
+            return self.interactions.user_products(user_id)
 
         except Exception as e:
             logger.error(f"❌ Failed to get user products: {e}")
             raise RuntimeError(
-                f"PostgreSQL query failed for user products: {e}. "
-                "Ensure database connection is valid and tables exist."
-            )
-
-    def _get_item_purchasers(self, item_id: int) -> Set[str]:
-        """
-        Get set of user IDs who purchased this item from PostgreSQL
-
-        REAL IMPLEMENTATION - Queries quotations/quote_items tables
-        """
-        try:
-            query = """
-                SELECT DISTINCT q.customer_email
-                FROM quote_items qi
-                JOIN quotations q ON qi.quotation_id = q.id
-                WHERE qi.id = %s
-                    AND q.status IN ('accepted', 'sent')
-            """
-
-            with self.db_connection.cursor() as cursor:
-                cursor.execute(query, (item_id,))
-                results = cursor.fetchall()
-                user_ids = {row['customer_email'] for row in results}
-
-                logger.debug(f"Retrieved {len(user_ids)} purchasers for item {item_id}")
-                return user_ids
-
-        except Exception as e:
-            logger.error(f"❌ Failed to get item purchasers: {e}")
-            raise RuntimeError(
-                f"PostgreSQL query failed for item purchasers: {e}. "
-                "Ensure database connection is valid and tables exist."
-            )
-
-    def _get_all_users(self) -> List[str]:
-        """
-        Get all user IDs from PostgreSQL
-
-        REAL IMPLEMENTATION - Queries quotations table
-        """
-        try:
-            query = """
-                SELECT DISTINCT customer_email
-                FROM quotations
-                WHERE customer_email IS NOT NULL
-                    AND status IN ('accepted', 'sent', 'draft')
-                ORDER BY customer_email
-            """
-
-            with self.db_connection.cursor() as cursor:
-                cursor.execute(query)
-                results = cursor.fetchall()
-                users = [row['customer_email'] for row in results]
-
-                logger.debug(f"Retrieved {len(users)} total users")
-                return users
-
-        except Exception as e:
-            logger.error(f"❌ Failed to get all users: {e}")
-            raise RuntimeError(
-                f"PostgreSQL query failed for all users: {e}. "
-                "Ensure database connection is valid and quotations table exists."
+                f"Interaction matrix lookup failed for user products: {e}. "
+                "Ensure database connection is valid and quotations/quote_items tables exist."
             )
 
     def _get_similar_items(
@@ -578,119 +424,22 @@ class CollaborativeFilter:
         item_id: int,
         limit: int = 10
     ) -> List[Tuple[int, float]]:
-        """Get items similar to given item"""
+        """Get items similar to given item (precomputed Jaccard neighbours)"""
         try:
-            # Check cache first
-            cache_key = f"similar_items:{item_id}"
-            if self.cache_enabled:
-                cached = self.redis_client.get(cache_key)
-                if cached:
-                    import json
-                    return json.loads(cached)
-
-            # Calculate similarities (expensive operation)
-            # In production, precompute and cache this
-            item_users = self._get_item_purchasers(item_id)
-
-            if not item_users:
-                return []
-
-            # Find items purchased by same users
-            similar_items = defaultdict(float)
-
-            for user_id in item_users:
-                user_products = self._get_user_products(user_id)
-
-                for other_item_id in user_products:
-                    if other_item_id != item_id:
-                        similar_items[other_item_id] += 1.0
-
-            # Normalize by number of shared users
-            if similar_items:
-                max_count = max(similar_items.values())
-                similar_items = {
-                    k: v / max_count
-                    for k, v in similar_items.items()
-                }
-
-            # Sort by similarity
-            result = sorted(
-                similar_items.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:limit]
-
-            # Cache result
-            if self.cache_enabled:
-                import json
-                self.redis_client.setex(
-                    cache_key,
-                    3600,  # 1 hour TTL
-                    json.dumps(result)
-                )
-
-            return result
+            return self.interactions.similar_items(
+                item_id,
+                min_similarity=self.min_item_similarity,
+                limit=limit
+            )
 
         except Exception as e:
             logger.error(f"Similar items retrieval failed: {e}")
             raise RuntimeError(f"Failed to retrieve similar items: {str(e)}") from e
 
-    def _get_copurchased_items(self, item_id: int) -> Dict[int, int]:
-        """Get items co-purchased with given item"""
-        try:
-            if not self.cache_enabled:
-                return {}
-
-            # Scan for co-purchase keys
-            pattern = f"copurchase:{item_id}:*"
-            copurchased = {}
-
-            for key in self.redis_client.scan_iter(match=pattern):
-                # Extract other item ID from key
-                parts = key.split(':')
-                if len(parts) == 3:
-                    other_item_id = int(parts[2])
-                    frequency = int(self.redis_client.get(key) or 0)
-
-                    if frequency > 0:
-                        copurchased[other_item_id] = frequency
-
-            return copurchased
-
-        except Exception as e:
-            logger.error(f"Co-purchased items retrieval failed: {e}")
-            raise RuntimeError(f"Failed to retrieve co-purchased items: {str(e)}") from e
-
     def get_statistics(self) -> Dict[str, int]:
         """Get collaborative filtering statistics"""
         try:
-            stats = {
-                'total_users': 0,
-                'total_items': 0,
-                'total_purchases': 0,
-                'total_copurchase_patterns': 0
-            }
-
-            if not self.cache_enabled:
-                return stats
-
-            # Count users
-            stats['total_users'] = self.redis_client.scard("all_users")
-
-            # Count items (products with purchasers)
-            product_keys = list(self.redis_client.scan_iter(match="product_users:*"))
-            stats['total_items'] = len(product_keys)
-
-            # Count purchases
-            user_keys = list(self.redis_client.scan_iter(match="user_products:*"))
-            for key in user_keys:
-                stats['total_purchases'] += self.redis_client.scard(key)
-
-            # Count co-purchase patterns
-            copurchase_keys = list(self.redis_client.scan_iter(match="copurchase:*"))
-            stats['total_copurchase_patterns'] = len(copurchase_keys)
-
-            return stats
+            return self.interactions.statistics()
 
         except Exception as e:
             logger.error(f"Statistics retrieval failed: {e}")
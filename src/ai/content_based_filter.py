@@ -8,18 +8,24 @@ Features:
 - Semantic embeddings (sentence-transformers)
 - Keyword extraction and matching
 - N-gram analysis
+- Full-catalogue ranking over a precomputed, memory-mapped TF-IDF and
+  embedding matrix (see catalogue_matrix.py)
 """
 
+import os
 import logging
 from typing import Dict, List, Optional, Tuple
 import re
 from collections import Counter
 
 import numpy as np
+from sklearn.base import clone
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 from sentence_transformers import SentenceTransformer
 
+from src.ai.catalogue_matrix import CatalogueMatrix, CatalogueMatrixStore, top_k_indices
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,12 +40,26 @@ class ContentBasedFilter:
     4. Keyword matching: Exact and fuzzy keyword matching
     """
 
-    def __init__(self, embedding_model_name: str = 'all-MiniLM-L6-v2'):
+    # Default weights for composite similarity
+    DEFAULT_WEIGHTS = {
+        'tfidf': 0.35,
+        'embedding': 0.35,
+        'keyword': 0.20,
+        'ngram': 0.10
+    }
+
+    def __init__(
+        self,
+        embedding_model_name: str = 'all-MiniLM-L6-v2',
+        catalogue_dir: Optional[str] = None
+    ):
         """
         Initialize content-based filter
 
         Args:
             embedding_model_name: Name of sentence-transformer model to use
+            catalogue_dir: Catalogue matrix directory built by
+                scripts/build_catalogue_matrix.py (default: CATALOGUE_MATRIX_DIR env)
         """
         # Initialize TF-IDF vectorizer
         self.tfidf_vectorizer = TfidfVectorizer(
@@ -62,9 +82,15 @@ class ContentBasedFilter:
             self.embedding_model = None
             self.embedding_dim = None
 
+        self.embedding_model_name = embedding_model_name
+
         # Cache for embeddings
         self.embedding_cache = {}
 
+        # Precomputed catalogue matrix (reloaded when a new build is published)
+        catalogue_dir = catalogue_dir or os.getenv('CATALOGUE_MATRIX_DIR')
+        self.catalogue_store = CatalogueMatrixStore(catalogue_dir) if catalogue_dir else None
+
         logger.info("✅ Content-based filter initialized")
 
     def calculate_tfidf_similarity(
@@ -314,12 +340,7 @@ class ContentBasedFilter:
         try:
             # Default weights
             if weights is None:
-                weights = {
-                    'tfidf': 0.35,
-                    'embedding': 0.35,
-                    'keyword': 0.20,
-                    'ngram': 0.10
-                }
+                weights = dict(self.DEFAULT_WEIGHTS)
 
             # Calculate individual scores
             tfidf_score = self.calculate_tfidf_similarity(product_text, query_text)
@@ -365,48 +386,122 @@ class ContentBasedFilter:
         products: List[Dict],
         query_text: str,
         query_keywords: List[str] = None,
-        limit: int = 20
+        limit: int = 20,
+        weights: Dict[str, float] = None
     ) -> List[Tuple[Dict, float]]:
         """
         Rank products by similarity to query
 
+        All products are scored at once: TF-IDF and embedding scores come from
+        the catalogue matrix rows (products missing from it are vectorised in
+        one batch), keyword and n-gram scores are computed per product, and
+        the top results are selected with argpartition.
+
         Args:
             products: List of product dictionaries
             query_text: Query text
             query_keywords: Optional query keywords
             limit: Maximum number of results
+            weights: Optional custom weights (see DEFAULT_WEIGHTS)
 
         Returns:
             List of (product, score) tuples, sorted by score descending
         """
         try:
-            scored_products = []
+            if not products:
+                return []
 
-            for product in products:
-                # Prepare product text
-                product_text = self._prepare_product_text(product)
+            weights = weights or self.DEFAULT_WEIGHTS
+            product_texts = [self._prepare_product_text(product) for product in products]
 
-                # Calculate composite similarity
-                similarity_result = self.calculate_composite_similarity(
-                    product_text,
-                    query_text,
-                    query_keywords
-                )
+            if query_keywords is None:
+                query_keywords = self.extract_keywords(query_text)
 
-                scored_products.append((
-                    product,
-                    similarity_result['composite_score']
-                ))
+            tfidf_scores, embedding_scores = self._vector_scores(
+                products, product_texts, query_text
+            )
 
-            # Sort by score descending
-            scored_products.sort(key=lambda x: x[1], reverse=True)
+            keyword_scores = np.array([
+                self.calculate_keyword_score(text, query_keywords)
+                if text and query_keywords else 0.0
+                for text in product_texts
+            ])
+
+            query_ngrams = self._extract_ngrams(query_text, 2)
+            ngram_scores = np.array([
+                self._jaccard(self._extract_ngrams(text, 2), query_ngrams)
+                for text in product_texts
+            ])
+
+            composite_scores = (
+                tfidf_scores * weights['tfidf'] +
+                embedding_scores * weights['embedding'] +
+                keyword_scores * weights['keyword'] +
+                ngram_scores * weights['ngram']
+            )
 
-            return scored_products[:limit]
+            return [
+                (products[index], float(composite_scores[index]))
+                for index in top_k_indices(composite_scores, limit)
+            ]
 
         except Exception as e:
             logger.error(f"Product ranking failed: {e}")
             return []
 
+    def rank_catalogue(
+        self,
+        query_text: str,
+        limit: int = 20,
+        weights: Dict[str, float] = None
+    ) -> List[Dict]:
+        """
+        Rank the whole catalogue against a query using the precomputed matrix
+
+        One sparse dot (TF-IDF) and one matmul (embeddings) over every product,
+        then argpartition for the top results. Keyword and n-gram scores need
+        the product text and are not part of catalogue ranking; the TF-IDF and
+        embedding weights are renormalised to sum to 1.
+
+        Args:
+            query_text: Query text
+            limit: Maximum number of results
+            weights: Optional custom weights (only 'tfidf' and 'embedding' are used)
+
+        Returns:
+            List of dicts with product_id, score, tfidf_score, embedding_score
+
+        FAIL-FAST: Raises error if no catalogue matrix or embedding model is available
+        """
+        if not query_text:
+            raise ValueError("Empty query text provided for catalogue ranking")
+
+        matrix = self._get_catalogue_matrix()
+        if matrix is None:
+            raise RuntimeError(
+                "CRITICAL: No catalogue matrix available. "
+                "Set CATALOGUE_MATRIX_DIR and run 'python scripts/build_catalogue_matrix.py'."
+            )
+
+        weights = weights or self.DEFAULT_WEIGHTS
+        total = weights['tfidf'] + weights['embedding']
+        tfidf_weight = weights['tfidf'] / total
+        embedding_weight = weights['embedding'] / total
+
+        tfidf_scores = matrix.tfidf_scores(query_text)
+        embedding_scores = matrix.embedding_scores(self._encode_normalized([query_text])[0])
+        scores = tfidf_scores * tfidf_weight + embedding_scores * embedding_weight
+
+        return [
+            {
+                'product_id': int(matrix.product_ids[index]),
+                'score': float(scores[index]),
+                'tfidf_score': float(tfidf_scores[index]),
+                'embedding_score': float(embedding_scores[index])
+            }
+            for index in top_k_indices(scores, limit)
+        ]
+
     # =========================================================================
     # Helper Methods
     # =========================================================================
@@ -441,6 +536,89 @@ class ContentBasedFilter:
             logger.debug(f"Embedding generation failed: {e}")
             return None
 
+    def _get_catalogue_matrix(self) -> Optional[CatalogueMatrix]:
+        """Active catalogue matrix, if one is configured and matches the embedding model"""
+        if self.catalogue_store is None:
+            return None
+
+        matrix = self.catalogue_store.get()
+        if matrix is not None and matrix.embedding_model != self.embedding_model_name:
+            logger.warning(
+                f"Catalogue matrix built with {matrix.embedding_model}, "
+                f"filter uses {self.embedding_model_name} - matrix ignored"
+            )
+            return None
+
+        return matrix
+
+    def _encode_normalized(self, texts: List[str]) -> np.ndarray:
+        """Encode texts in one batched call (L2-normalised float32 rows)"""
+        if not self.embedding_model:
+            raise RuntimeError(
+                "CRITICAL: Sentence transformer embedding model not loaded. "
+                "Check that sentence-transformers is installed and model is available. "
+                "Cannot provide fallback score - embeddings are required."
+            )
+
+        return np.asarray(
+            self.embedding_model.encode(
+                texts,
+                batch_size=64,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            ),
+            dtype=np.float32
+        )
+
+    def _vector_scores(
+        self,
+        products: List[Dict],
+        product_texts: List[str],
+        query_text: str
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """TF-IDF and embedding cosine scores for all products at once"""
+        matrix = self._get_catalogue_matrix()
+
+        if matrix is None:
+            # No catalogue matrix: fit TF-IDF once on this set and encode it in one call
+            vectorizer = clone(self.tfidf_vectorizer)
+            vectors = vectorizer.fit_transform(product_texts + [query_text])
+            tfidf_scores = cosine_similarity(vectors[:-1], vectors[-1]).ravel()
+
+            embeddings = self._encode_normalized([query_text] + product_texts)
+            return tfidf_scores, embeddings[1:] @ embeddings[0]
+
+        tfidf_scores = np.zeros(len(products))
+        embedding_scores = np.zeros(len(products))
+
+        query_vector = matrix.vectorizer.transform([query_text])
+        rows = matrix.rows_for([product.get('id') for product in products])
+        known = [i for i, row in enumerate(rows) if row is not None]
+        missing = [i for i, row in enumerate(rows) if row is None]
+
+        # Products outside the matrix: encode together with the query
+        embeddings = self._encode_normalized([query_text] + [product_texts[i] for i in missing])
+        query_embedding = embeddings[0]
+
+        if known:
+            known_rows = np.array([rows[i] for i in known])
+            tfidf_scores[known] = (matrix.tfidf[known_rows] @ query_vector.T).toarray().ravel()
+            embedding_scores[known] = matrix.embedding_scores(query_embedding, known_rows)
+
+        if missing:
+            missing_vectors = matrix.vectorizer.transform([product_texts[i] for i in missing])
+            tfidf_scores[missing] = (missing_vectors @ query_vector.T).toarray().ravel()
+            embedding_scores[missing] = embeddings[1:] @ query_embedding
+
+        return tfidf_scores, embedding_scores
+
+    @staticmethod
+    def _jaccard(set1: set, set2: set) -> float:
+        """Jaccard similarity of two sets (0.0 if either is empty)"""
+        if not set1 or not set2:
+            return 0.0
+        return len(set1 & set2) / len(set1 | set2)
+
     def _prepare_product_text(self, product: Dict) -> str:
         """Prepare product text for similarity analysis"""
         parts = []
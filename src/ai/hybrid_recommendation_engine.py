@@ -28,6 +28,21 @@ from src.core.neo4j_knowledge_graph import Neo4jKnowledgeGraph, get_knowledge_gr
 
 logger = logging.getLogger(__name__)
 
+# Hybrid algorithms, in score-matrix column order
+ALGORITHMS = ('collaborative', 'content_based', 'knowledge_graph', 'llm_analysis')
+
+# Knowledge graph USED_FOR necessity -> relationship score
+NECESSITY_SCORES = {'required': 0.9, 'recommended': 0.7, 'optional': 0.4}
+
+# Catalogue-wide TF-IDF (fitted once, reused for every request)
+CATALOGUE_TFIDF_PARAMS = {
+    'max_features': 20000,
+    'stop_words': 'english',
+    'ngram_range': (1, 2),
+    'sublinear_tf': True,
+    'dtype': np.float32
+}
+
 
 class HybridRecommendationEngine:
     """
@@ -134,6 +149,12 @@ class HybridRecommendationEngine:
         # Cache settings
         self.cache_ttl = 3600  # 1 hour
 
+        # Batch scoring settings
+        self.llm_scoring_batch_size = 25  # Products per LLM scoring call
+        self.catalogue_tfidf_ttl = timedelta(hours=6)  # Catalogue TF-IDF refit interval
+        self._catalogue_vectorizer: Optional[TfidfVectorizer] = None
+        self._catalogue_vectorizer_fitted_at: Optional[datetime] = None
+
         # Load category and task keyword mappings from database
         self._category_keywords = None  # Lazy-loaded from database
         self._task_keywords = None      # Lazy-loaded from database
@@ -184,41 +205,34 @@ class HybridRecommendationEngine:
 
             logger.info(f"🎯 Found {len(candidates)} candidate products")
 
-            # Score products using all algorithms
-            scored_products = []
+            # Score all candidates at once: one score array per algorithm
+            algorithm_scores = self._score_candidates(candidates, rfp_text, requirements, user_id)
 
-            for product in candidates:
-                scores = {
-                    'collaborative': self._collaborative_score(product, user_id),
-                    'content_based': self._content_based_score(product, rfp_text, requirements),
-                    'knowledge_graph': self._knowledge_graph_score(product, requirements),
-                    'llm_analysis': self._llm_analysis_score(product, requirements)
-                }
+            # Calculate weighted hybrid scores
+            weight_vector = np.array([self.weights[algo] for algo in ALGORITHMS])
+            score_matrix = np.column_stack([algorithm_scores[algo] for algo in ALGORITHMS])
+            hybrid_scores = score_matrix @ weight_vector
 
-                # Calculate weighted hybrid score
-                hybrid_score = sum(
-                    scores[algo] * self.weights[algo]
-                    for algo in scores
-                )
+            # Sort by hybrid score (descending) and limit results
+            top_indices = np.argsort(-hybrid_scores, kind='stable')[:limit]
+
+            recommendations = []
+            for index in top_indices:
+                product = candidates[index]
+                scores = {algo: float(algorithm_scores[algo][index]) for algo in ALGORITHMS}
 
                 # Add explanation if requested
                 explanation = None
                 if explain:
                     explanation = self._generate_explanation(product, scores, requirements)
 
-                scored_products.append({
+                recommendations.append({
                     'product': product,
-                    'hybrid_score': hybrid_score,
+                    'hybrid_score': float(hybrid_scores[index]),
                     'algorithm_scores': scores,
                     'explanation': explanation
                 })
 
-            # Sort by hybrid score (descending)
-            scored_products.sort(key=lambda x: x['hybrid_score'], reverse=True)
-
-            # Limit results
-            recommendations = scored_products[:limit]
-
             logger.info(f"✅ Generated {len(recommendations)} hybrid recommendations")
             logger.info(f"Top score: {recommendations[0]['hybrid_score']:.3f}, Bottom score: {recommendations[-1]['hybrid_score']:.3f}")
 
@@ -232,6 +246,409 @@ class HybridRecommendationEngine:
             logger.error(f"❌ Hybrid recommendation failed: {e}")
             return []
 
+    # =========================================================================
+    # Batch Scoring
+    # =========================================================================
+
+    def _score_candidates(
+        self,
+        candidates: List[Dict],
+        rfp_text: str,
+        requirements: List[str],
+        user_id: Optional[str]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Score every candidate with all four algorithms in one pass
+
+        - Collaborative: user history and similar users loaded once, one Redis
+          MGET for co-purchases and one SQL query for similar-user purchases
+        - Content-based: TF-IDF from a vectorizer fitted once on the catalogue,
+          RFP and all candidate texts encoded in a single embedding call
+        - Knowledge graph: one Neo4j query per extracted task (shared by all
+          candidates) plus one batched compatibility count
+        - LLM analysis: candidates scored in batches per chat completion
+
+        Returns:
+            Dict mapping algorithm name to an array of scores (candidate order)
+        """
+        product_texts = [self._prepare_product_text(product) for product in candidates]
+
+        return {
+            'collaborative': self._collaborative_scores(candidates, user_id),
+            'content_based': self._content_based_scores(
+                candidates, product_texts, rfp_text, requirements
+            ),
+            'knowledge_graph': self._knowledge_graph_scores(candidates, requirements),
+            'llm_analysis': self._llm_analysis_scores(candidates, requirements)
+        }
+
+    def _collaborative_scores(self, candidates: List[Dict], user_id: Optional[str]) -> np.ndarray:
+        """Collaborative filtering scores for all candidates (see _collaborative_score)"""
+        scores = np.zeros(len(candidates))
+
+        try:
+            if not user_id:
+                logger.debug("No user_id provided for collaborative filtering, returning 0.0")
+                return scores
+
+            user_history = self._get_user_purchase_history(user_id)
+            if not user_history:
+                logger.debug(f"No purchase history for user {user_id}, returning 0.0")
+                return scores
+
+            similar_users = self._find_similar_users(user_id, user_history)
+            product_ids = [product['id'] for product in candidates]
+
+            copurchase_scores = self._calculate_copurchase_scores(
+                product_ids,
+                [p['id'] for p in user_history]
+            )
+            similar_user_scores = self._calculate_similar_user_scores(product_ids, similar_users)
+
+            return np.minimum(copurchase_scores * 0.6 + similar_user_scores * 0.4, 1.0)
+
+        except Exception as e:
+            logger.error(f"❌ Collaborative filtering failed: {e}")
+            raise RuntimeError(
+                f"Collaborative filtering failed for {len(candidates)} candidates: {e}. "
+                "Check database connection and ensure purchase history tables exist."
+            )
+
+    def _calculate_copurchase_scores(
+        self,
+        product_ids: List[int],
+        user_product_ids: List[int]
+    ) -> np.ndarray:
+        """Co-purchase scores for all candidates with a single Redis MGET"""
+        if not self.cache_enabled or not product_ids or not user_product_ids:
+            return np.zeros(len(product_ids))
+
+        keys = [
+            f"copurchase:{user_product_id}:{product_id}"
+            for product_id in product_ids
+            for user_product_id in user_product_ids
+        ]
+        values = self.redis_client.mget(keys)
+        counts = np.array([int(value) if value else 0 for value in values], dtype=float)
+        max_copurchase = counts.reshape(len(product_ids), len(user_product_ids)).max(axis=1)
+
+        # Normalize to [0, 1] - 10+ co-purchases = 1.0 score
+        return np.minimum(max_copurchase / 10.0, 1.0)
+
+    def _calculate_similar_user_scores(
+        self,
+        product_ids: List[int],
+        similar_users: List[str]
+    ) -> np.ndarray:
+        """Similar-user purchase scores for all candidates with one query"""
+        if not similar_users or not product_ids:
+            return np.zeros(len(product_ids))
+
+        query = """
+            SELECT qi.id, COUNT(DISTINCT q.customer_email) as purchaser_count
+            FROM quote_items qi
+            JOIN quotations q ON qi.quotation_id = q.id
+            WHERE qi.id = ANY(%s)
+                AND q.customer_email = ANY(%s)
+                AND q.status IN ('accepted', 'sent')
+            GROUP BY qi.id
+        """
+
+        with self.database.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(query, (list(product_ids), similar_users))
+                purchaser_counts = dict(cursor.fetchall())
+
+        counts = np.array([purchaser_counts.get(pid, 0) for pid in product_ids], dtype=float)
+
+        # Normalize: if 50%+ of similar users purchased, score = 1.0
+        return np.minimum(counts / (len(similar_users) * 0.5), 1.0)
+
+    def _content_based_scores(
+        self,
+        candidates: List[Dict],
+        product_texts: List[str],
+        rfp_text: str,
+        requirements: List[str]
+    ) -> np.ndarray:
+        """Content-based scores for all candidates (see _content_based_score)"""
+        try:
+            for product, text in zip(candidates, product_texts):
+                if not text:
+                    raise ValueError(f"Product {product.get('id')} has no text content for scoring")
+
+            if not requirements:
+                raise ValueError("No requirements provided for keyword matching")
+
+            tfidf_scores = self._calculate_tfidf_similarities(product_texts, rfp_text)
+            keyword_scores = self._calculate_keyword_matches(product_texts, requirements)
+            embedding_scores = self._calculate_embedding_similarities(product_texts, rfp_text)
+
+            content_scores = (
+                tfidf_scores * 0.4 +
+                keyword_scores * 0.3 +
+                embedding_scores * 0.3
+            )
+
+            return np.minimum(content_scores, 1.0)
+
+        except Exception as e:
+            logger.error(f"❌ Content-based filtering failed: {e}")
+            raise RuntimeError(
+                f"Content-based scoring failed: {e}. "
+                "Check that products have valid text content and embedding model is loaded."
+            )
+
+    def _calculate_tfidf_similarities(self, product_texts: List[str], rfp_text: str) -> np.ndarray:
+        """
+        TF-IDF cosine similarity of every product text to the RFP
+
+        Uses the catalogue-fitted vectorizer; if the catalogue cannot be loaded,
+        fits once on the candidates and the RFP instead.
+        """
+        if not rfp_text:
+            raise ValueError("Empty text provided for TF-IDF calculation")
+
+        vectorizer = self._get_catalogue_vectorizer()
+        if vectorizer is None:
+            vectorizer = TfidfVectorizer(**CATALOGUE_TFIDF_PARAMS).fit(product_texts + [rfp_text])
+
+        product_vectors = vectorizer.transform(product_texts)
+        rfp_vector = vectorizer.transform([rfp_text])
+
+        # Rows are L2-normalised, so the dot product is the cosine similarity
+        return (product_vectors @ rfp_vector.T).toarray().ravel()
+
+    def _get_catalogue_vectorizer(self) -> Optional[TfidfVectorizer]:
+        """TF-IDF vectorizer fitted on the product catalogue (refitted after catalogue_tfidf_ttl)"""
+        if (
+            self._catalogue_vectorizer is not None
+            and datetime.now() - self._catalogue_vectorizer_fitted_at < self.catalogue_tfidf_ttl
+        ):
+            return self._catalogue_vectorizer
+
+        try:
+            with self.database.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT CONCAT_WS(' ', name, description) FROM products WHERE name IS NOT NULL"
+                    )
+                    documents = [row[0] for row in cursor.fetchall()]
+
+            if not documents:
+                logger.warning("Product catalogue is empty - TF-IDF fitted per request")
+                return None
+
+            self._catalogue_vectorizer = TfidfVectorizer(**CATALOGUE_TFIDF_PARAMS).fit(documents)
+            self._catalogue_vectorizer_fitted_at = datetime.now()
+            logger.info(f"✅ Fitted catalogue TF-IDF vectorizer on {len(documents)} products")
+
+        except Exception as e:
+            logger.warning(f"Catalogue TF-IDF fit failed, using previous/per-request vectorizer: {e}")
+
+        return self._catalogue_vectorizer
+
+    def _calculate_keyword_matches(self, product_texts: List[str], requirements: List[str]) -> np.ndarray:
+        """Fraction of requirements contained in each product text"""
+        lowered_requirements = [req.lower() for req in requirements]
+        matches = np.array([
+            [req in text.lower() for req in lowered_requirements]
+            for text in product_texts
+        ], dtype=float)
+        return matches.mean(axis=1)
+
+    def _calculate_embedding_similarities(self, product_texts: List[str], rfp_text: str) -> np.ndarray:
+        """
+        Semantic similarity of every product text to the RFP
+
+        The RFP and all candidate texts are encoded in one batched call.
+        """
+        if not self.embedding_model:
+            raise RuntimeError(
+                "CRITICAL: Sentence transformer embedding model not loaded. "
+                "Check that sentence-transformers is installed and model 'all-MiniLM-L6-v2' is available. "
+                "Cannot provide fallback score - embeddings are required for content-based filtering."
+            )
+
+        if not rfp_text:
+            raise ValueError("Empty text provided for embedding similarity")
+
+        embeddings = self.embedding_model.encode(
+            [rfp_text] + product_texts,
+            batch_size=64,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+
+        return embeddings[1:] @ embeddings[0]
+
+    def _knowledge_graph_scores(self, candidates: List[Dict], requirements: List[str]) -> np.ndarray:
+        """Knowledge graph scores for all candidates (see _knowledge_graph_score)"""
+        try:
+            product_ids = [product.get('id') for product in candidates]
+            if any(product_id is None for product_id in product_ids):
+                raise ValueError("Product missing ID for knowledge graph scoring")
+
+            tasks = self._extract_tasks_from_requirements(requirements)
+
+            if not tasks:
+                logger.warning("No tasks extracted from requirements for knowledge graph scoring")
+                return np.zeros(len(candidates))  # No task matches = 0 score
+
+            # One query per task, shared by all candidates
+            relationship_scores = np.zeros(len(candidates))
+            for task in tasks:
+                products_for_task = self.knowledge_graph.get_products_for_task(
+                    task_id=task,
+                    limit=50
+                )
+
+                task_scores = {}
+                for kg_product in products_for_task:
+                    task_scores.setdefault(
+                        kg_product.get('product_id'),
+                        NECESSITY_SCORES.get(kg_product.get('necessity', 'optional'), 0.4)
+                    )
+
+                relationship_scores += [task_scores.get(pid, 0.0) for pid in product_ids]
+
+            # Normalize score
+            relationship_scores /= len(tasks)
+
+            # Compatible products boost
+            compatible_counts = self.knowledge_graph.count_compatible_products(product_ids, limit=10)
+            compatibility_boost = np.minimum(
+                np.array([compatible_counts.get(pid, 0) for pid in product_ids]) * 0.05,
+                0.2
+            )
+
+            return np.minimum(relationship_scores + compatibility_boost, 1.0)
+
+        except Exception as e:
+            logger.error(f"❌ Knowledge graph scoring failed: {e}")
+            raise RuntimeError(
+                f"Neo4j query failed for {len(candidates)} candidates: {e}. "
+                "Ensure Neo4j is running and knowledge graph is populated. "
+                "Check NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD environment variables."
+            )
+
+    def _llm_analysis_scores(self, candidates: List[Dict], requirements: List[str]) -> np.ndarray:
+        """LLM scores for all candidates, llm_scoring_batch_size products per API call"""
+        if not self.openai_client:
+            raise RuntimeError(
+                "CRITICAL: OpenAI API key not configured. "
+                "Set OPENAI_API_KEY environment variable to use LLM analysis scoring. "
+                "Cannot provide neutral fallback - that would skew recommendation quality."
+            )
+
+        scores = np.zeros(len(candidates))
+
+        for start in range(0, len(candidates), self.llm_scoring_batch_size):
+            batch = candidates[start:start + self.llm_scoring_batch_size]
+
+            try:
+                response = self.openai_client.chat.completions.create(
+                    model=self.openai_model,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "You are an expert product recommendation system. Score how well each product matches customer requirements on a scale of 0.0 to 1.0."
+                        },
+                        {
+                            "role": "user",
+                            "content": self._create_llm_batch_scoring_prompt(batch, requirements)
+                        }
+                    ],
+                    temperature=0.1,
+                    max_tokens=50 + 15 * len(batch)
+                )
+
+                batch_scores = self._parse_llm_batch_scores(
+                    response.choices[0].message.content,
+                    len(batch)
+                )
+
+                if batch_scores is None:
+                    raise ValueError("Failed to parse scores from LLM response")
+
+                scores[start:start + len(batch)] = batch_scores
+
+            except Exception as e:
+                logger.error(f"❌ LLM analysis scoring failed: {e}")
+                raise RuntimeError(
+                    f"OpenAI API call failed for product scoring: {e}. "
+                    "Check API key, rate limits, and network connectivity. "
+                    f"Model: {self.openai_model}, Products: {[p.get('id') for p in batch]}"
+                )
+
+        return scores
+
+    def _create_llm_batch_scoring_prompt(self, products: List[Dict], requirements: List[str]) -> str:
+        """Create prompt that scores several products in one LLM call"""
+        product_lines = []
+        for number, product in enumerate(products, start=1):
+            description = (product.get('description') or 'No description')[:300]
+            product_lines.append(
+                f"[{number}] {product.get('name', 'Unknown')} | "
+                f"Brand: {product.get('brand', 'Unknown')} | "
+                f"Category: {product.get('category', 'Unknown')} | "
+                f"Description: {description}"
+            )
+
+        products_text = "\n".join(product_lines)
+        requirements_text = "\n".join(f"- {req}" for req in requirements)
+
+        prompt = f"""
+Products:
+{products_text}
+
+Customer Requirements:
+{requirements_text}
+
+Evaluate how well each product matches the customer requirements. Consider:
+1. Functional match (does it do what they need?)
+2. Technical specifications alignment
+3. Quality and reliability for the use case
+
+Score each product between 0.0 and 1.0, where:
+- 1.0 = Perfect match
+- 0.5 = Partial match
+- 0.0 = No match
+
+Respond with ONLY a JSON object mapping each product number to its score, e.g. {{"1": 0.8, "2": 0.3}}
+
+Scores:"""
+
+        return prompt
+
+    def _parse_llm_batch_scores(self, response_text: str, count: int) -> Optional[List[float]]:
+        """
+        Parse per-product scores from a batch LLM response
+
+        FAIL-FAST: Returns None unless every product got a score (no fallback score)
+        """
+        import re
+
+        parsed: Dict[int, float] = {}
+
+        try:
+            match = re.search(r'\{.*\}', response_text, re.DOTALL)
+            if match:
+                parsed = {int(k): float(v) for k, v in json.loads(match.group(0)).items()}
+        except (ValueError, TypeError, AttributeError):
+            parsed = {}
+
+        if not parsed:
+            # Tolerate "1: 0.8" / "[1] 0.8" style lines
+            for number, score in re.findall(r'\[?(\d+)\]?\s*[:=\-]?\s*(\d*\.\d+|\d+)', response_text):
+                parsed.setdefault(int(number), float(score))
+
+        if any(number not in parsed for number in range(1, count + 1)):
+            logger.warning(f"Could not parse {count} scores from LLM response: {response_text}")
+            return None
+
+        return [min(max(parsed[number], 0.0), 1.0) for number in range(1, count + 1)]
+
     # =========================================================================
     # Algorithm 1: Collaborative Filtering
     # =========================================================================
@@ -398,18 +815,8 @@ class HybridRecommendationEngine:
                 logger.debug("Redis cache not available, co-purchase score = 0.0")
                 return 0.0
 
-            # Check Redis for co-purchase patterns
-            max_copurchase = 0
-            for user_product_id in user_product_ids:
-                copurchase_key = f"copurchase:{user_product_id}:{product_id}"
-                copurchase_count = self.redis_client.get(copurchase_key)
-                if copurchase_count:
-                    max_copurchase = max(max_copurchase, int(copurchase_count))
-
-            # Normalize to [0, 1] - 10+ co-purchases = 1.0 score
-            normalized_score = min(max_copurchase / 10.0, 1.0)
-
-            return normalized_score
+            # Check Redis for co-purchase patterns (one MGET for all pairs)
+            return float(self._calculate_copurchase_scores([product_id], user_product_ids)[0])
 
         except Exception as e:
             logger.error(f"❌ Co-purchase score calculation failed: {e}")
@@ -1149,11 +1556,18 @@ Requirements:"""
             if not self.cache_enabled:
                 return
 
-            # Find all hybrid recommendation cache keys
-            keys = self.redis_client.keys("hybrid_rec:*")
-            if keys:
-                self.redis_client.delete(*keys)
-                logger.info(f"✅ Cleared {len(keys)} cached recommendations")
+            # Find all hybrid recommendation cache keys (SCAN, not a blocking KEYS)
+            cleared = 0
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key in self.redis_client.scan_iter(match="hybrid_rec:*", count=1000):
+                pipe.unlink(key)
+                cleared += 1
+                if cleared % 1000 == 0:
+                    pipe.execute()
+            pipe.execute()
+
+            if cleared:
+                logger.info(f"✅ Cleared {cleared} cached recommendations")
 
         except Exception as e:
             logger.error(f"❌ Failed to clear cache: {e}")
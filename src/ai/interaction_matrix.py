@@ -0,0 +1,521 @@
+"""
+Collaborative Filtering Interaction Matrix
+In-memory sparse matrices behind CollaborativeFilter
+
+Matrices (rows/columns indexed through user_index / item_index):
+- user_items:        users x items CSR, 1 if the user bought the item
+- user_cooccurrence: items x items, number of users who bought both items
+                     (diagonal = number of buyers of the item)
+- copurchase:        items x items, number of quotations containing both items
+
+Item neighbour lists (top-k by Jaccard similarity) are precomputed, so user,
+item and co-purchase scoring are sparse vector operations instead of per-pair
+lookups. The matrix is built from the quotations/quote_items tables and
+updated incrementally from a quotation-id watermark; a snapshot file lets
+workers start without a full rebuild.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from src.ai.catalogue_matrix import top_k_indices
+
+logger = logging.getLogger(__name__)
+
+# Purchases: accepted/sent quotations, in quotation order (watermark = q.id)
+INTERACTIONS_SQL = """
+    SELECT q.id AS quotation_id, q.customer_email, qi.id AS product_id
+    FROM quote_items qi
+    JOIN quotations q ON qi.quotation_id = q.id
+    WHERE q.id > %s
+        AND q.customer_email IS NOT NULL
+        AND q.status IN ('accepted', 'sent')
+    ORDER BY q.id
+"""
+
+DEFAULT_NEIGHBOR_K = 20
+
+# (quotation_id, user_id, product_id)
+Interaction = Tuple[int, str, int]
+
+
+def _binary(matrix: sparse.spmatrix) -> sparse.csr_matrix:
+    """CSR copy of matrix with every stored value set to 1"""
+    matrix = sparse.csr_matrix(matrix, dtype=np.float32)
+    matrix.sum_duplicates()
+    matrix.data[:] = 1.0
+    return matrix
+
+
+def _resized(matrix: sparse.csr_matrix, shape: Tuple[int, int]) -> sparse.csr_matrix:
+    """Copy of matrix padded with empty rows/columns to shape"""
+    matrix = matrix.copy()
+    matrix.resize(shape)
+    return matrix
+
+
+class InteractionMatrix:
+    """
+    Immutable snapshot of purchase interactions
+
+    with_interactions() returns an updated copy, so readers never see a
+    half-applied update.
+    """
+
+    def __init__(
+        self,
+        user_ids: List[str],
+        item_ids: List[int],
+        user_items: sparse.csr_matrix,
+        user_cooccurrence: sparse.csr_matrix,
+        copurchase: sparse.csr_matrix,
+        last_quotation_id: int = 0,
+        neighbor_k: int = DEFAULT_NEIGHBOR_K,
+        neighbors: Optional[Dict[int, Tuple[np.ndarray, np.ndarray]]] = None
+    ):
+        self.user_ids = user_ids
+        self.item_ids = item_ids
+        self.user_index = {user_id: i for i, user_id in enumerate(user_ids)}
+        self.item_index = {item_id: i for i, item_id in enumerate(item_ids)}
+        self.user_items = user_items
+        self.user_cooccurrence = user_cooccurrence
+        self.copurchase = copurchase
+        self.last_quotation_id = last_quotation_id
+        self.neighbor_k = neighbor_k
+        self.item_buyers = user_cooccurrence.diagonal()
+        self.user_sizes = np.diff(user_items.indptr)
+
+        if neighbors is None:
+            neighbors = self._compute_neighbors(range(len(item_ids)))
+        self.neighbors = neighbors
+
+    @classmethod
+    def empty(cls, neighbor_k: int = DEFAULT_NEIGHBOR_K) -> 'InteractionMatrix':
+        return cls(
+            user_ids=[],
+            item_ids=[],
+            user_items=sparse.csr_matrix((0, 0), dtype=np.float32),
+            user_cooccurrence=sparse.csr_matrix((0, 0), dtype=np.float32),
+            copurchase=sparse.csr_matrix((0, 0), dtype=np.float32),
+            neighbor_k=neighbor_k
+        )
+
+    @classmethod
+    def from_interactions(
+        cls,
+        interactions: Iterable[Interaction],
+        neighbor_k: int = DEFAULT_NEIGHBOR_K
+    ) -> 'InteractionMatrix':
+        """Full build from (quotation_id, user_id, product_id) rows"""
+        return cls.empty(neighbor_k).with_interactions(interactions)
+
+    # =========================================================================
+    # Incremental Update
+    # =========================================================================
+
+    def with_interactions(self, interactions: Iterable[Interaction]) -> 'InteractionMatrix':
+        """
+        Copy of the matrix with new interactions applied
+
+        Only the co-occurrence of users who have new purchases is recomputed
+        (new rows^T new rows - old rows^T old rows), and only the neighbour
+        lists of items whose counts changed are rebuilt.
+        """
+        interactions = list(interactions)
+        if not interactions:
+            return self
+
+        user_ids = list(self.user_ids)
+        item_ids = list(self.item_ids)
+        user_index = dict(self.user_index)
+        item_index = dict(self.item_index)
+
+        user_rows, item_cols, baskets = [], [], defaultdict(set)
+        for quotation_id, user_id, product_id in interactions:
+            if user_id not in user_index:
+                user_index[user_id] = len(user_ids)
+                user_ids.append(user_id)
+            if product_id not in item_index:
+                item_index[product_id] = len(item_ids)
+                item_ids.append(product_id)
+            user_rows.append(user_index[user_id])
+            item_cols.append(item_index[product_id])
+            baskets[quotation_id].add(item_index[product_id])
+
+        n_users, n_items = len(user_ids), len(item_ids)
+
+        # User x item purchases
+        old_user_items = _resized(self.user_items, (n_users, n_items))
+        delta = sparse.csr_matrix(
+            (np.ones(len(user_rows), dtype=np.float32), (user_rows, item_cols)),
+            shape=(n_users, n_items)
+        )
+        user_items = _binary(old_user_items + delta)
+
+        affected_users = np.unique(user_rows)
+        old_rows = old_user_items[affected_users]
+        new_rows = user_items[affected_users]
+        user_cooccurrence = (
+            _resized(self.user_cooccurrence, (n_items, n_items))
+            + new_rows.T @ new_rows
+            - old_rows.T @ old_rows
+        ).tocsr()
+        user_cooccurrence.eliminate_zeros()
+
+        # Quotation baskets
+        basket_rows, basket_cols = [], []
+        for row, items in enumerate(baskets.values()):
+            basket_rows.extend([row] * len(items))
+            basket_cols.extend(items)
+        basket_matrix = sparse.csr_matrix(
+            (np.ones(len(basket_rows), dtype=np.float32), (basket_rows, basket_cols)),
+            shape=(len(baskets), n_items)
+        )
+        copurchase = (
+            _resized(self.copurchase, (n_items, n_items)) + basket_matrix.T @ basket_matrix
+        ).tocsr()
+
+        updated = InteractionMatrix(
+            user_ids=user_ids,
+            item_ids=item_ids,
+            user_items=user_items,
+            user_cooccurrence=user_cooccurrence,
+            copurchase=copurchase,
+            last_quotation_id=max(self.last_quotation_id, max(q for q, _, _ in interactions)),
+            neighbor_k=self.neighbor_k,
+            neighbors=dict(self.neighbors)
+        )
+
+        # Jaccard(i, j) changes when i's or j's buyer count or their overlap changes
+        changed_items = np.unique(np.concatenate([new_rows.indices, old_rows.indices]))
+        touched_items = np.union1d(
+            changed_items, user_cooccurrence[changed_items].indices
+        )
+        updated.neighbors.update(updated._compute_neighbors(touched_items))
+
+        return updated
+
+    def _compute_neighbors(self, item_rows: Iterable[int]) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+        """Top-k Jaccard neighbours (item indices, similarities) of the given items"""
+        neighbors = {}
+        cooccurrence = self.user_cooccurrence
+        for i in item_rows:
+            i = int(i)
+            start, end = cooccurrence.indptr[i], cooccurrence.indptr[i + 1]
+            columns = cooccurrence.indices[start:end]
+            overlap = cooccurrence.data[start:end]
+
+            mask = columns != i
+            columns, overlap = columns[mask], overlap[mask]
+
+            union = self.item_buyers[i] + self.item_buyers[columns] - overlap
+            similarity = np.divide(
+                overlap, union, out=np.zeros(len(overlap), dtype=np.float32), where=union > 0
+            )
+
+            top = top_k_indices(similarity, self.neighbor_k)
+            neighbors[i] = (columns[top], similarity[top])
+        return neighbors
+
+    # =========================================================================
+    # Queries
+    # =========================================================================
+
+    def user_products(self, user_id: str) -> Set[int]:
+        """Products bought by the user"""
+        row = self.user_index.get(user_id)
+        if row is None:
+            return set()
+        start, end = self.user_items.indptr[row], self.user_items.indptr[row + 1]
+        return {self.item_ids[col] for col in self.user_items.indices[start:end]}
+
+    def user_similarities(self, user_id: str) -> Optional[np.ndarray]:
+        """Jaccard similarity of the user to every user (one sparse product)"""
+        row = self.user_index.get(user_id)
+        if row is None or self.user_sizes[row] == 0:
+            return None
+
+        intersection = (self.user_items @ self.user_items[row].T).toarray().ravel()
+        union = self.user_sizes + self.user_sizes[row] - intersection
+        return np.divide(
+            intersection, union, out=np.zeros(len(union), dtype=np.float64), where=union > 0
+        )
+
+    def user_similarity(self, user1_id: str, user2_id: str) -> float:
+        """Jaccard similarity of two users' purchases"""
+        row1 = self.user_index.get(user1_id)
+        row2 = self.user_index.get(user2_id)
+        if row1 is None or row2 is None:
+            return 0.0
+
+        intersection = self.user_items[row1].multiply(self.user_items[row2]).sum()
+        union = self.user_sizes[row1] + self.user_sizes[row2] - intersection
+        return float(intersection / union) if union > 0 else 0.0
+
+    def similar_users(
+        self,
+        user_id: str,
+        min_similarity: float,
+        limit: int
+    ) -> List[Tuple[str, float]]:
+        """Most similar users with similarity >= min_similarity"""
+        similarities = self.user_similarities(user_id)
+        if similarities is None:
+            return []
+
+        similarities[self.user_index[user_id]] = 0.0
+        similarities[similarities < min_similarity] = 0.0
+
+        return [
+            (self.user_ids[row], float(similarities[row]))
+            for row in top_k_indices(similarities, limit)
+            if similarities[row] > 0
+        ]
+
+    def item_similarity(self, item1_id: int, item2_id: int) -> float:
+        """Jaccard similarity of two items' buyers"""
+        i = self.item_index.get(item1_id)
+        j = self.item_index.get(item2_id)
+        if i is None or j is None:
+            return 0.0
+
+        overlap = self.user_cooccurrence[i, j]
+        union = self.item_buyers[i] + self.item_buyers[j] - overlap
+        return float(overlap / union) if union > 0 else 0.0
+
+    def similar_items(
+        self,
+        item_id: int,
+        min_similarity: float = 0.0,
+        limit: int = DEFAULT_NEIGHBOR_K
+    ) -> List[Tuple[int, float]]:
+        """Precomputed nearest items with similarity >= min_similarity"""
+        i = self.item_index.get(item_id)
+        if i is None:
+            return []
+
+        columns, similarities = self.neighbors[i]
+        return [
+            (self.item_ids[col], float(similarity))
+            for col, similarity in zip(columns[:limit], similarities[:limit])
+            if similarity >= min_similarity and similarity > 0
+        ]
+
+    def weighted_user_items(
+        self,
+        user_weights: Sequence[Tuple[str, float]],
+        exclude: Set[int],
+        limit: int
+    ) -> List[Tuple[int, float]]:
+        """Items scored by the summed weights of the users who bought them"""
+        rows, weights = [], []
+        for user_id, weight in user_weights:
+            row = self.user_index.get(user_id)
+            if row is not None:
+                rows.append(row)
+                weights.append(weight)
+        if not rows:
+            return []
+
+        scores = self.user_items[rows].T @ np.asarray(weights, dtype=np.float64)
+        return self._top_items(scores, exclude, limit)
+
+    def copurchase_scores(
+        self,
+        product_ids: Sequence[int],
+        limit: int
+    ) -> List[Tuple[int, float]]:
+        """Items co-purchased with product_ids, normalised to [0, 1]"""
+        rows = [self.item_index[pid] for pid in product_ids if pid in self.item_index]
+        if not rows:
+            return []
+
+        scores = np.asarray(self.copurchase[rows].sum(axis=0)).ravel()
+        results = self._top_items(scores, set(product_ids), limit)
+        if not results or results[0][1] <= 0:
+            return []
+
+        max_score = results[0][1]
+        return [(item_id, score / max_score) for item_id, score in results]
+
+    def _top_items(
+        self,
+        scores: np.ndarray,
+        exclude: Set[int],
+        limit: int
+    ) -> List[Tuple[int, float]]:
+        scores = np.array(scores, dtype=np.float64)
+        for item_id in exclude:
+            col = self.item_index.get(item_id)
+            if col is not None:
+                scores[col] = 0.0
+
+        return [
+            (self.item_ids[col], float(scores[col]))
+            for col in top_k_indices(scores, limit)
+            if scores[col] > 0
+        ]
+
+    def statistics(self) -> Dict[str, int]:
+        copurchase_pairs = self.copurchase.nnz - int(np.count_nonzero(self.copurchase.diagonal()))
+        return {
+            'total_users': len(self.user_ids),
+            'total_items': len(self.item_ids),
+            'total_purchases': int(self.user_items.nnz),
+            'total_copurchase_patterns': copurchase_pairs
+        }
+
+    # =========================================================================
+    # Snapshot
+    # =========================================================================
+
+    def save(self, path: str):
+        """Write a snapshot (atomic replace)"""
+        arrays = {
+            'user_ids': np.array(self.user_ids, dtype=str),
+            'item_ids': np.array(self.item_ids, dtype=np.int64),
+            'last_quotation_id': np.array(self.last_quotation_id, dtype=np.int64),
+            'neighbor_k': np.array(self.neighbor_k, dtype=np.int64)
+        }
+        for name in ('user_items', 'user_cooccurrence', 'copurchase'):
+            matrix = getattr(self, name)
+            arrays[f'{name}_data'] = matrix.data
+            arrays[f'{name}_indices'] = matrix.indices
+            arrays[f'{name}_indptr'] = matrix.indptr
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'InteractionMatrix':
+        """Read a snapshot written by save()"""
+        with np.load(path) as snapshot:
+            user_ids = snapshot['user_ids'].tolist()
+            item_ids = snapshot['item_ids'].tolist()
+            n_users, n_items = len(user_ids), len(item_ids)
+
+            def csr(name: str, shape: Tuple[int, int]) -> sparse.csr_matrix:
+                return sparse.csr_matrix(
+                    (snapshot[f'{name}_data'], snapshot[f'{name}_indices'], snapshot[f'{name}_indptr']),
+                    shape=shape
+                )
+
+            return cls(
+                user_ids=user_ids,
+                item_ids=item_ids,
+                user_items=csr('user_items', (n_users, n_items)),
+                user_cooccurrence=csr('user_cooccurrence', (n_items, n_items)),
+                copurchase=csr('copurchase', (n_items, n_items)),
+                last_quotation_id=int(snapshot['last_quotation_id']),
+                neighbor_k=int(snapshot['neighbor_k'])
+            )
+
+
+def fetch_interactions(db_connection, after_quotation_id: int = 0) -> List[Interaction]:
+    """Purchases from quotations newer than the watermark (psycopg2, dict rows)"""
+    with db_connection.cursor() as cursor:
+        cursor.execute(INTERACTIONS_SQL, (after_quotation_id,))
+        return [
+            (row['quotation_id'], row['customer_email'], row['product_id'])
+            for row in cursor.fetchall()
+        ]
+
+
+class InteractionMatrixStore:
+    """
+    Serves the current InteractionMatrix, catching up with new quotations
+
+    - First use: load the snapshot (if any), then apply newer quotations
+    - Every refresh_interval seconds: apply quotations past the watermark
+    - Every full_rebuild_interval seconds: rebuild from scratch, which also
+      picks up status changes of older quotations
+    """
+
+    def __init__(
+        self,
+        db_connection,
+        snapshot_path: Optional[str] = None,
+        refresh_interval: float = 300.0,
+        full_rebuild_interval: float = 24 * 3600.0,
+        neighbor_k: int = DEFAULT_NEIGHBOR_K
+    ):
+        self.db_connection = db_connection
+        self.snapshot_path = snapshot_path
+        self.refresh_interval = refresh_interval
+        self.full_rebuild_interval = full_rebuild_interval
+        self.neighbor_k = neighbor_k
+        self._matrix: Optional[InteractionMatrix] = None
+        self._refreshed_at = 0.0
+        self._rebuilt_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> InteractionMatrix:
+        """Current matrix (refreshed if due)"""
+        now = time.monotonic()
+        if self._matrix is not None and now - self._refreshed_at < self.refresh_interval:
+            return self._matrix
+
+        with self._lock:
+            now = time.monotonic()
+            if self._matrix is None:
+                self._matrix = self._load_snapshot()
+                if self._matrix is None:
+                    self.rebuild()
+                else:
+                    self._rebuilt_at = now
+                    self.refresh()
+            elif now - self._rebuilt_at >= self.full_rebuild_interval:
+                self.rebuild()
+            elif now - self._refreshed_at >= self.refresh_interval:
+                self.refresh()
+
+        return self._matrix
+
+    def rebuild(self) -> InteractionMatrix:
+        """Full build from the database"""
+        started = time.perf_counter()
+        self._matrix = InteractionMatrix.from_interactions(
+            fetch_interactions(self.db_connection), self.neighbor_k
+        )
+        self._refreshed_at = self._rebuilt_at = time.monotonic()
+        logger.info(
+            f"✅ Built interaction matrix: {len(self._matrix.user_ids)} users, "
+            f"{len(self._matrix.item_ids)} items ({time.perf_counter() - started:.1f}s)"
+        )
+        return self._matrix
+
+    def refresh(self) -> InteractionMatrix:
+        """Apply quotations newer than the matrix watermark"""
+        interactions = fetch_interactions(self.db_connection, self._matrix.last_quotation_id)
+        self._matrix = self._matrix.with_interactions(interactions)
+        self._refreshed_at = time.monotonic()
+        if interactions:
+            logger.debug(f"Interaction matrix updated with {len(interactions)} new purchases")
+        return self._matrix
+
+    def save(self):
+        """Write the current matrix to snapshot_path"""
+        if self.snapshot_path and self._matrix is not None:
+            self._matrix.save(self.snapshot_path)
+
+    def _load_snapshot(self) -> Optional[InteractionMatrix]:
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return None
+        try:
+            matrix = InteractionMatrix.load(self.snapshot_path)
+            logger.info(
+                f"✅ Loaded interaction matrix snapshot (quotations ≤ {matrix.last_quotation_id})"
+            )
+            return matrix
+        except Exception as e:
+            logger.error(f"❌ Failed to load interaction matrix snapshot: {e}")
+            return None
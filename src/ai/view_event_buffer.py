@@ -0,0 +1,146 @@
+"""
+View Event Buffer
+Write-behind buffer for product view tracking
+
+Writing a view directly costs four Redis round-trips. Views are instead
+added to an in-process buffer that coalesces repeated (user, product) views
+and is flushed as one Redis pipeline:
+- every flush_interval_ms by a background thread
+- when max_pending distinct events are buffered
+- on flush()/close() and at interpreter exit
+
+A flush that fails is logged and dropped (view tracking is implicit feedback
+and must never block or fail a request).
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+from typing import Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Keys written per flush
+USER_VIEWS_KEY = "user_views:{user_id}"
+USER_RECENT_VIEWS_KEY = "user_recent_views:{user_id}"
+RECENT_VIEWS_LIMIT = 100
+
+
+class ViewEventBuffer:
+    """
+    Coalescing write-behind buffer for view events
+
+    Usage:
+        buffer = ViewEventBuffer(redis_client, trending_key="trending_products")
+        buffer.add("user@example.com", 42)
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        trending_key: str,
+        flush_interval_ms: int = 250,
+        max_pending: int = 10000
+    ):
+        """
+        Args:
+            redis_client: Redis client
+            trending_key: Sorted set of global view counts
+            flush_interval_ms: Background flush interval
+            max_pending: Distinct (user, product) events that trigger an early flush
+        """
+        self.redis_client = redis_client
+        self.trending_key = trending_key
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.max_pending = max_pending
+
+        self._counts: Counter = Counter()
+        self._last_seen: Dict[Tuple[str, int], float] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+
+        self.flushed_events = 0
+        self.flush_errors = 0
+
+        self._thread = threading.Thread(target=self._run, name="view-event-flush", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def add(self, user_id: str, product_id: int, timestamp: float = None):
+        """Buffer one view (no network I/O)"""
+        key = (user_id, int(product_id))
+        with self._lock:
+            self._counts[key] += 1
+            self._last_seen[key] = timestamp or time.time()
+            pending = len(self._counts)
+
+        if pending >= self.max_pending:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """
+        Write buffered views in one pipeline
+
+        Returns:
+            Number of view events written
+        """
+        with self._lock:
+            if not self._counts:
+                return 0
+            counts, self._counts = self._counts, Counter()
+            last_seen, self._last_seen = self._last_seen, {}
+
+        recent_by_user: Dict[str, Dict[str, float]] = {}
+        product_totals: Counter = Counter()
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        for (user_id, product_id), count in counts.items():
+            pipe.zincrby(USER_VIEWS_KEY.format(user_id=user_id), count, str(product_id))
+            recent_by_user.setdefault(user_id, {})[str(product_id)] = last_seen[(user_id, product_id)]
+            product_totals[product_id] += count
+
+        for product_id, count in product_totals.items():
+            pipe.zincrby(self.trending_key, count, str(product_id))
+
+        for user_id, recent in recent_by_user.items():
+            recent_key = USER_RECENT_VIEWS_KEY.format(user_id=user_id)
+            pipe.zadd(recent_key, recent)
+            # Keep only last 100 views
+            pipe.zremrangebyrank(recent_key, 0, -(RECENT_VIEWS_LIMIT + 1))
+
+        events = sum(counts.values())
+        try:
+            pipe.execute()
+            self.flushed_events += events
+        except Exception as e:
+            self.flush_errors += 1
+            logger.debug(f"View flush failed ({events} events dropped): {e}")
+            return 0
+
+        return events
+
+    def close(self):
+        """Stop the background thread and flush what is left"""
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join(timeout=max(self.flush_interval * 4, 1.0))
+        self.flush()
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def _run(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if self._closed:
+                break
+            try:
+                self.flush()
+            except Exception as e:
+                logger.debug(f"View flush failed: {e}")
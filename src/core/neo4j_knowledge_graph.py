@@ -554,6 +554,44 @@ class Neo4jKnowledgeGraph:
             logger.error(f"❌ Failed to get compatible products for {product_id}: {e}")
             raise
 
+    def count_compatible_products(
+        self,
+        product_ids: List[int],
+        limit: int = 10
+    ) -> Dict[int, int]:
+        """
+        Count compatible products for many products in one query
+
+        Args:
+            product_ids: Product node IDs
+            limit: Cap on each count (same as get_compatible_products' limit)
+
+        Returns:
+            Dict mapping product ID to number of compatible products
+        """
+        try:
+            query = """
+            UNWIND $product_ids AS product_id
+            OPTIONAL MATCH (p1:Product {id: product_id})-[:COMPATIBLE_WITH]->(p2:Product)
+            WITH product_id, count(p2) AS compatible_count
+            RETURN
+                product_id,
+                CASE WHEN compatible_count > $limit THEN $limit ELSE compatible_count END
+                    AS compatible_count
+            """
+
+            with self.get_session() as session:
+                result = session.run(query, product_ids=list(product_ids), limit=limit)
+                counts = {
+                    record["product_id"]: record["compatible_count"] for record in result
+                }
+                logger.debug(f"Counted compatible products for {len(counts)} products")
+                return counts
+
+        except Exception as e:
+            logger.error(f"❌ Failed to count compatible products: {e}")
+            raise
+
     def get_task_recommendations_for_products(
         self,
         product_ids: List[int],
@@ -9,15 +9,22 @@ from typing import Dict, List, Optional, Any
 from contextlib import contextmanager
 import psycopg2
 from psycopg2 import pool
+from psycopg2.extras import RealDictCursor
 import json
 from datetime import datetime
 
 from kailash.workflow.builder import WorkflowBuilder
 from kailash.runtime.local import LocalRuntime
 from src.models.production_models import db
+from src.services.product_search import build_search_query
 
 logger = logging.getLogger(__name__)
 
+# Columns of the catalogue products table returned by search_products
+CATALOGUE_SEARCH_COLUMNS = (
+    "id", "sku", "name", "description", "category_id", "brand_id", "status", "is_active"
+)
+
 class PostgreSQLDatabase:
     """PostgreSQL database operations using DataFlow"""
     
@@ -280,42 +287,46 @@ class PostgreSQLDatabase:
             raise RuntimeError(f"Batch product creation failed: {str(e)}") from e
     
     def search_products(self, query: str, filters: Dict = None, limit: int = 100) -> List[Dict]:
-        """Search products using DataFlow"""
+        """Search products using the shared index-backed product search"""
         try:
-            search_filter = {}
-            
-            if query:
-                # Use DataFlow MongoDB-style query
-                search_filter = {
-                    "$or": [
-                        {"name": {"$regex": query, "$options": "i"}},
-                        {"description": {"$regex": query, "$options": "i"}},
-                        {"sku": {"$regex": query, "$options": "i"}}
-                    ]
-                }
-            
+            search_filters = {}
             if filters:
                 if 'category' in filters:
-                    search_filter["category_id"] = filters['category']
+                    search_filters["category_id"] = filters['category']
                 if 'brand' in filters:
-                    search_filter["brand_id"] = filters['brand']
+                    search_filters["brand_id"] = filters['brand']
                 if 'status' in filters:
-                    search_filter["status"] = filters['status']
-            
-            workflow = WorkflowBuilder()
-            workflow.add_node("ProductListNode", "search_products", {
-                "filter": search_filter,
-                "limit": limit,
-                "order_by": ["name"]
-            })
-            
-            results, run_id = self.runtime.execute(workflow.build())
-            return results.get("search_products", [])
-            
+                    search_filters["status"] = filters['status']
+
+            if not query:
+                # No search text - plain filtered listing via DataFlow
+                workflow = WorkflowBuilder()
+                workflow.add_node("ProductListNode", "search_products", {
+                    "filter": search_filters,
+                    "limit": limit,
+                    "order_by": ["name"]
+                })
+
+                results, run_id = self.runtime.execute(workflow.build())
+                return results.get("search_products", [])
+
+            sql, params = build_search_query(
+                query,
+                search_filters,
+                k=limit,
+                columns=CATALOGUE_SEARCH_COLUMNS,
+                paramstyle="pyformat"
+            )
+
+            with self.get_connection() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                    cursor.execute(sql, params)
+                    return [dict(row) for row in cursor.fetchall()]
+
         except Exception as e:
             logger.error(f"Product search failed: {e}")
             raise
-    
+
     def get_product_by_sku(self, sku: str) -> Optional[Dict]:
         """Get single product by SKU using DataFlow"""
         try:
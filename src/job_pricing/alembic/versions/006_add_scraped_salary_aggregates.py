@@ -0,0 +1,108 @@
+"""Add Mercer family assignment and salary aggregates for scraped listings
+
+Revision ID: 006_salary_aggregates
+Revises: 005_dedupe_version
+Create Date: 2025-11-18
+
+Pricing used to match scraped listings to a Mercer job family per request
+with an OR of trigram similarity predicates. Listings are now assigned to
+their best Mercer job once after each scrape, and salary distributions are
+precomputed per family x source x location.
+
+Changes:
+1. scraped_job_listings:
+   - Add annual_salary (normalised salary midpoint)
+   - Add mercer_job_code, mercer_family, mercer_match_score, mercer_assigned_at
+   - Add index on (mercer_family, source) and partial index on pending listings
+
+2. scraped_salary_aggregates (new):
+   - sample_size, P10-P90, mean_scraped_at, last_updated
+   - Unique (mercer_family, source, location)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '006_salary_aggregates'
+down_revision: Union[str, None] = '005_dedupe_version'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add Mercer assignment columns and the aggregates table"""
+
+    # ========================================================================
+    # Part 1: Mercer assignment on scraped_job_listings
+    # ========================================================================
+
+    op.add_column('scraped_job_listings',
+        sa.Column('annual_salary', sa.Numeric(12, 2), nullable=True,
+                  comment="Salary midpoint normalised to annual"))
+
+    op.add_column('scraped_job_listings',
+        sa.Column('mercer_job_code', sa.String(length=50), nullable=True,
+                  comment="Best matching Mercer job code"))
+
+    op.add_column('scraped_job_listings',
+        sa.Column('mercer_family', sa.String(length=100), nullable=True,
+                  comment="Mercer job family of the matched job code"))
+
+    op.add_column('scraped_job_listings',
+        sa.Column('mercer_match_score', sa.Numeric(4, 3), nullable=True,
+                  comment="Trigram similarity of the Mercer match (0-1)"))
+
+    op.add_column('scraped_job_listings',
+        sa.Column('mercer_assigned_at', sa.DateTime(timezone=True), nullable=True,
+                  comment="When the Mercer assignment was computed (NULL = pending)"))
+
+    op.create_index('idx_scraped_jobs_mercer_family', 'scraped_job_listings',
+                    ['mercer_family', 'source'])
+    op.create_index('idx_scraped_jobs_mercer_pending', 'scraped_job_listings', ['id'],
+                    postgresql_where=sa.text('mercer_assigned_at IS NULL'))
+
+    # ========================================================================
+    # Part 2: scraped_salary_aggregates
+    # ========================================================================
+
+    op.create_table(
+        'scraped_salary_aggregates',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False, comment="Unique identifier"),
+        sa.Column('mercer_family', sa.String(length=100), nullable=False, comment="Mercer job family"),
+        sa.Column('source', sa.String(length=50), nullable=False,
+                  comment="Data source (my_careers_future, glassdoor)"),
+        sa.Column('location', sa.String(length=255), nullable=False,
+                  comment="Normalised location, '*' for all locations"),
+        sa.Column('sample_size', sa.Integer(), nullable=False, comment="Number of listings in the group"),
+        sa.Column('p10', sa.Numeric(12, 2), nullable=False, comment="10th percentile (annual)"),
+        sa.Column('p25', sa.Numeric(12, 2), nullable=False, comment="25th percentile (annual)"),
+        sa.Column('p50', sa.Numeric(12, 2), nullable=False, comment="Median (annual)"),
+        sa.Column('p75', sa.Numeric(12, 2), nullable=False, comment="75th percentile (annual)"),
+        sa.Column('p90', sa.Numeric(12, 2), nullable=False, comment="90th percentile (annual)"),
+        sa.Column('mean_scraped_at', sa.DateTime(timezone=True), nullable=True,
+                  comment="Average scrape time of the listings"),
+        sa.Column('last_updated', sa.DateTime(timezone=True), nullable=False,
+                  server_default=sa.text('NOW()'), comment="When the aggregate was computed"),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('mercer_family', 'source', 'location', name='uq_salary_aggregate'),
+    )
+
+    print("Scraped salary aggregates added; run the full data scrape (or "
+          "MarketAggregationService(session).run()) to populate them")
+
+
+def downgrade() -> None:
+    """Remove the aggregates table and Mercer assignment columns"""
+
+    op.drop_table('scraped_salary_aggregates')
+
+    op.drop_index('idx_scraped_jobs_mercer_pending', 'scraped_job_listings')
+    op.drop_index('idx_scraped_jobs_mercer_family', 'scraped_job_listings')
+
+    op.drop_column('scraped_job_listings', 'mercer_assigned_at')
+    op.drop_column('scraped_job_listings', 'mercer_match_score')
+    op.drop_column('scraped_job_listings', 'mercer_family')
+    op.drop_column('scraped_job_listings', 'mercer_job_code')
+    op.drop_column('scraped_job_listings', 'annual_salary')
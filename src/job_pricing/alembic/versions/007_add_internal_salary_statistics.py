@@ -0,0 +1,59 @@
+"""Add precomputed internal salary statistics
+
+Revision ID: 007_internal_salary_stats
+Revises: 006_salary_aggregates
+Create Date: 2025-11-19
+
+HRIS salary statistics were computed per request by loading every matching
+employee. Statistics per grade and per job family are now precomputed after
+each BIPO sync (groups of at least 5 employees only, PDPA).
+
+Changes:
+1. internal_salary_statistics (new):
+   - employee_count, avg_salary, P25-P75, min/max, last_updated
+   - Unique (dimension, dimension_value)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '007_internal_salary_stats'
+down_revision: Union[str, None] = '006_salary_aggregates'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the internal salary statistics table"""
+
+    op.create_table(
+        'internal_salary_statistics',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False, comment="Unique identifier"),
+        sa.Column('dimension', sa.String(length=20), nullable=False,
+                  comment="Grouping dimension (internal_grade, job_family)"),
+        sa.Column('dimension_value', sa.String(length=100), nullable=False, comment="Grade or job family"),
+        sa.Column('employee_count', sa.Integer(), nullable=False, comment="Number of employees in the group"),
+        sa.Column('avg_salary', sa.Numeric(12, 2), nullable=True, comment="Average salary"),
+        sa.Column('p25', sa.Numeric(12, 2), nullable=True, comment="25th percentile salary"),
+        sa.Column('p50', sa.Numeric(12, 2), nullable=True, comment="Median salary"),
+        sa.Column('p75', sa.Numeric(12, 2), nullable=True, comment="75th percentile salary"),
+        sa.Column('min_salary', sa.Numeric(12, 2), nullable=True, comment="Minimum salary"),
+        sa.Column('max_salary', sa.Numeric(12, 2), nullable=True, comment="Maximum salary"),
+        sa.Column('last_updated', sa.DateTime(timezone=True), nullable=False,
+                  server_default=sa.text('NOW()'), comment="When the statistics were computed"),
+        sa.PrimaryKeyConstraint('id'),
+        sa.CheckConstraint("dimension IN ('internal_grade', 'job_family')",
+                           name='check_salary_statistic_dimension'),
+        sa.UniqueConstraint('dimension', 'dimension_value', name='uq_internal_salary_statistic'),
+    )
+
+    print("Internal salary statistics added; run a BIPO sync (or "
+          "HRISRepository(session).refresh_salary_statistics()) to populate them")
+
+
+def downgrade() -> None:
+    """Remove the internal salary statistics table"""
+
+    op.drop_table('internal_salary_statistics')
@@ -0,0 +1,52 @@
+"""Replace the Mercer embedding IVFFlat index with HNSW
+
+Revision ID: 008_mercer_hnsw
+Revises: 007_internal_salary_stats
+Create Date: 2025-11-19
+
+The IVFFlat index (lists=100) was built once over the job library and needed
+ivfflat.probes raised on every query to reach acceptable recall. HNSW needs
+no training data, keeps recall as the library is reloaded, and is tuned per
+connection with hnsw.ef_search (settings.VECTOR_HNSW_EF_SEARCH).
+
+Changes:
+1. mercer_job_library:
+   - Drop idx_mercer_embedding (ivfflat, vector_cosine_ops)
+   - Add idx_mercer_embedding_hnsw (hnsw, vector_cosine_ops, m=16, ef_construction=64)
+
+Requires pgvector >= 0.5.0. Compare both index types on the live library
+with benchmark_vector_index.py.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '008_mercer_hnsw'
+down_revision: Union[str, None] = '007_internal_salary_stats'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Swap the IVFFlat embedding index for HNSW"""
+
+    op.execute('DROP INDEX IF EXISTS idx_mercer_embedding')
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_mercer_embedding_hnsw
+        ON mercer_job_library
+        USING hnsw (embedding vector_cosine_ops)
+        WITH (m = 16, ef_construction = 64)
+    """)
+
+
+def downgrade() -> None:
+    """Restore the IVFFlat embedding index"""
+
+    op.execute('DROP INDEX IF EXISTS idx_mercer_embedding_hnsw')
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_mercer_embedding
+        ON mercer_job_library
+        USING ivfflat (embedding vector_cosine_ops)
+        WITH (lists = 100)
+    """)
@@ -0,0 +1,45 @@
+"""Add a trigram index on the Mercer base title
+
+Revision ID: 009_mercer_base_title_trgm
+Revises: 008_mercer_hnsw
+Create Date: 2025-11-21
+
+MarketAggregationService assigns scraped listings to Mercer jobs by trigram
+similarity of the listing title to the Mercer base title (the job title
+before " - "). The join now uses the pg_trgm % operator on that expression,
+which this index serves; similarity() is only used to rank the matches.
+
+Changes:
+1. mercer_job_library:
+   - Add idx_mercer_base_title_trgm (gin, gin_trgm_ops) on
+     btrim(split_part(job_title, ' - ', 1))
+
+The expression must stay identical to the one in ASSIGN_MERCER_SQL for the
+planner to use the index.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '009_mercer_base_title_trgm'
+down_revision: Union[str, None] = '008_mercer_hnsw'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the Mercer base title trigram index"""
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS "pg_trgm"')
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_mercer_base_title_trgm
+        ON mercer_job_library
+        USING gin ((btrim(split_part(job_title, ' - ', 1))) gin_trgm_ops)
+    """)
+
+
+def downgrade() -> None:
+    """Drop the Mercer base title trigram index"""
+
+    op.execute('DROP INDEX IF EXISTS idx_mercer_base_title_trgm')
@@ -0,0 +1,187 @@
+"""
+Vector Index Benchmark - IVFFlat vs HNSW on the Mercer Job Library
+
+Measures latency and recall@k of the Mercer job search statement
+(JobMatchingService SIMILAR_JOBS_SQL) for each index type and search setting
+against exact (sequential scan) results, on the job library in the database.
+
+Query vectors are library embeddings with a little noise added, so no
+OpenAI calls are needed. Indexes are built inside a transaction that is
+rolled back; the database is left unchanged, but the table is locked while
+the benchmark runs, so use a copy or a quiet period.
+
+Usage:
+    python benchmark_vector_index.py [--queries 200] [--top-k 10]
+"""
+import argparse
+import json
+import logging
+import statistics
+import time
+from datetime import datetime
+from typing import Dict, List, Set
+
+import numpy as np
+from sqlalchemy import text
+
+from src.job_pricing.core.database import SessionLocal
+from src.job_pricing.services.job_matching_service import SIMILAR_JOBS_SQL
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+INDEXES = {
+    "ivfflat": {
+        "create": "CREATE INDEX bench_mercer_embedding ON mercer_job_library "
+                  "USING ivfflat (embedding vector_cosine_ops) WITH (lists = {lists})",
+        "setting": "ivfflat.probes",
+        "values": [1, 5, 10, 20, 40],
+    },
+    "hnsw": {
+        "create": "CREATE INDEX bench_mercer_embedding ON mercer_job_library "
+                  "USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64)",
+        "setting": "hnsw.ef_search",
+        "values": [20, 40, 100, 200],
+    },
+}
+
+EXISTING_INDEXES = ["idx_mercer_embedding", "idx_mercer_embedding_hnsw"]
+
+
+class VectorIndexBenchmark:
+    """IVFFlat vs HNSW comparison for the Mercer job search."""
+
+    def __init__(self, num_queries: int = 200, top_k: int = 10, noise: float = 0.01):
+        self.session = SessionLocal()
+        self.num_queries = num_queries
+        self.top_k = top_k
+        self.noise = noise
+
+    def run(self) -> Dict:
+        """Run all configurations; nothing is committed."""
+        try:
+            library_size = self.session.execute(text(
+                "SELECT count(*) FROM mercer_job_library WHERE embedding IS NOT NULL"
+            )).scalar()
+            queries = self._query_vectors()
+
+            print(f"Library: {library_size} embedded jobs, {len(queries)} queries, recall@{self.top_k}")
+
+            for index in EXISTING_INDEXES:
+                self.session.execute(text(f"DROP INDEX IF EXISTS {index}"))
+
+            savepoint = self.session.begin_nested()
+            exact, exact_times = self._search(queries, "SET LOCAL enable_indexscan = off")
+            savepoint.rollback()
+
+            results = {
+                "library_size": library_size,
+                "queries": len(queries),
+                "top_k": self.top_k,
+                "exact": {"p50_ms": statistics.median(exact_times), "recall": 1.0},
+            }
+
+            for name, config in INDEXES.items():
+                savepoint = self.session.begin_nested()
+                try:
+                    started = time.perf_counter()
+                    self.session.execute(text(config["create"].format(
+                        lists=max(1, int(library_size ** 0.5))
+                    )))
+                    build_seconds = time.perf_counter() - started
+
+                    for value in config["values"]:
+                        found, times = self._search(
+                            queries,
+                            "SET LOCAL enable_seqscan = off",
+                            f"SET LOCAL {config['setting']} = {value}",
+                        )
+                        results[f"{name} {config['setting']}={value}"] = {
+                            "build_s": build_seconds,
+                            "p50_ms": statistics.median(times),
+                            "p95_ms": float(np.percentile(times, 95)),
+                            "recall": self._recall(exact, found),
+                        }
+                finally:
+                    savepoint.rollback()
+
+            return results
+
+        finally:
+            self.session.rollback()
+            self.session.close()
+
+    def _query_vectors(self) -> List[List[float]]:
+        """Random library embeddings with Gaussian noise, re-normalised."""
+        rows = self.session.execute(text(
+            "SELECT embedding::text FROM mercer_job_library "
+            "WHERE embedding IS NOT NULL ORDER BY random() LIMIT :n"
+        ), {"n": self.num_queries}).scalars().all()
+
+        rng = np.random.default_rng(42)
+        queries = []
+        for row in rows:
+            vector = np.array(json.loads(row), dtype=np.float64)
+            vector += rng.normal(0, self.noise, vector.shape)
+            queries.append((vector / np.linalg.norm(vector)).tolist())
+        return queries
+
+    def _search(self, queries: List[List[float]], *settings: str):
+        """Run the search statement per query; returns ids and latencies (ms)."""
+        for setting in settings:
+            self.session.execute(text(setting))
+
+        # Warm up the index pages
+        for embedding in queries[:10]:
+            self.session.execute(SIMILAR_JOBS_SQL, {"embedding": embedding, "limit": self.top_k}).fetchall()
+
+        found: List[Set[int]] = []
+        times = []
+        for embedding in queries:
+            started = time.perf_counter()
+            rows = self.session.execute(
+                SIMILAR_JOBS_SQL, {"embedding": embedding, "limit": self.top_k}
+            ).fetchall()
+            times.append((time.perf_counter() - started) * 1000)
+            found.append({row[0] for row in rows})
+        return found, times
+
+    def _recall(self, exact: List[Set[int]], found: List[Set[int]]) -> float:
+        """Mean fraction of the exact top-k returned."""
+        return statistics.mean(
+            len(truth & result) / len(truth) for truth, result in zip(exact, found) if truth
+        )
+
+
+def print_report(results: Dict):
+    """Print a comparison table."""
+    print("\n" + "=" * 80)
+    print(f"{'Configuration':<32}{'Build':>10}{'p50':>10}{'p95':>10}{'Recall':>10}")
+    print("-" * 80)
+    for name, row in results.items():
+        if not isinstance(row, dict):
+            continue
+        build = f"{row['build_s']:.1f}s" if "build_s" in row else "-"
+        p95 = f"{row['p95_ms']:.1f}ms" if "p95_ms" in row else "-"
+        print(f"{name:<32}{build:>10}{row['p50_ms']:>8.1f}ms{p95:>10}{row['recall']:>10.3f}")
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    try:
+        results = VectorIndexBenchmark(num_queries=args.queries, top_k=args.top_k).run()
+        print_report(results)
+
+        output_file = f'vector_index_benchmark_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+        with open(output_file, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to: {output_file}")
+
+    except Exception as e:
+        logger.error(f"Benchmark failed: {e}", exc_info=True)
+        print(f"\nERROR: Benchmark failed - {e}")
@@ -3,11 +3,21 @@ Base Data Loader
 
 Foundational class for all data ingestion operations.
 Provides common functionality: batch processing, error handling, progress tracking.
+
+Two write paths:
+- Record mode (default): repository.create() per record, duplicates detected
+  from IntegrityError
+- Bulk mode (bulk=True): batch validation over a DataFrame, then one
+  INSERT ... ON CONFLICT (conflict_columns) DO UPDATE ... RETURNING per batch;
+  per-row outcomes come from the RETURNING rows, and only a batch the database
+  rejects is retried row by row (each in a savepoint) to isolate the bad rows
 """
 
-from typing import List, Dict, Any, Optional, Callable, TypeVar, Generic
+from typing import List, Dict, Any, Optional, Callable, Tuple, TypeVar, Generic
 from dataclasses import dataclass, field
 from datetime import datetime
+from sqlalchemy import func, literal_column, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 import logging
@@ -33,6 +43,8 @@ class LoadStatistics:
     failed: int = 0
     skipped: int = 0
     duplicates: int = 0
+    updated: int = 0
+    unchanged: int = 0
     validation_errors: int = 0
     database_errors: int = 0
     start_time: datetime = field(default_factory=datetime.now)
@@ -68,6 +80,8 @@ class LoadStatistics:
             "failed": self.failed,
             "skipped": self.skipped,
             "duplicates": self.duplicates,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
             "validation_errors": self.validation_errors,
             "database_errors": self.database_errors,
             "success_rate": f"{self.success_rate:.2f}%",
@@ -85,6 +99,7 @@ class LoadStatistics:
             f"  ✓ Successful: {self.successful}\n"
             f"  ✗ Failed: {self.failed}\n"
             f"  ⊘ Skipped: {self.skipped}\n"
+            f"  ↻ Updated: {self.updated} (unchanged: {self.unchanged})\n"
             f"  ⚠ Validation Errors: {self.validation_errors}\n"
             f"  ⚠ Database Errors: {self.database_errors}\n"
             f"  Success Rate: {self.success_rate:.2f}%\n"
@@ -128,8 +143,15 @@ class BaseDataLoader(Generic[ModelType]):
     Subclasses should override:
     - transform_record() - Convert raw data to model instance
     - get_record_id() - Extract unique identifier from raw data
+    - conflict_columns - Natural key with a unique constraint (bulk mode)
     """
 
+    # Unique natural key used as the ON CONFLICT target in bulk mode
+    conflict_columns: Tuple[str, ...] = ()
+
+    # Columns never overwritten when a bulk upsert updates an existing row
+    immutable_columns: Tuple[str, ...] = ("id", "created_at")
+
     def __init__(
         self,
         session: Session,
@@ -137,7 +159,8 @@ class BaseDataLoader(Generic[ModelType]):
         validator: Optional[BaseValidator] = None,
         batch_size: int = 100,
         continue_on_error: bool = True,
-        show_progress: bool = True
+        show_progress: bool = True,
+        bulk: bool = False
     ):
         """
         Initialize data loader.
@@ -149,13 +172,19 @@ class BaseDataLoader(Generic[ModelType]):
             batch_size: Number of records to process per batch
             continue_on_error: If True, continue processing after errors
             show_progress: If True, show progress bar during loading
+            bulk: If True, upsert each batch in one statement (existing rows
+                with the same conflict_columns are updated, not rejected)
         """
+        if bulk and not self.conflict_columns:
+            raise ValueError(f"{type(self).__name__} does not define conflict_columns for bulk mode")
+
         self.session = session
         self.repository = repository
         self.validator = validator
         self.batch_size = batch_size
         self.continue_on_error = continue_on_error
         self.show_progress = show_progress
+        self.bulk = bulk
         self.statistics = LoadStatistics()
 
     def load_data(
@@ -173,14 +202,16 @@ class BaseDataLoader(Generic[ModelType]):
             post_transform_hook: Optional function to call after transforming each record
 
         Returns:
-            LoadResult with statistics and errors
+            LoadResult with statistics and errors (bulk mode returns no
+            loaded_models)
         """
         self.statistics = LoadStatistics()
         self.statistics.total_records = len(data)
         validation_results = []
         loaded_models = []
 
-        logger.info(f"Starting data load: {len(data)} records")
+        logger.info(f"Starting data load: {len(data)} records{' (bulk)' if self.bulk else ''}")
+        process_batch = self._process_batch_bulk if self.bulk else self._process_batch
 
         # Create progress bar
         progress = tqdm(total=len(data), disable=not self.show_progress)
@@ -189,7 +220,7 @@ class BaseDataLoader(Generic[ModelType]):
             # Process in batches
             for i in range(0, len(data), self.batch_size):
                 batch = data[i:i + self.batch_size]
-                batch_result = self._process_batch(
+                batch_result = process_batch(
                     batch,
                     pre_transform_hook,
                     post_transform_hook
@@ -317,6 +348,172 @@ class BaseDataLoader(Generic[ModelType]):
             "loaded_models": loaded_models
         }
 
+    def _process_batch_bulk(
+        self,
+        batch: List[Dict[str, Any]],
+        pre_transform_hook: Optional[Callable],
+        post_transform_hook: Optional[Callable]
+    ) -> Dict[str, List]:
+        """
+        Process a batch with one validation pass and one upsert statement.
+
+        Args:
+            batch: List of raw records to process
+            pre_transform_hook: Optional pre-processing function
+            post_transform_hook: Optional post-processing function
+
+        Returns:
+            Dictionary with validation_results and (empty) loaded_models
+        """
+        records = []
+        for raw_record in batch:
+            try:
+                records.append(pre_transform_hook(raw_record) if pre_transform_hook else raw_record)
+            except Exception as e:
+                self.statistics.failed += 1
+                logger.error(f"Error processing record {self.get_record_id(raw_record)}: {e}")
+                if not self.continue_on_error:
+                    raise
+
+        record_ids = [self.get_record_id(record) for record in records]
+
+        # Validate the whole batch
+        validation_results = []
+        valid = list(zip(record_ids, records))
+        if self.validator:
+            validation_results = self.validator.validate_records(records, record_ids)
+            valid = []
+            for record_id, record, validation_result in zip(record_ids, records, validation_results):
+                if validation_result.is_valid:
+                    valid.append((record_id, record))
+                    continue
+                self.statistics.validation_errors += 1
+                self.statistics.failed += 1
+                self._log_validation_errors(validation_result)
+                if not self.continue_on_error:
+                    raise ValueError(f"Validation failed for record {record_id}")
+
+        # Transform to column values, keeping the last row per conflict key
+        rows: Dict[Tuple, Tuple[str, Dict[str, Any], Dict[str, Any]]] = {}
+        for record_id, record in valid:
+            try:
+                model_instance = self.transform_record(record)
+                if post_transform_hook:
+                    model_instance = post_transform_hook(model_instance)
+                values = self._column_values(model_instance)
+            except Exception as e:
+                self.statistics.failed += 1
+                logger.error(f"Error processing record {record_id}: {e}")
+                if not self.continue_on_error:
+                    raise
+                continue
+
+            key = tuple(values.get(column) for column in self.conflict_columns)
+            if key in rows:
+                # One statement cannot update the same row twice
+                self.statistics.duplicates += 1
+                self.statistics.failed += 1
+                logger.warning(f"Duplicate record in batch superseded: {rows[key][0]}")
+            rows[key] = (record_id, record, values)
+
+        if rows:
+            try:
+                with self.session.begin_nested():
+                    outcomes = self._upsert([values for _, _, values in rows.values()])
+                self._count_upsert(rows.keys(), outcomes)
+            except Exception as e:
+                logger.warning(f"Bulk upsert of {len(rows)} rows failed, retrying row by row: {e}")
+                self._upsert_rows_individually(rows)
+
+        # Commit batch
+        try:
+            self.repository.commit()
+        except Exception as e:
+            logger.error(f"Failed to commit batch: {e}")
+            self.session.rollback()
+            raise
+
+        return {
+            "validation_results": validation_results,
+            "loaded_models": []
+        }
+
+    def _upsert_rows_individually(self, rows: Dict[Tuple, Tuple[str, Dict[str, Any], Dict[str, Any]]]):
+        """Upsert rows one at a time so only the rejected rows fail."""
+        for key, (record_id, record, values) in rows.items():
+            try:
+                with self.session.begin_nested():
+                    outcomes = self._upsert([values])
+                self._count_upsert([key], outcomes)
+
+            except Exception as e:
+                self.statistics.database_errors += 1
+                self.statistics.failed += 1
+                self._log_database_error(record_id, record, e)
+                if not self.continue_on_error:
+                    raise
+
+    def _upsert(self, rows: List[Dict[str, Any]]) -> Dict[Tuple, bool]:
+        """
+        INSERT ... ON CONFLICT DO UPDATE the rows.
+
+        Existing rows are only updated when a value differs, so unchanged
+        rows keep their updated_at.
+
+        Returns:
+            {conflict key: True if inserted, False if updated} for every
+            written row (unchanged rows are absent)
+        """
+        table = self.repository.model.__table__
+        columns = list(rows[0])
+        stmt = pg_insert(table).values(rows)
+
+        key_columns = [table.c[column] for column in self.conflict_columns]
+        update_columns = [
+            column for column in columns
+            if column not in self.conflict_columns and column not in self.immutable_columns
+        ]
+
+        if update_columns:
+            set_ = {column: stmt.excluded[column] for column in update_columns}
+            if "updated_at" in table.c and "updated_at" not in set_:
+                set_["updated_at"] = func.now()
+            stmt = stmt.on_conflict_do_update(
+                index_elements=key_columns,
+                set_=set_,
+                where=or_(*[
+                    table.c[column].is_distinct_from(stmt.excluded[column])
+                    for column in update_columns
+                ])
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=key_columns)
+
+        # xmax is 0 for a freshly inserted tuple
+        stmt = stmt.returning(*key_columns, literal_column("xmax = 0").label("inserted"))
+        return {
+            tuple(row[:-1]): bool(row[-1])
+            for row in self.session.execute(stmt).fetchall()
+        }
+
+    def _count_upsert(self, keys, outcomes: Dict[Tuple, bool]):
+        """Update statistics from the RETURNING rows of an upsert."""
+        for key in keys:
+            self.statistics.successful += 1
+            if key not in outcomes:
+                self.statistics.unchanged += 1
+            elif not outcomes[key]:
+                self.statistics.updated += 1
+
+    def _column_values(self, model_instance: ModelType) -> Dict[str, Any]:
+        """Column values set on a transformed (transient) model instance."""
+        state = model_instance.__dict__
+        return {
+            column.key: state[column.key]
+            for column in self.repository.model.__mapper__.column_attrs
+            if column.key in state
+        }
+
     def transform_record(self, raw_data: Dict[str, Any]) -> ModelType:
         """
         Transform raw data dictionary to model instance.
@@ -5,10 +5,16 @@ Generates OpenAI embeddings for Mercer Job Library records to enable semantic se
 Uses text-embedding-3-large model (1536 dimensions) for high-quality embeddings.
 
 Features:
-- Batch processing with configurable batch size
-- Rate limiting and retry logic
+- Keyset-paginated streaming (never loads the whole library)
+- Batched embedding requests (one API call per batch), several in flight
+- Bulk writes: COPY into a staging table + a single UPDATE ... FROM per page
+- Rate limiting
 - Progress tracking
-- Resume capability (skips jobs with existing embeddings)
+- Resume capability: skips jobs with existing embeddings, and a checkpoint
+  row (embedding_backfill_checkpoints, committed with each page) lets an
+  interrupted full re-embed continue where it stopped; jobs of failed
+  batches are recorded in the checkpoint and retried first on resume
+- Pluggable embedding provider (LocalEmbeddingProvider for offline tests)
 - Cost estimation and tracking
 
 Usage:
@@ -20,17 +26,23 @@ Usage:
 
     # Or from command line:
     python -m data.ingestion.generate_embeddings --batch-size 100
+    python -m data.ingestion.generate_embeddings --reembed   # after a model change
 """
 
 import sys
 import os
+import io
 import time
+import hashlib
 import logging
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor, Future
 from dataclasses import dataclass, field
 from datetime import datetime
+from sqlalchemy import func, text
 from sqlalchemy.orm import Session
+import numpy as np
 import openai
 from tqdm import tqdm
 
@@ -38,11 +50,80 @@ from tqdm import tqdm
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.job_pricing.models.mercer import MercerJobLibrary
-from src.job_pricing.repositories.mercer_repository import MercerJobLibraryRepository
+from src.job_pricing.repositories.mercer_repository import MercerRepository
 from src.job_pricing.core.database import get_session
 
 logger = logging.getLogger(__name__)
 
+# Checkpoints of interrupted runs (same table as the product embedding backfill)
+CHECKPOINT_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS embedding_backfill_checkpoints (
+    job_name VARCHAR(200) PRIMARY KEY,
+    last_id BIGINT NOT NULL,
+    processed INTEGER NOT NULL DEFAULT 0,
+    failed_ids BIGINT[] NOT NULL DEFAULT '{}',
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+ALTER TABLE embedding_backfill_checkpoints
+    ADD COLUMN IF NOT EXISTS failed_ids BIGINT[] NOT NULL DEFAULT '{}'
+"""
+
+# Columns needed to build the embedding text (the stored vectors are not loaded)
+EMBEDDING_TEXT_COLUMNS = (
+    MercerJobLibrary.id,
+    MercerJobLibrary.job_code,
+    MercerJobLibrary.job_title,
+    MercerJobLibrary.family,
+    MercerJobLibrary.subfamily,
+    MercerJobLibrary.career_level,
+    MercerJobLibrary.job_description,
+    MercerJobLibrary.typical_titles,
+    MercerJobLibrary.specialization_notes,
+)
+
+
+class OpenAIEmbeddingProvider:
+    """Embeds a batch of texts with a single OpenAI embeddings request."""
+
+    def __init__(self, api_key: str, model: str, dimensions: int):
+        self.client = openai.OpenAI(api_key=api_key)
+        self.model = model
+        self.dimensions = dimensions
+
+    def embed_batch(self, texts: List[str]) -> Tuple[List[List[float]], int]:
+        """
+        Returns:
+            (embeddings in input order, total tokens used)
+        """
+        response = self.client.embeddings.create(
+            model=self.model,
+            input=texts,
+            dimensions=self.dimensions
+        )
+        embeddings = [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+        return embeddings, response.usage.total_tokens
+
+
+class LocalEmbeddingProvider:
+    """
+    Deterministic offline provider for tests (no API calls).
+
+    Each text maps to a unit vector seeded from its SHA-256 hash.
+    """
+
+    def __init__(self, dimensions: int = 1536):
+        self.dimensions = dimensions
+        self.calls = 0
+
+    def embed_batch(self, texts: List[str]) -> Tuple[List[List[float]], int]:
+        self.calls += 1
+        embeddings = []
+        for item in texts:
+            seed = int.from_bytes(hashlib.sha256(item.encode()).digest()[:8], "little")
+            vector = np.random.default_rng(seed).standard_normal(self.dimensions)
+            embeddings.append((vector / np.linalg.norm(vector)).tolist())
+        return embeddings, sum(len(item) // 4 for item in texts)
+
 
 @dataclass
 class EmbeddingStatistics:
@@ -109,7 +190,10 @@ class EmbeddingGenerator:
         session: Session,
         api_key: Optional[str] = None,
         batch_size: int = 100,
-        show_progress: bool = True
+        show_progress: bool = True,
+        max_in_flight: int = 4,
+        provider: Optional[Any] = None,
+        checkpoint: bool = True
     ):
         """
         Initialize embedding generator.
@@ -117,23 +201,34 @@ class EmbeddingGenerator:
         Args:
             session: SQLAlchemy database session
             api_key: OpenAI API key (default: from OPENAI_API_KEY env var)
-            batch_size: Number of jobs to process per batch
+            batch_size: Number of jobs per embedding request
             show_progress: Show progress bar
+            max_in_flight: Concurrent embedding requests; a page is
+                batch_size * max_in_flight jobs
+            provider: Embedding provider with embed_batch(texts) -> (vectors, tokens)
+                (default: OpenAIEmbeddingProvider)
+            checkpoint: Record progress in embedding_backfill_checkpoints
         """
         self.session = session
-        self.repository = MercerJobLibraryRepository(session)
+        self.repository = MercerRepository(session)
         self.batch_size = batch_size
         self.show_progress = show_progress
-
-        # Initialize OpenAI client
-        api_key = api_key or os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError(
-                "OpenAI API key required. Set OPENAI_API_KEY environment variable "
-                "or pass api_key parameter."
+        self.max_in_flight = max_in_flight
+        self.page_size = batch_size * max_in_flight
+        self.checkpoint = checkpoint
+
+        if provider is None:
+            # Initialize OpenAI client
+            api_key = api_key or os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                raise ValueError(
+                    "OpenAI API key required. Set OPENAI_API_KEY environment variable "
+                    "or pass api_key parameter."
+                )
+            provider = OpenAIEmbeddingProvider(
+                api_key, self.EMBEDDING_MODEL, self.EMBEDDING_DIMENSIONS
             )
-
-        self.client = openai.OpenAI(api_key=api_key)
+        self.provider = provider
 
         # Rate limiting
         self.request_times: List[float] = []
@@ -142,14 +237,22 @@ class EmbeddingGenerator:
     def generate_all(
         self,
         skip_existing: bool = True,
-        max_jobs: Optional[int] = None
+        max_jobs: Optional[int] = None,
+        resume: bool = True
     ) -> Dict[str, Any]:
         """
         Generate embeddings for all Mercer jobs.
 
+        Jobs are streamed by keyset pagination. Each page is embedded as up to
+        max_in_flight concurrent batch requests while the previous page is
+        written with COPY + UPDATE ... FROM and committed together with the
+        checkpoint row. Jobs of failed batches are kept in the checkpoint and
+        retried first by the next resumed run.
+
         Args:
             skip_existing: Skip jobs that already have embeddings
             max_jobs: Maximum number of jobs to process (for testing)
+            resume: Continue an interrupted run from its checkpoint
 
         Returns:
             Dictionary with statistics
@@ -160,44 +263,83 @@ class EmbeddingGenerator:
             >>> print(f"Total cost: ${result['statistics'].total_cost_usd:.2f}")
         """
         stats = EmbeddingStatistics()
+        run_key = self._checkpoint_key(skip_existing)
 
         logger.info("Starting embedding generation for Mercer jobs")
 
-        # Get jobs that need embeddings
-        if skip_existing:
-            jobs = self.repository.find_by(embedding=None)
-            logger.info(f"Found {len(jobs)} jobs without embeddings")
-        else:
-            jobs = self.repository.get_all()
-            logger.info(f"Found {len(jobs)} total jobs")
+        if not resume:
+            self._clear_checkpoint(run_key)
+        last_id, retry_ids = self._load_checkpoint(run_key)
+        if last_id or retry_ids:
+            logger.info(
+                f"Resuming from checkpoint after job id {last_id} "
+                f"({len(retry_ids)} failed jobs to retry)"
+            )
 
-        # Apply max_jobs limit for testing
+        pending_jobs = self._count_pending(skip_existing, last_id)
         if max_jobs:
-            jobs = jobs[:max_jobs]
+            pending_jobs = min(pending_jobs, max_jobs)
             logger.info(f"Limited to {max_jobs} jobs for testing")
 
-        stats.total_jobs = len(jobs)
-        stats.jobs_without_embeddings = len(jobs)
-
-        # Process in batches
-        batches = [
-            jobs[i:i + self.batch_size]
-            for i in range(0, len(jobs), self.batch_size)
-        ]
+        stats.total_jobs = pending_jobs
+        stats.jobs_without_embeddings = pending_jobs
+        logger.info(f"Found {pending_jobs} jobs to embed (pages of {self.page_size})")
 
-        logger.info(f"Processing {len(batches)} batches of size {self.batch_size}")
-
-        for batch in tqdm(batches, desc="Generating embeddings", disable=not self.show_progress):
-            try:
-                self._process_batch(batch, stats)
+        fetched = 0
+        exhausted = False
+        failed_ids: Set[int] = set()
+        in_flight: Optional[Tuple[list, List[Tuple[list, Future]]]] = None
+        progress = tqdm(
+            total=pending_jobs, desc="Generating embeddings", disable=not self.show_progress
+        )
 
-                # Commit after each batch
-                self.session.commit()
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            # Jobs that failed in the interrupted run come first; the ones
+            # that fail again stay recorded for the next run
+            if retry_ids:
+                retry_rows = self._fetch_ids(retry_ids)
+                self._complete_page(
+                    retry_rows, self._submit_page(executor, retry_rows),
+                    stats, run_key, last_id, failed_ids
+                )
 
-            except Exception as e:
-                logger.error(f"Error processing batch: {e}")
-                self.session.rollback()
-                stats.failed += len(batch)
+            while True:
+                rows: list = []
+                if max_jobs is None or fetched < max_jobs:
+                    limit = self.page_size
+                    if max_jobs is not None:
+                        limit = min(limit, max_jobs - fetched)
+                    rows = self._fetch_page(last_id, limit, skip_existing)
+                    exhausted = not rows
+
+                # Submit the next page before writing the previous one so the
+                # provider keeps working while the database write runs
+                submitted = self._submit_page(executor, rows) if rows else None
+
+                if in_flight is not None:
+                    rows_done, futures = in_flight
+                    self._complete_page(
+                        rows_done, futures, stats, run_key, rows_done[-1].id, failed_ids
+                    )
+                    progress.update(len(rows_done))
+
+                if not rows:
+                    break
+
+                fetched += len(rows)
+                last_id = rows[-1].id
+                in_flight = (rows, submitted)
+
+        progress.close()
+
+        # A finished run removes its checkpoint; a run stopped by max_jobs, or
+        # one with jobs still failing, keeps it for the next run
+        if exhausted and failed_ids:
+            logger.warning(
+                f"{len(failed_ids)} jobs failed; they are retried when the run is resumed"
+            )
+        elif exhausted:
+            self._clear_checkpoint(run_key)
 
         stats.end_time = datetime.now()
 
@@ -212,59 +354,206 @@ class EmbeddingGenerator:
             "generated": stats.generated,
             "failed": stats.failed,
             "skipped": stats.skipped,
+            "failed_job_ids": sorted(failed_ids),
             "total_cost_usd": stats.total_cost_usd,
             "duration_seconds": stats.duration_seconds,
         }
 
-    def _process_batch(self, jobs: List[MercerJobLibrary], stats: EmbeddingStatistics):
+    def _fetch_page(self, last_id: int, limit: int, skip_existing: bool) -> list:
+        """Next page of jobs after last_id (keyset pagination, text columns only)"""
+        query = self.session.query(*EMBEDDING_TEXT_COLUMNS).filter(
+            MercerJobLibrary.id > last_id
+        )
+        if skip_existing:
+            query = query.filter(MercerJobLibrary.embedding.is_(None))
+        return query.order_by(MercerJobLibrary.id).limit(limit).all()
+
+    def _fetch_ids(self, job_ids: List[int]) -> list:
+        """Jobs with the given ids (text columns only)"""
+        return (
+            self.session.query(*EMBEDDING_TEXT_COLUMNS)
+            .filter(MercerJobLibrary.id.in_(job_ids))
+            .order_by(MercerJobLibrary.id)
+            .all()
+        )
+
+    def _count_pending(self, skip_existing: bool, last_id: int = 0) -> int:
+        """Number of jobs still to embed"""
+        query = self.session.query(func.count(MercerJobLibrary.id)).filter(
+            MercerJobLibrary.id > last_id
+        )
+        if skip_existing:
+            query = query.filter(MercerJobLibrary.embedding.is_(None))
+        return query.scalar() or 0
+
+    def _submit_page(
+        self,
+        executor: ThreadPoolExecutor,
+        rows: list
+    ) -> List[Tuple[list, Future]]:
+        """Submit one embedding request per batch of the page"""
+        submitted = []
+        for i in range(0, len(rows), self.batch_size):
+            batch = rows[i:i + self.batch_size]
+            texts = [self._create_embedding_text(job) for job in batch]
+
+            # Rate limiting
+            self._rate_limit(sum(len(text) // 4 for text in texts))
+            self.request_times.append(time.time())
+
+            submitted.append((batch, executor.submit(self.provider.embed_batch, texts)))
+        return submitted
+
+    def _complete_page(
+        self,
+        rows: list,
+        submitted: List[Tuple[list, Future]],
+        stats: EmbeddingStatistics,
+        run_key: str,
+        checkpoint_id: int,
+        failed_ids: Set[int]
+    ):
         """
-        Process a batch of jobs.
+        Collect a page's embeddings, write them in bulk and commit them with
+        the checkpoint.
 
         Args:
-            jobs: List of jobs to process
+            rows: Jobs of the page (ordered by id)
+            submitted: (batch, future) pairs from _submit_page
             stats: Statistics object to update
+            run_key: Checkpoint key of this run
+            checkpoint_id: Job id the checkpoint moves to
+            failed_ids: Ids of jobs whose batch failed; updated in place
         """
-        for job in jobs:
-            try:
-                # Skip if already has embedding (safety check)
-                if job.embedding is not None:
-                    stats.skipped += 1
-                    continue
-
-                # Generate embedding text
-                embedding_text = self._create_embedding_text(job)
+        records: List[Tuple[int, List[float]]] = []
 
-                # Estimate tokens
-                estimated_tokens = len(embedding_text) // 4  # Rough estimate
-
-                # Rate limiting
-                self._rate_limit(estimated_tokens)
-
-                # Generate embedding
-                response = self.client.embeddings.create(
-                    model=self.EMBEDDING_MODEL,
-                    input=embedding_text,
-                    dimensions=self.EMBEDDING_DIMENSIONS
+        for batch, future in submitted:
+            try:
+                embeddings, tokens = future.result()
+            except Exception as e:
+                logger.error(
+                    f"Failed to generate embeddings for jobs "
+                    f"{batch[0].job_code}..{batch[-1].job_code}: {e}"
                 )
+                stats.failed += len(batch)
+                failed_ids.update(job.id for job in batch)
+                continue
+
+            failed_ids.difference_update(job.id for job in batch)
+            records.extend((job.id, embedding) for job, embedding in zip(batch, embeddings))
+            stats.total_tokens += tokens
+            stats.total_cost_usd += (tokens / 1_000_000) * self.COST_PER_1M_TOKENS
+            self.token_counts.append(tokens)
+
+        try:
+            written = self._write_embeddings(records)
+            self._save_checkpoint(run_key, checkpoint_id, stats.generated + written, sorted(failed_ids))
+            self.session.commit()
+        except Exception as e:
+            logger.error(f"Error writing embeddings: {e}")
+            self.session.rollback()
+            stats.failed += len(records)
+            raise
+
+        stats.generated += written
+
+    def _write_embeddings(self, records: List[Tuple[int, List[float]]]) -> int:
+        """
+        COPY embeddings into a temp staging table and apply them with one UPDATE.
 
-                # Extract embedding vector
-                embedding_vector = response.data[0].embedding
-
-                # Update job
-                job.embedding = embedding_vector
-
-                # Update statistics
-                stats.generated += 1
-                stats.total_tokens += response.usage.total_tokens
-                stats.total_cost_usd += (response.usage.total_tokens / 1_000_000) * self.COST_PER_1M_TOKENS
+        Args:
+            records: (job id, embedding) pairs
 
-                # Record request time for rate limiting
-                self.request_times.append(time.time())
-                self.token_counts.append(response.usage.total_tokens)
+        Returns:
+            Number of updated jobs
+        """
+        if not records:
+            return 0
+
+        buffer = io.StringIO()
+        for job_id, embedding in records:
+            buffer.write(f"{job_id}\t[{','.join(repr(float(x)) for x in embedding)}]\n")
+        buffer.seek(0)
+
+        cursor = self.session.connection().connection.cursor()
+        try:
+            cursor.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS mercer_embedding_staging "
+                "(id INTEGER PRIMARY KEY, embedding TEXT NOT NULL) ON COMMIT DELETE ROWS"
+            )
+            cursor.copy_expert(
+                "COPY mercer_embedding_staging (id, embedding) FROM STDIN", buffer
+            )
+            cursor.execute(
+                """
+                UPDATE mercer_job_library m
+                SET embedding = s.embedding::vector,
+                    updated_at = NOW()
+                FROM mercer_embedding_staging s
+                WHERE m.id = s.id
+                """
+            )
+            return cursor.rowcount
+        finally:
+            cursor.close()
+
+    def _checkpoint_key(self, skip_existing: bool) -> str:
+        """Checkpoint key; a model change never resumes another model's run"""
+        scope = "missing" if skip_existing else "all"
+        return f"mercer_jobs:{self.EMBEDDING_MODEL}:{self.EMBEDDING_DIMENSIONS}:{scope}"
+
+    def _load_checkpoint(self, run_key: str) -> Tuple[int, List[int]]:
+        """Last committed job id and failed job ids of this run ((0, []) if none)"""
+        if not self.checkpoint:
+            return 0, []
+        self.session.execute(text(CHECKPOINT_TABLE_SQL))
+        row = self.session.execute(
+            text(
+                "SELECT last_id, failed_ids FROM embedding_backfill_checkpoints "
+                "WHERE job_name = :job_name"
+            ),
+            {"job_name": run_key}
+        ).first()
+        self.session.commit()
+        if row is None:
+            return 0, []
+        return int(row.last_id), sorted(row.failed_ids or [])
+
+    def _save_checkpoint(self, run_key: str, last_id: int, processed: int, failed_ids: List[int]):
+        """Record the checkpoint in the current transaction (committed with the page)"""
+        if not self.checkpoint:
+            return
+        self.session.execute(
+            text(
+                """
+                INSERT INTO embedding_backfill_checkpoints
+                    (job_name, last_id, processed, failed_ids, updated_at)
+                VALUES (:job_name, :last_id, :processed, CAST(:failed_ids AS BIGINT[]), NOW())
+                ON CONFLICT (job_name) DO UPDATE
+                SET last_id = EXCLUDED.last_id,
+                    processed = EXCLUDED.processed,
+                    failed_ids = EXCLUDED.failed_ids,
+                    updated_at = EXCLUDED.updated_at
+                """
+            ),
+            {
+                "job_name": run_key,
+                "last_id": int(last_id),
+                "processed": processed,
+                "failed_ids": [int(job_id) for job_id in failed_ids],
+            }
+        )
 
-            except Exception as e:
-                logger.error(f"Failed to generate embedding for job {job.job_code}: {e}")
-                stats.failed += 1
+    def _clear_checkpoint(self, run_key: str):
+        """Remove the checkpoint of a finished (or restarted) run"""
+        if not self.checkpoint:
+            return
+        self.session.execute(text(CHECKPOINT_TABLE_SQL))
+        self.session.execute(
+            text("DELETE FROM embedding_backfill_checkpoints WHERE job_name = :job_name"),
+            {"job_name": run_key}
+        )
+        self.session.commit()
 
     @staticmethod
     def _create_embedding_text(job: MercerJobLibrary) -> str:
@@ -363,8 +652,7 @@ class EmbeddingGenerator:
             >>> print(f"Estimated cost: ${estimate['total_cost_usd']:.2f}")
         """
         if num_jobs is None:
-            jobs_without_embeddings = self.repository.find_by(embedding=None)
-            num_jobs = len(jobs_without_embeddings)
+            num_jobs = self._count_pending(skip_existing=True)
 
         # Estimate tokens per job (500 tokens average)
         estimated_tokens_per_job = 500
@@ -389,6 +677,7 @@ def main():
 
     Usage:
         python -m data.ingestion.generate_embeddings [--batch-size 100] [--max-jobs 10] [--estimate]
+            [--reembed] [--max-in-flight 4] [--restart]
 
     Examples:
         # Estimate cost
@@ -402,6 +691,9 @@ def main():
 
         # Custom batch size
         python -m data.ingestion.generate_embeddings --batch-size 50
+
+        # Re-embed every job after a model change (resumes if interrupted)
+        python -m data.ingestion.generate_embeddings --reembed
     """
     import argparse
 
@@ -433,6 +725,22 @@ def main():
         default=True,
         help="Skip jobs with existing embeddings (default: True)"
     )
+    parser.add_argument(
+        "--reembed",
+        action="store_true",
+        help="Re-embed all jobs, including jobs with existing embeddings"
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=4,
+        help="Concurrent embedding requests (default: 4)"
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore the checkpoint of an interrupted run"
+    )
     parser.add_argument(
         "--estimate",
         action="store_true",
@@ -447,14 +755,15 @@ def main():
     args = parser.parse_args()
 
     # Get database session
-    session = get_session()
+    session = next(get_session())
 
     try:
         # Create generator
         generator = EmbeddingGenerator(
             session=session,
             batch_size=args.batch_size,
-            show_progress=not args.no_progress
+            show_progress=not args.no_progress,
+            max_in_flight=args.max_in_flight
         )
 
         if args.estimate:
@@ -476,8 +785,9 @@ def main():
         else:
             # Generate embeddings
             result = generator.generate_all(
-                skip_existing=args.skip_existing,
-                max_jobs=args.max_jobs
+                skip_existing=args.skip_existing and not args.reembed,
+                max_jobs=args.max_jobs,
+                resume=not args.restart
             )
 
             stats = result["statistics"]
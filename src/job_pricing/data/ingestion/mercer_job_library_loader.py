@@ -67,12 +67,15 @@ class MercerJobLibraryLoader(BaseDataLoader[MercerJobLibrary], ExcelLoader):
         >>> print(f"Speed: {result.statistics.records_per_second:.1f} records/sec")
     """
 
+    conflict_columns = ("job_code",)
+
     def __init__(
         self,
         session: Session,
         batch_size: int = 100,
         continue_on_error: bool = True,
-        show_progress: bool = True
+        show_progress: bool = True,
+        bulk: bool = False
     ):
         """
         Initialize Mercer Job Library loader.
@@ -82,13 +85,17 @@ class MercerJobLibraryLoader(BaseDataLoader[MercerJobLibrary], ExcelLoader):
             batch_size: Number of records per batch (default: 100)
             continue_on_error: Continue loading on errors (default: True)
             show_progress: Show progress bar (default: True)
+            bulk: Upsert batches in one statement (default: False)
         """
         # Initialize repository
         repository = MercerRepository(session)
 
-        # Get existing job codes for duplicate detection
-        existing_jobs = repository.get_all()
-        existing_job_codes = {job.job_code for job in existing_jobs}
+        # Get existing job codes for duplicate detection (bulk mode updates
+        # existing jobs instead)
+        existing_job_codes = None
+        if not bulk:
+            existing_jobs = repository.get_all()
+            existing_job_codes = {job.job_code for job in existing_jobs}
 
         # Initialize validator
         validator = MercerJobLibraryValidator(existing_job_codes=existing_job_codes)
@@ -100,7 +107,8 @@ class MercerJobLibraryLoader(BaseDataLoader[MercerJobLibrary], ExcelLoader):
             validator=validator,
             batch_size=batch_size,
             continue_on_error=continue_on_error,
-            show_progress=show_progress
+            show_progress=show_progress,
+            bulk=bulk
         )
 
     def transform_record(self, raw_data: Dict[str, Any]) -> MercerJobLibrary:
@@ -314,6 +322,11 @@ def main():
         action="store_true",
         help="Hide progress bar"
     )
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Upsert each batch in one statement, updating existing records"
+    )
 
     args = parser.parse_args()
 
@@ -331,7 +344,8 @@ def main():
         loader = MercerJobLibraryLoader(
             session=session,
             batch_size=args.batch_size,
-            show_progress=not args.no_progress
+            show_progress=not args.no_progress,
+            bulk=args.bulk
         )
 
         # Load data
@@ -53,12 +53,15 @@ class SSGJobRolesLoader(BaseDataLoader[SSGSkillsFramework], ExcelLoader):
         >>> print(f"Success rate: {result.statistics.success_rate:.1f}%")
     """
 
+    conflict_columns = ("job_role_code",)
+
     def __init__(
         self,
         session: Session,
         batch_size: int = 100,
         continue_on_error: bool = True,
-        show_progress: bool = True
+        show_progress: bool = True,
+        bulk: bool = False
     ):
         """
         Initialize SSG Job Roles loader.
@@ -68,13 +71,17 @@ class SSGJobRolesLoader(BaseDataLoader[SSGSkillsFramework], ExcelLoader):
             batch_size: Number of records per batch (default: 100)
             continue_on_error: Continue loading on errors (default: True)
             show_progress: Show progress bar (default: True)
+            bulk: Upsert batches in one statement (default: False)
         """
         # Initialize repository
         repository = SSGRepository(session)
 
-        # Get existing job role codes for duplicate detection
-        existing_roles = repository.get_all()
-        existing_role_codes = {role.job_role_code for role in existing_roles}
+        # Get existing job role codes for duplicate detection (bulk mode
+        # updates existing roles instead)
+        existing_role_codes = None
+        if not bulk:
+            existing_roles = repository.get_all()
+            existing_role_codes = {role.job_role_code for role in existing_roles}
 
         # Initialize validator
         validator = SSGJobRoleValidator(existing_role_codes=existing_role_codes)
@@ -86,7 +93,8 @@ class SSGJobRolesLoader(BaseDataLoader[SSGSkillsFramework], ExcelLoader):
             validator=validator,
             batch_size=batch_size,
             continue_on_error=continue_on_error,
-            show_progress=show_progress
+            show_progress=show_progress,
+            bulk=bulk
         )
 
     def transform_record(self, raw_data: Dict[str, Any]) -> SSGSkillsFramework:
@@ -249,6 +257,11 @@ def main():
         action="store_true",
         help="Hide progress bar"
     )
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Upsert each batch in one statement, updating existing records"
+    )
 
     args = parser.parse_args()
 
@@ -266,7 +279,8 @@ def main():
         loader = SSGJobRolesLoader(
             session=session,
             batch_size=args.batch_size,
-            show_progress=not args.no_progress
+            show_progress=not args.no_progress,
+            bulk=args.bulk
         )
 
         # Load data
@@ -60,12 +60,15 @@ class SSGMappingsLoader(BaseDataLoader[SSGJobRoleTSCMapping], ExcelLoader):
         >>> print(f"Success rate: {result.statistics.success_rate:.1f}%")
     """
 
+    conflict_columns = ("job_role_code", "tsc_code")
+
     def __init__(
         self,
         session: Session,
         batch_size: int = 100,
         continue_on_error: bool = True,
-        show_progress: bool = True
+        show_progress: bool = True,
+        bulk: bool = False
     ):
         """
         Initialize SSG Mappings loader.
@@ -75,6 +78,7 @@ class SSGMappingsLoader(BaseDataLoader[SSGJobRoleTSCMapping], ExcelLoader):
             batch_size: Number of records per batch (default: 100)
             continue_on_error: Continue loading on errors (default: True)
             show_progress: Show progress bar (default: True)
+            bulk: Upsert batches in one statement (default: False)
         """
         # Initialize repositories
         job_roles_repo = SSGJobRolesRepository(session)
@@ -111,7 +115,8 @@ class SSGMappingsLoader(BaseDataLoader[SSGJobRoleTSCMapping], ExcelLoader):
             validator=validator,
             batch_size=batch_size,
             continue_on_error=continue_on_error,
-            show_progress=show_progress
+            show_progress=show_progress,
+            bulk=bulk
         )
 
     def transform_record(self, raw_data: Dict[str, Any]) -> SSGJobRoleTSCMapping:
@@ -318,6 +323,11 @@ def main():
         action="store_true",
         help="Hide progress bar"
     )
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Upsert each batch in one statement, updating existing records"
+    )
 
     args = parser.parse_args()
 
@@ -335,7 +345,8 @@ def main():
         loader = SSGMappingsLoader(
             session=session,
             batch_size=args.batch_size,
-            show_progress=not args.no_progress
+            show_progress=not args.no_progress,
+            bulk=args.bulk
         )
 
         # Load data
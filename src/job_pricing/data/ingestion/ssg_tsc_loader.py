@@ -51,12 +51,15 @@ class SSGTSCLoader(BaseDataLoader[SSGTSC], ExcelLoader):
         >>> print(f"Success rate: {result.statistics.success_rate:.1f}%")
     """
 
+    conflict_columns = ("tsc_code",)
+
     def __init__(
         self,
         session: Session,
         batch_size: int = 100,
         continue_on_error: bool = True,
-        show_progress: bool = True
+        show_progress: bool = True,
+        bulk: bool = False
     ):
         """
         Initialize SSG TSC loader.
@@ -66,13 +69,17 @@ class SSGTSCLoader(BaseDataLoader[SSGTSC], ExcelLoader):
             batch_size: Number of records per batch (default: 100)
             continue_on_error: Continue loading on errors (default: True)
             show_progress: Show progress bar (default: True)
+            bulk: Upsert batches in one statement (default: False)
         """
         # Initialize repository
         repository = SSGTSCRepository(session)
 
-        # Get existing TSC codes for duplicate detection
-        existing_tsc = repository.get_all()
-        existing_tsc_codes = {tsc.tsc_code for tsc in existing_tsc}
+        # Get existing TSC codes for duplicate detection (bulk mode updates
+        # existing skills instead)
+        existing_tsc_codes = None
+        if not bulk:
+            existing_tsc = repository.get_all()
+            existing_tsc_codes = {tsc.tsc_code for tsc in existing_tsc}
 
         # Initialize validator
         validator = SSGTSCValidator(existing_tsc_codes=existing_tsc_codes)
@@ -84,7 +91,8 @@ class SSGTSCLoader(BaseDataLoader[SSGTSC], ExcelLoader):
             validator=validator,
             batch_size=batch_size,
             continue_on_error=continue_on_error,
-            show_progress=show_progress
+            show_progress=show_progress,
+            bulk=bulk
         )
 
     def transform_record(self, raw_data: Dict[str, Any]) -> SSGTSC:
@@ -250,6 +258,11 @@ def main():
         action="store_true",
         help="Hide progress bar"
     )
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Upsert each batch in one statement, updating existing records"
+    )
 
     args = parser.parse_args()
 
@@ -267,7 +280,8 @@ def main():
         loader = SSGTSCLoader(
             session=session,
             batch_size=args.batch_size,
-            show_progress=not args.no_progress
+            show_progress=not args.no_progress,
+            bulk=args.bulk
         )
 
         # Load data
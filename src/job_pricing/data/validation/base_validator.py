@@ -9,6 +9,9 @@ from dataclasses import dataclass, field
 from datetime import datetime
 import logging
 
+import numpy as np
+import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 
@@ -136,26 +139,7 @@ class BaseValidator:
 
         # Run all validation rules
         for rule in self.validation_rules:
-            try:
-                rule_result = rule(data, record_id)
-
-                if rule_result:
-                    if isinstance(rule_result, ValidationError):
-                        result.add_error(rule_result)
-                    elif isinstance(rule_result, list):
-                        for error in rule_result:
-                            if isinstance(error, ValidationError):
-                                result.add_error(error)
-
-            except Exception as e:
-                logger.error(f"Validation rule failed: {rule.__name__}: {e}")
-                result.add_error(ValidationError(
-                    field="__system__",
-                    error_type="rule_exception",
-                    message=f"Validation rule {rule.__name__} raised exception: {e}",
-                    value=None,
-                    record_id=record_id
-                ))
+            self._apply_rule(rule, data, record_id, result)
 
         return result
 
@@ -183,6 +167,78 @@ class BaseValidator:
 
         return results
 
+    def validate_records(
+        self,
+        records: List[Dict[str, Any]],
+        record_ids: List[Optional[str]]
+    ) -> List[ValidationResult]:
+        """
+        Validate a batch of records with vectorised rule checks.
+
+        Each rule with a batch_check(frame) is first evaluated over the whole
+        batch as a pandas DataFrame; the record-level rule then only runs on
+        the rows it flags. Results are the same as validate() per record.
+
+        Args:
+            records: Records to validate
+            record_ids: Identifier of each record
+
+        Returns:
+            ValidationResult per record, in order
+        """
+        results = [
+            ValidationResult(is_valid=True, record_id=record_id, validator_name=self.name)
+            for record_id in record_ids
+        ]
+        if not records:
+            return results
+
+        frame = pd.DataFrame(records, dtype=object)
+
+        for rule in self.validation_rules:
+            positions = range(len(records))
+            batch_check = getattr(rule, "batch_check", None)
+            if batch_check is not None:
+                try:
+                    positions = np.flatnonzero(batch_check(frame).to_numpy(dtype=bool))
+                except Exception as e:
+                    # e.g. unhashable values; fall back to checking every record
+                    logger.debug(f"Batch check {rule.__name__} failed, checking per record: {e}")
+
+            for position in positions:
+                self._apply_rule(rule, records[position], record_ids[position], results[position])
+
+        return results
+
+    @staticmethod
+    def _apply_rule(
+        rule: Callable,
+        data: Dict[str, Any],
+        record_id: Optional[str],
+        result: ValidationResult
+    ):
+        """Run one rule on one record, adding its errors to result."""
+        try:
+            rule_result = rule(data, record_id)
+
+            if rule_result:
+                if isinstance(rule_result, ValidationError):
+                    result.add_error(rule_result)
+                elif isinstance(rule_result, list):
+                    for error in rule_result:
+                        if isinstance(error, ValidationError):
+                            result.add_error(error)
+
+        except Exception as e:
+            logger.error(f"Validation rule failed: {rule.__name__}: {e}")
+            result.add_error(ValidationError(
+                field="__system__",
+                error_type="rule_exception",
+                message=f"Validation rule {rule.__name__} raised exception: {e}",
+                value=None,
+                record_id=record_id
+            ))
+
     def get_validation_summary(self, results: List[ValidationResult]) -> Dict[str, Any]:
         """
         Generate summary statistics from validation results.
@@ -3,12 +3,38 @@ Field Validators
 
 Common validation functions for individual fields.
 Can be composed to create complex validation rules.
+
+Rules also carry a vectorised batch_check(frame) that marks the rows of a
+pandas DataFrame the rule may reject; BaseValidator.validate_records only
+runs the per-record rule on those rows.
 """
 
+from numbers import Real
 from typing import Any, List, Optional, Set, Type, Callable
+import pandas as pd
 from .base_validator import ValidationError, create_validation_rule
 
 
+def _column(frame: pd.DataFrame, field: str) -> pd.Series:
+    """Column of a batch frame as objects (all None if the field is absent)."""
+    if field in frame.columns:
+        return frame[field].astype(object)
+    return pd.Series([None] * len(frame), index=frame.index, dtype=object)
+
+
+def _is_instance(column: pd.Series, types) -> pd.Series:
+    """Mask of values that are instances of types."""
+    return column.map(lambda value: isinstance(value, types)).astype(bool)
+
+
+def _string_lengths(column: pd.Series) -> pd.Series:
+    """Length of string values (NaN for anything else)."""
+    is_str = _is_instance(column, str)
+    if not is_str.any():
+        return pd.Series(float("nan"), index=column.index)
+    return column.where(is_str).str.len()
+
+
 def required_field(field: str) -> Callable:
     """
     Validate that a field is present and not None/empty.
@@ -36,7 +62,13 @@ def required_field(field: str) -> Callable:
 
         return None
 
+    def batch_check(frame: pd.DataFrame) -> pd.Series:
+        column = _column(frame, field)
+        blank = _string_lengths(column.map(lambda v: v.strip() if isinstance(v, str) else v)) == 0
+        return column.isna() | blank
+
     rule.__name__ = f"required_{field}"
+    rule.batch_check = batch_check
     return rule
 
 
@@ -82,7 +114,14 @@ def type_check(field: str, expected_type: Type, allow_none: bool = False) -> Cal
 
         return None
 
-    rule.__name__ = f"type_check_{field}_{expected_type.__name__}"
+    expected_types = expected_type if isinstance(expected_type, tuple) else (expected_type,)
+
+    def batch_check(frame: pd.DataFrame) -> pd.Series:
+        # Exact type match passes; subclasses (e.g. bool for int) are re-checked
+        return ~_column(frame, field).map(type).isin(expected_types)
+
+    rule.__name__ = f"type_check_{field}_{getattr(expected_type, '__name__', 'types')}"
+    rule.batch_check = batch_check
     return rule
 
 
@@ -142,7 +181,19 @@ def range_check(
 
         return None
 
+    def batch_check(frame: pd.DataFrame) -> pd.Series:
+        column = _column(frame, field)
+        is_number = _is_instance(column, Real)
+        values = pd.to_numeric(column.where(is_number), errors="coerce")
+        suspect = values.isna()
+        if min_value is not None:
+            suspect |= values < min_value
+        if max_value is not None:
+            suspect |= values > max_value
+        return suspect
+
     rule.__name__ = f"range_check_{field}_{min_value}_{max_value}"
+    rule.batch_check = batch_check
     return rule
 
 
@@ -189,7 +240,12 @@ def enum_check(field: str, allowed_values: List[Any], allow_none: bool = False)
 
         return None
 
+    def batch_check(frame: pd.DataFrame) -> pd.Series:
+        column = _column(frame, field)
+        return column.isna() | ~column.isin(allowed_set)
+
     rule.__name__ = f"enum_check_{field}"
+    rule.batch_check = batch_check
     return rule
 
 
@@ -222,7 +278,11 @@ def unique_check(field: str, existing_values: Set[Any]) -> Callable:
 
         return None
 
+    def batch_check(frame: pd.DataFrame) -> pd.Series:
+        return _column(frame, field).isin(existing_values)
+
     rule.__name__ = f"unique_check_{field}"
+    rule.batch_check = batch_check
     return rule
 
 
@@ -256,7 +316,12 @@ def foreign_key_check(field: str, valid_keys: Set[Any], reference_table: str) ->
 
         return None
 
+    def batch_check(frame: pd.DataFrame) -> pd.Series:
+        column = _column(frame, field)
+        return column.notna() & ~column.isin(valid_keys)
+
     rule.__name__ = f"foreign_key_check_{field}"
+    rule.batch_check = batch_check
     return rule
 
 
@@ -327,7 +392,17 @@ def string_length_check(
 
         return None
 
+    def batch_check(frame: pd.DataFrame) -> pd.Series:
+        lengths = _string_lengths(_column(frame, field))
+        suspect = lengths.isna()
+        if min_length is not None:
+            suspect |= lengths < min_length
+        if max_length is not None:
+            suspect |= lengths > max_length
+        return suspect
+
     rule.__name__ = f"string_length_check_{field}_{min_length}_{max_length}"
+    rule.batch_check = batch_check
     return rule
 
 
@@ -384,7 +459,16 @@ def pattern_check(field: str, pattern: str, allow_none: bool = False) -> Callabl
 
         return None
 
+    def batch_check(frame: pd.DataFrame) -> pd.Series:
+        column = _column(frame, field)
+        is_str = _is_instance(column, str)
+        if not is_str.any():
+            return pd.Series(True, index=column.index)
+        matched = column.where(is_str).str.match(regex)
+        return ~(matched.fillna(False).astype(bool))
+
     rule.__name__ = f"pattern_check_{field}"
+    rule.batch_check = batch_check
     return rule
 
 
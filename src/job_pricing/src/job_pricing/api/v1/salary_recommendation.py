@@ -7,9 +7,13 @@ and real Mercer market data.
 SECURITY: All endpoints require authentication and VIEW_SALARY_RECOMMENDATIONS permission.
 """
 
+import asyncio
+import json
 import logging
+import uuid
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
 from job_pricing.schemas.salary_recommendation import (
@@ -18,6 +22,9 @@ from job_pricing.schemas.salary_recommendation import (
     SalaryRecommendationError,
     JobMatchingRequest,
     JobMatchingResponse,
+    BulkSalaryPricingRequest,
+    BulkSalaryPricingJobResponse,
+    BulkSalaryPricingStatusResponse,
     MatchedJob,
     ConfidenceMetrics,
     SalaryRange,
@@ -28,6 +35,7 @@ from job_pricing.schemas.salary_recommendation import (
 from job_pricing.services.salary_recommendation_service import SalaryRecommendationService
 from job_pricing.services.salary_recommendation_service_v2 import SalaryRecommendationServiceV2
 from job_pricing.services.job_matching_service import JobMatchingService
+from job_pricing.services.bulk_salary_pricing_service import BulkPricingResultStore
 from job_pricing.exceptions import NoMarketDataError
 from job_pricing.models.auth import User
 from job_pricing.models import JobPricingRequest, LocationIndex
@@ -66,6 +74,13 @@ def get_cost_of_living_index(session: Session, location: str) -> float:
 
 router = APIRouter()
 
+# How often the bulk result stream checks for new role results
+BULK_STREAM_POLL_SECONDS = 1.0
+
+# End the stream if no role result arrives for this long. Celery reports an
+# unknown or lost task as PENDING, so the task state alone never ends it.
+BULK_STREAM_IDLE_SECONDS = 300.0
+
 
 # --------------------------------------------------------------------------
 # Endpoints
@@ -407,6 +422,209 @@ async def match_jobs(
         )
 
 
+def _get_bulk_job(store: BulkPricingResultStore, job_id: str, current_user: User) -> dict:
+    """Bulk pricing run metadata, 404 unless it belongs to the current user."""
+    job = store.get_job(job_id)
+    if not job or job["user_id"] != str(current_user.id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Bulk pricing job not found")
+    return job
+
+
+def _bulk_job_status(job_id: str) -> str:
+    """Run state from the Celery task: pending, processing, completed or failed."""
+    from job_pricing.core.celery_app import celery_app
+
+    task = celery_app.AsyncResult(job_id)
+    if task.state == "PENDING":
+        return "pending"
+    if task.state == "SUCCESS":
+        return (task.result or {}).get("status", "completed")
+    if task.state in ("FAILURE", "REVOKED"):
+        return "failed"
+    return "processing"
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkSalaryPricingJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Bulk Salary Pricing",
+    description="Queue salary pricing for many roles (e.g. a whole job architecture)",
+    responses={
+        202: {"description": "Bulk pricing queued"},
+        401: {"description": "Authentication required"},
+        403: {"description": "Permission denied"},
+        422: {"description": "Invalid roles"},
+        500: {"description": "Internal server error"},
+    },
+)
+async def bulk_price_roles(
+    request: BulkSalaryPricingRequest,
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Queue salary pricing for up to 1000 roles.
+
+    The roles are priced by a background task that:
+    - Embeds all job titles in **one** OpenAI call
+    - Runs **one** multi-query pgvector search for all roles
+    - Shares Mercer market data and scraped family aggregates between roles
+      with the same Mercer job family and location
+    - Reuses cached results (same cache as `/recommend`, bypass with `force_refresh`)
+
+    Results become available as each role completes:
+    - `GET /bulk/{job_id}` - progress plus results (use `offset` to page)
+    - `GET /bulk/{job_id}/stream` - NDJSON stream, one role result per line
+
+    **Returns**: Job ID and result URLs
+    """
+    logger.info(
+        f"Bulk salary pricing requested by user {current_user.email} "
+        f"for {len(request.roles)} roles"
+    )
+
+    try:
+        from job_pricing.tasks import process_bulk_salary_pricing
+
+        job_id = str(uuid.uuid4())
+        BulkPricingResultStore().create(job_id, current_user.id, len(request.roles))
+
+        process_bulk_salary_pricing.apply_async(
+            kwargs={
+                "roles": [role.model_dump() for role in request.roles],
+                "user_id": current_user.id,
+                "user_email": current_user.email,
+                "force_refresh": request.force_refresh,
+            },
+            task_id=job_id,
+        )
+
+        return BulkSalaryPricingJobResponse(
+            success=True,
+            job_id=job_id,
+            total_roles=len(request.roles),
+            status_url=f"/api/v1/salary/bulk/{job_id}",
+            stream_url=f"/api/v1/salary/bulk/{job_id}/stream",
+        )
+
+    except Exception as e:
+        logger.error(
+            f"Failed to queue bulk salary pricing for user {current_user.email}: {e}",
+            exc_info=True
+        )
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={
+                "success": False,
+                "error": "Failed to queue bulk salary pricing",
+                "details": str(e)
+            }
+        )
+
+
+@router.get(
+    "/bulk/{job_id}",
+    response_model=BulkSalaryPricingStatusResponse,
+    summary="Bulk Salary Pricing Status",
+    description="Get progress and role results of a bulk pricing run",
+    responses={
+        200: {"description": "Status retrieved successfully"},
+        401: {"description": "Authentication required"},
+        404: {"description": "Bulk pricing job not found"},
+    },
+)
+async def get_bulk_pricing(
+    job_id: str,
+    offset: int = Query(0, ge=0, description="Skip the first N results (already received)"),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Get progress and results of a bulk pricing run.
+
+    Results are in completion order; each carries the `index` of its role in
+    the submitted list. Poll with `offset` set to the number of results
+    already received to get only new ones.
+
+    **Returns**: Run status and role results
+    """
+    store = BulkPricingResultStore()
+    job = _get_bulk_job(store, job_id, current_user)
+
+    results = store.read(job_id, offset)
+
+    return BulkSalaryPricingStatusResponse(
+        success=True,
+        job_id=job_id,
+        status=_bulk_job_status(job_id),
+        total_roles=job["total_roles"],
+        processed=offset + len(results),
+        results=results,
+    )
+
+
+@router.get(
+    "/bulk/{job_id}/stream",
+    summary="Stream Bulk Salary Pricing Results",
+    description="Stream role results of a bulk pricing run as NDJSON while it runs",
+    responses={
+        200: {"description": "NDJSON stream of role results"},
+        401: {"description": "Authentication required"},
+        404: {"description": "Bulk pricing job not found"},
+    },
+)
+async def stream_bulk_pricing(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Stream role results of a bulk pricing run as they complete.
+
+    Each line is one JSON role result (`index`, `job_title`, `location`,
+    `status`, `result`, `error`). The stream ends once every role has a
+    result or the run has finished, and also when the run's results have
+    expired or no result has arrived for BULK_STREAM_IDLE_SECONDS (e.g. the
+    task was lost); poll `GET /bulk/{job_id}` for the final state.
+
+    **Returns**: `application/x-ndjson` stream
+    """
+    store = BulkPricingResultStore()
+    job = _get_bulk_job(store, job_id, current_user)
+
+    async def role_results():
+        sent = 0
+        idle_since = asyncio.get_running_loop().time()
+        while True:
+            # Redis and the Celery result backend are blocking clients
+            results = await run_in_threadpool(store.read, job_id, sent)
+            for item in results:
+                yield json.dumps(item) + "\n"
+            sent += len(results)
+
+            if sent >= job["total_roles"]:
+                return
+            if results:
+                idle_since = asyncio.get_running_loop().time()
+            else:
+                if await run_in_threadpool(_bulk_job_status, job_id) in ("completed", "failed"):
+                    # Pick up anything appended just before the task finished
+                    for item in await run_in_threadpool(store.read, job_id, sent):
+                        yield json.dumps(item) + "\n"
+                    return
+                if await run_in_threadpool(store.get_job, job_id) is None:
+                    logger.warning(f"Bulk pricing job {job_id} expired while streaming after {sent} results")
+                    return
+                if asyncio.get_running_loop().time() - idle_since >= BULK_STREAM_IDLE_SECONDS:
+                    logger.warning(
+                        f"Bulk pricing job {job_id} sent no results for {BULK_STREAM_IDLE_SECONDS:.0f}s "
+                        f"- ending stream after {sent} of {job['total_roles']}"
+                    )
+                    return
+
+            await asyncio.sleep(BULK_STREAM_POLL_SECONDS)
+
+    return StreamingResponse(role_results(), media_type="application/x-ndjson")
+
+
 @router.get(
     "/locations",
     summary="List Available Locations",
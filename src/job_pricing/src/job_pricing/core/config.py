@@ -49,6 +49,10 @@ class Settings(BaseSettings):
     DB_MAX_OVERFLOW: int = Field(default=10)
     SQL_ECHO: bool = Field(default=False)
 
+    # pgvector ANN search (applied once per pooled connection)
+    VECTOR_HNSW_EF_SEARCH: int = Field(default=100)  # HNSW candidate list size (recall vs speed)
+    VECTOR_IVFFLAT_PROBES: int = Field(default=10)  # Lists searched if still on IVFFlat
+
     # --------------------------------------------------------------------------
     # Redis
     # --------------------------------------------------------------------------
@@ -10,6 +10,7 @@ from contextlib import contextmanager
 from typing import Generator
 
 from .config import get_settings
+from ..utils.db_optimization import configure_vector_search
 
 settings = get_settings()
 
@@ -20,6 +21,7 @@ engine = create_engine(
     pool_size=10,
     max_overflow=20,
 )
+configure_vector_search(engine, settings.VECTOR_HNSW_EF_SEARCH, settings.VECTOR_IVFFLAT_PROBES)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
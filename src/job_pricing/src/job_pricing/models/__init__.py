@@ -28,8 +28,8 @@ from .pricing_parameters import (
 )
 from .mercer import MercerJobLibrary, MercerJobMapping, MercerMarketData
 from .ssg import SSGSkillsFramework, SSGTSC, SSGJobRoleTSCMapping, JobSkillsExtracted
-from .scraping import ScrapedJobListing, ScrapedCompanyData, ScrapingAuditLog
-from .hris import InternalEmployee, GradeSalaryBand, Applicant
+from .scraping import ScrapedJobListing, ScrapedCompanyData, ScrapingAuditLog, ScrapedSalaryAggregate
+from .hris import InternalEmployee, GradeSalaryBand, Applicant, InternalSalaryStatistic
 from .supporting import Location, LocationIndex, CurrencyExchangeRate, AuditLog
 
 __all__ = [
@@ -59,10 +59,12 @@ __all__ = [
     "ScrapedJobListing",
     "ScrapedCompanyData",
     "ScrapingAuditLog",
+    "ScrapedSalaryAggregate",
     # HRIS
     "InternalEmployee",
     "GradeSalaryBand",
     "Applicant",
+    "InternalSalaryStatistic",
     # Supporting
     "Location",
     "LocationIndex",
@@ -2,7 +2,8 @@
 HRIS Integration Models
 
 Stores internal employee data, salary bands, and applicant data.
-Corresponds to: internal_employees, grade_salary_bands, applicants tables
+Corresponds to: internal_employees, grade_salary_bands, applicants,
+internal_salary_statistics tables
 """
 
 from datetime import datetime, date
@@ -18,6 +19,7 @@ from sqlalchemy import (
     DateTime,
     CheckConstraint,
     Index,
+    UniqueConstraint,
     text,
 )
 
@@ -479,3 +481,115 @@ class Applicant(Base):
 
     def __repr__(self) -> str:
         return f"<Applicant(id={self.id}, applicant_id='{self.applicant_id}', job='{self.applied_job_title}')>"
+
+
+class InternalSalaryStatistic(Base):
+    """
+    Internal Salary Statistic Model
+
+    Precomputed salary statistics of internal employees per grade and per
+    job family. Rebuilt after each BIPO sync so statistics requests read one
+    row instead of aggregating employees. Only groups with at least 5
+    employees are stored (PDPA).
+
+    Attributes:
+        id: Unique identifier (SERIAL)
+        dimension: Grouping dimension (internal_grade, job_family)
+        dimension_value: Grade or job family
+        employee_count: Number of employees in the group
+        avg_salary: Average salary
+        p25, p50, p75: Salary percentiles
+        min_salary, max_salary: Salary range
+        last_updated: When the statistics were computed
+    """
+
+    __tablename__ = "internal_salary_statistics"
+
+    # InternalEmployee columns statistics are grouped by
+    DIMENSIONS = ("internal_grade", "job_family")
+
+    # Primary Key
+    id = Column(
+        Integer,
+        primary_key=True,
+        autoincrement=True,
+        comment="Unique identifier"
+    )
+
+    # Group Key
+    dimension = Column(
+        String(20),
+        nullable=False,
+        comment="Grouping dimension (internal_grade, job_family)"
+    )
+
+    dimension_value = Column(
+        String(100),
+        nullable=False,
+        comment="Grade or job family"
+    )
+
+    # Statistics
+    employee_count = Column(
+        Integer,
+        nullable=False,
+        comment="Number of employees in the group"
+    )
+
+    avg_salary = Column(
+        Numeric(12, 2),
+        nullable=True,
+        comment="Average salary"
+    )
+
+    p25 = Column(
+        Numeric(12, 2),
+        nullable=True,
+        comment="25th percentile salary"
+    )
+
+    p50 = Column(
+        Numeric(12, 2),
+        nullable=True,
+        comment="Median salary"
+    )
+
+    p75 = Column(
+        Numeric(12, 2),
+        nullable=True,
+        comment="75th percentile salary"
+    )
+
+    min_salary = Column(
+        Numeric(12, 2),
+        nullable=True,
+        comment="Minimum salary"
+    )
+
+    max_salary = Column(
+        Numeric(12, 2),
+        nullable=True,
+        comment="Maximum salary"
+    )
+
+    last_updated = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=text("NOW()"),
+        comment="When the statistics were computed"
+    )
+
+    # Constraints and Indexes
+    __table_args__ = (
+        CheckConstraint(
+            "dimension IN ('internal_grade', 'job_family')",
+            name="check_salary_statistic_dimension"
+        ),
+        UniqueConstraint("dimension", "dimension_value", name="uq_internal_salary_statistic"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<InternalSalaryStatistic({self.dimension}='{self.dimension_value}', "
+            f"n={self.employee_count})>"
+        )
@@ -213,12 +213,12 @@ class MercerJobLibrary(Base, TimestampMixin):
         Index("idx_mercer_subfamily", "subfamily"),
         Index("idx_mercer_level", "career_level"),
         Index("idx_mercer_position_class", "position_class"),
-        # Vector similarity search index (IVFFlat)
+        # Vector similarity search index (HNSW)
         Index(
-            "idx_mercer_embedding",
+            "idx_mercer_embedding_hnsw",
             "embedding",
-            postgresql_using="ivfflat",
-            postgresql_with={"lists": 100},
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
             postgresql_ops={"embedding": "vector_cosine_ops"}
         ),
         # Full-text search on job description
@@ -227,6 +227,13 @@ class MercerJobLibrary(Base, TimestampMixin):
             text("to_tsvector('english', job_description)"),
             postgresql_using="gin"
         ),
+        # Trigram search on the base title (text before " - "), used by
+        # MarketAggregationService to assign scraped listings
+        Index(
+            "idx_mercer_base_title_trgm",
+            text("(btrim(split_part(job_title, ' - ', 1))) gin_trgm_ops"),
+            postgresql_using="gin"
+        ),
     )
 
     def __repr__(self) -> str:
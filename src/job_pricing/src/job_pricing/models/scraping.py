@@ -2,7 +2,8 @@
 Web Scraping Data Models
 
 Stores job data scraped from MyCareersFuture and Glassdoor.
-Corresponds to: scraped_job_listings, scraped_company_data, scraping_audit_log tables
+Corresponds to: scraped_job_listings, scraped_company_data, scraping_audit_log,
+scraped_salary_aggregates tables
 """
 
 from datetime import datetime
@@ -60,6 +61,11 @@ class ScrapedJobListing(Base):
         scraped_at: When job was scraped
         last_seen_at: Last time job was seen (for tracking active/inactive)
         is_active: Whether job listing is still active
+        annual_salary: Salary midpoint normalised to annual (set by market aggregation)
+        mercer_job_code: Best matching Mercer job code (set by market aggregation)
+        mercer_family: Mercer job family of mercer_job_code
+        mercer_match_score: Trigram similarity of the Mercer match
+        mercer_assigned_at: When the listing was last assigned (NULL = pending)
     """
 
     __tablename__ = "scraped_job_listings"
@@ -229,6 +235,37 @@ class ScrapedJobListing(Base):
         comment="Whether job listing is still active"
     )
 
+    # Market Aggregation (precomputed after each scrape)
+    annual_salary = Column(
+        Numeric(12, 2),
+        nullable=True,
+        comment="Salary midpoint normalised to annual"
+    )
+
+    mercer_job_code = Column(
+        String(50),
+        nullable=True,
+        comment="Best matching Mercer job code"
+    )
+
+    mercer_family = Column(
+        String(100),
+        nullable=True,
+        comment="Mercer job family of the matched job code"
+    )
+
+    mercer_match_score = Column(
+        Numeric(4, 3),
+        nullable=True,
+        comment="Trigram similarity of the Mercer match (0-1)"
+    )
+
+    mercer_assigned_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="When the Mercer assignment was computed (NULL = pending)"
+    )
+
     # Constraints and Indexes
     __table_args__ = (
         CheckConstraint(
@@ -236,6 +273,12 @@ class ScrapedJobListing(Base):
             name="check_source"
         ),
         UniqueConstraint("source", "job_id", name="uq_scraped_job"),
+        Index("idx_scraped_jobs_mercer_family", "mercer_family", "source"),
+        Index(
+            "idx_scraped_jobs_mercer_pending",
+            "id",
+            postgresql_where=text("mercer_assigned_at IS NULL")
+        ),
         Index("idx_scraped_jobs_source", "source"),
         Index("idx_scraped_jobs_title", "job_title"),
         Index("idx_scraped_jobs_company", "company_name"),
@@ -519,3 +562,90 @@ class ScrapingAuditLog(Base):
 
     def __repr__(self) -> str:
         return f"<ScrapingAuditLog(id={self.id}, run_date='{self.run_date}', status='{self.status}')>"
+
+
+class ScrapedSalaryAggregate(Base):
+    """
+    Scraped Salary Aggregate Model
+
+    Precomputed salary distribution of scraped listings per Mercer job
+    family x source x location. Rebuilt after each scrape so pricing reads
+    one row per source instead of scanning listings.
+
+    Attributes:
+        id: Unique identifier (SERIAL)
+        mercer_family: Mercer job family
+        source: Data source (my_careers_future, glassdoor)
+        location: Normalised listing location, or '*' for all locations
+        sample_size: Number of listings in the group
+        p10-p90: Percentiles of annual salary (linear interpolation)
+        mean_scraped_at: Average scrape time (for recency)
+        last_updated: When the aggregate was computed
+    """
+
+    __tablename__ = "scraped_salary_aggregates"
+
+    # Primary Key
+    id = Column(
+        Integer,
+        primary_key=True,
+        autoincrement=True,
+        comment="Unique identifier"
+    )
+
+    # Group Key
+    mercer_family = Column(
+        String(100),
+        nullable=False,
+        comment="Mercer job family"
+    )
+
+    source = Column(
+        String(50),
+        nullable=False,
+        comment="Data source (my_careers_future, glassdoor)"
+    )
+
+    location = Column(
+        String(255),
+        nullable=False,
+        comment="Normalised location, '*' for all locations"
+    )
+
+    # Distribution
+    sample_size = Column(
+        Integer,
+        nullable=False,
+        comment="Number of listings in the group"
+    )
+
+    p10 = Column(Numeric(12, 2), nullable=False, comment="10th percentile (annual)")
+    p25 = Column(Numeric(12, 2), nullable=False, comment="25th percentile (annual)")
+    p50 = Column(Numeric(12, 2), nullable=False, comment="Median (annual)")
+    p75 = Column(Numeric(12, 2), nullable=False, comment="75th percentile (annual)")
+    p90 = Column(Numeric(12, 2), nullable=False, comment="90th percentile (annual)")
+
+    # Temporal
+    mean_scraped_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Average scrape time of the listings"
+    )
+
+    last_updated = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=text("NOW()"),
+        comment="When the aggregate was computed"
+    )
+
+    # Constraints and Indexes
+    __table_args__ = (
+        UniqueConstraint("mercer_family", "source", "location", name="uq_salary_aggregate"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<ScrapedSalaryAggregate(family='{self.mercer_family}', source='{self.source}', "
+            f"location='{self.location}', n={self.sample_size})>"
+        )
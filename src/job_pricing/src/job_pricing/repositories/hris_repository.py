@@ -6,7 +6,7 @@ Includes privacy-protected queries for PDPA compliance.
 """
 
 from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta, date
+from datetime import datetime, timedelta, date, timezone
 
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, and_, or_, func
@@ -15,9 +15,26 @@ from job_pricing.models import (
     InternalEmployee,
     GradeSalaryBand,
     Applicant,
+    InternalSalaryStatistic,
 )
 from .base import BaseRepository
 
+# PDPA compliance: statistics need at least this many records
+MIN_ANONYMIZED_COUNT = 5
+
+
+def _summary_columns(salary) -> List:
+    """Aggregate columns of a salary summary (percentiles interpolate linearly)."""
+    return [
+        func.count().label("count"),
+        func.avg(salary).label("avg"),
+        func.percentile_cont(0.25).within_group(salary).label("p25"),
+        func.percentile_cont(0.5).within_group(salary).label("p50"),
+        func.percentile_cont(0.75).within_group(salary).label("p75"),
+        func.min(salary).label("min"),
+        func.max(salary).label("max"),
+    ]
+
 
 class HRISRepository(BaseRepository[InternalEmployee]):
     """
@@ -116,6 +133,10 @@ class HRISRepository(BaseRepository[InternalEmployee]):
         """
         Get salary statistics for internal employees.
 
+        Computed in one aggregate query. A grade-only or job-family-only
+        request is served from internal_salary_statistics when the group
+        has been precomputed (see refresh_salary_statistics).
+
         Args:
             grade: Optional grade filter
             job_family: Optional job family filter
@@ -136,66 +157,105 @@ class HRISRepository(BaseRepository[InternalEmployee]):
             if stats:
                 print(f"Average: {stats['avg_salary']}")
         """
-        query = self.session.query(InternalEmployee)
+        filters = {"internal_grade": grade, "job_family": job_family, "department": department}
+        filters = {column: value for column, value in filters.items() if value}
+
+        if anonymize and len(filters) == 1 and "department" not in filters:
+            [(dimension, value)] = filters.items()
+            precomputed = self.session.query(InternalSalaryStatistic).filter(
+                InternalSalaryStatistic.dimension == dimension,
+                InternalSalaryStatistic.dimension_value == value,
+            ).first()
+            if precomputed is not None:
+                return {
+                    "count": precomputed.employee_count,
+                    "avg_salary": precomputed.avg_salary,
+                    "median_salary": precomputed.p50,
+                    "p25": precomputed.p25,
+                    "p75": precomputed.p75,
+                    "min_salary": precomputed.min_salary,
+                    "max_salary": precomputed.max_salary,
+                }
+
+        row = self._salary_summary(
+            InternalEmployee,
+            InternalEmployee.current_salary,
+            [getattr(InternalEmployee, column) == value for column, value in filters.items()],
+            anonymize,
+        )
+        if row is None:
+            return None
 
-        if grade:
-            query = query.filter(InternalEmployee.grade == grade)
+        return {
+            "count": row.count,
+            "avg_salary": row.avg,
+            "median_salary": row.p50,
+            "p25": row.p25,
+            "p75": row.p75,
+            "min_salary": row.min,
+            "max_salary": row.max,
+        }
 
-        if job_family:
-            query = query.filter(InternalEmployee.job_family == job_family)
+    def refresh_salary_statistics(self) -> int:
+        """
+        Rebuild internal_salary_statistics per grade and per job family.
 
-        if department:
-            query = query.filter(InternalEmployee.department == department)
+        Only groups with at least MIN_ANONYMIZED_COUNT employees are stored.
+        Does not commit.
 
-        employees = query.all()
+        Returns:
+            Number of statistic rows written
+        """
+        now = datetime.now(timezone.utc)
+        salary = func.nullif(InternalEmployee.current_salary, 0)
+        rows = []
+
+        for dimension in InternalSalaryStatistic.DIMENSIONS:
+            group = getattr(InternalEmployee, dimension)
+            groups = (
+                self.session.query(group.label("value"), *_summary_columns(salary))
+                .filter(group.isnot(None))
+                .group_by(group)
+                .having(func.count() >= MIN_ANONYMIZED_COUNT)
+                .all()
+            )
+            rows.extend(
+                {
+                    "dimension": dimension,
+                    "dimension_value": row.value,
+                    "employee_count": row.count,
+                    "avg_salary": row.avg,
+                    "p25": row.p25,
+                    "p50": row.p50,
+                    "p75": row.p75,
+                    "min_salary": row.min,
+                    "max_salary": row.max,
+                    "last_updated": now,
+                }
+                for row in groups
+            )
 
-        # PDPA compliance: Return None if fewer than 5 records
-        if anonymize and len(employees) < 5:
-            return None
+        self.session.query(InternalSalaryStatistic).delete(synchronize_session=False)
+        self.session.bulk_insert_mappings(InternalSalaryStatistic, rows)
+        self.session.flush()
 
-        if not employees:
-            return {
-                "count": 0,
-                "avg_salary": None,
-                "median_salary": None,
-                "p25": None,
-                "p75": None,
-                "min_salary": None,
-                "max_salary": None,
-            }
-
-        salaries = [emp.current_salary for emp in employees if emp.current_salary]
-
-        if not salaries:
-            return {
-                "count": len(employees),
-                "avg_salary": None,
-                "median_salary": None,
-                "p25": None,
-                "p75": None,
-                "min_salary": None,
-                "max_salary": None,
-            }
-
-        # Calculate statistics
-        def percentile(data: List[float], p: float) -> Optional[float]:
-            sorted_data = sorted(data)
-            k = (len(sorted_data) - 1) * p
-            f = int(k)
-            c = k - f
-            if f + 1 < len(sorted_data):
-                return sorted_data[f] + c * (sorted_data[f + 1] - sorted_data[f])
-            return sorted_data[f]
+        return len(rows)
 
-        return {
-            "count": len(employees),
-            "avg_salary": sum(salaries) / len(salaries),
-            "median_salary": percentile(salaries, 0.5),
-            "p25": percentile(salaries, 0.25),
-            "p75": percentile(salaries, 0.75),
-            "min_salary": min(salaries),
-            "max_salary": max(salaries),
-        }
+    def _salary_summary(self, model, salary_column, criteria: List, anonymize: bool):
+        """
+        One-row salary summary of model rows matching criteria.
+
+        Zero salaries count as missing. With anonymize, groups below
+        MIN_ANONYMIZED_COUNT rows are dropped by the database (no row).
+        """
+        query = (
+            self.session.query(*_summary_columns(func.nullif(salary_column, 0)))
+            .select_from(model)
+            .filter(*criteria)
+        )
+        if anonymize:
+            query = query.having(func.count() >= MIN_ANONYMIZED_COUNT)
+        return query.one_or_none()
 
     def get_grade_progression(self, employee_id: str) -> List[InternalEmployee]:
         """
@@ -472,65 +532,23 @@ class HRISRepository(BaseRepository[InternalEmployee]):
         Example:
             stats = repo.get_applicant_salary_statistics(position_title="Engineer")
         """
-        query = self.session.query(Applicant).filter(
-            Applicant.expected_salary.isnot(None)
-        )
+        criteria = [Applicant.expected_salary.isnot(None)]
 
         if position_title:
-            query = query.filter(
-                Applicant.applied_job_title.ilike(f"%{position_title}%")
-            )
-
-        applicants = query.all()
+            criteria.append(Applicant.applied_job_title.ilike(f"%{position_title}%"))
 
-        # PDPA compliance: Return None if fewer than 5 records
-        if anonymize and len(applicants) < 5:
+        row = self._salary_summary(Applicant, Applicant.expected_salary, criteria, anonymize)
+        if row is None:
             return None
 
-        if not applicants:
-            return {
-                "count": 0,
-                "avg_expected": None,
-                "median_expected": None,
-                "p25": None,
-                "p75": None,
-                "min_expected": None,
-                "max_expected": None,
-            }
-
-        expectations = [
-            app.expected_salary for app in applicants if app.expected_salary
-        ]
-
-        if not expectations:
-            return {
-                "count": len(applicants),
-                "avg_expected": None,
-                "median_expected": None,
-                "p25": None,
-                "p75": None,
-                "min_expected": None,
-                "max_expected": None,
-            }
-
-        # Calculate statistics
-        def percentile(data: List[float], p: float) -> Optional[float]:
-            sorted_data = sorted(data)
-            k = (len(sorted_data) - 1) * p
-            f = int(k)
-            c = k - f
-            if f + 1 < len(sorted_data):
-                return sorted_data[f] + c * (sorted_data[f + 1] - sorted_data[f])
-            return sorted_data[f]
-
         return {
-            "count": len(applicants),
-            "avg_expected": sum(expectations) / len(expectations),
-            "median_expected": percentile(expectations, 0.5),
-            "p25": percentile(expectations, 0.25),
-            "p75": percentile(expectations, 0.75),
-            "min_expected": min(expectations),
-            "max_expected": max(expectations),
+            "count": row.count,
+            "avg_expected": row.avg,
+            "median_expected": row.p50,
+            "p25": row.p25,
+            "p75": row.p75,
+            "min_expected": row.min,
+            "max_expected": row.max,
         }
 
     def create_applicant(
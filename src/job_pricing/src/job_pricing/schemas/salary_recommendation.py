@@ -92,6 +92,46 @@ class JobMatchingRequest(BaseModel):
         }
 
 
+class BulkPricingRole(BaseModel):
+    """One role of a bulk salary pricing request."""
+
+    job_title: str = Field(..., min_length=3, max_length=200)
+    job_description: Optional[str] = Field(default="", max_length=5000)
+    location: str = Field(default="Singapore", max_length=100)
+
+    @field_validator('job_title')
+    @classmethod
+    def validate_job_title(cls, v):
+        """Validate job title is not empty."""
+        if not v or not v.strip():
+            raise ValueError('Job title cannot be empty')
+        return v.strip()
+
+
+class BulkSalaryPricingRequest(BaseModel):
+    """Request model for pricing many roles (e.g. a job architecture)."""
+
+    roles: List[BulkPricingRole] = Field(
+        ...,
+        min_length=1,
+        max_length=1000,
+        description="Roles to price (duplicates of the same title and location are priced once)"
+    )
+    force_refresh: bool = Field(default=False, description="Bypass cached results")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "roles": [
+                    {"job_title": "HR Business Partner", "location": "Singapore"},
+                    {"job_title": "Senior HR Business Partner", "location": "Singapore"},
+                    {"job_title": "Payroll Specialist", "location": "Tampines"}
+                ],
+                "force_refresh": False
+            }
+        }
+
+
 # --------------------------------------------------------------------------
 # Response Schemas
 # --------------------------------------------------------------------------
@@ -274,3 +314,28 @@ class JobMatchingResponse(BaseModel):
                 "query": "Senior HR Business Partner"
             }
         }
+
+
+class BulkSalaryPricingJobResponse(BaseModel):
+    """Response model for a queued bulk pricing run."""
+
+    success: bool = Field(..., description="Whether the run was queued")
+    job_id: str = Field(..., description="Bulk pricing run ID")
+    total_roles: int = Field(..., description="Number of roles submitted")
+    status_url: str = Field(..., description="Poll for progress and results")
+    stream_url: str = Field(..., description="NDJSON stream of role results as they complete")
+
+
+class BulkSalaryPricingStatusResponse(BaseModel):
+    """Response model for bulk pricing progress and results."""
+
+    success: bool = Field(..., description="Whether the run status was retrieved")
+    job_id: str = Field(..., description="Bulk pricing run ID")
+    status: str = Field(..., description="Run state: pending, processing, completed or failed")
+    total_roles: int = Field(..., description="Number of roles submitted")
+    processed: int = Field(..., description="Number of role results available")
+    results: List[Dict] = Field(
+        ...,
+        description="Role results from the requested offset, in completion order "
+                    "(index, job_title, location, status, result, error)"
+    )
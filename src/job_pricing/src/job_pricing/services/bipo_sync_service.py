@@ -27,6 +27,7 @@ class BIPOSyncService:
     - Transforming BIPO format to internal format
     - Data anonymization (PDPA compliance)
     - Upserting records to database
+    - Refreshing precomputed salary statistics
     - Error handling and logging
 
     Example:
@@ -264,14 +265,16 @@ class BIPOSyncService:
                 else:
                     result["failed"] += 1
 
-            # Commit all changes
+            # Commit all changes with statistics for the synced employees
+            statistics = self.repository.refresh_salary_statistics()
             self.session.commit()
 
             logger.info(
                 f"BIPO sync completed: "
                 f"fetched={result['fetched']}, "
                 f"synced={result['synced']}, "
-                f"failed={result['failed']}"
+                f"failed={result['failed']}, "
+                f"salary_statistics={statistics}"
             )
 
             return result
@@ -326,6 +329,7 @@ class BIPOSyncService:
             success = self._upsert_employee(transformed)
 
             if success:
+                self.repository.refresh_salary_statistics()
                 self.session.commit()
                 logger.info(f"Successfully synced employee: {employee_id}")
 
@@ -0,0 +1,281 @@
+"""
+Bulk Salary Pricing Service - Price whole job architectures
+
+Prices N roles in one run instead of N calculate_recommendation calls:
+
+1. Deduplicate roles and serve cached results (same request hashing and
+   result cache as SalaryRecommendationServiceV2)
+2. Embed all remaining roles in one provider call and run one multi-query
+   vector search (JobMatchingService.find_similar_jobs_batch)
+3. Select each role's Mercer match concurrently (independent LLM calls)
+4. Price roles as their matches complete; Mercer market data and scraped
+   family aggregates are looked up once per job code / family and location
+5. Yield each role's result as soon as it is saved
+
+The process_bulk_salary_pricing Celery task appends results to
+BulkPricingResultStore so the API can stream them while the run continues.
+"""
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional
+
+import redis
+from sqlalchemy.orm import Session
+
+from job_pricing.core.config import get_settings
+from job_pricing.exceptions import NoMarketDataError
+from job_pricing.services.pricing_calculation_service_v3 import PricingCalculationServiceV3
+from job_pricing.services.salary_recommendation_service_v2 import SalaryRecommendationServiceV2
+
+logger = logging.getLogger(__name__)
+
+
+class BulkPricingResultStore:
+    """
+    Redis store for bulk pricing runs: owner/size metadata and the list of
+    per-role results, appended as roles complete.
+    """
+
+    KEY_PREFIX = "bulk_pricing"
+
+    # Results stay readable for a day after the run
+    RESULT_TTL = 24 * 3600
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None):
+        """
+        Initialize store.
+
+        Args:
+            redis_client: Redis client with decode_responses=True (created
+                from settings.REDIS_URL if not provided)
+        """
+        self.redis = redis_client or redis.from_url(
+            get_settings().REDIS_URL, decode_responses=True
+        )
+
+    def create(self, job_id: str, user_id: int, total_roles: int):
+        """Register a run before its task is queued."""
+        key = self._job_key(job_id)
+        self.redis.hset(key, mapping={"user_id": str(user_id), "total_roles": total_roles})
+        self.redis.expire(key, self.RESULT_TTL)
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """Run metadata (user_id, total_roles), or None if unknown/expired."""
+        job = self.redis.hgetall(self._job_key(job_id))
+        if not job:
+            return None
+        return {"user_id": job["user_id"], "total_roles": int(job["total_roles"])}
+
+    def append(self, job_id: str, item: Dict):
+        """Append one role result."""
+        key = self._results_key(job_id)
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.rpush(key, json.dumps(item, default=str))
+        pipe.expire(key, self.RESULT_TTL)
+        pipe.execute()
+
+    def read(self, job_id: str, start: int = 0) -> List[Dict]:
+        """Role results from position start onwards, in completion order."""
+        return [json.loads(item) for item in self.redis.lrange(self._results_key(job_id), start, -1)]
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{job_id}"
+
+    def _results_key(self, job_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{job_id}:results"
+
+
+class BulkSalaryPricingService:
+    """
+    Prices many roles with batched matching and shared source lookups.
+
+    Skill extraction is skipped (it does not affect pricing), so fresh
+    results report no skills.
+    """
+
+    MAX_ROLES = 1000
+
+    # Concurrent Mercer match selections (one LLM call each)
+    MATCH_WORKERS = 8
+
+    # Candidates per role for match selection (same as find_best_match)
+    MATCH_CANDIDATES = 5
+
+    def __init__(self, session: Session, use_llm_reasoning: bool = True):
+        """
+        Initialize service.
+
+        Args:
+            session: SQLAlchemy database session
+            use_llm_reasoning: Use the LLM to pick each role's Mercer match
+        """
+        self.session = session
+        self.use_llm_reasoning = use_llm_reasoning
+        self.recommendation_service = SalaryRecommendationServiceV2(session)
+        self.matching_service = self.recommendation_service.matching_service
+
+        # One memo for the whole run: roles with the same Mercer job code,
+        # family and location reuse market data and scraped aggregates
+        self.shared_lookups: Dict = {}
+        self.recommendation_service.pricing_service = PricingCalculationServiceV3(
+            session, shared_lookups=self.shared_lookups
+        )
+
+    def price_roles(
+        self,
+        roles: List[Dict],
+        user_id: int,
+        user_email: Optional[str] = None,
+        force_refresh: bool = False
+    ) -> Iterator[Dict]:
+        """
+        Price roles, yielding each result as it completes.
+
+        Args:
+            roles: Roles with job_title and optional job_description, location
+            user_id: User ID making the request
+            user_email: User's email address for audit trail
+            force_refresh: If True, bypass cached results
+
+        Yields:
+            {"index", "job_title", "location", "status", "result", "error"}
+            per input role, where status is completed, no_data or failed.
+            Duplicate roles (same title and location) are priced once.
+        """
+        if len(roles) > self.MAX_ROLES:
+            raise ValueError(f"At most {self.MAX_ROLES} roles per bulk request, got {len(roles)}")
+
+        service = self.recommendation_service
+
+        # Step 1: Requests per distinct role; serve cached results first
+        pending = {}  # request_hash -> (request, [indexes])
+        done = {}  # request_hash -> result already yielded (cached or failed)
+        for index, role in enumerate(roles):
+            job_title = (role.get("job_title") or "").strip()
+            location = role.get("location") or "Singapore"
+            request_hash = service._generate_request_hash(job_title, location, user_id)
+
+            if request_hash in done:
+                yield {**done[request_hash], "index": index}
+                continue
+            if request_hash in pending:
+                pending[request_hash][1].append(index)
+                continue
+
+            try:
+                request = service._find_or_create_request(
+                    request_hash=request_hash,
+                    job_title=job_title,
+                    location=location,
+                    user_id=user_id,
+                    job_description=role.get("job_description") or "",
+                    user_email=user_email
+                )
+
+                cached = None if force_refresh else service._get_cached_result(request)
+                if cached:
+                    cached.cache_hit = True
+                    response = service._format_cached_response(cached)
+                    self.session.commit()
+                    done[request_hash] = self._role_result(
+                        index, job_title, location, "completed", result=response
+                    )
+                    yield done[request_hash]
+                    continue
+
+                shared = None if force_refresh else service._serve_shared_result(request)
+                if shared:
+                    done[request_hash] = self._role_result(
+                        index, job_title, location, "completed", result=shared
+                    )
+                    yield done[request_hash]
+                    continue
+
+                # Commit per role so a later failure does not roll it back
+                self.session.commit()
+                pending[request_hash] = (request, [index])
+
+            except Exception as e:
+                self.session.rollback()
+                logger.error(f"Bulk pricing: could not create request for '{job_title}': {e}")
+                done[request_hash] = self._role_result(index, job_title, location, "failed", error=str(e))
+                yield done[request_hash]
+
+        to_price = list(pending.values())
+        if not to_price:
+            return
+
+        # Step 2: One embedding call and one vector search for all roles
+        try:
+            candidates = self.matching_service.find_similar_jobs_batch(
+                [(request.job_title, request.job_description or "") for request, _ in to_price],
+                top_k=self.MATCH_CANDIDATES
+            )
+        except Exception as e:
+            logger.error(f"Bulk pricing: batch job matching failed: {e}", exc_info=True)
+            for request, indexes in to_price:
+                for index in indexes:
+                    yield self._role_result(
+                        index, request.job_title, request.location_text, "failed", error=str(e)
+                    )
+            return
+
+        # Steps 3-5: Select matches concurrently, price each role as its match completes
+        executor = ThreadPoolExecutor(max_workers=self.MATCH_WORKERS, thread_name_prefix="bulk-match")
+        try:
+            futures = {
+                executor.submit(
+                    self.matching_service.select_best_match,
+                    request.job_title,
+                    request.job_description or "",
+                    role_candidates,
+                    self.use_llm_reasoning
+                ): (request, indexes)
+                for (request, indexes), role_candidates in zip(to_price, candidates)
+            }
+
+            for future in as_completed(futures):
+                request, indexes = futures[future]
+                job_title, location = request.job_title, request.location_text
+
+                try:
+                    mercer_match = future.result()
+                    response = service._price_and_save(request, mercer_match, None)
+                    status, result, error = "completed", response, None
+
+                except NoMarketDataError as e:
+                    self.session.rollback()
+                    status, result, error = "no_data", None, "No market data available for this job title"
+                    logger.info(f"Bulk pricing: no market data for '{e.job_title}'")
+
+                except Exception as e:
+                    self.session.rollback()
+                    status, result, error = "failed", None, str(e)
+                    logger.error(f"Bulk pricing failed for '{job_title}': {e}", exc_info=True)
+
+                for index in indexes:
+                    yield self._role_result(index, job_title, location, status, result=result, error=error)
+
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _role_result(
+        index: int,
+        job_title: str,
+        location: str,
+        status: str,
+        result: Optional[Dict] = None,
+        error: Optional[str] = None
+    ) -> Dict:
+        """Streamed result for one input role."""
+        return {
+            "index": index,
+            "job_title": job_title,
+            "location": location,
+            "status": status,
+            "result": result,
+            "error": error,
+        }
@@ -0,0 +1,241 @@
+"""
+Embedding Cache Service
+
+Content-hash keyed cache for query embeddings, so repeated job titles are not
+re-embedded on every request.
+
+- Key: (model, dimensions, sha256(normalised text)); normalisation is Unicode
+  NFC plus whitespace collapsing
+- Tier 1: process-wide LRU of float32 vectors (shared by all service instances)
+- Tier 2: Redis (binary values, TTL), optional and fail-open
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import redis
+
+from ..core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form of a text for hashing (NFC, collapsed whitespace)."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text or "")).strip()
+
+
+def text_hash(text: str) -> str:
+    """SHA-256 hex digest of the normalised text."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    LRU + Redis cache for text embeddings.
+
+    Use get_embedding_cache() for the process-wide instance.
+    """
+
+    KEY_PREFIX = "embedding"
+
+    # 2048 x 1536 float32 is ~12 MB per process
+    DEFAULT_MAX_ENTRIES = 2048
+
+    # Embeddings of a fixed model never go stale
+    CACHE_TTL = 30 * 24 * 3600
+
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        use_redis: bool = True
+    ):
+        """
+        Initialize embedding cache.
+
+        Args:
+            redis_client: Redis client returning bytes (created from
+                settings.REDIS_URL on first use if not provided)
+            max_entries: Capacity of the in-process LRU
+            use_redis: Set False for an LRU-only cache
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = redis_client
+        self._use_redis = use_redis
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_create(
+        self,
+        model: str,
+        dimensions: int,
+        text: str,
+        create: Callable[[str], List[float]]
+    ) -> List[float]:
+        """
+        Cached embedding of text, calling create(text) on a miss.
+
+        Args:
+            model: Embedding model name
+            dimensions: Embedding dimensions
+            text: Text to embed
+            create: Provider call for a cache miss (exceptions propagate)
+
+        Returns:
+            Embedding vector
+        """
+        key = (model, dimensions, text_hash(text))
+
+        vector = self._lru_get(key)
+        if vector is None:
+            vector = self._redis_get(key)
+            if vector is not None:
+                self._lru_put(key, vector)
+
+        if vector is not None:
+            self.hits += 1
+            return vector.tolist()
+
+        self.misses += 1
+        embedding = create(text)
+        vector = np.asarray(embedding, dtype=np.float32)
+        self._lru_put(key, vector)
+        self._redis_put(key, vector)
+        return list(embedding)
+
+    def get_or_create_many(
+        self,
+        model: str,
+        dimensions: int,
+        texts: List[str],
+        create_many: Callable[[List[str]], List[List[float]]]
+    ) -> List[List[float]]:
+        """
+        Cached embeddings of texts, calling create_many once for all misses.
+
+        Args:
+            model: Embedding model name
+            dimensions: Embedding dimensions
+            texts: Texts to embed (duplicates are embedded once)
+            create_many: Batched provider call returning one embedding per
+                input text, in order (exceptions propagate)
+
+        Returns:
+            Embedding vectors in the order of texts
+        """
+        keys = [(model, dimensions, text_hash(text)) for text in texts]
+        vectors: Dict[tuple, np.ndarray] = {}
+        missing: Dict[tuple, str] = {}
+
+        for key, text in zip(keys, texts):
+            if key in vectors or key in missing:
+                continue
+            vector = self._lru_get(key)
+            if vector is None:
+                vector = self._redis_get(key)
+                if vector is not None:
+                    self._lru_put(key, vector)
+            if vector is None:
+                missing[key] = text
+            else:
+                self.hits += 1
+                vectors[key] = vector
+
+        if missing:
+            self.misses += len(missing)
+            embeddings = create_many(list(missing.values()))
+            if len(embeddings) != len(missing):
+                raise ValueError(
+                    f"Expected {len(missing)} embeddings, got {len(embeddings)}"
+                )
+            for key, embedding in zip(missing, embeddings):
+                vector = np.asarray(embedding, dtype=np.float32)
+                self._lru_put(key, vector)
+                self._redis_put(key, vector)
+                vectors[key] = vector
+
+        return [vectors[key].tolist() for key in keys]
+
+    def clear(self):
+        """Clear the in-process tier."""
+        with self._lock:
+            self._entries.clear()
+
+    # -------------------------------------------------------------------------
+    # Internal Helpers
+    # -------------------------------------------------------------------------
+
+    def _lru_get(self, key: tuple) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+            return vector
+
+    def _lru_put(self, key: tuple, vector: np.ndarray):
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _get_redis(self) -> Optional[redis.Redis]:
+        if self._redis is None and self._use_redis:
+            try:
+                self._redis = redis.from_url(get_settings().REDIS_URL)
+            except Exception as e:
+                logger.warning(f"Embedding cache Redis unavailable: {e}")
+                self._use_redis = False
+        return self._redis if self._use_redis else None
+
+    def _redis_key(self, key: tuple) -> str:
+        model, dimensions, digest = key
+        return f"{self.KEY_PREFIX}:{model}:{dimensions}:{digest}"
+
+    def _redis_get(self, key: tuple) -> Optional[np.ndarray]:
+        client = self._get_redis()
+        if client is None:
+            return None
+        try:
+            value = client.get(self._redis_key(key))
+            return np.frombuffer(value, dtype=np.float32) if value else None
+        except Exception as e:
+            logger.warning(f"Embedding cache read failed: {e}")
+            return None
+
+    def _redis_put(self, key: tuple, vector: np.ndarray):
+        client = self._get_redis()
+        if client is None:
+            return
+        try:
+            client.setex(self._redis_key(key), self.CACHE_TTL, vector.tobytes())
+        except Exception as e:
+            logger.warning(f"Embedding cache write failed: {e}")
+
+
+# Global cache instance
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """
+    Get global embedding cache instance.
+
+    Returns:
+        EmbeddingCache singleton
+    """
+    global _embedding_cache
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache()
+    return _embedding_cache
@@ -10,12 +10,15 @@ from typing import Dict, List, Optional, Tuple
 import openai
 import os
 import time
+from pgvector.sqlalchemy import Vector
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.exc import SQLAlchemyError, OperationalError
 
 from ..models.mercer import MercerJobLibrary
 from ..utils.database import get_db_context
+from .embedding_cache import get_embedding_cache
 from ..exceptions import (
     EmbeddingGenerationException,
     VectorSearchException,
@@ -28,19 +31,105 @@ from ..exceptions import (
 
 logger = logging.getLogger(__name__)
 
+EMBEDDING_DIMENSIONS = 1536
+
+# Nearest Mercer jobs by cosine distance (HNSW index scan). The query vector
+# is a bound parameter, so the statement text is the same for every search;
+# ANN settings (hnsw.ef_search) are applied per pooled connection, see
+# utils.db_optimization.configure_vector_search.
+SIMILAR_JOBS_SQL = text("""
+    SELECT
+        id,
+        job_code,
+        job_title,
+        job_description,
+        family,
+        subfamily,
+        career_level,
+        1 - (embedding <=> :embedding) AS similarity
+    FROM mercer_job_library
+    ORDER BY embedding <=> :embedding
+    LIMIT :limit
+""").bindparams(bindparam("embedding", type_=Vector(EMBEDDING_DIMENSIONS)))
+
+# Filtered search: filter first, then rank the (small) family/level subset
+# exactly. MATERIALIZED keeps the ANN index out, which would otherwise
+# filter after the scan and return fewer than :limit rows.
+SIMILAR_JOBS_FILTERED_SQL = text("""
+    WITH candidates AS MATERIALIZED (
+        SELECT id, job_code, job_title, job_description, family, subfamily, career_level, embedding
+        FROM mercer_job_library
+        WHERE (CAST(:family AS text) IS NULL OR family = :family)
+          AND (CAST(:career_level AS text) IS NULL OR career_level = :career_level)
+    )
+    SELECT
+        id,
+        job_code,
+        job_title,
+        job_description,
+        family,
+        subfamily,
+        career_level,
+        1 - (embedding <=> :embedding) AS similarity
+    FROM candidates
+    ORDER BY embedding <=> :embedding
+    LIMIT :limit
+""").bindparams(bindparam("embedding", type_=Vector(EMBEDDING_DIMENSIONS)))
+
+# Multi-query search: a LATERAL nearest-neighbour subquery per query vector
+SIMILAR_JOBS_BATCH_SQL = text("""
+    WITH queries AS (
+        SELECT CAST(q.embedding AS vector) AS embedding, q.query_index
+        FROM unnest(CAST(:embeddings AS text[])) WITH ORDINALITY AS q(embedding, query_index)
+    )
+    SELECT
+        queries.query_index,
+        m.id,
+        m.job_code,
+        m.job_title,
+        m.job_description,
+        m.family,
+        m.subfamily,
+        m.career_level,
+        m.similarity
+    FROM queries
+    CROSS JOIN LATERAL (
+        SELECT
+            id,
+            job_code,
+            job_title,
+            job_description,
+            family,
+            subfamily,
+            career_level,
+            1 - (mercer_job_library.embedding <=> queries.embedding) AS similarity
+        FROM mercer_job_library
+        ORDER BY mercer_job_library.embedding <=> queries.embedding
+        LIMIT :limit
+    ) m
+    ORDER BY queries.query_index, m.similarity DESC
+""").bindparams(bindparam("embeddings", type_=ARRAY(Vector(EMBEDDING_DIMENSIONS), dimensions=1)))
+
 
 class JobMatchingService:
     """Service for matching user jobs to Mercer Job Library using semantic search."""
 
+    # OpenAI accepts up to 2048 inputs per embeddings request
+    EMBEDDING_BATCH_SIZE = 2048
+
     def __init__(self, session: Optional[Session] = None):
         """Initialize job matching service."""
         self.session = session
+        self.embedding_cache = get_embedding_cache()
         openai.api_key = os.getenv('OPENAI_API_KEY')
 
     def generate_query_embedding(self, job_title: str, job_description: str = "", max_retries: int = 3) -> List[float]:
         """
         Generate embedding for a job query with retry logic.
 
+        Repeated queries (same normalised title/description) are served from
+        the shared embedding cache without an API call.
+
         Args:
             job_title: Job title to match
             job_description: Optional job description for better matching
@@ -70,28 +159,98 @@ class JobMatchingService:
         # Combine title and description for richer matching
         query_text = f"{job_title}. {job_description}" if job_description else job_title
 
+        return self.embedding_cache.get_or_create(
+            "text-embedding-3-large",
+            1536,
+            query_text,
+            lambda text: self._request_query_embedding(text, max_retries)
+        )
+
+    def generate_query_embeddings(
+        self,
+        queries: List[Tuple[str, str]],
+        max_retries: int = 3
+    ) -> List[List[float]]:
+        """
+        Generate embeddings for many job queries with one API call.
+
+        Cached queries are served from the shared embedding cache; all
+        misses are sent to the provider together (in EMBEDDING_BATCH_SIZE
+        chunks).
+
+        Args:
+            queries: (job_title, job_description) pairs
+            max_retries: Maximum number of retry attempts for transient failures
+
+        Returns:
+            1536-dimension embedding vector per query, in order
+
+        Raises:
+            Same as generate_query_embedding
+        """
+        for job_title, _ in queries:
+            if not job_title or not job_title.strip():
+                raise DataValidationException("job_title", "Job title cannot be empty")
+            if len(job_title) > 1000:
+                raise DataValidationException("job_title", "Job title exceeds maximum length of 1000 characters")
+
+        if not os.getenv('OPENAI_API_KEY'):
+            raise ConfigurationException("OPENAI_API_KEY", "OpenAI API key not configured")
+
+        query_texts = [
+            f"{job_title}. {job_description}" if job_description else job_title
+            for job_title, job_description in queries
+        ]
+
+        return self.embedding_cache.get_or_create_many(
+            "text-embedding-3-large",
+            1536,
+            query_texts,
+            lambda texts: [
+                embedding
+                for start in range(0, len(texts), self.EMBEDDING_BATCH_SIZE)
+                for embedding in self._request_query_embeddings(
+                    texts[start:start + self.EMBEDDING_BATCH_SIZE], max_retries
+                )
+            ]
+        )
+
+    def _request_query_embedding(self, query_text: str, max_retries: int) -> List[float]:
+        """Call the OpenAI embeddings API for a query text (cache miss path)."""
+        return self._request_query_embeddings([query_text], max_retries)[0]
+
+    def _request_query_embeddings(self, query_texts: List[str], max_retries: int) -> List[List[float]]:
+        """Call the OpenAI embeddings API for a batch of query texts."""
         # Retry logic for transient failures
         for attempt in range(max_retries):
             try:
-                logger.debug(f"Generating embedding for: {job_title[:50]}... (attempt {attempt + 1}/{max_retries})")
+                logger.debug(
+                    f"Generating {len(query_texts)} embedding(s), first: {query_texts[0][:50]}... "
+                    f"(attempt {attempt + 1}/{max_retries})"
+                )
 
                 response = openai.embeddings.create(
                     model="text-embedding-3-large",
-                    input=query_text,
+                    input=query_texts,
                     dimensions=1536
                 )
 
-                embedding = response.data[0].embedding
+                # Results carry their input index; keep input order
+                embeddings = [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
 
-                # Validate embedding
-                if not embedding or len(embedding) != 1536:
+                # Validate embeddings
+                if len(embeddings) != len(query_texts):
                     raise EmbeddingGenerationException(
-                        f"Invalid embedding dimensions: expected 1536, got {len(embedding) if embedding else 0}"
+                        f"Expected {len(query_texts)} embeddings, got {len(embeddings)}"
                     )
-
-                logger.debug(f"Successfully generated embedding ({len(embedding)} dimensions)")
-                return embedding
-
+                for embedding in embeddings:
+                    if not embedding or len(embedding) != 1536:
+                        raise EmbeddingGenerationException(
+                            f"Invalid embedding dimensions: expected 1536, got {len(embedding) if embedding else 0}"
+                        )
+
+                logger.debug(f"Successfully generated {len(embeddings)} embedding(s)")
+                return embeddings
             except openai.RateLimitError as e:
                 logger.warning(f"OpenAI rate limit exceeded: {e}")
                 if attempt < max_retries - 1:
@@ -167,57 +326,21 @@ class JobMatchingService:
             if top_k < 1 or top_k > 100:
                 raise DataValidationException("top_k", "Must be between 1 and 100")
 
-            # Build SQL query with filters
-            filters = []
-            params = {
-                "limit": top_k
-            }
-
-            if job_family:
-                filters.append("family = :family")
-                params["family"] = job_family
-
-            if career_level:
-                filters.append("career_level = :career_level")
-                params["career_level"] = career_level
-
-            where_clause = "WHERE " + " AND ".join(filters) if filters else ""
-
-            # Convert embedding to PostgreSQL array format
-            embedding_str = '[' + ','.join(map(str, query_embedding)) + ']'
-
-            # Use pgvector cosine similarity
-            query = text(f"""
-                SELECT
-                    id,
-                    job_code,
-                    job_title,
-                    job_description,
-                    family,
-                    subfamily,
-                    career_level,
-                    1 - (embedding <=> '{embedding_str}'::vector) AS similarity
-                FROM mercer_job_library
-                {where_clause}
-                ORDER BY embedding <=> '{embedding_str}'::vector
-                LIMIT :limit
-            """)
-
-            # Debug: log the actual SQL
-            logger.debug(f"SQL WHERE clause: '{where_clause}'")
-            logger.debug(f"SQL params: {params}")
+            params = {"embedding": query_embedding, "limit": top_k}
+            if job_family or career_level:
+                query = SIMILAR_JOBS_FILTERED_SQL
+                params.update(family=job_family, career_level=career_level)
+            else:
+                query = SIMILAR_JOBS_SQL
+
+            logger.debug(f"Vector search filters: family={job_family}, career_level={career_level}")
 
             # Execute with context manager or provided session
             try:
                 if self.session:
-                    # Set IVFFlat probes to search more clusters (default is 1, which is too restrictive)
-                    # This improves recall at slight cost of speed
-                    self.session.execute(text("SET ivfflat.probes = 10"))
                     results = self.session.execute(query, params).fetchall()
                 else:
                     with get_db_context() as session:
-                        # Set IVFFlat probes for this session
-                        session.execute(text("SET ivfflat.probes = 10"))
                         results = session.execute(query, params).fetchall()
 
             except OperationalError as e:
@@ -268,6 +391,87 @@ class JobMatchingService:
                 original_error=e
             )
 
+    def find_similar_jobs_batch(
+        self,
+        queries: List[Tuple[str, str]],
+        top_k: int = 5
+    ) -> List[List[Dict]]:
+        """
+        Find similar Mercer jobs for many queries in one vector search.
+
+        Embeddings come from one batched API call (generate_query_embeddings);
+        the top_k matches of every query are read in a single statement with a
+        LATERAL nearest-neighbour subquery per query vector.
+
+        Args:
+            queries: (job_title, job_description) pairs
+            top_k: Number of top matches to return per query
+
+        Returns:
+            Matched jobs with similarity scores, one list per query
+        """
+        if not queries:
+            return []
+
+        if top_k < 1 or top_k > 100:
+            raise DataValidationException("top_k", "Must be between 1 and 100")
+
+        try:
+            embeddings = self.generate_query_embeddings(queries)
+
+            params = {"embeddings": embeddings, "limit": top_k}
+
+            try:
+                if self.session:
+                    results = self.session.execute(SIMILAR_JOBS_BATCH_SQL, params).fetchall()
+                else:
+                    with get_db_context() as session:
+                        results = session.execute(SIMILAR_JOBS_BATCH_SQL, params).fetchall()
+
+            except OperationalError as e:
+                logger.error(f"Database connection error: {e}")
+                raise DatabaseConnectionException(
+                    "Failed to connect to database for vector search",
+                    original_error=e
+                )
+
+            except SQLAlchemyError as e:
+                logger.error(f"Batch vector search query failed: {e}", exc_info=True)
+                raise VectorSearchException(
+                    "Database query failed - check pgvector extension is installed",
+                    original_error=e
+                )
+
+            matches: List[List[Dict]] = [[] for _ in queries]
+            for row in results:
+                similarity = float(row[8])
+                matches[row[0] - 1].append({
+                    "id": row[1],
+                    "job_code": row[2],
+                    "job_title": row[3],
+                    "job_description": row[4],
+                    "family": row[5],
+                    "subfamily": row[6],
+                    "career_level": row[7],
+                    "similarity_score": similarity,
+                    "confidence": self._calculate_confidence(similarity)
+                })
+
+            logger.debug(f"find_similar_jobs_batch matched {len(queries)} queries ({len(results)} rows)")
+
+            return matches
+
+        except (EmbeddingGenerationException, DatabaseConnectionException, VectorSearchException,
+                DataValidationException, ConfigurationException, RateLimitException):
+            raise
+
+        except Exception as e:
+            logger.error(f"Unexpected error in find_similar_jobs_batch: {e}", exc_info=True)
+            raise VectorSearchException(
+                f"Unexpected error during batch job search: {str(e)}",
+                original_error=e
+            )
+
     def find_best_match(
         self,
         job_title: str,
@@ -302,11 +506,33 @@ class JobMatchingService:
             top_k=5  # Get top 5 for LLM to analyze
         )
 
+        # Step 2: Pick the best candidate
+        return self.select_best_match(job_title, job_description, candidates, use_llm_reasoning)
+
+    def select_best_match(
+        self,
+        job_title: str,
+        job_description: str,
+        candidates: List[Dict],
+        use_llm_reasoning: bool = True
+    ) -> Optional[Dict]:
+        """
+        Pick the best match among embedding search candidates.
+
+        Args:
+            job_title: Job title to match
+            job_description: Job description for context
+            candidates: Candidates from find_similar_jobs / find_similar_jobs_batch
+            use_llm_reasoning: If True, use LLM for final decision (recommended)
+
+        Returns:
+            Best match with confidence score and reasoning, or None if no good match
+        """
         if not candidates:
             logger.debug("No embedding matches found")
             return None
 
-        # Step 2: If LLM reasoning enabled, use it for final decision
+        # If LLM reasoning enabled, use it for final decision
         if use_llm_reasoning and openai.api_key:
             logger.debug(f"Using LLM to analyze {len(candidates)} candidates")
             return self._llm_select_best_match(
@@ -0,0 +1,275 @@
+"""
+Market Aggregation Service - Precomputed scraped salary distributions
+
+Runs after each scrape (worker.full_data_scrape) so pricing does not scan
+scraped listings per request:
+
+1. Normalise each new listing's salary midpoint to annual
+2. Assign each new listing to its best Mercer job code/family once
+   (pg_trgm % against Mercer base titles, served by the trigram index
+   idx_mercer_base_title_trgm; similarity() only ranks the candidates)
+3. Rebuild scraped_salary_aggregates in one INSERT ... SELECT: sample size,
+   P10-P90 (percentile_cont) and mean scrape time per family x source x
+   location, plus a '*' row per family x source covering all locations
+   (GROUPING SETS); no listings are loaded into Python
+
+At request time PricingCalculationServiceV3 reads one aggregate row per source.
+"""
+
+import logging
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from job_pricing.models import ScrapedJobListing, ScrapedSalaryAggregate
+
+logger = logging.getLogger(__name__)
+
+ALL_LOCATIONS = "*"
+
+
+def normalize_location(location: Optional[str]) -> str:
+    """Aggregate key for a listing or request location."""
+    return " ".join((location or "").lower().split()) or ALL_LOCATIONS
+
+
+def annual_salary_midpoint(
+    source: str,
+    salary_min,
+    salary_max,
+    salary_type: Optional[str] = None
+) -> Optional[Decimal]:
+    """
+    Salary range midpoint normalised to annual.
+
+    MCF provides salary_type (Monthly, Annual, Hourly); unknown types are
+    assumed monthly (Singapore standard). Glassdoor shows annual salaries,
+    so midpoints below 15K are treated as monthly.
+
+    Returns:
+        Annual salary, or None if the range is incomplete
+    """
+    if not salary_min or not salary_max:
+        return None
+
+    midpoint = (Decimal(salary_min) + Decimal(salary_max)) / 2
+
+    if source == "glassdoor":
+        return midpoint * 12 if midpoint < 15000 else midpoint
+
+    salary_type = (salary_type or "").lower()
+    if "month" in salary_type:
+        return midpoint * 12
+    if "hour" in salary_type:
+        return midpoint * 40 * 52  # 40hr/wk * 52wk
+    if "annual" in salary_type or "year" in salary_type:
+        return midpoint
+    return midpoint * 12
+
+
+# Best Mercer job per pending listing, by trigram similarity of the listing
+# title to the Mercer base title ("HR Business Partners - Director (M5)" ->
+# "HR Business Partners"). The join uses the % operator (threshold from
+# pg_trgm.similarity_threshold) on the same expression as the trigram index
+# idx_mercer_base_title_trgm, so each listing is an index lookup rather than
+# a similarity() call against every Mercer job.
+ASSIGN_MERCER_SQL = """
+WITH best AS (
+    SELECT DISTINCT ON (s.id)
+        s.id,
+        m.job_code,
+        m.family,
+        similarity(s.job_title, btrim(split_part(m.job_title, ' - ', 1))) AS score
+    FROM scraped_job_listings s
+    JOIN mercer_job_library m
+      ON btrim(split_part(m.job_title, ' - ', 1)) % s.job_title
+    WHERE s.mercer_assigned_at IS NULL
+      AND s.annual_salary IS NOT NULL
+    ORDER BY s.id, score DESC, m.job_code
+)
+UPDATE scraped_job_listings s
+SET mercer_job_code = best.job_code,
+    mercer_family = best.family,
+    mercer_match_score = best.score
+FROM best
+WHERE s.id = best.id
+"""
+
+
+# Per family x source x location, plus an all-locations ('*') row per
+# family x source. Location keys match normalize_location(); listings without
+# a location only count towards the '*' row.
+REFRESH_AGGREGATES_SQL = r"""
+INSERT INTO scraped_salary_aggregates (
+    mercer_family, source, location, sample_size,
+    p10, p25, p50, p75, p90, mean_scraped_at, last_updated
+)
+SELECT
+    mercer_family,
+    source,
+    CASE WHEN GROUPING(location_key) = 1 THEN '*' ELSE location_key END,
+    count(*),
+    CAST(percentile_cont(0.10) WITHIN GROUP (ORDER BY annual_salary) AS NUMERIC(12, 2)),
+    CAST(percentile_cont(0.25) WITHIN GROUP (ORDER BY annual_salary) AS NUMERIC(12, 2)),
+    CAST(percentile_cont(0.50) WITHIN GROUP (ORDER BY annual_salary) AS NUMERIC(12, 2)),
+    CAST(percentile_cont(0.75) WITHIN GROUP (ORDER BY annual_salary) AS NUMERIC(12, 2)),
+    CAST(percentile_cont(0.90) WITHIN GROUP (ORDER BY annual_salary) AS NUMERIC(12, 2)),
+    to_timestamp(avg(extract(epoch FROM scraped_at))),
+    NOW()
+FROM (
+    SELECT
+        mercer_family,
+        source,
+        annual_salary,
+        scraped_at,
+        COALESCE(NULLIF(btrim(regexp_replace(lower(location), '\s+', ' ', 'g')), ''), '*') AS location_key
+    FROM scraped_job_listings
+    WHERE mercer_family IS NOT NULL
+      AND annual_salary IS NOT NULL
+) listings
+GROUP BY GROUPING SETS ((mercer_family, source, location_key), (mercer_family, source))
+HAVING GROUPING(location_key) = 1 OR location_key <> '*'
+"""
+
+
+class MarketAggregationService:
+    """
+    Maintains Mercer assignments of scraped listings and the per-family
+    salary aggregates read by pricing.
+    """
+
+    # Same threshold pricing used for family-based title matching
+    SIMILARITY_THRESHOLD = 0.3
+
+    # Location-specific rows need this many listings to be used
+    MIN_LOCATION_SAMPLE_SIZE = 5
+
+    BATCH_SIZE = 1000
+
+    def __init__(self, session: Session):
+        """
+        Initialize service.
+
+        Args:
+            session: SQLAlchemy database session
+        """
+        self.session = session
+
+    def run(self, reassign: bool = False) -> Dict[str, int]:
+        """
+        Assign pending listings and rebuild aggregates, then commit.
+
+        Args:
+            reassign: Recompute assignments for all listings (e.g. after a
+                Mercer job library reload)
+
+        Returns:
+            Statistics (listings_assigned, aggregates)
+        """
+        if reassign:
+            self.session.query(ScrapedJobListing).update(
+                {ScrapedJobListing.mercer_assigned_at: None},
+                synchronize_session=False,
+            )
+
+        assigned = self.assign_listings()
+        aggregates = self.refresh_aggregates()
+        self.session.commit()
+
+        logger.info(f"Market aggregation: {assigned} listings assigned, {aggregates} aggregates")
+
+        return {"listings_assigned": assigned, "aggregates": aggregates}
+
+    def assign_listings(self) -> int:
+        """
+        Normalise salaries and assign Mercer jobs for pending listings.
+
+        Returns:
+            Number of pending listings processed
+        """
+        pending = self.session.query(
+            ScrapedJobListing.id,
+            ScrapedJobListing.source,
+            ScrapedJobListing.salary_min,
+            ScrapedJobListing.salary_max,
+            ScrapedJobListing.salary_type,
+        ).filter(ScrapedJobListing.mercer_assigned_at.is_(None)).all()
+
+        if not pending:
+            return 0
+
+        updates = [
+            {
+                "id": row.id,
+                "annual_salary": annual_salary_midpoint(
+                    row.source, row.salary_min, row.salary_max, row.salary_type
+                ),
+                "mercer_job_code": None,
+                "mercer_family": None,
+                "mercer_match_score": None,
+            }
+            for row in pending
+        ]
+        for start in range(0, len(updates), self.BATCH_SIZE):
+            self.session.bulk_update_mappings(ScrapedJobListing, updates[start:start + self.BATCH_SIZE])
+        self.session.flush()
+
+        # % matches at or above the threshold; scoped to this transaction
+        self.session.execute(text(f"SET LOCAL pg_trgm.similarity_threshold = {self.SIMILARITY_THRESHOLD}"))
+        self.session.execute(text(ASSIGN_MERCER_SQL))
+
+        # Unmatched listings are done too; they are retried only on reassign
+        self.session.query(ScrapedJobListing).filter(
+            ScrapedJobListing.mercer_assigned_at.is_(None)
+        ).update(
+            {ScrapedJobListing.mercer_assigned_at: datetime.now(timezone.utc)},
+            synchronize_session=False,
+        )
+
+        return len(pending)
+
+    def refresh_aggregates(self) -> int:
+        """
+        Rebuild scraped_salary_aggregates from assigned listings.
+
+        Percentiles interpolate linearly (percentile_cont) and are computed
+        by the database.
+
+        Returns:
+            Number of aggregate rows written
+        """
+        self.session.query(ScrapedSalaryAggregate).delete(synchronize_session=False)
+        result = self.session.execute(text(REFRESH_AGGREGATES_SQL))
+        self.session.flush()
+
+        return result.rowcount
+
+    def get_aggregate(
+        self,
+        family: str,
+        source: str,
+        location: Optional[str] = None
+    ) -> Optional[ScrapedSalaryAggregate]:
+        """
+        Aggregate for a family and source, preferring the request location.
+
+        Falls back to the all-locations row when the location has fewer
+        than MIN_LOCATION_SAMPLE_SIZE listings.
+        """
+        location_key = normalize_location(location)
+        candidates = self.session.query(ScrapedSalaryAggregate).filter(
+            ScrapedSalaryAggregate.mercer_family == family,
+            ScrapedSalaryAggregate.source == source,
+            ScrapedSalaryAggregate.location.in_({location_key, ALL_LOCATIONS}),
+        ).all()
+
+        by_location = {aggregate.location: aggregate for aggregate in candidates}
+        local = by_location.get(location_key)
+        if local is not None and (
+            location_key == ALL_LOCATIONS or local.sample_size >= self.MIN_LOCATION_SAMPLE_SIZE
+        ):
+            return local
+        return by_location.get(ALL_LOCATIONS)
@@ -26,14 +26,20 @@ NO MOCK DATA - All calculations use real data sources.
 """
 
 import logging
-from typing import List, Dict, Optional
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, List, Dict, Optional, Sequence, Tuple
 from decimal import Decimal
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone, date
 import statistics
 
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
+import numpy as np
+
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm.state import InstanceState
+from sqlalchemy import func, inspect, text
+from sqlalchemy.engine import Engine
 
 from job_pricing.models import (
     JobPricingRequest,
@@ -49,9 +55,29 @@ from job_pricing.repositories.mercer_repository import MercerRepository
 from job_pricing.repositories.scraping_repository import ScrapingRepository
 from job_pricing.repositories.hris_repository import HRISRepository
 from job_pricing.exceptions import NoMarketDataError
+from job_pricing.services.market_aggregation_service import (
+    MarketAggregationService,
+    annual_salary_midpoint,
+    normalize_location,
+)
+from job_pricing.utils.weighted_percentiles import quantile_sketch, weighted_percentiles
 
 logger = logging.getLogger(__name__)
 
+# Shared pool for concurrent source gathering (created on first use)
+_source_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_source_executor(max_workers: int) -> ThreadPoolExecutor:
+    """Get the shared thread pool used to query data sources concurrently."""
+    global _source_executor
+    if _source_executor is None:
+        _source_executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="pricing-source",
+        )
+    return _source_executor
+
 
 @dataclass
 class DataSourceContribution:
@@ -143,17 +169,56 @@ class PricingCalculationServiceV3:
     # Query limits to prevent excessive data retrieval
     QUERY_LIMIT_EXTERNAL = 100  # MCF, Glassdoor, Applicants (more data available)
     QUERY_LIMIT_INTERNAL = 50   # HRIS only (current employees, less data)
-    QUERY_LIMIT_MERCER_FAMILY = 10  # Max related titles to use in family matching
 
     # Default recency when scraped_at is missing (days)
     DEFAULT_RECENCY_DAYS = 30
 
-    def __init__(self, session: Session):
+    # Source fetchers in aggregation order: (source, method, uses Mercer match)
+    SOURCE_FETCHERS = (
+        ("mercer", "_get_mercer_data", True),
+        ("my_careers_future", "_get_mycareersfuture_data", True),
+        ("glassdoor", "_get_glassdoor_data", True),
+        ("internal_hris", "_get_internal_hris_data", False),
+        ("applicants", "_get_applicants_data", False),
+    )
+
+    # Concurrent gathering: each source runs on its own pooled session and
+    # is treated as missing if it has not finished within the deadline. The
+    # deadline starts when the source starts running, so time spent queued
+    # behind other requests' sources does not count against it; a source
+    # still queued after SOURCE_QUEUE_TIMEOUT_SECONDS is dropped.
+    CONCURRENT_SOURCES = True
+    SOURCE_TIMEOUT_SECONDS = 5.0
+    SOURCE_QUEUE_TIMEOUT_SECONDS = 30.0
+    SOURCE_WORKERS = 10  # Shared across requests; keep below DB pool size
+
+    def __init__(
+        self,
+        session: Session,
+        concurrent_sources: Optional[bool] = None,
+        source_timeout: Optional[float] = None,
+        session_factory: Optional[Callable[[], Session]] = None,
+        shared_lookups: Optional[Dict] = None,
+    ):
         """
         Initialize service.
 
         Args:
             session: SQLAlchemy database session
+            concurrent_sources: Query data sources in parallel (default: CONCURRENT_SOURCES)
+            source_timeout: Per-source deadline in seconds (default: SOURCE_TIMEOUT_SECONDS)
+            session_factory: Factory for per-source sessions (default: new sessions
+                on the engine bound to ``session``)
+            shared_lookups: Memo for lookups that depend only on the Mercer
+                match (market data per job code, scraped aggregates per family
+                and location). Pass the same dict when pricing many roles so
+                roles in the same family share them.
+
+        Note on concurrency:
+            Parallel sources need their own sessions, which cannot see data
+            uncommitted in ``session``. When ``session`` is bound to a
+            Connection rather than an Engine (e.g. a test transaction) and no
+            session_factory is given, sources are gathered serially.
 
         Note on Repositories:
             The repositories (mercer_repo, scraping_repo, hris_repo) are initialized
@@ -175,6 +240,12 @@ class PricingCalculationServiceV3:
             - Consistency (same queries across endpoints)
         """
         self.session = session
+        self.source_timeout = source_timeout if source_timeout is not None else self.SOURCE_TIMEOUT_SECONDS
+        self.session_factory = session_factory or self._default_session_factory(session)
+        if concurrent_sources is None:
+            concurrent_sources = self.CONCURRENT_SOURCES
+        self.concurrent_sources = concurrent_sources and self.session_factory is not None
+        self.shared_lookups = shared_lookups
 
         # Validate weights sum to 1.0 (within floating point tolerance)
         weights_sum = sum(self.WEIGHTS.values())
@@ -255,10 +326,10 @@ class PricingCalculationServiceV3:
             )
 
         # Step 2b: Fallback to weighted aggregation if no strong Mercer match
-        weighted_data_points = self._apply_weights_and_aggregate(contributions)
+        data_points, weights = self._apply_weights_and_aggregate(contributions)
 
         # Check if all sources were filtered out due to low match quality
-        if not weighted_data_points:
+        if len(data_points) == 0:
             logger.warning(
                 "All data sources filtered out due to low match quality. "
                 "Sources attempted: mercer, my_careers_future, glassdoor, internal_hris, applicants. "
@@ -270,7 +341,7 @@ class PricingCalculationServiceV3:
             )
 
         # Step 3: Calculate percentiles from aggregated data
-        percentiles = self._calculate_percentiles(weighted_data_points)
+        percentiles = self._calculate_percentiles(data_points, weights)
 
         # Step 4: Calculate overall confidence score
         confidence = self._calculate_confidence_score(contributions)
@@ -304,6 +375,17 @@ class PricingCalculationServiceV3:
 
         return result
 
+    @staticmethod
+    def _default_session_factory(session: Session) -> Optional[Callable[[], Session]]:
+        """Session factory on the same engine as ``session``, if it is bound to one."""
+        try:
+            bind = session.get_bind()
+        except Exception:
+            return None
+        if not isinstance(bind, Engine):
+            return None
+        return sessionmaker(bind=bind, autocommit=False, autoflush=False)
+
     def _gather_all_sources(
         self,
         request: JobPricingRequest,
@@ -312,6 +394,9 @@ class PricingCalculationServiceV3:
         """
         Gather salary data from all 5 sources.
 
+        Sources are independent, so in concurrent mode they are queried in
+        parallel and a source that misses the deadline counts as missing.
+
         Args:
             request: Job pricing request
             mercer_match: Optional Mercer job match with job_code and family info
@@ -319,36 +404,145 @@ class PricingCalculationServiceV3:
         Returns:
             List of data source contributions
         """
-        contributions = []
+        if self.concurrent_sources:
+            results = self._gather_sources_concurrently(request, mercer_match)
+        else:
+            results = {
+                source_name: self._fetch_source(self, source_name, request, mercer_match)
+                for source_name, _, _ in self.SOURCE_FETCHERS
+            }
 
-        # Source 1: Mercer IPE (40% weight)
-        mercer_data = self._get_mercer_data(request, mercer_match)
-        if mercer_data:
-            contributions.append(mercer_data)
+        # Keep aggregation order stable regardless of completion order
+        contributions = [
+            results[source_name]
+            for source_name, _, _ in self.SOURCE_FETCHERS
+            if results.get(source_name)
+        ]
 
-        # Source 2: MyCareersFuture (25% weight) - Uses job family from Mercer match
-        mcf_data = self._get_mycareersfuture_data(request, mercer_match)
-        if mcf_data:
-            contributions.append(mcf_data)
+        logger.info(f"Gathered data from {len(contributions)}/{len(self.SOURCE_FETCHERS)} sources")
 
-        # Source 3: Glassdoor (15% weight) - Uses job family from Mercer match
-        glassdoor_data = self._get_glassdoor_data(request, mercer_match)
-        if glassdoor_data:
-            contributions.append(glassdoor_data)
+        return contributions
 
-        # Source 4: Internal HRIS (15% weight)
-        hris_data = self._get_internal_hris_data(request)
-        if hris_data:
-            contributions.append(hris_data)
+    def _gather_sources_concurrently(
+        self,
+        request: JobPricingRequest,
+        mercer_match: Optional[Dict]
+    ) -> Dict[str, Optional[DataSourceContribution]]:
+        """
+        Query every source in parallel, each on its own session.
 
-        # Source 5: Applicants (5% weight)
-        applicants_data = self._get_applicants_data(request)
-        if applicants_data:
-            contributions.append(applicants_data)
+        A source has source_timeout from the moment a pool thread picks it
+        up. A source that overruns is abandoned; its query is ended by the
+        statement timeout set in _fetch_source_in_session, which frees the
+        thread and connection.
 
-        logger.info(f"Gathered data from {len(contributions)}/5 sources")
+        Returns:
+            Contribution (or None) for each source that finished in time
+        """
+        # Load request attributes here so worker threads never lazy-load
+        # through the caller's session
+        state = inspect(request, raiseerr=False)
+        if isinstance(state, InstanceState):
+            for attr in state.mapper.column_attrs:
+                getattr(request, attr.key)
+
+        started_at: Dict[str, float] = {}
+
+        def run(source_name: str) -> Optional[DataSourceContribution]:
+            started_at[source_name] = time.monotonic()
+            return self._fetch_source_in_session(source_name, request, mercer_match)
+
+        executor = _get_source_executor(self.SOURCE_WORKERS)
+        futures = {
+            executor.submit(run, source_name): source_name
+            for source_name, _, _ in self.SOURCE_FETCHERS
+        }
+        queue_deadline = time.monotonic() + self.SOURCE_QUEUE_TIMEOUT_SECONDS
+
+        def deadline(future) -> float:
+            source_name = futures[future]
+            if source_name in started_at:
+                return started_at[source_name] + self.source_timeout
+            return queue_deadline
+
+        results = {}
+        pending = set(futures)
+        while pending:
+            # Re-check at least every source_timeout: a queued source may
+            # start (and get its own deadline) while we wait
+            next_deadline = min(deadline(future) for future in pending)
+            timeout = min(max(0.0, next_deadline - time.monotonic()), self.source_timeout)
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                source_name = futures[future]
+                try:
+                    results[source_name] = future.result()
+                except Exception as e:
+                    logger.error(f"Error querying {source_name} data: {e}")
+
+            now = time.monotonic()
+            for future in [future for future in pending if deadline(future) <= now]:
+                pending.discard(future)
+                source_name = futures[future]
+                if future.cancel():
+                    logger.warning(
+                        f"{source_name} data not started after {self.SOURCE_QUEUE_TIMEOUT_SECONDS:.1f}s "
+                        "(source pool busy) - treating as missing"
+                    )
+                else:
+                    logger.warning(
+                        f"{source_name} data not ready after {self.source_timeout:.1f}s - treating as missing"
+                    )
+
+        return results
+
+    def _fetch_source_in_session(
+        self,
+        source_name: str,
+        request: JobPricingRequest,
+        mercer_match: Optional[Dict]
+    ) -> Optional[DataSourceContribution]:
+        """Run one source fetcher on a dedicated session (worker thread)."""
+        session = self.session_factory()
+        try:
+            bind = session.get_bind()
+            if bind.dialect.name == "postgresql":
+                # Abandoned queries stop at the deadline instead of holding a connection
+                timeout_ms = int(self.source_timeout * 1000)
+                session.execute(text(f"SET LOCAL statement_timeout = {timeout_ms}"))
+
+            worker = PricingCalculationServiceV3(
+                session, concurrent_sources=False, shared_lookups=self.shared_lookups
+            )
+            return self._fetch_source(worker, source_name, request, mercer_match)
+        finally:
+            session.rollback()
+            session.close()
 
-        return contributions
+    def _fetch_source(
+        self,
+        service: "PricingCalculationServiceV3",
+        source_name: str,
+        request: JobPricingRequest,
+        mercer_match: Optional[Dict]
+    ) -> Optional[DataSourceContribution]:
+        """Call the fetcher for ``source_name`` on ``service``."""
+        for name, method_name, uses_mercer_match in self.SOURCE_FETCHERS:
+            if name == source_name:
+                fetch = getattr(service, method_name)
+                if uses_mercer_match:
+                    return fetch(request, mercer_match)
+                return fetch(request)
+        raise ValueError(f"Unknown data source: {source_name}")
+
+    def _shared_lookup(self, key: Tuple, load: Callable[[], object]):
+        """Result of load(), memoised in shared_lookups under key if enabled."""
+        if self.shared_lookups is None:
+            return load()
+        if key not in self.shared_lookups:
+            self.shared_lookups[key] = load()
+        return self.shared_lookups[key]
 
     def _get_mercer_data(
         self,
@@ -393,11 +587,22 @@ class PricingCalculationServiceV3:
             logger.debug(f"Found Mercer match: {job_code} (score: {match_score:.2f})")
 
             # Query market data for this job code (Singapore data)
-            market_data = self.session.query(MercerMarketData).filter(
-                MercerMarketData.job_code == job_code,
-                MercerMarketData.country_code == "SG",
-                MercerMarketData.p50.isnot(None)
-            ).first()
+            market_data = self._shared_lookup(
+                ("mercer_market_data", job_code),
+                lambda: self.session.query(
+                    MercerMarketData.p10,
+                    MercerMarketData.p25,
+                    MercerMarketData.p50,
+                    MercerMarketData.p75,
+                    MercerMarketData.p90,
+                    MercerMarketData.sample_size,
+                    MercerMarketData.survey_date,
+                ).filter(
+                    MercerMarketData.job_code == job_code,
+                    MercerMarketData.country_code == "SG",
+                    MercerMarketData.p50.isnot(None)
+                ).first()
+            )
 
             if not market_data:
                 logger.debug(f"No Singapore market data for job code: {job_code}")
@@ -469,80 +674,34 @@ class PricingCalculationServiceV3:
         logger.debug("Querying MyCareersFuture data...")
 
         try:
-            # If we have a Mercer match, use job family to find related roles
-            related_titles = []
-            if mercer_match and mercer_match.get("job_code"):
-                # Get the matched Mercer job to extract family
-                mercer_job = self.session.query(MercerJobLibrary).filter(
-                    MercerJobLibrary.job_code == mercer_match["job_code"]
-                ).first()
-
-                if mercer_job and mercer_job.family:
-                    logger.debug(f"Using Mercer family '{mercer_job.family}' for MCF filtering")
-
-                    # Get all job titles from the same Mercer family
-                    family_jobs = self.session.query(MercerJobLibrary).filter(
-                        MercerJobLibrary.family == mercer_job.family
-                    ).all()
-
-                    # Extract keywords from related job titles (remove parenthetical suffixes)
-                    for job in family_jobs:
-                        # Extract base title (e.g., "HR Business Partners" from "HR Business Partners - Director (M5)")
-                        title = job.job_title.split(" - ")[0].strip()
-                        related_titles.append(title)
-
-                    logger.debug(f"Found {len(related_titles)} related job titles in {mercer_job.family} family")
-
-            # Query scraped job listings from MCF
-            listings = []
-            match_quality = 0.5  # Default - will be updated based on matching strategy
-
-            # Strategy 1: If we have family-based titles, match against those (highest quality)
-            if related_titles:
-                # Use OR condition to match any of the related titles
-                title_conditions = [
-                    func.similarity(ScrapedJobListing.job_title, title) > self.SIMILARITY_THRESHOLD_RELAXED
-                    for title in related_titles[:self.QUERY_LIMIT_MERCER_FAMILY]
-                ]
-
-                try:
-                    listings = self.session.query(ScrapedJobListing).filter(
-                        ScrapedJobListing.source == "my_careers_future",
-                        ScrapedJobListing.salary_min.isnot(None),
-                        ScrapedJobListing.salary_max.isnot(None),
-                        or_(*title_conditions)
-                    ).limit(self.QUERY_LIMIT_EXTERNAL).all()
-
-                    logger.info(f"Family-based matching found {len(listings)} MCF listings")
-                    match_quality = 0.9  # High quality: matched by Mercer job family
-                except Exception as e:
-                    logger.warning(f"Family-based matching failed, trying alternative: {e}")
-                    listings = []
+            # Strategy 1: Precomputed Mercer family aggregate (highest quality)
+            family_data = self._get_family_aggregate_data("my_careers_future", request, mercer_match, 0.9)
+            if family_data:
+                return family_data
 
-            # Strategy 2: Alternative - fuzzy match on job title if no family match (medium quality)
-            if not listings:
-                try:
-                    listings = self.session.query(ScrapedJobListing).filter(
-                        ScrapedJobListing.source == "my_careers_future",
-                        ScrapedJobListing.salary_min.isnot(None),
-                        ScrapedJobListing.salary_max.isnot(None),
-                    ).filter(
-                        func.similarity(
-                            ScrapedJobListing.job_title,
-                            request.job_title
-                        ) > self.SIMILARITY_THRESHOLD_RELAXED
-                    ).limit(self.QUERY_LIMIT_EXTERNAL).all()
-                    match_quality = 0.75  # Medium-high quality: fuzzy trigram match
-                except Exception as e:
-                    logger.warning(f"Trigram similarity not available, using basic LIKE match: {e}")
-                    # Strategy 3: Basic LIKE match when trigram extension unavailable (lower quality)
-                    listings = self.session.query(ScrapedJobListing).filter(
-                        ScrapedJobListing.source == "my_careers_future",
-                        ScrapedJobListing.salary_min.isnot(None),
-                        ScrapedJobListing.salary_max.isnot(None),
-                        ScrapedJobListing.job_title.ilike(f"%{request.job_title}%")
-                    ).limit(self.QUERY_LIMIT_EXTERNAL).all()
-                    match_quality = 0.6  # Lower quality: basic string match
+            # Strategy 2: Fuzzy match on job title if no family aggregate (medium quality)
+            try:
+                listings = self.session.query(ScrapedJobListing).filter(
+                    ScrapedJobListing.source == "my_careers_future",
+                    ScrapedJobListing.salary_min.isnot(None),
+                    ScrapedJobListing.salary_max.isnot(None),
+                ).filter(
+                    func.similarity(
+                        ScrapedJobListing.job_title,
+                        request.job_title
+                    ) > self.SIMILARITY_THRESHOLD_RELAXED
+                ).limit(self.QUERY_LIMIT_EXTERNAL).all()
+                match_quality = 0.75  # Medium-high quality: fuzzy trigram match
+            except Exception as e:
+                logger.warning(f"Trigram similarity not available, using basic LIKE match: {e}")
+                # Strategy 3: Basic LIKE match when trigram extension unavailable (lower quality)
+                listings = self.session.query(ScrapedJobListing).filter(
+                    ScrapedJobListing.source == "my_careers_future",
+                    ScrapedJobListing.salary_min.isnot(None),
+                    ScrapedJobListing.salary_max.isnot(None),
+                    ScrapedJobListing.job_title.ilike(f"%{request.job_title}%")
+                ).limit(self.QUERY_LIMIT_EXTERNAL).all()
+                match_quality = 0.6  # Lower quality: basic string match
 
             if not listings:
                 logger.debug("No MCF listings found matching criteria")
@@ -552,28 +711,16 @@ class PricingCalculationServiceV3:
 
             # Extract salary midpoints and normalize to ANNUAL
             # MCF API provides salary_type (Monthly, Annual, Hourly, etc.)
-            data_points = []
-            for listing in listings:
-                if listing.salary_min and listing.salary_max:
-                    midpoint = (Decimal(listing.salary_min) + Decimal(listing.salary_max)) / 2
-
-                    # Check salary_type to determine conversion factor
-                    # MCF stores salary_type like "Monthly", "Annual", "Hourly"
-                    salary_type = (listing.salary_type or "").lower()
-
-                    if "month" in salary_type:
-                        annual_salary = midpoint * 12  # Monthly to annual
-                    elif "hour" in salary_type:
-                        annual_salary = midpoint * 40 * 52  # Hourly to annual (40hr/wk * 52wk)
-                    elif "annual" in salary_type or "year" in salary_type:
-                        annual_salary = midpoint  # Already annual, no conversion
-                    else:
-                        # Default: assume monthly for MCF (Singapore standard)
-                        # Log warning for transparency
-                        logger.debug(f"Unknown salary_type '{listing.salary_type}' for MCF listing, assuming monthly")
-                        annual_salary = midpoint * 12
-
-                    data_points.append(annual_salary)
+            data_points = [
+                annual_salary
+                for annual_salary in (
+                    annual_salary_midpoint(
+                        "my_careers_future", listing.salary_min, listing.salary_max, listing.salary_type
+                    )
+                    for listing in listings
+                )
+                if annual_salary is not None
+            ]
 
             if not data_points:
                 return None
@@ -625,67 +772,23 @@ class PricingCalculationServiceV3:
         logger.debug("Querying Glassdoor data...")
 
         try:
-            # If we have a Mercer match, use job family to find related roles
-            related_titles = []
-            if mercer_match and mercer_match.get("job_code"):
-                # Get the matched Mercer job to extract family
-                mercer_job = self.session.query(MercerJobLibrary).filter(
-                    MercerJobLibrary.job_code == mercer_match["job_code"]
-                ).first()
-
-                if mercer_job and mercer_job.family:
-                    logger.debug(f"Using Mercer family '{mercer_job.family}' for Glassdoor filtering")
-
-                    # Get all job titles from the same Mercer family
-                    family_jobs = self.session.query(MercerJobLibrary).filter(
-                        MercerJobLibrary.family == mercer_job.family
-                    ).all()
-
-                    # Extract keywords from related job titles
-                    for job in family_jobs:
-                        title = job.job_title.split(" - ")[0].strip()
-                        related_titles.append(title)
-
-                    logger.debug(f"Found {len(related_titles)} related job titles in {mercer_job.family} family")
-
-            # Query scraped job listings from Glassdoor
-            listings = []
-            match_quality = 0.5  # Default
-
-            # Strategy 1: Family-based matching (highest quality)
-            if related_titles:
-                title_conditions = [
-                    func.similarity(ScrapedJobListing.job_title, title) > self.SIMILARITY_THRESHOLD_RELAXED
-                    for title in related_titles[:self.QUERY_LIMIT_MERCER_FAMILY]
-                ]
-
-                try:
-                    listings = self.session.query(ScrapedJobListing).filter(
-                        ScrapedJobListing.source == "glassdoor",
-                        ScrapedJobListing.salary_min.isnot(None),
-                        ScrapedJobListing.salary_max.isnot(None),
-                        or_(*title_conditions)
-                    ).limit(self.QUERY_LIMIT_EXTERNAL).all()
-
-                    logger.info(f"Family-based matching found {len(listings)} Glassdoor listings")
-                    match_quality = 0.85  # High quality: matched by Mercer job family
-                except Exception as e:
-                    logger.warning(f"Family-based Glassdoor matching failed: {e}")
-                    listings = []
+            # Strategy 1: Precomputed Mercer family aggregate (highest quality)
+            family_data = self._get_family_aggregate_data("glassdoor", request, mercer_match, 0.85)
+            if family_data:
+                return family_data
 
             # Strategy 2: Fuzzy match on job title (fallback)
-            if not listings:
-                listings = self.session.query(ScrapedJobListing).filter(
-                    ScrapedJobListing.source == "glassdoor",
-                    ScrapedJobListing.salary_min.isnot(None),
-                    ScrapedJobListing.salary_max.isnot(None),
-                ).filter(
-                    func.similarity(
-                        ScrapedJobListing.job_title,
-                        request.job_title
-                    ) > self.SIMILARITY_THRESHOLD_RELAXED
-                ).limit(self.QUERY_LIMIT_EXTERNAL).all()
-                match_quality = 0.75  # Medium quality: fuzzy title match
+            listings = self.session.query(ScrapedJobListing).filter(
+                ScrapedJobListing.source == "glassdoor",
+                ScrapedJobListing.salary_min.isnot(None),
+                ScrapedJobListing.salary_max.isnot(None),
+            ).filter(
+                func.similarity(
+                    ScrapedJobListing.job_title,
+                    request.job_title
+                ) > self.SIMILARITY_THRESHOLD_RELAXED
+            ).limit(self.QUERY_LIMIT_EXTERNAL).all()
+            match_quality = 0.75  # Medium quality: fuzzy title match
 
             if not listings:
                 return None
@@ -693,23 +796,14 @@ class PricingCalculationServiceV3:
             # Extract salary midpoints and normalize to ANNUAL
             # Glassdoor typically displays annual salaries
             # salary_type field is "estimated" (data quality indicator), not period
-            data_points = []
-            for listing in listings:
-                if listing.salary_min and listing.salary_max:
-                    midpoint = (Decimal(listing.salary_min) + Decimal(listing.salary_max)) / 2
-
-                    # Glassdoor Singapore shows annual salaries (typically $50K-$300K range)
-                    # If salary looks like monthly (< $15K), convert to annual
-                    # This heuristic catches edge cases where data might be monthly
-                    if midpoint < 15000:
-                        # Likely monthly - convert to annual
-                        logger.debug(f"Glassdoor salary {midpoint} appears monthly, converting to annual")
-                        annual_salary = midpoint * 12
-                    else:
-                        # Already annual
-                        annual_salary = midpoint
-
-                    data_points.append(annual_salary)
+            data_points = [
+                annual_salary
+                for annual_salary in (
+                    annual_salary_midpoint("glassdoor", listing.salary_min, listing.salary_max)
+                    for listing in listings
+                )
+                if annual_salary is not None
+            ]
 
             if not data_points:
                 return None
@@ -739,6 +833,101 @@ class PricingCalculationServiceV3:
             logger.error(f"Error querying Glassdoor data: {e}")
             return None
 
+    def _get_family_aggregate_data(
+        self,
+        source_name: str,
+        request: JobPricingRequest,
+        mercer_match: Optional[Dict],
+        match_quality: float
+    ) -> Optional[DataSourceContribution]:
+        """
+        Get precomputed scraped salary distribution for the Mercer job family.
+
+        Aggregates are maintained by MarketAggregationService after each
+        scrape. The family's P10-P90 are passed through, and the distribution
+        enters the weighted aggregation as a quantile sketch of
+        min(sample_size, QUERY_LIMIT_EXTERNAL) points, the same cap a
+        listing scan had.
+
+        Args:
+            source_name: Scraped data source (my_careers_future, glassdoor)
+            request: Job pricing request (location selects the aggregate row)
+            mercer_match: Optional Mercer match with job_code and family info
+            match_quality: Match quality for family-based data
+
+        Returns:
+            Data contribution or None if there is no aggregate for the family
+        """
+        if not mercer_match or not mercer_match.get("job_code"):
+            return None
+
+        family = mercer_match.get("family")
+        if not family:
+            family = self._shared_lookup(
+                ("mercer_family", mercer_match["job_code"]),
+                lambda: self.session.query(MercerJobLibrary.family).filter(
+                    MercerJobLibrary.job_code == mercer_match["job_code"]
+                ).scalar()
+            )
+        if not family:
+            return None
+
+        return self._shared_lookup(
+            ("family_aggregate", source_name, family, normalize_location(request.location_text)),
+            lambda: self._build_family_aggregate_contribution(
+                source_name, family, request.location_text, match_quality
+            )
+        )
+
+    def _build_family_aggregate_contribution(
+        self,
+        source_name: str,
+        family: str,
+        location: Optional[str],
+        match_quality: float
+    ) -> Optional[DataSourceContribution]:
+        """Contribution for the family aggregate of source_name at location."""
+        aggregate = MarketAggregationService(self.session).get_aggregate(
+            family, source_name, location
+        )
+        if not aggregate or not aggregate.sample_size:
+            return None
+
+        logger.info(
+            f"Using {source_name} aggregate for family '{family}' "
+            f"(location={aggregate.location}, n={aggregate.sample_size})"
+        )
+
+        percentiles = {
+            "p10": aggregate.p10,
+            "p25": aggregate.p25,
+            "p50": aggregate.p50,
+            "p75": aggregate.p75,
+            "p90": aggregate.p90,
+        }
+        sketch = quantile_sketch(
+            percentiles, min(aggregate.sample_size, self.QUERY_LIMIT_EXTERNAL)
+        )
+        data_points = [Decimal(str(round(float(point), 2))) for point in sketch]
+
+        recency_days = self.DEFAULT_RECENCY_DAYS
+        if aggregate.mean_scraped_at:
+            now = datetime.now(timezone.utc)
+            if aggregate.mean_scraped_at.tzinfo:
+                recency_days = (now - aggregate.mean_scraped_at).days
+            else:
+                recency_days = (now.replace(tzinfo=None) - aggregate.mean_scraped_at).days
+
+        return DataSourceContribution(
+            source_name=source_name,
+            weight=self.WEIGHTS[source_name],
+            sample_size=aggregate.sample_size,
+            data_points=data_points,
+            **percentiles,
+            recency_days=recency_days,
+            match_quality=match_quality,
+        )
+
     def _get_internal_hris_data(
         self,
         request: JobPricingRequest
@@ -755,7 +944,7 @@ class PricingCalculationServiceV3:
         logger.debug("Querying internal HRIS data...")
 
         try:
-            employees = self.session.query(InternalEmployee).filter(
+            salaries = self.session.query(InternalEmployee.current_salary).filter(
                 InternalEmployee.employment_status == "Active",
                 InternalEmployee.current_salary.isnot(None),
             ).filter(
@@ -765,10 +954,10 @@ class PricingCalculationServiceV3:
                 ) > self.SIMILARITY_THRESHOLD_STRICT
             ).limit(self.QUERY_LIMIT_INTERNAL).all()
 
-            if not employees:
+            if not salaries:
                 return None
 
-            data_points = [Decimal(emp.current_salary) for emp in employees]
+            data_points = [Decimal(salary) for salary, in salaries]
 
             return DataSourceContribution(
                 source_name="internal_hris",
@@ -802,7 +991,10 @@ class PricingCalculationServiceV3:
             # Query recent applicants (last 2 years)
             cutoff_date = datetime.now() - timedelta(days=730)
 
-            applicants = self.session.query(Applicant).filter(
+            applicants = self.session.query(
+                Applicant.expected_salary,
+                Applicant.application_date,
+            ).filter(
                 Applicant.application_date >= cutoff_date,
                 Applicant.expected_salary.isnot(None),
             ).filter(
@@ -847,22 +1039,22 @@ class PricingCalculationServiceV3:
     def _apply_weights_and_aggregate(
         self,
         contributions: List[DataSourceContribution]
-    ) -> List[Decimal]:
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """
         Apply weights to each source and aggregate all data points.
 
-        Weighted sampling approach: each data point is repeated
-        proportionally to its source weight AND match quality.
-        This ensures high-quality matches (e.g., exact Mercer job matches)
-        have more influence than low-quality matches (e.g., generic MCF listings).
+        Each data point is weighted by its source weight AND match quality,
+        so high-quality matches (e.g., exact Mercer job matches) have more
+        influence than low-quality matches (e.g., generic MCF listings).
 
         Args:
             contributions: List of data source contributions
 
         Returns:
-            Aggregated weighted data points
+            Parallel arrays of data point values and weights
         """
-        weighted_points = []
+        values = []
+        weights = []
 
         for contrib in contributions:
             # Skip sources with match quality below threshold
@@ -874,80 +1066,51 @@ class PricingCalculationServiceV3:
                 )
                 continue
 
-            # Calculate repeat factor based on weight AND match quality
-            # E.g., Mercer (40% weight, 85% match) = 0.4 * 0.85 * 100 = 34 repeats
-            #       MCF (25% weight, 60% match) = 0.25 * 0.6 * 100 = 15 repeats
-            # This ensures high-quality matches have more influence
+            # Effective weight per data point
+            # E.g., Mercer (40% weight, 85% match) = 0.4 * 0.85 = 0.34
+            #       MCF (25% weight, 75% match) = 0.25 * 0.75 = 0.1875
             effective_weight = contrib.weight * contrib.match_quality
-            repeat_factor = max(1, int(effective_weight * 100))  # At least 1 repeat
 
             logger.debug(
                 f"Source {contrib.source_name}: weight={contrib.weight:.2f}, "
                 f"quality={contrib.match_quality:.2f}, effective={effective_weight:.3f}, "
-                f"repeats={repeat_factor}, points={len(contrib.data_points)}"
+                f"points={len(contrib.data_points)}"
             )
 
-            # Add each data point N times based on effective weight
-            for point in contrib.data_points:
-                for _ in range(repeat_factor):
-                    weighted_points.append(point)
+            values.extend(float(point) for point in contrib.data_points)
+            weights.extend([effective_weight] * len(contrib.data_points))
 
-        logger.info(f"Aggregated {len(weighted_points)} weighted data points")
+        logger.info(f"Aggregated {len(values)} weighted data points")
 
-        return weighted_points
+        return np.asarray(values, dtype=np.float64), np.asarray(weights, dtype=np.float64)
 
     def _calculate_percentiles(
         self,
-        data_points: List[Decimal]
+        data_points: Sequence,
+        weights: Optional[Sequence[float]] = None
     ) -> Dict[str, Decimal]:
         """
-        Calculate statistical percentiles from data points.
+        Calculate statistical percentiles from (weighted) data points.
 
         Args:
-            data_points: List of salary data points
+            data_points: Salary data points
+            weights: Weight per data point (None for equal weights)
 
         Returns:
             Dictionary with P10, P25, P50, P75, P90
         """
-        if not data_points:
+        if len(data_points) == 0:
             raise ValueError("No data points available for percentile calculation")
 
-        sorted_data = sorted(data_points)
-        n = len(sorted_data)
-
-        # Handle edge case: single data point
-        # statistics.quantiles requires at least 2 data points
-        if n == 1:
-            single_value = sorted_data[0]
-            logger.warning(f"Only 1 data point available ({single_value}), using same value for all percentiles")
-            return {
-                "p10": single_value,
-                "p25": single_value,
-                "p50": single_value,
-                "p75": single_value,
-                "p90": single_value,
-            }
-
-        # Handle edge case: 2-3 data points (quantiles needs at least n+1 for n-tile)
-        if n < 4:
-            logger.warning(f"Only {n} data points available, using linear interpolation")
-            # Use median for p50, min for lower, max for upper
-            median_val = Decimal(str(statistics.median(sorted_data)))
-            return {
-                "p10": sorted_data[0],
-                "p25": sorted_data[0],
-                "p50": median_val,
-                "p75": sorted_data[-1],
-                "p90": sorted_data[-1],
-            }
+        if len(data_points) < 4:
+            logger.warning(
+                f"Only {len(data_points)} data points available, "
+                "outer percentiles use the smallest/largest value"
+            )
 
-        # Normal case: enough data points for proper percentile calculation
         percentiles = {
-            "p10": Decimal(str(statistics.quantiles(sorted_data, n=10)[0])),
-            "p25": Decimal(str(statistics.quantiles(sorted_data, n=4)[0])),
-            "p50": Decimal(str(statistics.median(sorted_data))),
-            "p75": Decimal(str(statistics.quantiles(sorted_data, n=4)[2])),
-            "p90": Decimal(str(statistics.quantiles(sorted_data, n=10)[8])),
+            name: Decimal(str(value))
+            for name, value in weighted_percentiles(data_points, weights).items()
         }
 
         logger.debug(f"Calculated percentiles: {percentiles}")
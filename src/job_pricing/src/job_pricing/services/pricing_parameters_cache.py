@@ -1,16 +1,30 @@
 """
 Pricing Parameters Cache Service
 
-Redis-backed caching for pricing parameters to avoid repeated database queries.
-Implements cache warming, invalidation, and automatic expiration.
+In-process cache of database-driven pricing parameters (salary bands,
+industry adjustments, company size factors, skill premiums).
+
+- All active parameters are loaded into one immutable snapshot; lookups are
+  plain dict reads on the current snapshot, without locks or Redis calls
+- Snapshots carry the version stamp stored in Redis; invalidate_*() bumps the
+  version and publishes it, so every API and Celery worker process drops its
+  snapshot and reloads on the next lookup
+- The version is also re-read every VERSION_CHECK_SECONDS, in case a pub/sub
+  message is missed, and snapshots are reloaded when the date changes
+  (parameters have effective dates)
+
+Writers must call the matching invalidate_*() after committing changes.
 """
 
-import json
 import logging
-from datetime import date, datetime
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
 from decimal import Decimal
-from typing import Optional, List, Dict, Any
-from functools import wraps
+from types import MappingProxyType
+from typing import Optional, List, Dict, Any, Mapping, Tuple
 
 import redis
 from sqlalchemy.orm import Session
@@ -27,34 +41,113 @@ logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
+def _salary_band_dict(band) -> Dict[str, Any]:
+    return {
+        'experience_level': band.experience_level,
+        'min_years': band.min_years,
+        'max_years': band.max_years,
+        'salary_min_sgd': float(band.salary_min_sgd),
+        'salary_max_sgd': float(band.salary_max_sgd),
+        'currency': band.currency,
+    }
+
+
+@dataclass(frozen=True)
+class PricingParametersSnapshot:
+    """
+    Immutable view of all pricing parameters active on one date.
+
+    Attributes:
+        version: Redis version stamp the snapshot was loaded at (None if
+            Redis was unavailable)
+        as_of_date: Date the active parameters were selected for
+        salary_bands: Active salary bands, ordered by min_years
+        salary_bands_by_level: experience_level -> salary band
+        industry_adjustments: industry_name -> adjustment factor
+        company_size_factors: size_category -> adjustment factor
+        skill_premiums: skill_name -> premium percentage
+    """
+    version: Optional[str]
+    as_of_date: date
+    salary_bands: Tuple[Mapping[str, Any], ...]
+    salary_bands_by_level: Mapping[str, Mapping[str, Any]]
+    industry_adjustments: Mapping[str, Decimal]
+    company_size_factors: Mapping[str, Decimal]
+    skill_premiums: Mapping[str, Decimal]
+
+    @classmethod
+    def load(
+        cls,
+        session: Session,
+        version: Optional[str],
+        as_of_date: Optional[date] = None
+    ) -> "PricingParametersSnapshot":
+        """
+        Load all active pricing parameters (one query per table).
+
+        Args:
+            session: Database session
+            version: Version stamp to record
+            as_of_date: Date to check active status (defaults to today)
+
+        Returns:
+            New snapshot
+        """
+        as_of_date = as_of_date or date.today()
+
+        bands = tuple(
+            MappingProxyType(_salary_band_dict(band))
+            for band in SalaryBandRepository(session).get_active_bands(as_of_date)
+        )
+        bands_by_level = {}
+        for band in bands:
+            bands_by_level.setdefault(band['experience_level'], band)
+
+        industries = {}
+        for industry in IndustryAdjustmentRepository(session).get_active_adjustments(as_of_date):
+            industries.setdefault(industry.industry_name, industry.adjustment_factor)
+
+        sizes = {}
+        for size in CompanySizeFactorRepository(session).get_active_factors(as_of_date):
+            sizes.setdefault(size.size_category, size.adjustment_factor)
+
+        premiums = {}
+        for skill in SkillPremiumRepository(session).get_active_premiums(as_of_date):
+            premiums.setdefault(skill.skill_name, skill.premium_percentage)
+
+        return cls(
+            version=version,
+            as_of_date=as_of_date,
+            salary_bands=bands,
+            salary_bands_by_level=MappingProxyType(bands_by_level),
+            industry_adjustments=MappingProxyType(industries),
+            company_size_factors=MappingProxyType(sizes),
+            skill_premiums=MappingProxyType(premiums),
+        )
+
+
 class PricingParametersCache:
     """
-    Redis cache for pricing parameters.
+    Snapshot cache for pricing parameters.
 
-    Caches database-driven pricing parameters to reduce database load.
-    Implements automatic cache warming on startup and invalidation on updates.
+    Use get_pricing_cache() for the process-wide instance.
     """
 
-    # Cache key prefixes
+    # Redis keys
     KEY_PREFIX = "pricing_params"
-    KEY_SALARY_BAND = f"{KEY_PREFIX}:salary_band"
-    KEY_INDUSTRY_ADJ = f"{KEY_PREFIX}:industry_adj"
-    KEY_COMPANY_SIZE = f"{KEY_PREFIX}:company_size"
-    KEY_SKILL_PREMIUM = f"{KEY_PREFIX}:skill_premium"
-    KEY_ALL_SALARY_BANDS = f"{KEY_PREFIX}:all_salary_bands"
-    KEY_ALL_INDUSTRY_ADJ = f"{KEY_PREFIX}:all_industry_adj"
-    KEY_ALL_COMPANY_SIZE = f"{KEY_PREFIX}:all_company_size"
-    KEY_ALL_SKILL_PREMIUMS = f"{KEY_PREFIX}:all_skill_premiums"
-
-    # Cache TTL (Time To Live) in seconds
-    CACHE_TTL = settings.CACHE_TTL_MEDIUM  # Default: 1800 seconds (30 minutes)
-
-    def __init__(self, redis_client: Optional[redis.Redis] = None):
+    KEY_VERSION = f"{KEY_PREFIX}:version"
+    INVALIDATION_CHANNEL = f"{KEY_PREFIX}:invalidate"
+
+    # Fallback for missed invalidation messages
+    VERSION_CHECK_SECONDS = 60.0
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None, listen: bool = True):
         """
         Initialize pricing parameters cache.
 
         Args:
             redis_client: Redis client instance (creates new if not provided)
+            listen: Subscribe to invalidation messages (set False in tests)
         """
         if redis_client:
             self.redis = redis_client
@@ -66,6 +159,14 @@ class PricingParametersCache:
                 encoding="utf-8"
             )
 
+        self._listen = listen
+        self._snapshot: Optional[PricingParametersSnapshot] = None
+        self._latest_version: Optional[str] = None
+        self._next_version_check = 0.0
+        self._lock = threading.Lock()
+        self._listener = None
+        self._listener_pid: Optional[int] = None
+
     # -------------------------------------------------------------------------
     # Salary Bands
     # -------------------------------------------------------------------------
@@ -77,76 +178,30 @@ class PricingParametersCache:
         as_of_date: Optional[date] = None
     ) -> Optional[Dict[str, Any]]:
         """
-        Get salary band from cache or database.
+        Get salary band from the snapshot.
 
         Args:
             experience_level: Experience level
-            session: Database session (for cache miss)
+            session: Database session (for reloading the snapshot)
             as_of_date: Date to check active status
 
         Returns:
             Salary band dictionary or None
         """
-        cache_key = f"{self.KEY_SALARY_BAND}:{experience_level}"
-
-        # Try cache first
-        cached = self._get_from_cache(cache_key)
-        if cached:
-            return cached
-
-        # Cache miss - query database
-        repo = SalaryBandRepository(session)
-        band = repo.get_by_experience_level(experience_level, as_of_date)
-
-        if band:
-            band_dict = {
-                'experience_level': band.experience_level,
-                'min_years': band.min_years,
-                'max_years': band.max_years,
-                'salary_min_sgd': float(band.salary_min_sgd),
-                'salary_max_sgd': float(band.salary_max_sgd),
-                'currency': band.currency,
-            }
-            self._set_in_cache(cache_key, band_dict, self.CACHE_TTL)
-            return band_dict
-
-        return None
+        band = self.get_snapshot(session, as_of_date).salary_bands_by_level.get(experience_level)
+        return dict(band) if band else None
 
     def get_all_salary_bands(self, session: Session) -> List[Dict[str, Any]]:
         """
-        Get all active salary bands from cache or database.
+        Get all active salary bands from the snapshot.
 
         Args:
-            session: Database session (for cache miss)
+            session: Database session (for reloading the snapshot)
 
         Returns:
             List of salary band dictionaries
         """
-        cache_key = self.KEY_ALL_SALARY_BANDS
-
-        # Try cache first
-        cached = self._get_from_cache(cache_key)
-        if cached:
-            return cached
-
-        # Cache miss - query database
-        repo = SalaryBandRepository(session)
-        bands = repo.get_active_bands()
-
-        bands_list = [
-            {
-                'experience_level': b.experience_level,
-                'min_years': b.min_years,
-                'max_years': b.max_years,
-                'salary_min_sgd': float(b.salary_min_sgd),
-                'salary_max_sgd': float(b.salary_max_sgd),
-                'currency': b.currency,
-            }
-            for b in bands
-        ]
-
-        self._set_in_cache(cache_key, bands_list, self.CACHE_TTL)
-        return bands_list
+        return [dict(band) for band in self.get_snapshot(session).salary_bands]
 
     # -------------------------------------------------------------------------
     # Industry Adjustments
@@ -159,28 +214,22 @@ class PricingParametersCache:
         as_of_date: Optional[date] = None
     ) -> Decimal:
         """
-        Get industry adjustment factor from cache or database.
+        Get industry adjustment factor from the snapshot.
+
+        Falls back to the 'default' industry, then to 1.0.
 
         Args:
             industry_name: Industry name
-            session: Database session (for cache miss)
+            session: Database session (for reloading the snapshot)
             as_of_date: Date to check active status
 
         Returns:
             Adjustment factor (Decimal)
         """
-        cache_key = f"{self.KEY_INDUSTRY_ADJ}:{industry_name}"
-
-        # Try cache first
-        cached = self._get_from_cache(cache_key)
-        if cached:
-            return Decimal(str(cached))
-
-        # Cache miss - query database
-        repo = IndustryAdjustmentRepository(session)
-        factor = repo.get_adjustment_factor(industry_name, as_of_date)
-
-        self._set_in_cache(cache_key, float(factor), self.CACHE_TTL)
+        factors = self.get_snapshot(session, as_of_date).industry_adjustments
+        factor = factors.get(industry_name or 'default')
+        if factor is None:
+            factor = factors.get('default', Decimal('1.0'))
         return factor
 
     # -------------------------------------------------------------------------
@@ -194,28 +243,22 @@ class PricingParametersCache:
         as_of_date: Optional[date] = None
     ) -> Decimal:
         """
-        Get company size adjustment factor from cache or database.
+        Get company size adjustment factor from the snapshot.
+
+        Falls back to the 'default' size category, then to 1.0.
 
         Args:
             size_category: Size category
-            session: Database session (for cache miss)
+            session: Database session (for reloading the snapshot)
             as_of_date: Date to check active status
 
         Returns:
             Adjustment factor (Decimal)
         """
-        cache_key = f"{self.KEY_COMPANY_SIZE}:{size_category}"
-
-        # Try cache first
-        cached = self._get_from_cache(cache_key)
-        if cached:
-            return Decimal(str(cached))
-
-        # Cache miss - query database
-        repo = CompanySizeFactorRepository(session)
-        factor = repo.get_adjustment_factor(size_category, as_of_date)
-
-        self._set_in_cache(cache_key, float(factor), self.CACHE_TTL)
+        factors = self.get_snapshot(session, as_of_date).company_size_factors
+        factor = factors.get(size_category or 'default')
+        if factor is None:
+            factor = factors.get('default', Decimal('1.0'))
         return factor
 
     # -------------------------------------------------------------------------
@@ -229,47 +272,22 @@ class PricingParametersCache:
         as_of_date: Optional[date] = None
     ) -> Dict[str, Decimal]:
         """
-        Get skill premiums from cache or database.
+        Get skill premiums from the snapshot.
 
         Args:
             skill_names: List of skill names
-            session: Database session (for cache miss)
+            session: Database session (for reloading the snapshot)
             as_of_date: Date to check active status
 
         Returns:
             Dictionary mapping skill_name -> premium_percentage
         """
-        # Normalize skill names to lowercase
-        skill_names_lower = [s.lower() for s in skill_names]
-
-        # Try to get each skill from cache
-        premiums = {}
-        missing_skills = []
-
-        for skill in skill_names_lower:
-            cache_key = f"{self.KEY_SKILL_PREMIUM}:{skill}"
-            cached = self._get_from_cache(cache_key)
-
-            if cached is not None:
-                premiums[skill] = Decimal(str(cached))
-            else:
-                missing_skills.append(skill)
-
-        # If all skills found in cache, return
-        if not missing_skills:
-            return premiums
-
-        # Cache miss - query database for missing skills
-        repo = SkillPremiumRepository(session)
-        db_premiums = repo.get_premiums_for_skills(missing_skills, as_of_date)
-
-        # Cache the database results
-        for skill, premium in db_premiums.items():
-            cache_key = f"{self.KEY_SKILL_PREMIUM}:{skill}"
-            self._set_in_cache(cache_key, float(premium), self.CACHE_TTL)
-            premiums[skill] = premium
-
-        return premiums
+        premiums = self.get_snapshot(session, as_of_date).skill_premiums
+        return {
+            skill: premiums[skill]
+            for skill in (s.lower() for s in skill_names)
+            if skill in premiums
+        }
 
     def calculate_total_skill_premium(
         self,
@@ -283,7 +301,7 @@ class PricingParametersCache:
 
         Args:
             skill_names: List of skill names
-            session: Database session (for cache miss)
+            session: Database session (for reloading the snapshot)
             max_premium: Maximum total premium (default 50%)
             as_of_date: Date to check active status
 
@@ -294,139 +312,170 @@ class PricingParametersCache:
         total = sum(premiums.values())
         return min(total, max_premium)
 
+    # -------------------------------------------------------------------------
+    # Snapshot
+    # -------------------------------------------------------------------------
+
+    def get_snapshot(
+        self,
+        session: Session,
+        as_of_date: Optional[date] = None
+    ) -> PricingParametersSnapshot:
+        """
+        Current snapshot, reloading it if invalidated or out of date.
+
+        Args:
+            session: Database session (for reloading)
+            as_of_date: Date to check active status; a date other than today
+                is loaded from the database and not kept
+
+        Returns:
+            Snapshot of the active pricing parameters
+        """
+        if as_of_date is not None and as_of_date != date.today():
+            return PricingParametersSnapshot.load(session, version=None, as_of_date=as_of_date)
+
+        snapshot = self._snapshot
+        if (
+            snapshot is not None
+            and snapshot.version == self._latest_version
+            and snapshot.as_of_date == date.today()
+            and time.monotonic() < self._next_version_check
+        ):
+            return snapshot
+
+        return self._refresh(session)
+
+    def _refresh(self, session: Session) -> PricingParametersSnapshot:
+        """Check the version stamp and reload the snapshot if needed."""
+        with self._lock:
+            self._ensure_listener()
+
+            if time.monotonic() >= self._next_version_check:
+                self._latest_version = self._read_version()
+                self._next_version_check = time.monotonic() + self.VERSION_CHECK_SECONDS
+
+            snapshot = self._snapshot
+            if (
+                snapshot is None
+                or self._latest_version is None
+                or snapshot.version != self._latest_version
+                or snapshot.as_of_date != date.today()
+            ):
+                snapshot = PricingParametersSnapshot.load(session, version=self._latest_version)
+                self._snapshot = snapshot
+                logger.info(f"Loaded pricing parameters snapshot (version {snapshot.version})")
+
+            return snapshot
+
     # -------------------------------------------------------------------------
     # Cache Management
     # -------------------------------------------------------------------------
 
     def invalidate_all(self):
-        """Invalidate all pricing parameter caches."""
-        pattern = f"{self.KEY_PREFIX}:*"
-        keys = self.redis.keys(pattern)
-
-        if keys:
-            self.redis.delete(*keys)
-            logger.info(f"Invalidated {len(keys)} pricing parameter cache keys")
-        else:
-            logger.info("No pricing parameter cache keys to invalidate")
+        """Invalidate the pricing parameters snapshot in all processes."""
+        self._publish_new_version("all")
 
     def invalidate_salary_bands(self):
-        """Invalidate salary band caches."""
-        pattern = f"{self.KEY_SALARY_BAND}:*"
-        keys = self.redis.keys(pattern)
-        keys.append(self.KEY_ALL_SALARY_BANDS)
-
-        if keys:
-            self.redis.delete(*keys)
-            logger.info(f"Invalidated {len(keys)} salary band cache keys")
+        """Invalidate after salary band changes."""
+        self._publish_new_version("salary_bands")
 
     def invalidate_industry_adjustments(self):
-        """Invalidate industry adjustment caches."""
-        pattern = f"{self.KEY_INDUSTRY_ADJ}:*"
-        keys = self.redis.keys(pattern)
-        keys.append(self.KEY_ALL_INDUSTRY_ADJ)
-
-        if keys:
-            self.redis.delete(*keys)
-            logger.info(f"Invalidated {len(keys)} industry adjustment cache keys")
+        """Invalidate after industry adjustment changes."""
+        self._publish_new_version("industry_adjustments")
 
     def invalidate_company_size_factors(self):
-        """Invalidate company size factor caches."""
-        pattern = f"{self.KEY_COMPANY_SIZE}:*"
-        keys = self.redis.keys(pattern)
-        keys.append(self.KEY_ALL_COMPANY_SIZE)
-
-        if keys:
-            self.redis.delete(*keys)
-            logger.info(f"Invalidated {len(keys)} company size factor cache keys")
+        """Invalidate after company size factor changes."""
+        self._publish_new_version("company_size_factors")
 
     def invalidate_skill_premiums(self):
-        """Invalidate skill premium caches."""
-        pattern = f"{self.KEY_SKILL_PREMIUM}:*"
-        keys = self.redis.keys(pattern)
-        keys.append(self.KEY_ALL_SKILL_PREMIUMS)
-
-        if keys:
-            self.redis.delete(*keys)
-            logger.info(f"Invalidated {len(keys)} skill premium cache keys")
+        """Invalidate after skill premium changes."""
+        self._publish_new_version("skill_premiums")
 
     def warm_cache(self, session: Session):
         """
-        Warm cache by loading all active pricing parameters.
+        Load the snapshot ahead of the first request.
 
         Args:
             session: Database session
         """
         logger.info("Warming pricing parameters cache...")
-
-        # Warm salary bands
-        self.get_all_salary_bands(session)
-
-        # Warm industry adjustments
-        repo_industry = IndustryAdjustmentRepository(session)
-        industries = repo_industry.get_active_adjustments()
-        for industry in industries:
-            cache_key = f"{self.KEY_INDUSTRY_ADJ}:{industry.industry_name}"
-            self._set_in_cache(cache_key, float(industry.adjustment_factor), self.CACHE_TTL)
-
-        # Warm company size factors
-        repo_size = CompanySizeFactorRepository(session)
-        sizes = repo_size.get_active_factors()
-        for size in sizes:
-            cache_key = f"{self.KEY_COMPANY_SIZE}:{size.size_category}"
-            self._set_in_cache(cache_key, float(size.adjustment_factor), self.CACHE_TTL)
-
-        # Warm skill premiums (top 100 most common)
-        repo_skills = SkillPremiumRepository(session)
-        skills = repo_skills.get_active_premiums()[:100]  # Limit to top 100
-        for skill in skills:
-            cache_key = f"{self.KEY_SKILL_PREMIUM}:{skill.skill_name}"
-            self._set_in_cache(cache_key, float(skill.premium_percentage), self.CACHE_TTL)
-
+        self._next_version_check = 0.0
+        self._refresh(session)
         logger.info("Cache warming complete")
 
     # -------------------------------------------------------------------------
     # Private Helper Methods
     # -------------------------------------------------------------------------
 
-    def _get_from_cache(self, key: str) -> Any:
+    def _publish_new_version(self, reason: str):
         """
-        Get value from Redis cache.
+        Bump the version stamp and notify all processes.
 
-        Args:
-            key: Cache key
+        The local snapshot is dropped even if Redis is unavailable.
+        """
+        with self._lock:
+            self._snapshot = None
+
+        try:
+            version = str(self.redis.incr(self.KEY_VERSION))
+            self.redis.publish(self.INVALIDATION_CHANNEL, version)
+            logger.info(f"Invalidated pricing parameters ({reason}): version {version}")
+        except Exception as e:
+            logger.warning(f"Pricing parameters invalidation could not be published: {e}")
+            version = None
+
+        self._latest_version = version
+
+    def _read_version(self) -> Optional[str]:
+        """
+        Current version stamp from Redis.
 
         Returns:
-            Cached value or None if not found
+            Version ("0" if never invalidated), or None if Redis is unavailable
         """
         try:
-            value = self.redis.get(key)
-            if value:
-                return json.loads(value)
-            return None
+            return self.redis.get(self.KEY_VERSION) or "0"
         except Exception as e:
-            logger.warning(f"Cache read error for key '{key}': {e}")
+            logger.warning(f"Pricing parameters version check failed: {e}")
             return None
 
-    def _set_in_cache(self, key: str, value: Any, ttl: int):
-        """
-        Set value in Redis cache.
+    def _on_invalidation(self, message: Dict[str, Any]):
+        """Pub/sub handler: record the new version so lookups reload."""
+        self._latest_version = message.get("data")
+
+    def _ensure_listener(self):
+        """Subscribe to invalidations (again after a fork, e.g. Celery prefork)."""
+        if not self._listen:
+            return
+        if self._listener is not None and self._listener_pid == os.getpid() and self._listener.is_alive():
+            return
 
-        Args:
-            key: Cache key
-            value: Value to cache
-            ttl: Time to live in seconds
-        """
         try:
-            self.redis.setex(key, ttl, json.dumps(value))
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{self.INVALIDATION_CHANNEL: self._on_invalidation})
+            self._listener = pubsub.run_in_thread(
+                sleep_time=1.0,
+                daemon=True,
+                exception_handler=self._on_listener_error
+            )
+            self._listener_pid = os.getpid()
         except Exception as e:
-            logger.warning(f"Cache write error for key '{key}': {e}")
+            logger.warning(f"Pricing parameters invalidation listener unavailable: {e}")
+            self._listener = None
+
+    def _on_listener_error(self, error: Exception, pubsub, thread):
+        """Stop a failed listener; it is restarted on the next version check."""
+        logger.warning(f"Pricing parameters invalidation listener stopped: {error}")
+        thread.stop()
+        pubsub.close()
 
     def health_check(self) -> bool:
         """
-        Check if Redis cache is healthy.
+        Check if Redis (used for invalidation) is healthy.
 
         Returns:
-            True if cache is accessible, False otherwise
+            True if Redis is accessible, False otherwise
         """
         try:
             self.redis.ping()
@@ -0,0 +1,249 @@
+"""
+Pricing Result Cache Service
+
+Cross-user cache of computed pricing results, so the same role priced by
+different users is calculated once.
+
+- Key: sha256 of the normalised pricing inputs (job title, location, job
+  description) and the data version stamp
+- Data version stamp: row count and latest timestamp of every input
+  dataset (Mercer job library and market data, scraped listings and
+  aggregates, internal HRIS, applicants) plus the pricing parameters
+  snapshot version. Loads, updates and deletions change the stamp; old
+  entries expire with their TTL
+- Values: PricingResult, Mercer match and reported skills as JSON (Decimals
+  kept exact), in Redis with the result's smart-expiry TTL; fail-open
+
+The stamp is re-read at most every VERSION_CHECK_SECONDS per process, so a
+result can be served for up to that long after its input data changed.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple
+
+import redis
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..core.config import get_settings
+from ..models import (
+    Applicant,
+    InternalEmployee,
+    MercerJobLibrary,
+    MercerMarketData,
+    ScrapedJobListing,
+    ScrapedSalaryAggregate,
+)
+from .embedding_cache import normalize_text
+from .pricing_calculation_service_v3 import DataSourceContribution, PricingResult
+from .pricing_parameters_cache import get_pricing_cache
+
+logger = logging.getLogger(__name__)
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return {"__decimal__": str(value)}
+    raise TypeError(f"Cannot serialise {type(value).__name__}")
+
+
+def _decode(obj: Dict) -> Any:
+    if "__decimal__" in obj and len(obj) == 1:
+        return Decimal(obj["__decimal__"])
+    return obj
+
+
+def dump_pricing_result(pricing_result: PricingResult) -> Dict:
+    """PricingResult as a JSON-compatible dict (Decimals tagged)."""
+    return json.loads(json.dumps(asdict(pricing_result), default=_encode))
+
+
+def load_pricing_result(data: Dict) -> PricingResult:
+    """Inverse of dump_pricing_result."""
+    data = json.loads(json.dumps(data), object_hook=_decode)
+    contributions = [DataSourceContribution(**c) for c in data.pop("source_contributions")]
+    return PricingResult(source_contributions=contributions, **data)
+
+
+class PricingResultCache:
+    """
+    Redis cache of pricing results shared by all users.
+
+    Use get_pricing_result_cache() for the process-wide instance.
+    """
+
+    KEY_PREFIX = "pricing_result"
+
+    # How often the data version stamp is recomputed
+    VERSION_CHECK_SECONDS = 60.0
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None):
+        """
+        Initialize result cache.
+
+        Args:
+            redis_client: Redis client with decode_responses=True (created
+                from settings.REDIS_URL on first use if not provided)
+        """
+        self._redis = redis_client
+        self._versions: Optional[str] = None
+        self._versions_checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def cache_key(
+        self,
+        session: Session,
+        job_title: str,
+        location: str,
+        job_description: str = ""
+    ) -> str:
+        """
+        Cache key for a set of pricing inputs at the current data versions.
+
+        Args:
+            session: Database session (for the data version stamp)
+            job_title: Job title
+            location: Location
+            job_description: Job description
+
+        Returns:
+            Redis key
+        """
+        inputs = "|".join([
+            normalize_text(job_title).lower(),
+            normalize_text(location).lower(),
+            normalize_text(job_description),
+            self.data_versions(session),
+        ])
+        return f"{self.KEY_PREFIX}:{hashlib.sha256(inputs.encode('utf-8')).hexdigest()}"
+
+    def data_versions(self, session: Session) -> str:
+        """
+        Version stamp of all pricing input datasets.
+
+        Args:
+            session: Database session
+
+        Returns:
+            Opaque stamp that changes whenever an input dataset changes
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._versions is None or now - self._versions_checked_at >= self.VERSION_CHECK_SECONDS:
+                markers = self._dataset_markers(session)
+                parameters_version = get_pricing_cache().get_snapshot(session).version
+                self._versions = json.dumps([*markers, parameters_version], default=str)
+                self._versions_checked_at = now
+            return self._versions
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Cached entry for key.
+
+        Returns:
+            {"pricing_result": PricingResult, "mercer_match", "skills",
+            "expires_at" (ISO timestamp)}, or None
+        """
+        client = self._get_redis()
+        if client is None:
+            return None
+        try:
+            value = client.get(key)
+            if not value:
+                return None
+            entry = json.loads(value)
+            entry["pricing_result"] = load_pricing_result(entry["pricing_result"])
+            return entry
+        except Exception as e:
+            logger.warning(f"Pricing result cache read failed: {e}")
+            return None
+
+    def put(
+        self,
+        key: str,
+        pricing_result: PricingResult,
+        mercer_match: Optional[Dict],
+        skills: Dict,
+        ttl_seconds: int
+    ):
+        """
+        Store a computed result.
+
+        Args:
+            key: Key from cache_key()
+            pricing_result: Computed pricing result
+            mercer_match: Mercer match the result was priced for
+            skills: Reported skills ({"skills_extracted", "top_skills"})
+            ttl_seconds: Time to live (the result's smart expiry)
+        """
+        client = self._get_redis()
+        if client is None or ttl_seconds <= 0:
+            return
+        try:
+            entry = {
+                "pricing_result": dump_pricing_result(pricing_result),
+                "mercer_match": mercer_match,
+                "skills": skills,
+                "expires_at": (datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)).isoformat(),
+            }
+            client.setex(key, ttl_seconds, json.dumps(entry, default=str))
+        except Exception as e:
+            logger.warning(f"Pricing result cache write failed: {e}")
+
+    # -------------------------------------------------------------------------
+    # Internal Helpers
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _dataset_markers(session: Session) -> Tuple:
+        """Change markers of the input tables (one round trip)."""
+        def marker(*columns):
+            return select(*columns).scalar_subquery()
+
+        return tuple(session.query(
+            marker(func.count(MercerJobLibrary.id)),
+            marker(func.max(MercerJobLibrary.updated_at)),
+            marker(func.count(MercerMarketData.id)),
+            marker(func.max(MercerMarketData.data_retrieved_at)),
+            marker(func.count(ScrapedJobListing.id)),
+            marker(func.max(ScrapedJobListing.scraped_at)),
+            marker(func.count(ScrapedSalaryAggregate.id)),
+            marker(func.max(ScrapedSalaryAggregate.last_updated)),
+            marker(func.count(InternalEmployee.id)),
+            marker(func.max(InternalEmployee.last_updated)),
+            marker(func.count(Applicant.id)),
+            marker(func.max(Applicant.last_updated)),
+        ).one())
+
+    def _get_redis(self) -> Optional[redis.Redis]:
+        if self._redis is None:
+            try:
+                self._redis = redis.from_url(get_settings().REDIS_URL, decode_responses=True)
+            except Exception as e:
+                logger.warning(f"Pricing result cache Redis unavailable: {e}")
+                return None
+        return self._redis
+
+
+# Global cache instance
+_result_cache: Optional[PricingResultCache] = None
+
+
+def get_pricing_result_cache() -> PricingResultCache:
+    """
+    Get global pricing result cache instance.
+
+    Returns:
+        PricingResultCache singleton
+    """
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = PricingResultCache()
+    return _result_cache
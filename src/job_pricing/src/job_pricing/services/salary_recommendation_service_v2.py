@@ -34,6 +34,7 @@ from job_pricing.services.pricing_calculation_service_v3 import (
     PricingResult,
     DataSourceContribution,
 )
+from job_pricing.services.pricing_result_cache import get_pricing_result_cache
 from job_pricing.services.skill_extraction_service import SkillExtractionService
 from job_pricing.services.job_matching_service import JobMatchingService
 from job_pricing.repositories.job_pricing_repository import JobPricingRepository
@@ -48,7 +49,8 @@ class SalaryRecommendationServiceV2:
     Workflow (Option 1+: Smart Caching):
     1. Generate request hash for deduplication
     2. Find or create request (reuse existing)
-    3. Check cache for non-expired result
+    3. Check cache for non-expired result, then the result shared by all
+       users for the same inputs and data versions
     4. If cache miss: Calculate fresh recommendation
     5. Save versioned result with smart expiry
     6. Cleanup old versions (keep last 5)
@@ -76,6 +78,7 @@ class SalaryRecommendationServiceV2:
         self.skill_service = SkillExtractionService()
         self.matching_service = JobMatchingService(session)
         self.repository = JobPricingRepository(session)
+        self.result_cache = get_pricing_result_cache()
 
     def _generate_request_hash(self, job_title: str, location: str, user_id: int) -> str:
         """
@@ -327,6 +330,11 @@ class SalaryRecommendationServiceV2:
                     )
                     return response
 
+                # Same inputs priced for another user at the current data versions
+                response = self._serve_shared_result(request)
+                if response:
+                    return response
+
             # Step 4: Cache MISS or force refresh - calculate fresh recommendation
             logger.info("Cache miss or force refresh - calculating fresh recommendation")
             request.status = 'processing'
@@ -354,44 +362,126 @@ class SalaryRecommendationServiceV2:
                 if mercer_match:
                     logger.info(f"Matched to Mercer code: {mercer_match.get('job_code')}")
 
-            # Calculate pricing using V3 algorithm with Mercer match for job family filtering
-            logger.debug("Calculating pricing with multi-source aggregation...")
-            pricing_result: PricingResult = self.pricing_service.calculate_pricing(request, mercer_match)
+            # Steps 5-7: Price, save versioned result and format response
+            return self._price_and_save(request, mercer_match, extracted_skills)
 
-            # Step 5: Save versioned result with smart expiry
-            job_result = self._save_result(request, pricing_result, mercer_match)
+        except Exception as e:
+            request.status = 'failed'
+            request.error_message = str(e)
+            self.session.rollback()
+            logger.error(f"Error calculating recommendation: {e}", exc_info=True)
+            raise
 
-            # Step 6: Cleanup old versions (keep last 5)
-            self._cleanup_old_versions(request, keep_last=5)
+    def _price_and_save(
+        self,
+        request: JobPricingRequest,
+        mercer_match: Optional[Dict],
+        extracted_skills: Optional[List]
+    ) -> Dict:
+        """
+        Price a request for its Mercer match, save the versioned result and
+        format the response (steps 5-7 of calculate_recommendation).
 
-            # Mark request as completed
-            request.status = 'completed'
-            request.processing_completed_at = datetime.now(timezone.utc)
-            self.session.commit()
+        Commits on success; the caller handles rollback on failure.
 
-            # Step 7: Format response with cache metadata
-            response = self._format_response(pricing_result, job_result, mercer_match, extracted_skills)
+        Args:
+            request: Request being priced
+            mercer_match: Matched Mercer job (if any)
+            extracted_skills: Extracted skills to report in the response, or
+                None if skill extraction was skipped (bulk pricing); such
+                results are not shared, as their skills would be empty
 
-            logger.info(
-                f"Fresh calculation complete: ${pricing_result.target_salary:,.0f} "
-                f"(confidence: {pricing_result.confidence_score:.0f}%, "
-                f"version: {job_result.version})"
-            )
+        Returns:
+            Formatted response dictionary with fresh calculation metadata
+        """
+        # Calculate pricing using V3 algorithm with Mercer match for job family filtering
+        logger.debug("Calculating pricing with multi-source aggregation...")
+        pricing_result: PricingResult = self.pricing_service.calculate_pricing(request, mercer_match)
+
+        # Step 5: Save versioned result with smart expiry
+        job_result = self._save_result(request, pricing_result, mercer_match)
+
+        # Step 6: Cleanup old versions (keep last 5)
+        self._cleanup_old_versions(request, keep_last=5)
+
+        # Mark request as completed
+        request.status = 'completed'
+        request.processing_completed_at = datetime.now(timezone.utc)
+        self.session.commit()
+
+        # Step 7: Format response with cache metadata
+        response = self._format_response(pricing_result, job_result, mercer_match, extracted_skills or [])
 
+        logger.info(
+            f"Fresh calculation complete: ${pricing_result.target_salary:,.0f} "
+            f"(confidence: {pricing_result.confidence_score:.0f}%, "
+            f"version: {job_result.version})"
+        )
+
+        if extracted_skills is None:
             return response
 
-        except Exception as e:
-            request.status = 'failed'
-            request.error_message = str(e)
-            self.session.rollback()
-            logger.error(f"Error calculating recommendation: {e}", exc_info=True)
-            raise
+        # Share the result with other users until it expires or the data changes
+        self.result_cache.put(
+            self._shared_cache_key(request),
+            pricing_result,
+            mercer_match,
+            {"skills_extracted": response["skills_extracted"], "top_skills": response["top_skills"]},
+            ttl_seconds=int((job_result.expires_at - datetime.now(timezone.utc)).total_seconds()),
+        )
+
+        return response
+
+    def _shared_cache_key(self, request: JobPricingRequest) -> str:
+        """Shared result cache key for a request's pricing inputs."""
+        return self.result_cache.cache_key(
+            self.session, request.job_title, request.location_text, request.job_description or ""
+        )
+
+    def _serve_shared_result(self, request: JobPricingRequest) -> Optional[Dict]:
+        """
+        Serve a request from the result shared by all users, if there is one.
+
+        The shared result is saved as a new version of this request (so the
+        per-user history is unchanged) and expires no later than the shared
+        entry. Commits on a hit.
+
+        Args:
+            request: Request to serve
+
+        Returns:
+            Formatted response dictionary, or None on a shared cache miss
+        """
+        entry = self.result_cache.get(self._shared_cache_key(request))
+        if not entry:
+            return None
+
+        pricing_result = entry["pricing_result"]
+        mercer_match = entry["mercer_match"]
+        job_result = self._save_result(
+            request, pricing_result, mercer_match,
+            expires_at=datetime.fromisoformat(entry["expires_at"])
+        )
+        job_result.cache_hit = True
+        self._cleanup_old_versions(request, keep_last=5)
+
+        request.status = 'completed'
+        request.processing_completed_at = datetime.now(timezone.utc)
+        self.session.commit()
+
+        response = self._format_response(pricing_result, job_result, mercer_match, [])
+        response.update(entry["skills"])
+        response["metadata"]["from_cache"] = True
+        response["metadata"]["shared_cache"] = True
+        logger.info(f"Shared cache HIT for request {request.id} (version {job_result.version})")
+        return response
 
     def _save_result(
         self,
         request: JobPricingRequest,
         pricing_result: PricingResult,
-        mercer_match: Optional[Dict] = None
+        mercer_match: Optional[Dict] = None,
+        expires_at: Optional[datetime] = None
     ) -> JobPricingResult:
         """
         Save versioned pricing result to database with smart cache expiry.
@@ -406,6 +496,7 @@ class SalaryRecommendationServiceV2:
             request: Original pricing request
             pricing_result: Calculated pricing result
             mercer_match: Matched Mercer job (if any)
+            expires_at: Latest allowed expiry (e.g. of a shared cached result)
 
         Returns:
             Saved JobPricingResult model with version and expiry
@@ -430,7 +521,8 @@ class SalaryRecommendationServiceV2:
 
             # Step 3: Calculate smart cache expiry based on data sources
             data_sources_used = [c.source_name for c in pricing_result.source_contributions]
-            expires_at = self._calculate_cache_expiry(data_sources_used)
+            smart_expiry = self._calculate_cache_expiry(data_sources_used)
+            expires_at = min(smart_expiry, expires_at) if expires_at else smart_expiry
 
             # Prepare confidence factors with Mercer match
             confidence_factors = {
@@ -5,8 +5,11 @@ Matches extracted skills from job descriptions to SSG TSC (Technical Skills & Co
 
 Uses multiple matching strategies:
 1. Exact matching (normalized lowercase comparison)
-2. Fuzzy matching (trigram similarity using PostgreSQL pg_trgm)
+2. Fuzzy matching (trigram similarity, same scores as PostgreSQL pg_trgm)
 3. Semantic matching (future: using embeddings)
+
+Both strategies run against the in-process SkillTaxonomyIndex, so a whole
+skill list is matched in one pass without per-skill queries.
 """
 
 import logging
@@ -18,7 +21,11 @@ from sqlalchemy.orm import Session
 
 from job_pricing.repositories.ssg_repository import SSGRepository
 from job_pricing.models import SSGTSC, JobSkillsExtracted
-from job_pricing.exceptions import VectorSearchException
+from job_pricing.services.skill_taxonomy_index import (
+    SkillTaxonomyIndex,
+    get_skill_taxonomy_index,
+    normalize_skill,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -68,6 +75,7 @@ class SkillMatchingService:
         session: Session,
         exact_match_threshold: float = 0.95,
         fuzzy_match_threshold: float = 0.3,
+        index: Optional[SkillTaxonomyIndex] = None,
     ):
         """
         Initialize skill matching service.
@@ -76,11 +84,21 @@ class SkillMatchingService:
             session: SQLAlchemy database session
             exact_match_threshold: Minimum similarity for exact matches (default: 0.95)
             fuzzy_match_threshold: Minimum similarity for fuzzy matches (default: 0.3)
+            index: Skill index to match against (default: the process-wide
+                index, refreshed when ssg_tsc changes)
         """
         self.session = session
         self.repository = SSGRepository(session)
         self.exact_match_threshold = exact_match_threshold
         self.fuzzy_match_threshold = fuzzy_match_threshold
+        self._index = index
+
+    @property
+    def index(self) -> SkillTaxonomyIndex:
+        """Skill taxonomy index used for matching."""
+        if self._index is not None:
+            return self._index
+        return get_skill_taxonomy_index(self.session)
 
     def match_skill(
         self, skill_name: str, skill_category: Optional[str] = None
@@ -105,27 +123,7 @@ class SkillMatchingService:
             >>> match = service.match_skill("Python Programming")
             >>> print(f"{match.matched_tsc_title}: {match.confidence:.2%} confidence")
         """
-        # Normalize skill name
-        normalized_skill = skill_name.strip().lower()
-
-        # Strategy 1: Try exact match with TSC title
-        exact_match = self._exact_match(normalized_skill)
-        if exact_match:
-            return exact_match
-
-        # Strategy 2: Try fuzzy match
-        fuzzy_match = self._fuzzy_match(normalized_skill)
-        if fuzzy_match:
-            return fuzzy_match
-
-        # No match found
-        return SkillMatch(
-            skill_name=skill_name,
-            matched_tsc=None,
-            confidence=0.0,
-            match_method="none",
-            skill_category=skill_category,
-        )
+        return self.match_skills_batch([(skill_name, skill_category)])[0]
 
     def match_skills_batch(
         self, skills: List[Tuple[str, Optional[str]]]
@@ -145,10 +143,36 @@ class SkillMatchingService:
             >>> for match in matches:
             ...     print(f"{match.skill_name} -> {match.matched_tsc_title}")
         """
+        if not skills:
+            return []
+
+        index = self.index
+        normalized_skills = [normalize_skill(skill_name) for skill_name, _ in skills]
+
+        # One similarity pass for every skill without an exact title match
+        unmatched = [i for i, normalized in enumerate(normalized_skills) if index.exact(normalized) is None]
+        candidates = dict(zip(
+            unmatched,
+            index.top_matches([normalized_skills[i] for i in unmatched], limit=5),
+        ))
+
         matches = []
-        for skill_name, skill_category in skills:
-            match = self.match_skill(skill_name, skill_category)
+        for i, (skill_name, skill_category) in enumerate(skills):
+            normalized_skill = normalized_skills[i]
+            match = (
+                self._exact_match(normalized_skill, index, candidates.get(i, []))
+                or self._fuzzy_match(normalized_skill, candidates.get(i, []))
+            )
+            if match is None:
+                match = SkillMatch(
+                    skill_name=skill_name,
+                    matched_tsc=None,
+                    confidence=0.0,
+                    match_method="none",
+                    skill_category=skill_category,
+                )
             matches.append(match)
+
         return matches
 
     def save_matched_skills(
@@ -206,36 +230,44 @@ class SkillMatchingService:
         """
         return self.repository.get_extracted_skills_by_request(request_id)
 
-    def _exact_match(self, normalized_skill: str) -> Optional[SkillMatch]:
+    def _exact_match(
+        self,
+        normalized_skill: str,
+        index: SkillTaxonomyIndex,
+        candidates: List[Tuple[SSGTSC, float]]
+    ) -> Optional[SkillMatch]:
         """
         Try to find an exact match for a skill.
 
-        Compares normalized lowercase strings.
+        Compares normalized lowercase strings; titles that contain the skill
+        and are nearly identical (exact_match_threshold) also count.
 
         Args:
             normalized_skill: Lowercased, stripped skill name
+            index: Skill taxonomy index
+            candidates: Most similar titles from the index, best first
 
         Returns:
             SkillMatch if found, None otherwise
         """
-        # Search for skills with similar title
-        candidates = self.repository.search_tsc_by_title(normalized_skill, limit=5)
+        exact = index.exact(normalized_skill)
+        if exact is not None:
+            return SkillMatch(
+                skill_name=normalized_skill,
+                matched_tsc=exact,
+                confidence=1.0,
+                match_method="exact",
+                skill_category=exact.skill_category,
+            )
 
-        for candidate in candidates:
-            normalized_candidate = candidate.tsc_title.strip().lower()
-
-            # Check for exact match
-            if normalized_candidate == normalized_skill:
-                return SkillMatch(
-                    skill_name=normalized_skill,
-                    matched_tsc=candidate,
-                    confidence=1.0,
-                    match_method="exact",
-                    skill_category=candidate.skill_category,
-                )
+        for candidate, _ in candidates:
+            normalized_candidate = normalize_skill(candidate.tsc_title)
 
             # Check for very close match (>95% similarity after normalization)
-            if self._string_similarity(normalized_skill, normalized_candidate) >= self.exact_match_threshold:
+            if (
+                normalized_skill in normalized_candidate
+                and self._string_similarity(normalized_skill, normalized_candidate) >= self.exact_match_threshold
+            ):
                 return SkillMatch(
                     skill_name=normalized_skill,
                     matched_tsc=candidate,
@@ -246,51 +278,36 @@ class SkillMatchingService:
 
         return None
 
-    def _fuzzy_match(self, normalized_skill: str) -> Optional[SkillMatch]:
+    def _fuzzy_match(
+        self,
+        normalized_skill: str,
+        candidates: List[Tuple[SSGTSC, float]]
+    ) -> Optional[SkillMatch]:
         """
         Try to find a fuzzy match using trigram similarity.
 
-        Uses PostgreSQL pg_trgm extension for similarity search.
-
         Args:
             normalized_skill: Lowercased, stripped skill name
+            candidates: Most similar titles from the index, best first
 
         Returns:
             SkillMatch if found with sufficient confidence, None otherwise
         """
-        try:
-            # Use repository's fuzzy search (trigram similarity)
-            fuzzy_matches = self.repository.search_skills_fuzzy(
-                normalized_skill,
-                threshold=self.fuzzy_match_threshold,
-                limit=5,
-            )
+        if not candidates:
+            return None
 
-            if not fuzzy_matches:
-                return None
+        # Take best match (trigram similarity is already 0-1)
+        best_match, similarity = candidates[0]
+        if similarity < self.fuzzy_match_threshold:
+            return None
 
-            # Take best match
-            best_match, similarity = fuzzy_matches[0]
-
-            # Adjust confidence score (trigram similarity is already 0-1)
-            confidence = similarity
-
-            return SkillMatch(
-                skill_name=normalized_skill,
-                matched_tsc=best_match,
-                confidence=confidence,
-                match_method="fuzzy",
-                skill_category=best_match.skill_category,
-            )
-
-        except Exception as e:
-            # PRODUCTION: If fuzzy search fails, raise exception - don't silently fail
-            # Note: pg_trgm extension must be installed for fuzzy matching to work
-            logger.error(f"Fuzzy matching failed: {e}")
-            raise VectorSearchException(
-                f"Skill fuzzy matching failed - ensure pg_trgm extension is installed: {str(e)}",
-                original_error=e
-            )
+        return SkillMatch(
+            skill_name=normalized_skill,
+            matched_tsc=best_match,
+            confidence=similarity,
+            match_method="fuzzy",
+            skill_category=best_match.skill_category,
+        )
 
     def _string_similarity(self, s1: str, s2: str) -> float:
         """
@@ -0,0 +1,243 @@
+"""
+SSG Skill Taxonomy Index
+
+In-process index of SSG TSC titles, so a job's skill list is matched
+without database round-trips per skill:
+
+- Exact tier: dict of normalised title -> TSC
+- Fuzzy tier: inverted index of pg_trgm-style trigrams; the similarity of a
+  whole batch of skills against every title is computed in one numpy pass
+  (|A & B| / |A | B| over trigram sets, as pg_trgm similarity())
+
+The process-wide index (get_skill_taxonomy_index) is rebuilt when ssg_tsc
+changes, e.g. after the SSG loaders run: the table signature (row count,
+max id, max updated_at) is re-checked at most every REFRESH_CHECK_SECONDS.
+"""
+
+import logging
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from job_pricing.models import SSGTSC
+
+logger = logging.getLogger(__name__)
+
+# Word characters for trigram extraction (pg_trgm treats non-alphanumerics as separators)
+_WORD = re.compile(r"[^\W_]+")
+
+
+def normalize_skill(text: str) -> str:
+    """Exact-match key of a skill or TSC title."""
+    return (text or "").strip().lower()
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    Trigram set of a text, as extracted by pg_trgm.
+
+    Each lowercased word is padded with two spaces in front and one behind.
+    """
+    grams = set()
+    for word in _WORD.findall((text or "").lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class SkillTaxonomyIndex:
+    """
+    Exact and trigram index over SSG TSC titles.
+
+    Entries are transient SSGTSC instances (not attached to any session), so
+    the index can be shared between sessions and threads.
+    """
+
+    # Queries scored per numpy pass (bounds the queries x titles matrix)
+    QUERY_CHUNK_SIZE = 256
+
+    def __init__(self, entries: List[SSGTSC], signature: Optional[Tuple] = None):
+        """
+        Build the index.
+
+        Args:
+            entries: TSC records to index
+            signature: Table signature the entries were loaded at
+        """
+        self.entries = entries
+        self.signature = signature
+
+        self._exact: Dict[str, SSGTSC] = {}
+        for entry in entries:
+            self._exact.setdefault(normalize_skill(entry.tsc_title), entry)
+
+        vocabulary: Dict[str, int] = {}
+        postings: List[List[int]] = []
+        sizes = np.zeros(len(entries), dtype=np.int32)
+        for position, entry in enumerate(entries):
+            grams = trigrams(entry.tsc_title)
+            sizes[position] = len(grams)
+            for gram in grams:
+                gram_id = vocabulary.setdefault(gram, len(vocabulary))
+                if gram_id == len(postings):
+                    postings.append([])
+                postings[gram_id].append(position)
+
+        self._vocabulary = vocabulary
+        self._postings = [np.asarray(p, dtype=np.int64) for p in postings]
+        self._sizes = sizes
+
+    @classmethod
+    def load(cls, session: Session) -> "SkillTaxonomyIndex":
+        """Build the index from ssg_tsc."""
+        signature = cls.table_signature(session)
+        rows = session.query(
+            SSGTSC.id,
+            SSGTSC.tsc_code,
+            SSGTSC.tsc_title,
+            SSGTSC.skill_category,
+            SSGTSC.proficiency_level,
+        ).order_by(SSGTSC.id).all()
+
+        entries = [
+            SSGTSC(
+                id=row.id,
+                tsc_code=row.tsc_code,
+                tsc_title=row.tsc_title,
+                skill_category=row.skill_category,
+                proficiency_level=row.proficiency_level,
+            )
+            for row in rows
+        ]
+        logger.info(f"Built SSG skill index: {len(entries)} TSC titles")
+        return cls(entries, signature)
+
+    @staticmethod
+    def table_signature(session: Session) -> Tuple:
+        """Cheap change marker for ssg_tsc (row count, max id, max updated_at)."""
+        return tuple(session.query(
+            func.count(SSGTSC.id),
+            func.max(SSGTSC.id),
+            func.max(SSGTSC.updated_at),
+        ).one())
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def exact(self, text: str) -> Optional[SSGTSC]:
+        """TSC whose normalised title equals the normalised text."""
+        return self._exact.get(normalize_skill(text))
+
+    def similarities(self, texts: List[str]) -> np.ndarray:
+        """
+        Trigram similarity of each text to every indexed title.
+
+        Returns:
+            Array of shape (len(texts), len(entries))
+        """
+        n_entries = len(self.entries)
+        result = np.zeros((len(texts), n_entries), dtype=np.float64)
+        if not n_entries:
+            return result
+
+        for start in range(0, len(texts), self.QUERY_CHUNK_SIZE):
+            chunk = texts[start:start + self.QUERY_CHUNK_SIZE]
+            query_sizes = np.zeros(len(chunk), dtype=np.int64)
+            cells = []
+            for row, text in enumerate(chunk):
+                grams = trigrams(text)
+                query_sizes[row] = len(grams)
+                for gram in grams:
+                    gram_id = self._vocabulary.get(gram)
+                    if gram_id is not None:
+                        cells.append(row * n_entries + self._postings[gram_id])
+
+            if not cells:
+                continue
+
+            shared = np.bincount(
+                np.concatenate(cells), minlength=len(chunk) * n_entries
+            ).reshape(len(chunk), n_entries)
+            union = query_sizes[:, None] + self._sizes[None, :] - shared
+            result[start:start + len(chunk)] = np.divide(
+                shared, union, out=np.zeros(shared.shape, dtype=np.float64), where=union > 0
+            )
+
+        return result
+
+    def top_matches(
+        self,
+        texts: List[str],
+        limit: int = 5,
+        threshold: float = 0.0
+    ) -> List[List[Tuple[SSGTSC, float]]]:
+        """
+        Most similar titles per text, best first (ties by load order).
+
+        Args:
+            texts: Texts to match
+            limit: Maximum matches per text
+            threshold: Minimum similarity
+
+        Returns:
+            (TSC, similarity) pairs per text
+        """
+        scores = self.similarities(texts)
+        matches = []
+        for row in scores:
+            k = min(limit, len(row))
+            if k == 0:
+                matches.append([])
+                continue
+            # Stable sort keeps load order among equal scores
+            best = np.argsort(-row, kind="stable")[:k]
+            matches.append([
+                (self.entries[position], float(row[position]))
+                for position in best
+                if row[position] >= threshold and row[position] > 0
+            ])
+        return matches
+
+
+# Process-wide index
+_skill_index: Optional[SkillTaxonomyIndex] = None
+_skill_index_checked_at = 0.0
+_skill_index_lock = threading.Lock()
+
+# How often the ssg_tsc signature is compared with the loaded index
+REFRESH_CHECK_SECONDS = 60.0
+
+
+def get_skill_taxonomy_index(session: Session) -> SkillTaxonomyIndex:
+    """
+    Get the process-wide skill index, (re)building it if ssg_tsc changed.
+
+    Args:
+        session: Session used to check the table signature and (re)build
+
+    Returns:
+        Current index
+    """
+    global _skill_index, _skill_index_checked_at
+
+    with _skill_index_lock:
+        now = time.monotonic()
+        if _skill_index is not None and now - _skill_index_checked_at < REFRESH_CHECK_SECONDS:
+            return _skill_index
+
+        if _skill_index is None or SkillTaxonomyIndex.table_signature(session) != _skill_index.signature:
+            _skill_index = SkillTaxonomyIndex.load(session)
+        _skill_index_checked_at = now
+        return _skill_index
+
+
+def invalidate_skill_taxonomy_index():
+    """Drop the process-wide index so the next use rebuilds it."""
+    global _skill_index
+    with _skill_index_lock:
+        _skill_index = None
@@ -4,8 +4,9 @@ Celery Tasks
 Asynchronous background tasks for job pricing workflow.
 """
 
-from .job_processing_tasks import process_job_pricing_request
+from .job_processing_tasks import process_job_pricing_request, process_bulk_salary_pricing
 
 __all__ = [
     "process_job_pricing_request",
+    "process_bulk_salary_pricing",
 ]
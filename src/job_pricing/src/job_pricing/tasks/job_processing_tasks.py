@@ -7,6 +7,7 @@ Background tasks for processing job pricing requests.
 import logging
 from uuid import UUID
 from datetime import datetime
+from typing import Dict, List, Optional
 
 from job_pricing.core.celery_app import celery_app
 from job_pricing.core.database import get_session
@@ -115,6 +116,97 @@ def process_job_pricing_request(self, request_id: str):
         session.close()
 
 
+@celery_app.task(
+    name="process_bulk_salary_pricing",
+    bind=True,
+    time_limit=3600,  # Whole job architectures take longer than the 5 minute default
+    soft_time_limit=3300,
+)
+def process_bulk_salary_pricing(
+    self,
+    roles: List[Dict],
+    user_id: int,
+    user_email: Optional[str] = None,
+    force_refresh: bool = False,
+):
+    """
+    Price a batch of roles (e.g. a whole job architecture) asynchronously.
+
+    Each role result is appended to BulkPricingResultStore under the task id
+    as soon as it is priced, so the API can stream results while the task
+    runs. Progress counts are published as the PROGRESS task state.
+
+    Not retried: a re-run would append every result a second time.
+
+    Args:
+        self: Celery task instance (for progress updates)
+        roles: Roles with job_title and optional job_description, location
+        user_id: User ID making the request
+        user_email: User's email address for audit trail
+        force_refresh: If True, bypass cached results
+
+    Returns:
+        dict: Run status with per-status role counts
+
+    Example:
+        >>> from job_pricing.tasks import process_bulk_salary_pricing
+        >>> task = process_bulk_salary_pricing.delay(
+        ...     [{"job_title": "HR Business Partner", "location": "Singapore"}], user_id=1
+        ... )
+    """
+    from job_pricing.services.bulk_salary_pricing_service import (
+        BulkPricingResultStore,
+        BulkSalaryPricingService,
+    )
+
+    job_id = self.request.id
+    logger.info(f"[CELERY] Starting bulk salary pricing {job_id}: {len(roles)} roles")
+
+    session = next(get_session())
+    counts = {"completed": 0, "no_data": 0, "failed": 0}
+
+    try:
+        store = BulkPricingResultStore()
+        service = BulkSalaryPricingService(session)
+
+        start_time = datetime.now()
+        for item in service.price_roles(
+            roles, user_id=user_id, user_email=user_email, force_refresh=force_refresh
+        ):
+            store.append(job_id, item)
+            counts[item["status"]] += 1
+            self.update_state(
+                state="PROGRESS",
+                meta={"total_roles": len(roles), "processed": sum(counts.values()), **counts},
+            )
+        duration = (datetime.now() - start_time).total_seconds()
+
+        logger.info(
+            f"[CELERY] Completed bulk salary pricing {job_id} in {duration:.1f}s: "
+            f"{counts['completed']} priced, {counts['no_data']} without data, {counts['failed']} failed"
+        )
+
+        return {
+            "status": "completed",
+            "total_roles": len(roles),
+            "duration_seconds": duration,
+            **counts,
+        }
+
+    except Exception as e:
+        logger.error(f"[CELERY] Bulk salary pricing {job_id} failed: {e}", exc_info=True)
+
+        return {
+            "status": "failed",
+            "total_roles": len(roles),
+            "error": str(e),
+            **counts,
+        }
+
+    finally:
+        session.close()
+
+
 @celery_app.task(name="process_pending_requests")
 def process_pending_requests():
     """
@@ -16,6 +16,7 @@ from sqlalchemy.pool import QueuePool
 
 from job_pricing.core.config import get_settings
 from job_pricing.models import Base
+from job_pricing.utils.db_optimization import configure_vector_search
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -32,6 +33,7 @@ engine = create_engine(
     pool_pre_ping=True,  # Verify connections before using them
     echo=settings.ENVIRONMENT == "development",  # Log SQL in dev mode
 )
+configure_vector_search(engine, settings.VECTOR_HNSW_EF_SEARCH, settings.VECTOR_IVFFLAT_PROBES)
 
 
 # Configure SQLite-like behavior for PostgreSQL (if needed)
@@ -157,6 +157,35 @@ def setup_query_logging(engine: Engine, enable_explain: bool = False):
                 logger.debug(f"Could not get query plan: {e}")
 
 
+def configure_vector_search(engine: Engine, hnsw_ef_search: int, ivfflat_probes: int):
+    """
+    Apply pgvector search settings to every new connection of engine.
+
+    Set once per pooled connection (session level) instead of before each
+    vector query. No-op for non-PostgreSQL engines.
+
+    Args:
+        engine: SQLAlchemy engine
+        hnsw_ef_search: hnsw.ef_search (HNSW candidate list size)
+        ivfflat_probes: ivfflat.probes (for databases still on IVFFlat)
+    """
+    if engine.dialect.name != "postgresql":
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_vector_search_params(dbapi_conn, connection_record):
+        """Session-level ANN settings (autocommit so a rollback keeps them)"""
+        autocommit = dbapi_conn.autocommit
+        dbapi_conn.autocommit = True
+        cursor = dbapi_conn.cursor()
+        try:
+            cursor.execute(f"SET hnsw.ef_search = {int(hnsw_ef_search)}")
+            cursor.execute(f"SET ivfflat.probes = {int(ivfflat_probes)}")
+        finally:
+            cursor.close()
+            dbapi_conn.autocommit = autocommit
+
+
 def add_database_indexes(engine: Engine):
     """
     Add recommended database indexes for common queries.
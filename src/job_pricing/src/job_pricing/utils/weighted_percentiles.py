@@ -0,0 +1,131 @@
+"""
+Weighted Percentile Utilities
+
+Exact weighted percentiles over parallel value/weight arrays, computed with a
+single sort.
+
+Definition: point k (sorted, 1-based) with cumulative weight S_k sits at
+plotting position S_k / (W + W/n), where W is the total weight and n the
+number of points. Percentiles interpolate linearly between positions and are
+clamped to the smallest/largest value outside them. With equal weights this
+is the "exclusive" method of statistics.quantiles (p * (n + 1)), without
+extrapolating past the observed range.
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+# Percentiles reported for every salary recommendation
+PERCENTILE_LEVELS: Dict[str, float] = {
+    "p10": 0.10,
+    "p25": 0.25,
+    "p50": 0.50,
+    "p75": 0.75,
+    "p90": 0.90,
+}
+
+
+def weighted_quantiles(
+    values: Sequence[float],
+    weights: Optional[Sequence[float]],
+    quantiles: Sequence[float],
+) -> np.ndarray:
+    """
+    Weighted quantiles of ``values``.
+
+    Args:
+        values: Data points
+        weights: Non-negative weight per data point (None for equal weights)
+        quantiles: Quantile levels in [0, 1]
+
+    Returns:
+        Array with one value per requested quantile
+
+    Raises:
+        ValueError: If there are no data points with positive weight, or
+            values and weights differ in length
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if weights is None:
+        weights = np.ones(len(values), dtype=np.float64)
+    else:
+        weights = np.asarray(weights, dtype=np.float64)
+
+    if values.shape != weights.shape:
+        raise ValueError(
+            f"values and weights must have the same length ({len(values)} != {len(weights)})"
+        )
+    if np.any(weights < 0):
+        raise ValueError("weights must be non-negative")
+
+    keep = weights > 0
+    values, weights = values[keep], weights[keep]
+    if len(values) == 0:
+        raise ValueError("No data points available for percentile calculation")
+
+    order = np.argsort(values, kind="stable")
+    values, weights = values[order], weights[order]
+
+    total = weights.sum()
+    positions = np.cumsum(weights) / (total + total / len(values))
+
+    # np.interp clamps to the first/last value outside the positions
+    return np.interp(np.asarray(quantiles, dtype=np.float64), positions, values)
+
+
+def weighted_percentiles(
+    values: Sequence[float],
+    weights: Optional[Sequence[float]] = None,
+    levels: Dict[str, float] = PERCENTILE_LEVELS,
+) -> Dict[str, float]:
+    """
+    Named weighted percentiles (P10, P25, P50, P75, P90 by default).
+
+    Args:
+        values: Data points
+        weights: Non-negative weight per data point (None for equal weights)
+        levels: Mapping of name to quantile level
+
+    Returns:
+        Mapping of name to percentile value
+    """
+    results = weighted_quantiles(values, weights, list(levels.values()))
+    return {name: float(value) for name, value in zip(levels, results)}
+
+
+def quantile_sketch(
+    percentiles: Dict[str, float],
+    n: int,
+    levels: Dict[str, float] = PERCENTILE_LEVELS,
+) -> np.ndarray:
+    """
+    n equally weighted points reproducing a distribution known by its percentiles.
+
+    Point k (1-based) is the piecewise-linear inverse CDF through the given
+    percentiles at k / (n + 1), the plotting position weighted_quantiles
+    uses, so the points' own percentiles match the input ones. Outside the
+    outermost percentiles the points are clamped, as in weighted_quantiles.
+
+    Args:
+        percentiles: Mapping of name (as in levels) to value; missing names
+            are skipped
+        n: Number of points (e.g. the sample size, capped by the caller)
+        levels: Mapping of name to quantile level
+
+    Returns:
+        Array of n points in ascending order
+
+    Raises:
+        ValueError: If no percentile is given or n < 1
+    """
+    known = sorted(
+        (levels[name], float(value))
+        for name, value in percentiles.items()
+        if name in levels and value is not None
+    )
+    if not known or n < 1:
+        raise ValueError("A quantile sketch needs at least one percentile and one point")
+
+    positions = np.arange(1, n + 1, dtype=np.float64) / (n + 1)
+    return np.interp(positions, [level for level, _ in known], [value for _, value in known])
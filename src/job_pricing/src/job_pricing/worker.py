@@ -115,9 +115,10 @@ def refresh_market_data():
                 logger.info(f"Loading Mercer data from {mercer_file}")
                 mercer_loader = MercerJobLibraryLoader(
                     session=db_session,
-                    batch_size=100,
+                    batch_size=1000,
                     continue_on_error=True,
-                    show_progress=False
+                    show_progress=False,
+                    bulk=True
                 )
                 mercer_result = mercer_loader.load_from_excel(str(mercer_file))
 
@@ -139,9 +140,10 @@ def refresh_market_data():
                 logger.info(f"Loading SSG data from {ssg_file}")
                 ssg_loader = SSGJobRolesLoader(
                     session=db_session,
-                    batch_size=100,
+                    batch_size=1000,
                     continue_on_error=True,
-                    show_progress=False
+                    show_progress=False,
+                    bulk=True
                 )
                 ssg_result = ssg_loader.load_from_excel(str(ssg_file))
 
@@ -201,6 +203,7 @@ def full_data_scrape(
     from job_pricing.core.database import get_db
     from job_pricing.repositories.scraping_repository import ScrapingRepository
     from job_pricing.models import ScrapedJobListing, ScrapingAuditLog
+    from job_pricing.services.market_aggregation_service import MarketAggregationService
 
     logger = logging.getLogger(__name__)
     logger.info("Starting full data scrape task")
@@ -227,6 +230,8 @@ def full_data_scrape(
         "glassdoor_count": 0,
         "total_scraped": 0,
         "total_stored": 0,
+        "listings_assigned": 0,
+        "aggregates": 0,
         "errors": [],
         "execution_time_seconds": 0,
     }
@@ -341,6 +346,16 @@ def full_data_scrape(
             results["total_stored"] = stored_count
             logger.info(f"Stored {stored_count} new jobs, updated {len(all_jobs) - stored_count} existing")
 
+        # Assign new listings to Mercer families and rebuild salary aggregates
+        try:
+            aggregation_stats = MarketAggregationService(db_session).run()
+            results.update(aggregation_stats)
+        except Exception as e:
+            db_session.rollback()
+            error_msg = f"Market aggregation failed: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            results["errors"].append(error_msg)
+
         # Create audit log entry
         execution_time = (datetime.now() - start_time).total_seconds()
         results["execution_time_seconds"] = execution_time
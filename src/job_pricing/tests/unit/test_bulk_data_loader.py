@@ -0,0 +1,170 @@
+"""
+Unit Tests for Bulk Data Loading
+
+Tests:
+- Vectorised batch validation gives the same results as per-record validation
+- Bulk mode upserts a batch in one ON CONFLICT statement
+- Per-row outcomes (inserted, updated, unchanged, in-batch duplicates)
+- A batch rejected by the database is retried row by row
+"""
+
+from unittest.mock import MagicMock, Mock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+import sys
+from pathlib import Path
+
+# Add project root (data package) and src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from job_pricing.models import SSGTSC
+from data.ingestion.base_loader import BaseDataLoader
+from data.validation.base_validator import BaseValidator
+from data.validation.field_validators import required_field, string_length_check
+from data.validation.ssg_validator import SSGJobRoleValidator
+
+
+class TSCLoader(BaseDataLoader[SSGTSC]):
+    conflict_columns = ("tsc_code",)
+
+    def transform_record(self, raw_data):
+        return SSGTSC(
+            tsc_code=raw_data["tsc_code"],
+            tsc_title=raw_data["tsc_title"],
+            skill_category="Technical",
+        )
+
+    def get_record_id(self, raw_data):
+        return raw_data.get("tsc_code", "UNKNOWN")
+
+
+def make_loader(session, validator=None):
+    repository = Mock()
+    repository.model = SSGTSC
+    return TSCLoader(session, repository, validator=validator, batch_size=1000, show_progress=False, bulk=True)
+
+
+def returning(*rows):
+    result = Mock()
+    result.fetchall.return_value = list(rows)
+    return result
+
+
+class TestBatchValidation:
+    """Test DataFrame-based validation of a batch."""
+
+    def test_same_results_as_per_record_validation(self):
+        """Test errors per record match validate()."""
+        validator = SSGJobRoleValidator(existing_role_codes={"ICT-DIS-4010-1.1"})
+        records = [
+            {"job_role_code": "ICT-DIS-4010-1.1", "job_role_title": "Data Analyst",
+             "sector": "Infocomm", "career_level": "Manager"},
+            {"job_role_code": "ICT-DIS-4010-1.2", "job_role_title": "Data Engineer",
+             "sector": "Infocomm", "career_level": "Manager"},
+            {"job_role_code": "bad code", "job_role_title": "DE", "sector": None,
+             "career_level": "Wizard", "job_role_description": 42},
+            {"job_role_code": None, "job_role_title": "   "},
+        ]
+        record_ids = [r.get("job_role_code") for r in records]
+
+        batch = validator.validate_records(records, record_ids)
+        single = [validator.validate(r, i) for r, i in zip(records, record_ids)]
+
+        assert [r.is_valid for r in batch] == [r.is_valid for r in single]
+        assert [[e.message for e in r.errors] for r in batch] == [
+            [e.message for e in r.errors] for r in single
+        ]
+
+    def test_rules_only_run_on_flagged_rows(self):
+        """Test record-level rules are skipped for rows passing the batch check."""
+        calls = []
+        rule = string_length_check("title", min_length=3)
+
+        def counting_rule(data, record_id=None):
+            calls.append(record_id)
+            return rule(data, record_id)
+        counting_rule.batch_check = rule.batch_check
+
+        validator = BaseValidator()
+        validator.add_rule(required_field("title"))
+        validator.add_rule(counting_rule)
+
+        results = validator.validate_records(
+            [{"title": "Payroll"}, {"title": "HR"}, {"title": "Finance"}], ["a", "b", "c"]
+        )
+
+        assert [r.is_valid for r in results] == [True, False, True]
+        assert calls == ["b"]
+
+
+class TestBulkLoad:
+    """Test the set-based load path."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.session = MagicMock(spec=Session)
+        self.loader = make_loader(self.session)
+
+    def test_one_upsert_per_batch(self):
+        """Test inserted/updated/unchanged rows come from the RETURNING rows."""
+        self.session.execute.return_value = returning(("TSC-1", True), ("TSC-2", False))
+
+        result = self.loader.load_data([
+            {"tsc_code": "TSC-1", "tsc_title": "Payroll"},
+            {"tsc_code": "TSC-2", "tsc_title": "Budgeting"},
+            {"tsc_code": "TSC-3", "tsc_title": "Auditing"},
+        ])
+
+        assert self.session.execute.call_count == 1
+        sql = str(self.session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (tsc_code) DO UPDATE" in sql
+        assert "IS DISTINCT FROM" in sql
+        assert "RETURNING ssg_tsc.tsc_code, xmax = 0" in sql
+
+        stats = result.statistics
+        assert (stats.successful, stats.updated, stats.unchanged, stats.failed) == (3, 1, 1, 0)
+        self.loader.repository.commit.assert_called_once()
+
+    def test_duplicates_within_batch(self):
+        """Test the last row per key is written and earlier ones reported."""
+        self.session.execute.return_value = returning(("TSC-1", True))
+
+        result = self.loader.load_data([
+            {"tsc_code": "TSC-1", "tsc_title": "Payroll"},
+            {"tsc_code": "TSC-1", "tsc_title": "Payroll Processing"},
+        ])
+
+        params = self.session.execute.call_args.args[0].compile(dialect=postgresql.dialect()).params
+        assert "Payroll Processing" in params.values()
+        assert "Payroll" not in params.values()
+        assert (result.statistics.successful, result.statistics.duplicates) == (1, 1)
+
+    def test_rejected_batch_retried_per_row(self):
+        """Test only the row the database rejects fails."""
+        self.session.execute.side_effect = [
+            IntegrityError("INSERT", {}, Exception("check constraint")),
+            returning(("TSC-1", True)),
+            IntegrityError("INSERT", {}, Exception("check constraint")),
+        ]
+
+        result = self.loader.load_data([
+            {"tsc_code": "TSC-1", "tsc_title": "Payroll"},
+            {"tsc_code": "TSC-2", "tsc_title": "x" * 300},
+        ])
+
+        assert self.session.execute.call_count == 3
+        stats = result.statistics
+        assert (stats.successful, stats.database_errors, stats.failed) == (1, 1, 1)
+
+    def test_requires_conflict_columns(self):
+        """Test bulk mode needs a conflict target."""
+        class NoKeyLoader(BaseDataLoader[SSGTSC]):
+            pass
+
+        with pytest.raises(ValueError):
+            NoKeyLoader(self.session, Mock(), bulk=True)
@@ -0,0 +1,237 @@
+"""
+Unit Tests for Bulk Salary Pricing
+
+Tests:
+- Query embeddings for many roles use one provider call
+- Multi-query vector search rows are grouped per query
+- Roles with the same Mercer job code share market data lookups
+- Bulk pricing streams cached, priced, no-data and duplicate roles
+- The NDJSON result stream ends for lost or expired runs
+"""
+
+import asyncio
+import json
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from job_pricing.api.v1 import salary_recommendation
+from job_pricing.exceptions import NoMarketDataError
+from job_pricing.services.bulk_salary_pricing_service import BulkSalaryPricingService
+from job_pricing.services.embedding_cache import EmbeddingCache
+from job_pricing.services.job_matching_service import JobMatchingService
+from job_pricing.services.pricing_calculation_service_v3 import PricingCalculationServiceV3
+
+
+def embedding_response(texts):
+    return SimpleNamespace(data=[
+        SimpleNamespace(index=i, embedding=[float(len(text))] * 1536)
+        for i, text in reversed(list(enumerate(texts)))
+    ])
+
+
+@pytest.fixture
+def matching_service(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    service = JobMatchingService(Mock(spec=Session))
+    service.embedding_cache = EmbeddingCache(use_redis=False)
+    return service
+
+
+class TestBatchedMatching:
+    """Test batched embeddings and the multi-query vector search."""
+
+    def test_one_embedding_call_for_all_roles(self, matching_service):
+        """Test cache misses are embedded together, in input order."""
+        with patch("job_pricing.services.job_matching_service.openai.embeddings.create") as create:
+            create.side_effect = lambda model, input, dimensions: embedding_response(input)
+
+            embeddings = matching_service.generate_query_embeddings(
+                [("HR Manager", ""), ("Payroll Lead", "Runs payroll"), ("HR Manager", "")]
+            )
+
+        create.assert_called_once()
+        assert create.call_args.kwargs["input"] == ["HR Manager", "Payroll Lead. Runs payroll"]
+        assert [e[0] for e in embeddings] == [10.0, 26.0, 10.0]
+
+    def test_search_rows_grouped_per_query(self, matching_service):
+        """Test one statement returns the candidates of every query."""
+        matching_service.generate_query_embeddings = Mock(return_value=[[0.1] * 1536, [0.2] * 1536])
+        rows = [
+            (1, 11, "HRM.01", "HR Manager", "", "Human Resources", "HRBP", "M4", 0.9),
+            (1, 12, "HRM.02", "HR Director", "", "Human Resources", "HRBP", "M5", 0.8),
+            (2, 21, "FIN.01", "Payroll Lead", "", "Finance", "Payroll", "P3", 0.7),
+        ]
+        matching_service.session.execute.return_value.fetchall.return_value = rows
+
+        matches = matching_service.find_similar_jobs_batch(
+            [("HR Manager", ""), ("Payroll Lead", "")], top_k=2
+        )
+
+        # One search statement; vectors are bound parameters
+        matching_service.session.execute.assert_called_once()
+        params = matching_service.session.execute.call_args.args[1]
+        assert params == {"embeddings": [[0.1] * 1536, [0.2] * 1536], "limit": 2}
+        assert [m["job_code"] for m in matches[0]] == ["HRM.01", "HRM.02"]
+        assert [m["job_code"] for m in matches[1]] == ["FIN.01"]
+        assert matches[1][0]["similarity_score"] == 0.7
+
+
+class TestSharedLookups:
+    """Test source lookups shared between roles of the same family."""
+
+    def test_mercer_market_data_queried_once_per_job_code(self):
+        """Test a second role with the same job code reuses the market data."""
+        session = Mock(spec=Session)
+        market_data = SimpleNamespace(
+            p10=Decimal(60000), p25=Decimal(70000), p50=Decimal(80000),
+            p75=Decimal(90000), p90=Decimal(100000), sample_size=20,
+            survey_date=date(2025, 6, 1),
+        )
+        session.query.return_value.filter.return_value.first.return_value = market_data
+        service = PricingCalculationServiceV3(session, concurrent_sources=False, shared_lookups={})
+        mercer_match = {"job_code": "HRM.04.005.M50", "similarity_score": 0.8}
+
+        first = service._get_mercer_data(SimpleNamespace(job_title="HRBP"), mercer_match)
+        second = service._get_mercer_data(SimpleNamespace(job_title="Senior HRBP"), mercer_match)
+
+        assert session.query.call_count == 1
+        assert first.p50 == second.p50 == Decimal(80000)
+
+
+class TestBulkPricing:
+    """Test the bulk pricing result stream."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.session = Mock(spec=Session)
+        with patch("job_pricing.services.bulk_salary_pricing_service.SalaryRecommendationServiceV2") as v2, \
+                patch("job_pricing.services.bulk_salary_pricing_service.PricingCalculationServiceV3"):
+            self.service = BulkSalaryPricingService(self.session)
+        self.v2 = v2.return_value
+
+        self.v2._generate_request_hash.side_effect = lambda title, location, user_id: f"{title}|{location}"
+        self.v2._find_or_create_request.side_effect = lambda **kwargs: SimpleNamespace(
+            job_title=kwargs["job_title"], location_text=kwargs["location"], job_description=""
+        )
+        self.v2._get_cached_result.side_effect = lambda request: (
+            SimpleNamespace() if request.job_title == "Cached Role" else None
+        )
+        self.v2._format_cached_response.return_value = {"from_cache": True}
+        self.v2._serve_shared_result.return_value = None
+
+    def test_results_for_every_role(self):
+        """Test cached roles stream first and duplicates are priced once."""
+        self.service.matching_service.find_similar_jobs_batch.return_value = [[{"job_code": "A"}], []]
+        self.service.matching_service.select_best_match.side_effect = (
+            lambda title, description, candidates, use_llm: candidates[0] if candidates else None
+        )
+
+        def price(request, mercer_match, skills):
+            if mercer_match is None:
+                raise NoMarketDataError(job_title=request.job_title, sources_attempted=["mercer"])
+            return {"job_code": mercer_match["job_code"]}
+        self.v2._price_and_save.side_effect = price
+
+        roles = [
+            {"job_title": "Cached Role"},
+            {"job_title": "HR Manager"},
+            {"job_title": "Unknown Role"},
+            {"job_title": "HR Manager"},
+        ]
+        results = list(self.service.price_roles(roles, user_id=1))
+
+        assert results[0]["index"] == 0 and results[0]["result"] == {"from_cache": True}
+        by_index = {r["index"]: r for r in results}
+        assert sorted(by_index) == [0, 1, 2, 3]
+        assert by_index[1]["status"] == by_index[3]["status"] == "completed"
+        assert by_index[3]["result"] == {"job_code": "A"}
+        assert by_index[2]["status"] == "no_data"
+        assert self.v2._price_and_save.call_count == 2
+
+        # One batched search for the two distinct uncached roles
+        queries = self.service.matching_service.find_similar_jobs_batch.call_args.args[0]
+        assert queries == [("HR Manager", ""), ("Unknown Role", "")]
+
+    def test_matching_failure_fails_uncached_roles(self):
+        """Test a failed batch search marks the remaining roles as failed."""
+        self.service.matching_service.find_similar_jobs_batch.side_effect = RuntimeError("db down")
+
+        results = list(self.service.price_roles([{"job_title": "HR Manager"}], user_id=1))
+
+        assert results == [{
+            "index": 0, "job_title": "HR Manager", "location": "Singapore",
+            "status": "failed", "result": None, "error": "db down",
+        }]
+
+    def test_too_many_roles(self):
+        """Test the role limit."""
+        with pytest.raises(ValueError):
+            list(self.service.price_roles([{"job_title": "HR"}] * 1001, user_id=1))
+
+
+class FakeResultStore:
+    """In-memory BulkPricingResultStore; the job expires after expire_after reads."""
+
+    def __init__(self, results, total_roles, expire_after=None):
+        self.results = results
+        self.job = {"user_id": "1", "total_roles": total_roles}
+        self.expire_after = expire_after
+        self.reads = 0
+
+    def get_job(self, job_id):
+        if self.expire_after is not None and self.reads >= self.expire_after:
+            return None
+        return self.job
+
+    def read(self, job_id, start=0):
+        self.reads += 1
+        return self.results[start:]
+
+
+class TestBulkStream:
+    """Test the bulk pricing NDJSON stream ends."""
+
+    def stream(self, monkeypatch, store, status="pending"):
+        monkeypatch.setattr(salary_recommendation, "BulkPricingResultStore", lambda: store)
+        monkeypatch.setattr(salary_recommendation, "_bulk_job_status", lambda job_id: status)
+        monkeypatch.setattr(salary_recommendation, "BULK_STREAM_POLL_SECONDS", 0.01)
+        monkeypatch.setattr(salary_recommendation, "BULK_STREAM_IDLE_SECONDS", 0.05)
+
+        async def collect():
+            response = await salary_recommendation.stream_bulk_pricing(
+                "job-1", current_user=SimpleNamespace(id=1)
+            )
+            return [json.loads(line) async for line in response.body_iterator]
+
+        return asyncio.run(asyncio.wait_for(collect(), timeout=5))
+
+    def test_stream_ends_when_all_roles_sent(self, monkeypatch):
+        """Test the stream ends with the last role result."""
+        store = FakeResultStore([{"index": 0}, {"index": 1}], total_roles=2)
+
+        assert self.stream(monkeypatch, store) == [{"index": 0}, {"index": 1}]
+
+    def test_lost_task_stream_ends_when_idle(self, monkeypatch):
+        """Test a run stuck in PENDING ends after the idle limit."""
+        store = FakeResultStore([{"index": 0}], total_roles=3)
+
+        assert self.stream(monkeypatch, store) == [{"index": 0}]
+
+    def test_expired_job_ends_stream(self, monkeypatch):
+        """Test the stream ends once the run's results have expired."""
+        store = FakeResultStore([], total_roles=3, expire_after=2)
+        monkeypatch.setattr(salary_recommendation, "BULK_STREAM_IDLE_SECONDS", 60)
+
+        assert self.stream(monkeypatch, store) == []
+        assert store.reads == 2
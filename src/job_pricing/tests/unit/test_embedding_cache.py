@@ -0,0 +1,89 @@
+"""
+Unit Tests for the Embedding Cache
+
+Tests the in-process tier of the query embedding cache:
+- Repeated texts are served without calling the provider
+- Whitespace-only differences share a cache entry
+- Least recently used entries are evicted
+- Batched lookups embed all misses in one provider call
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from job_pricing.services.embedding_cache import EmbeddingCache, text_hash
+
+
+class CountingProvider:
+    """Fake provider that records every text it embeds."""
+
+    def __init__(self):
+        self.texts = []
+
+    def __call__(self, text):
+        self.texts.append(text)
+        return [float(len(text)), 0.5]
+
+
+@pytest.fixture
+def cache():
+    return EmbeddingCache(use_redis=False, max_entries=2)
+
+
+def test_repeated_text_is_embedded_once(cache):
+    provider = CountingProvider()
+
+    first = cache.get_or_create("model", 2, "HR Manager", provider)
+    second = cache.get_or_create("model", 2, "HR Manager", provider)
+
+    assert provider.texts == ["HR Manager"]
+    assert first == second == [10.0, 0.5]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_whitespace_differences_share_an_entry(cache):
+    provider = CountingProvider()
+
+    cache.get_or_create("model", 2, "HR  Manager ", provider)
+    cache.get_or_create("model", 2, "HR Manager", provider)
+
+    assert len(provider.texts) == 1
+    assert text_hash("HR\n Manager") == text_hash("HR Manager")
+
+
+def test_model_and_dimensions_are_part_of_the_key(cache):
+    provider = CountingProvider()
+
+    cache.get_or_create("model-a", 2, "HR Manager", provider)
+    cache.get_or_create("model-b", 2, "HR Manager", provider)
+
+    assert len(provider.texts) == 2
+
+
+def test_least_recently_used_entry_is_evicted(cache):
+    provider = CountingProvider()
+
+    for text in ["a", "b", "a", "c", "b"]:
+        cache.get_or_create("model", 2, text, provider)
+
+    # "b" was evicted when "c" was added ("a" had been used more recently)
+    assert provider.texts == ["a", "b", "c", "b"]
+
+
+def test_batch_embeds_only_misses_in_one_call(cache):
+    provider = CountingProvider()
+    batches = []
+
+    def provider_many(texts):
+        batches.append(list(texts))
+        return [provider(text) for text in texts]
+
+    cache.get_or_create("model", 2, "a", provider)
+    vectors = cache.get_or_create_many("model", 2, ["a", "bb", "a", "ccc"], provider_many)
+
+    assert batches == [["bb", "ccc"]]
+    assert vectors == [[1.0, 0.5], [2.0, 0.5], [1.0, 0.5], [3.0, 0.5]]
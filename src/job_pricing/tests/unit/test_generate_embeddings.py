@@ -0,0 +1,179 @@
+"""
+Unit Tests for Mercer Embedding Generation
+
+Tests the bulk embedding backfill:
+- Keyset pagination and batched provider requests
+- Checkpoint resume after an interrupted run
+- Checkpoint cleanup after a finished run
+- Retry of failed batches on resume
+"""
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import sys
+from pathlib import Path
+
+# Add job_pricing root and src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from data.ingestion.generate_embeddings import EmbeddingGenerator, LocalEmbeddingProvider
+
+
+def make_job(job_id: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=job_id,
+        job_code=f"J{job_id:04d}",
+        job_title=f"Job {job_id}",
+        family="HR",
+        subfamily=None,
+        career_level="M3",
+        job_description=None,
+        typical_titles=None,
+        specialization_notes=None,
+    )
+
+
+class FakeLibrary:
+    """In-memory stand-in for the keyset query and bulk write."""
+
+    def __init__(self, n_jobs: int, fail_on_write: int = None):
+        self.jobs = [make_job(i) for i in range(1, n_jobs + 1)]
+        self.embedded = {}
+        self.writes = 0
+        self.fail_on_write = fail_on_write
+
+    def fetch_ids(self, job_ids):
+        return [job for job in self.jobs if job.id in job_ids]
+
+    def fetch_page(self, last_id, limit, skip_existing):
+        pending = [
+            job for job in self.jobs
+            if job.id > last_id and not (skip_existing and job.id in self.embedded)
+        ]
+        return pending[:limit]
+
+    def count_pending(self, skip_existing, last_id=0):
+        return len(self.fetch_page(last_id, len(self.jobs), skip_existing))
+
+    def write(self, records):
+        self.writes += 1
+        if self.writes == self.fail_on_write:
+            raise RuntimeError("database connection lost")
+        self.embedded.update(dict(records))
+        return len(records)
+
+
+class FakeCheckpoints:
+    """In-memory stand-in for the embedding_backfill_checkpoints table."""
+
+    def __init__(self):
+        self.rows = {}
+
+    def load(self, run_key):
+        row = self.rows.get(run_key)
+        return (row["last_id"], row["failed_ids"]) if row else (0, [])
+
+    def save(self, run_key, last_id, processed, failed_ids):
+        self.rows[run_key] = {"last_id": last_id, "failed_ids": list(failed_ids)}
+
+    def clear(self, run_key):
+        self.rows.pop(run_key, None)
+
+
+@pytest.fixture
+def checkpoints():
+    return FakeCheckpoints()
+
+
+def make_generator(library: FakeLibrary, checkpoints, provider=None) -> EmbeddingGenerator:
+    generator = EmbeddingGenerator(
+        session=Mock(),
+        batch_size=10,
+        max_in_flight=2,
+        show_progress=False,
+        provider=provider or LocalEmbeddingProvider(dimensions=8),
+    )
+    generator._fetch_page = library.fetch_page
+    generator._fetch_ids = library.fetch_ids
+    generator._count_pending = library.count_pending
+    generator._write_embeddings = library.write
+    generator._load_checkpoint = checkpoints.load
+    generator._save_checkpoint = checkpoints.save
+    generator._clear_checkpoint = checkpoints.clear
+    return generator
+
+
+def flaky_provider(fail_for):
+    """Provider whose batches containing any of the given job titles fail"""
+    provider = LocalEmbeddingProvider(dimensions=8)
+    original = provider.embed_batch
+
+    def embed_batch(texts):
+        if any(f"Job Title: {title}\n" in text for text in texts for title in fail_for):
+            raise RuntimeError("rate limited")
+        return original(texts)
+
+    provider.embed_batch = embed_batch
+    return provider
+
+
+class TestEmbeddingGenerator:
+    """Test bulk embedding generation."""
+
+    def test_batches_requests_and_writes_per_page(self, checkpoints):
+        library = FakeLibrary(n_jobs=45)
+        provider = LocalEmbeddingProvider(dimensions=8)
+        generator = make_generator(library, checkpoints, provider)
+
+        result = generator.generate_all(skip_existing=True)
+
+        assert result["generated"] == 45
+        assert result["failed"] == 0
+        assert provider.calls == 5  # ceil(45 / batch_size)
+        assert library.writes == 3  # ceil(45 / (batch_size * max_in_flight))
+        assert len(library.embedded[1]) == 8
+
+    def test_resumes_from_checkpoint_after_crash(self, checkpoints):
+        library = FakeLibrary(n_jobs=60, fail_on_write=2)
+        generator = make_generator(library, checkpoints)
+
+        with pytest.raises(RuntimeError):
+            generator.generate_all(skip_existing=False)
+
+        assert sorted(library.embedded) == list(range(1, 21))
+        assert [row["last_id"] for row in checkpoints.rows.values()] == [20]
+
+        library.embedded.clear()
+        result = make_generator(library, checkpoints).generate_all(skip_existing=False)
+
+        assert result["generated"] == 40
+        assert sorted(library.embedded) == list(range(21, 61))
+        assert checkpoints.rows == {}
+
+    def test_failed_batch_is_counted_not_written(self, checkpoints):
+        library = FakeLibrary(n_jobs=20)
+        provider = flaky_provider(["Job 1"])
+        result = make_generator(library, checkpoints, provider).generate_all()
+
+        assert result["failed"] == 10
+        assert result["generated"] == 10
+        assert sorted(library.embedded) == list(range(11, 21))
+
+    def test_failed_jobs_are_retried_on_resume(self, checkpoints):
+        library = FakeLibrary(n_jobs=60)
+        first = make_generator(library, checkpoints, flaky_provider(["Job 25"])).generate_all(
+            skip_existing=False
+        )
+
+        assert first["failed_job_ids"] == list(range(21, 31))
+        assert [row["failed_ids"] for row in checkpoints.rows.values()] == [list(range(21, 31))]
+
+        library.embedded.clear()
+        second = make_generator(library, checkpoints).generate_all(skip_existing=False)
+
+        assert second["generated"] == 10
+        assert sorted(library.embedded) == list(range(21, 31))
+        assert checkpoints.rows == {}
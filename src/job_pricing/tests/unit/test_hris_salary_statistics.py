@@ -0,0 +1,161 @@
+"""
+Unit Tests for HRIS Salary Statistics
+
+Tests:
+- Employee and applicant statistics are one aggregate query with the PDPA
+  guard in HAVING (no rows hydrated)
+- Grade-only and family-only requests are served from precomputed rows
+- Precomputed statistics are rebuilt per grade and job family
+- BIPO sync refreshes the precomputed statistics
+"""
+
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Query, Session
+
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from job_pricing.models import InternalSalaryStatistic
+from job_pricing.repositories.hris_repository import HRISRepository
+from job_pricing.services.bipo_sync_service import BIPOSyncService
+
+
+def summary_row(count=6, **overrides):
+    values = dict(
+        count=count, avg=Decimal("5000"), p25=4500.0, p50=5000.0, p75=5500.0,
+        min=Decimal("4000"), max=Decimal("6000"),
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class CapturedQueries:
+    """Record queries executed through Query terminal methods."""
+
+    def __init__(self, result):
+        self.result = result
+        self.statements = []
+
+    def __get__(self, query, owner=None):
+        def execute():
+            self.statements.append(str(query.statement.compile(dialect=postgresql.dialect())))
+            return self.result
+        return execute
+
+
+class TestSalaryStatistics:
+    """Test SQL-side salary statistics."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.repo = HRISRepository(Session())
+
+    def test_single_aggregate_query(self):
+        """Test percentiles and the PDPA guard are computed by the database."""
+        captured = CapturedQueries(summary_row())
+        with patch.object(Query, "one_or_none", captured), patch.object(Query, "all") as hydrate:
+            stats = self.repo.get_salary_statistics(grade="M4", department="HR")
+
+        [sql] = captured.statements
+        assert "WITHIN GROUP (ORDER BY nullif(internal_employees.current_salary" in sql
+        assert "internal_employees.internal_grade = " in sql
+        assert "internal_employees.department = " in sql
+        assert "HAVING count(*) >= " in sql
+        hydrate.assert_not_called()
+
+        assert stats == {
+            "count": 6, "avg_salary": Decimal("5000"), "median_salary": 5000.0,
+            "p25": 4500.0, "p75": 5500.0, "min_salary": Decimal("4000"), "max_salary": Decimal("6000"),
+        }
+
+    def test_below_threshold(self):
+        """Test a group dropped by HAVING returns None."""
+        with patch.object(Query, "one_or_none", return_value=None):
+            assert self.repo.get_salary_statistics(department="HR") is None
+
+    def test_without_anonymization(self):
+        """Test no HAVING guard when anonymize is False."""
+        captured = CapturedQueries(summary_row(count=0, avg=None, p25=None, p50=None, p75=None, min=None, max=None))
+        with patch.object(Query, "one_or_none", captured):
+            stats = self.repo.get_salary_statistics(department="HR", anonymize=False)
+
+        assert "HAVING" not in captured.statements[0]
+        assert stats["count"] == 0 and stats["median_salary"] is None
+
+    def test_precomputed_group(self):
+        """Test a family-only request reads the precomputed row."""
+        precomputed = InternalSalaryStatistic(
+            dimension="job_family", dimension_value="Finance", employee_count=12,
+            avg_salary=Decimal("7000"), p25=Decimal("6000"), p50=Decimal("7000"), p75=Decimal("8000"),
+            min_salary=Decimal("5000"), max_salary=Decimal("9000"),
+        )
+        with patch.object(Query, "first", return_value=precomputed), \
+                patch.object(Query, "one_or_none") as aggregate:
+            stats = self.repo.get_salary_statistics(job_family="Finance")
+
+        aggregate.assert_not_called()
+        assert stats["count"] == 12
+        assert stats["median_salary"] == Decimal("7000")
+
+    def test_applicant_statistics(self):
+        """Test applicant expectations use the same aggregate query."""
+        captured = CapturedQueries(summary_row())
+        with patch.object(Query, "one_or_none", captured):
+            stats = self.repo.get_applicant_salary_statistics(position_title="Engineer")
+
+        sql = captured.statements[0]
+        assert "nullif(applicants.expected_salary" in sql
+        assert "applicants.applied_job_title ILIKE" in sql
+        assert stats["median_expected"] == 5000.0
+        assert stats["max_expected"] == Decimal("6000")
+
+
+class TestRefreshSalaryStatistics:
+    """Test rebuilding internal_salary_statistics."""
+
+    def test_rebuild_per_dimension(self):
+        """Test one grouped query per dimension and a full replace."""
+        session = Session()
+        repo = HRISRepository(session)
+        captured = CapturedQueries([SimpleNamespace(value="M4", **vars(summary_row()))])
+
+        with patch.object(Query, "all", captured), \
+                patch.object(Query, "delete") as delete, \
+                patch.object(Session, "bulk_insert_mappings") as insert, \
+                patch.object(Session, "flush"):
+            written = repo.refresh_salary_statistics()
+
+        assert written == 2
+        assert [("GROUP BY internal_employees.internal_grade" in sql) for sql in captured.statements] == [True, False]
+        assert all("HAVING count(*) >= " in sql for sql in captured.statements)
+        delete.assert_called_once()
+
+        rows = insert.call_args.args[1]
+        assert [(row["dimension"], row["dimension_value"]) for row in rows] == [
+            ("internal_grade", "M4"), ("job_family", "M4")
+        ]
+        assert rows[0]["p50"] == 5000.0 and rows[0]["employee_count"] == 6
+
+
+class TestBIPOSyncRefresh:
+    """Test the BIPO sync keeps precomputed statistics current."""
+
+    def test_sync_refreshes_statistics(self):
+        """Test statistics are rebuilt before the sync commits."""
+        session = Mock(spec=Session)
+        with patch("job_pricing.services.bipo_sync_service.BIPOClient") as client, \
+                patch("job_pricing.services.bipo_sync_service.HRISRepository") as repository:
+            client.return_value.get_employee_data.return_value = []
+            service = BIPOSyncService(session)
+
+            service.sync_all_employees()
+
+        repository.return_value.refresh_salary_statistics.assert_called_once()
+        session.commit.assert_called_once()
@@ -0,0 +1,172 @@
+"""
+Unit Tests for Market Aggregation Service
+
+Tests:
+- Salary normalisation to annual
+- Mercer assignment joins through the trigram index
+- Aggregate rows are rebuilt by one SQL statement
+- Location fallback when reading aggregates
+- V3 pricing reads family aggregates instead of scanning listings
+"""
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.query import Query
+
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from job_pricing.services.market_aggregation_service import (
+    ALL_LOCATIONS,
+    MarketAggregationService,
+    annual_salary_midpoint,
+    normalize_location,
+)
+from job_pricing.services.pricing_calculation_service_v3 import PricingCalculationServiceV3
+from job_pricing.utils.weighted_percentiles import weighted_percentiles
+
+
+def make_aggregate(location, sample_size, p50=Decimal("90000")):
+    return SimpleNamespace(
+        mercer_family="Human Resources",
+        source="my_careers_future",
+        location=location,
+        sample_size=sample_size,
+        p10=p50 - 20000, p25=p50 - 10000, p50=p50, p75=p50 + 10000, p90=p50 + 20000,
+        mean_scraped_at=datetime.now(timezone.utc) - timedelta(days=10),
+    )
+
+
+class TestSalaryNormalisation:
+    """Test annual salary normalisation."""
+
+    def test_mcf_salary_types(self):
+        """Test MCF monthly, hourly and annual salaries."""
+        assert annual_salary_midpoint("my_careers_future", 5000, 7000, "Monthly") == Decimal(72000)
+        assert annual_salary_midpoint("my_careers_future", 20, 30, "Hourly") == Decimal(52000)
+        assert annual_salary_midpoint("my_careers_future", 80000, 100000, "Annual") == Decimal(90000)
+        assert annual_salary_midpoint("my_careers_future", 5000, 7000, None) == Decimal(72000)
+
+    def test_glassdoor_monthly_heuristic(self):
+        """Test Glassdoor midpoints below 15K are treated as monthly."""
+        assert annual_salary_midpoint("glassdoor", 6000, 8000) == Decimal(84000)
+        assert annual_salary_midpoint("glassdoor", 80000, 100000) == Decimal(90000)
+
+    def test_incomplete_range(self):
+        """Test missing bounds give no salary."""
+        assert annual_salary_midpoint("glassdoor", None, 8000) is None
+
+    def test_normalize_location(self):
+        """Test location keys."""
+        assert normalize_location("  Central   Region ") == "central region"
+        assert normalize_location(None) == ALL_LOCATIONS
+
+class TestMercerAssignment:
+    """Test Mercer job assignment of pending listings."""
+
+    def test_assignment_uses_indexable_trigram_operator(self):
+        """Test the join uses % with a transaction-scoped threshold."""
+        session = Mock(spec=Session)
+        session.query.return_value.filter.return_value.all.return_value = [
+            SimpleNamespace(id=1, source="glassdoor", salary_min=80000, salary_max=100000, salary_type=None),
+        ]
+        service = MarketAggregationService(session)
+
+        assert service.assign_listings() == 1
+
+        threshold, assign = [str(call.args[0]) for call in session.execute.call_args_list]
+        assert threshold == "SET LOCAL pg_trgm.similarity_threshold = 0.3"
+        assert "btrim(split_part(m.job_title, ' - ', 1)) % s.job_title" in assign
+        assert "> :threshold" not in assign
+
+
+class TestAggregates:
+    """Test aggregate rows built from assigned listings."""
+
+    def test_refresh_aggregates_in_sql(self):
+        """Test aggregates are computed by the database, without loading listings."""
+        session = Mock(spec=Session)
+        session.execute.return_value.rowcount = 12
+        service = MarketAggregationService(session)
+
+        with patch.object(Query, "all") as hydrate:
+            assert service.refresh_aggregates() == 12
+
+        session.query.return_value.delete.assert_called_once_with(synchronize_session=False)
+        [statement] = session.execute.call_args[0]
+        assert "percentile_cont(0.90) WITHIN GROUP (ORDER BY annual_salary)" in str(statement)
+        assert "GROUPING SETS" in str(statement)
+        hydrate.assert_not_called()
+
+    def _service_with_rows(self, rows):
+        session = Mock(spec=Session)
+        session.query.return_value.filter.return_value.all.return_value = rows
+        return MarketAggregationService(session)
+
+    def test_location_row_preferred(self):
+        """Test a well-populated location row is used."""
+        service = self._service_with_rows([make_aggregate("central", 8), make_aggregate("*", 40)])
+
+        assert service.get_aggregate("Human Resources", "my_careers_future", "Central").location == "central"
+
+    def test_sparse_location_falls_back_to_all(self):
+        """Test a thin location row falls back to all locations."""
+        service = self._service_with_rows([make_aggregate("central", 2), make_aggregate("*", 40)])
+
+        assert service.get_aggregate("Human Resources", "my_careers_future", "Central").location == "*"
+
+
+class TestV3FamilyAggregates:
+    """Test V3 reads precomputed aggregates for family matches."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.mock_session = Mock(spec=Session)
+        self.service = PricingCalculationServiceV3(self.mock_session, concurrent_sources=False)
+        self.request = SimpleNamespace(job_title="HR Business Partner", location_text="Singapore")
+
+    def test_mcf_uses_family_aggregate(self):
+        """Test no listing scan when an aggregate exists."""
+        mercer_match = {"job_code": "HRM.04.005.M50", "family": "Human Resources"}
+
+        with patch(
+            "job_pricing.services.pricing_calculation_service_v3.MarketAggregationService.get_aggregate",
+            return_value=make_aggregate("*", 40),
+        ) as get_aggregate:
+            contribution = self.service._get_mycareersfuture_data(self.request, mercer_match)
+
+        get_aggregate.assert_called_once_with("Human Resources", "my_careers_future", "Singapore")
+        self.mock_session.query.assert_not_called()
+        assert contribution.sample_size == 40
+        assert contribution.match_quality == 0.9
+        assert contribution.p50 == Decimal("90000")
+        assert len(contribution.data_points) == 40
+        assert weighted_percentiles(contribution.data_points)["p50"] == pytest.approx(90000)
+        assert contribution.recency_days == 10
+
+    def test_aggregate_points_are_capped(self):
+        """Test a large family counts like a capped listing scan."""
+        with patch(
+            "job_pricing.services.pricing_calculation_service_v3.MarketAggregationService.get_aggregate",
+            return_value=make_aggregate("*", 5000),
+        ):
+            contribution = self.service._get_glassdoor_data(
+                self.request, {"job_code": "HRM.04.005.M50", "family": "Human Resources"}
+            )
+
+        assert contribution.sample_size == 5000
+        assert len(contribution.data_points) == self.service.QUERY_LIMIT_EXTERNAL
+
+    def test_no_family_match_skips_aggregate(self):
+        """Test requests without a Mercer match do not read aggregates."""
+        assert self.service._get_family_aggregate_data(
+            "glassdoor", self.request, None, 0.85
+        ) is None
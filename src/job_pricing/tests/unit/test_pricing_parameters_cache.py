@@ -0,0 +1,157 @@
+"""
+Unit Tests for the Pricing Parameters Snapshot Cache
+
+Tests:
+- Lookups are served from the in-process snapshot (no Redis or DB calls)
+- Default fallbacks for industry and company size factors
+- invalidate_*() bumps and publishes the version; other processes reload
+  when the message arrives
+- Redis outages fall back to periodic reloads
+"""
+
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from job_pricing.services import pricing_parameters_cache
+from job_pricing.services.pricing_parameters_cache import PricingParametersCache
+
+MODULE = "job_pricing.services.pricing_parameters_cache"
+
+
+@pytest.fixture
+def repositories():
+    """Patch the pricing parameter repositories with fixed active rows."""
+    with patch(f"{MODULE}.SalaryBandRepository") as bands, \
+            patch(f"{MODULE}.IndustryAdjustmentRepository") as industries, \
+            patch(f"{MODULE}.CompanySizeFactorRepository") as sizes, \
+            patch(f"{MODULE}.SkillPremiumRepository") as skills:
+        bands.return_value.get_active_bands.return_value = [SimpleNamespace(
+            experience_level="mid", min_years=3, max_years=5,
+            salary_min_sgd=Decimal("60000"), salary_max_sgd=Decimal("90000"), currency="SGD",
+        )]
+        industries.return_value.get_active_adjustments.return_value = [
+            SimpleNamespace(industry_name="Finance", adjustment_factor=Decimal("1.15")),
+            SimpleNamespace(industry_name="default", adjustment_factor=Decimal("1.00")),
+        ]
+        sizes.return_value.get_active_factors.return_value = [
+            SimpleNamespace(size_category="1000+", adjustment_factor=Decimal("1.10")),
+        ]
+        skills.return_value.get_active_premiums.return_value = [
+            SimpleNamespace(skill_name="python", premium_percentage=Decimal("0.05")),
+            SimpleNamespace(skill_name="kubernetes", premium_percentage=Decimal("0.08")),
+        ]
+        yield SimpleNamespace(bands=bands, industries=industries, sizes=sizes, skills=skills)
+
+
+@pytest.fixture
+def redis_client():
+    client = Mock()
+    client.get.return_value = "1"
+    client.incr.return_value = 2
+    return client
+
+
+@pytest.fixture
+def cache(redis_client):
+    return PricingParametersCache(redis_client=redis_client, listen=False)
+
+
+class TestSnapshotLookups:
+    """Test lookups against the snapshot."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.session = Mock(spec=Session)
+
+    def test_lookups_do_not_hit_redis_or_database(self, cache, redis_client, repositories):
+        """Test only the first lookup loads; later ones are dict reads."""
+        for _ in range(3):
+            assert cache.get_salary_band("mid", self.session)["salary_max_sgd"] == 90000.0
+            assert cache.get_industry_adjustment("Finance", self.session) == Decimal("1.15")
+            assert cache.get_company_size_factor("1000+", self.session) == Decimal("1.10")
+            assert cache.get_skill_premiums(["Python", "Go"], self.session) == {"python": Decimal("0.05")}
+
+        assert redis_client.get.call_count == 1
+        assert repositories.bands.return_value.get_active_bands.call_count == 1
+        assert repositories.skills.return_value.get_active_premiums.call_count == 1
+
+    def test_default_factors(self, cache, repositories):
+        """Test unknown industries/sizes fall back to 'default', then 1.0."""
+        assert cache.get_industry_adjustment("Mining", self.session) == Decimal("1.00")
+        assert cache.get_company_size_factor("1-10", self.session) == Decimal("1.0")
+        assert cache.get_salary_band("principal", self.session) is None
+
+    def test_total_skill_premium_capped(self, cache, repositories):
+        """Test the premium total is capped."""
+        total = cache.calculate_total_skill_premium(
+            ["python", "kubernetes"], self.session, max_premium=Decimal("0.10")
+        )
+        assert total == Decimal("0.10")
+
+    def test_other_dates_bypass_snapshot(self, cache, repositories):
+        """Test a historical as_of_date loads parameters for that date."""
+        cache.get_salary_band("mid", self.session)
+        cache.get_salary_band("mid", self.session, as_of_date=date(2020, 1, 1))
+
+        calls = repositories.bands.return_value.get_active_bands.call_args_list
+        assert [c.args[0] for c in calls] == [date.today(), date(2020, 1, 1)]
+
+
+class TestInvalidation:
+    """Test version stamps and pub/sub invalidation."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.session = Mock(spec=Session)
+
+    def test_invalidate_publishes_new_version(self, cache, redis_client, repositories):
+        """Test invalidation bumps the version and reloads locally."""
+        cache.get_salary_band("mid", self.session)
+
+        cache.invalidate_salary_bands()
+        cache.get_salary_band("mid", self.session)
+
+        redis_client.incr.assert_called_once_with(PricingParametersCache.KEY_VERSION)
+        redis_client.publish.assert_called_once_with(PricingParametersCache.INVALIDATION_CHANNEL, "2")
+        assert cache.get_snapshot(self.session).version == "2"
+        assert repositories.bands.return_value.get_active_bands.call_count == 2
+
+    def test_message_from_other_process_triggers_reload(self, cache, repositories):
+        """Test a published version swaps the snapshot on the next lookup."""
+        first = cache.get_snapshot(self.session)
+
+        cache._on_invalidation({"type": "message", "data": "7"})
+        second = cache.get_snapshot(self.session)
+
+        assert first.version == "1"
+        assert second.version == "7"
+        assert second is not first
+        assert cache.get_snapshot(self.session) is second
+
+    def test_redis_unavailable(self, cache, redis_client, repositories):
+        """Test lookups still work, reloading once per version check."""
+        redis_client.get.side_effect = ConnectionError("redis down")
+
+        with patch.object(PricingParametersCache, "VERSION_CHECK_SECONDS", 0.0):
+            assert cache.get_industry_adjustment("Finance", self.session) == Decimal("1.15")
+            snapshot = cache.get_snapshot(self.session)
+
+        assert snapshot.version is None
+        assert repositories.industries.return_value.get_active_adjustments.call_count == 2
+
+    def test_global_instance(self, monkeypatch):
+        """Test get_pricing_cache returns a singleton."""
+        monkeypatch.setattr(pricing_parameters_cache, "_cache_instance", None)
+        with patch(f"{MODULE}.redis.from_url"):
+            assert pricing_parameters_cache.get_pricing_cache() is pricing_parameters_cache.get_pricing_cache()
@@ -0,0 +1,224 @@
+"""
+Unit Tests for the Shared Pricing Result Cache
+
+Tests:
+- PricingResult round-trips through JSON with exact Decimals
+- Keys ignore user, case and whitespace but change with the data versions
+- The data version stamp is read at most once per check interval
+- Redis failures are treated as cache misses
+- A second user is served the shared result without re-pricing
+- Results priced without skill extraction (bulk) are not shared
+"""
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from job_pricing.services.pricing_calculation_service_v3 import DataSourceContribution, PricingResult
+from job_pricing.services.pricing_result_cache import (
+    PricingResultCache,
+    dump_pricing_result,
+    load_pricing_result,
+)
+from job_pricing.services.salary_recommendation_service_v2 import SalaryRecommendationServiceV2
+
+MODULE = "job_pricing.services.pricing_result_cache"
+
+
+def make_result():
+    return PricingResult(
+        recommended_min=Decimal("70000.50"),
+        recommended_max=Decimal("95000"),
+        target_salary=Decimal("82000"),
+        p10=Decimal("60000"), p25=Decimal("70000.50"), p50=Decimal("82000"),
+        p75=Decimal("95000"), p90=Decimal("110000"),
+        confidence_score=78.5,
+        source_contributions=[DataSourceContribution(
+            source_name="mercer", weight=0.4, sample_size=120,
+            data_points=[Decimal("82000.10")], p50=Decimal("82000"), recency_days=30,
+        )],
+        alternative_scenarios={"conservative": {"min": Decimal("65000"), "max": Decimal("80000")}},
+        explanation="Based on 1 source",
+    )
+
+
+class DictRedis:
+    """Minimal in-memory stand-in for the Redis GET/SETEX calls used."""
+
+    def __init__(self):
+        self.values = {}
+        self.ttls = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def setex(self, key, ttl, value):
+        self.values[key] = value
+        self.ttls[key] = ttl
+
+
+@pytest.fixture
+def data_versions():
+    """Patch the dataset markers and parameter snapshot version."""
+    with patch.object(PricingResultCache, "_dataset_markers", return_value=(1, 2, "2026-10-01")) as markers, \
+            patch(f"{MODULE}.get_pricing_cache") as parameters:
+        parameters.return_value.get_snapshot.return_value.version = "3"
+        yield markers
+
+
+class TestSerialization:
+    """Test PricingResult JSON round-trip."""
+
+    def test_round_trip(self):
+        """Test Decimals and nested contributions survive exactly."""
+        result = make_result()
+
+        restored = load_pricing_result(dump_pricing_result(result))
+
+        assert restored == result
+        assert isinstance(restored.source_contributions[0], DataSourceContribution)
+        assert restored.alternative_scenarios["conservative"]["min"] == Decimal("65000")
+
+
+class TestResultCache:
+    """Test keys, data versions and storage."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.session = Mock(spec=Session)
+        self.redis = DictRedis()
+        self.cache = PricingResultCache(redis_client=self.redis)
+
+    def test_key_normalises_inputs(self, data_versions):
+        """Test equivalent inputs share a key and different ones do not."""
+        key = self.cache.cache_key(self.session, "HR Manager", "Singapore", "Leads HR")
+
+        assert key == self.cache.cache_key(self.session, "  hr   manager", "SINGAPORE", "Leads  HR ")
+        assert key != self.cache.cache_key(self.session, "HR Manager", "Singapore", "Leads payroll")
+        assert data_versions.call_count == 1
+
+    def test_key_changes_with_data_versions(self, data_versions):
+        """Test a data load yields a new key once the stamp is re-read."""
+        with patch.object(PricingResultCache, "VERSION_CHECK_SECONDS", 0.0):
+            before = self.cache.cache_key(self.session, "HR Manager", "Singapore")
+            data_versions.return_value = (1, 3, "2026-10-02")
+            after = self.cache.cache_key(self.session, "HR Manager", "Singapore")
+
+        assert before != after
+
+    def test_stamp_counts_rows(self):
+        """Test deletions change the stamp (row counts next to latest timestamps)."""
+        self.session.query.return_value.one.return_value = ()
+
+        PricingResultCache._dataset_markers(self.session)
+
+        markers = " ".join(str(column) for column in self.session.query.call_args[0])
+        for table in ("mercer_job_library", "mercer_market_data", "scraped_job_listings",
+                      "scraped_salary_aggregates", "internal_employees", "applicants"):
+            assert f"count({table}.id)" in markers
+
+    def test_put_and_get(self):
+        """Test entries are stored with the given TTL and restored."""
+        self.cache.put("k", make_result(), {"job_code": "HRM.04"}, {"skills_extracted": 0, "top_skills": []}, 3600)
+
+        entry = self.cache.get("k")
+
+        assert self.redis.ttls["k"] == 3600
+        assert entry["pricing_result"] == make_result()
+        assert entry["mercer_match"] == {"job_code": "HRM.04"}
+        assert datetime.fromisoformat(entry["expires_at"]) > datetime.now(timezone.utc)
+        assert self.cache.get("missing") is None
+
+    def test_redis_errors_are_misses(self):
+        """Test a failing Redis does not fail pricing."""
+        client = Mock()
+        client.get.side_effect = ConnectionError("redis down")
+        client.setex.side_effect = ConnectionError("redis down")
+        cache = PricingResultCache(redis_client=client)
+
+        cache.put("k", make_result(), None, {}, 3600)
+        assert cache.get("k") is None
+
+
+class TestSharedRecommendation:
+    """Test SalaryRecommendationServiceV2 with the shared cache."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.session = Mock(spec=Session)
+        with patch("job_pricing.services.salary_recommendation_service_v2.PricingCalculationServiceV3"), \
+                patch("job_pricing.services.salary_recommendation_service_v2.SkillExtractionService"), \
+                patch("job_pricing.services.salary_recommendation_service_v2.JobMatchingService"), \
+                patch("job_pricing.services.salary_recommendation_service_v2.JobPricingRepository"):
+            self.service = SalaryRecommendationServiceV2(self.session)
+        self.service.result_cache = PricingResultCache(redis_client=DictRedis())
+
+        self.service.pricing_service.calculate_pricing.return_value = make_result()
+        self.service.skill_service.extract_skills.return_value = [
+            SimpleNamespace(skill_name="Payroll", skill_category="HR", match_confidence=0.9)
+        ]
+        self.service.matching_service.find_best_match.return_value = {"job_code": "HRM.04", "job_title": "HR Manager"}
+
+        self.requests = {}
+        self.service._find_or_create_request = Mock(side_effect=self.find_or_create)
+        self.service._get_cached_result = Mock(return_value=None)
+        self.service._cleanup_old_versions = Mock()
+        self.service._save_result = Mock(side_effect=self.save_result)
+
+    def find_or_create(self, request_hash, job_title, location, user_id, job_description="", user_email=None):
+        return self.requests.setdefault(request_hash, SimpleNamespace(
+            id=len(self.requests) + 1, job_title=job_title, location_text=location,
+            job_description=job_description, status="pending",
+        ))
+
+    def save_result(self, request, pricing_result, mercer_match=None, expires_at=None):
+        now = datetime.now(timezone.utc)
+        return SimpleNamespace(
+            id=request.id, request=request, version=1, calculated_at=now, created_at=now,
+            expires_at=expires_at or now + timedelta(hours=24), cache_hit=False,
+        )
+
+    def test_second_user_served_without_repricing(self, data_versions):
+        """Test per-user requests stay separate but pricing runs once."""
+        first = self.service.calculate_recommendation("HR Manager", "Singapore", user_id=1, job_description="Payroll")
+        second = self.service.calculate_recommendation("hr manager", "Singapore", user_id=2, job_description="Payroll")
+
+        assert len(self.requests) == 2
+        assert self.service.pricing_service.calculate_pricing.call_count == 1
+        assert self.service.skill_service.extract_skills.call_count == 1
+        assert self.service.matching_service.find_best_match.call_count == 1
+
+        assert second["target_salary"] == first["target_salary"] == 82000.0
+        assert second["top_skills"] == first["top_skills"]
+        assert second["mercer_match"]["job_code"] == "HRM.04"
+        assert second["metadata"]["shared_cache"] is True
+        assert second["metadata"]["from_cache"] is True
+        assert self.service._save_result.call_count == 2
+
+    def test_force_refresh_reprices(self, data_versions):
+        """Test force_refresh bypasses the shared result."""
+        self.service.calculate_recommendation("HR Manager", "Singapore", user_id=1)
+        self.service.calculate_recommendation("HR Manager", "Singapore", user_id=2, force_refresh=True)
+
+        assert self.service.pricing_service.calculate_pricing.call_count == 2
+
+    def test_bulk_results_are_not_shared(self, data_versions):
+        """Test results priced without skill extraction do not fill the shared cache."""
+        request = self.find_or_create("bulk", "HR Manager", "Singapore", user_id=1, job_description="Payroll")
+
+        self.service._price_and_save(request, {"job_code": "HRM.04"}, None)
+        response = self.service.calculate_recommendation("HR Manager", "Singapore", user_id=2, job_description="Payroll")
+
+        assert self.service.pricing_service.calculate_pricing.call_count == 2
+        assert response["skills_extracted"] == 1
+        assert "shared_cache" not in response["metadata"]
@@ -0,0 +1,193 @@
+"""
+Unit Tests for concurrent source gathering in PricingCalculationServiceV3
+
+Tests:
+- Sources run in parallel and keep aggregation order
+- A source that misses the deadline is treated as missing
+- Time queued behind other requests does not count against the deadline
+- Failing sources do not fail the whole gather
+- Serial fallback for sessions bound to a connection
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy.orm import Session
+
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from job_pricing.services import pricing_calculation_service_v3
+from job_pricing.services.pricing_calculation_service_v3 import (
+    PricingCalculationServiceV3,
+    DataSourceContribution,
+)
+
+
+def make_contribution(source_name):
+    return DataSourceContribution(
+        source_name=source_name,
+        weight=PricingCalculationServiceV3.WEIGHTS[source_name],
+        sample_size=10,
+        data_points=[],
+        p10=None, p25=None, p50=None, p75=None, p90=None,
+        recency_days=30,
+        match_quality=0.9,
+    )
+
+
+def make_fetcher(source_name, delay=0.0, fail=False, calls=None):
+    def fetch(self, request, mercer_match=None):
+        if calls is not None:
+            calls.append((source_name, threading.current_thread().name, self.session))
+        time.sleep(delay)
+        if fail:
+            raise RuntimeError("connection lost")
+        return make_contribution(source_name)
+    return fetch
+
+
+@pytest.fixture
+def patch_fetchers(monkeypatch):
+    """Replace the five source fetchers with fakes."""
+    def apply(delays=None, failing=(), calls=None):
+        delays = delays or {}
+        for source_name, method_name, _ in PricingCalculationServiceV3.SOURCE_FETCHERS:
+            monkeypatch.setattr(
+                PricingCalculationServiceV3,
+                method_name,
+                make_fetcher(source_name, delays.get(source_name, 0.0), source_name in failing, calls),
+            )
+    return apply
+
+
+def make_session_factory(sessions):
+    def factory():
+        session = Mock(spec=Session)
+        session.get_bind.return_value.dialect.name = "sqlite"
+        sessions.append(session)
+        return session
+    return factory
+
+
+class TestConcurrentGathering:
+    """Test parallel source queries with a per-source deadline."""
+
+    def test_sources_run_in_parallel_in_stable_order(self, patch_fetchers):
+        calls = []
+        sessions = []
+        patch_fetchers(delays={"mercer": 0.2, "glassdoor": 0.2, "applicants": 0.2}, calls=calls)
+        service = PricingCalculationServiceV3(
+            Mock(spec=Session),
+            concurrent_sources=True,
+            source_timeout=2.0,
+            session_factory=make_session_factory(sessions),
+        )
+
+        start = time.monotonic()
+        contributions = service._gather_all_sources(SimpleNamespace(job_title="Data Engineer"), None)
+        elapsed = time.monotonic() - start
+
+        assert [c.source_name for c in contributions] == [
+            "mercer", "my_careers_future", "glassdoor", "internal_hris", "applicants"
+        ]
+        assert elapsed < 0.5
+        # Every source used its own session, never the caller's
+        assert {id(session) for _, _, session in calls} == {id(s) for s in sessions}
+        assert all(s.close.called for s in sessions)
+
+    def test_slow_source_treated_as_missing(self, patch_fetchers):
+        patch_fetchers(delays={"glassdoor": 1.0})
+        service = PricingCalculationServiceV3(
+            Mock(spec=Session),
+            concurrent_sources=True,
+            source_timeout=0.2,
+            session_factory=make_session_factory([]),
+        )
+
+        start = time.monotonic()
+        contributions = service._gather_all_sources(SimpleNamespace(job_title="Data Engineer"), None)
+
+        assert time.monotonic() - start < 0.8
+        assert "glassdoor" not in [c.source_name for c in contributions]
+        assert len(contributions) == 4
+
+    def test_concurrent_requests_do_not_drop_queued_sources(self, patch_fetchers, monkeypatch):
+        """Sources waiting for a pool thread keep their full deadline."""
+        patch_fetchers(delays={name: 0.1 for name, _, _ in PricingCalculationServiceV3.SOURCE_FETCHERS})
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pricing-source-test")
+        monkeypatch.setattr(pricing_calculation_service_v3, "_source_executor", executor)
+
+        results = {}
+
+        def price(request_number):
+            service = PricingCalculationServiceV3(
+                Mock(spec=Session),
+                concurrent_sources=True,
+                source_timeout=0.3,
+                session_factory=make_session_factory([]),
+            )
+            contributions = service._gather_all_sources(SimpleNamespace(job_title="Data Engineer"), None)
+            results[request_number] = [c.source_name for c in contributions]
+
+        # 4 requests x 5 sources on 2 threads: the last sources queue ~1s,
+        # well past the 0.3s per-source deadline
+        requests = [threading.Thread(target=price, args=(n,)) for n in range(4)]
+        try:
+            for thread in requests:
+                thread.start()
+            for thread in requests:
+                thread.join()
+        finally:
+            executor.shutdown(wait=True)
+
+        expected = [name for name, _, _ in PricingCalculationServiceV3.SOURCE_FETCHERS]
+        assert results == {n: expected for n in range(4)}
+
+    def test_failing_source_treated_as_missing(self, patch_fetchers):
+        patch_fetchers(failing={"internal_hris"})
+        service = PricingCalculationServiceV3(
+            Mock(spec=Session),
+            concurrent_sources=True,
+            session_factory=make_session_factory([]),
+        )
+
+        contributions = service._gather_all_sources(SimpleNamespace(job_title="Data Engineer"), None)
+
+        assert [c.source_name for c in contributions] == [
+            "mercer", "my_careers_future", "glassdoor", "applicants"
+        ]
+
+
+class TestSerialFallback:
+    """Test when sources are gathered on the caller's session."""
+
+    def test_connection_bound_session_is_serial(self, patch_fetchers):
+        calls = []
+        patch_fetchers(calls=calls)
+        session = Mock(spec=Session)
+        session.get_bind.return_value = Mock()  # Connection, not Engine
+
+        service = PricingCalculationServiceV3(session)
+        contributions = service._gather_all_sources(SimpleNamespace(job_title="Data Engineer"), None)
+
+        assert service.concurrent_sources is False
+        assert len(contributions) == 5
+        assert all(s is session for _, _, s in calls)
+        assert {thread for _, thread, _ in calls} == {threading.current_thread().name}
+
+    def test_concurrency_can_be_disabled(self, patch_fetchers):
+        service = PricingCalculationServiceV3(
+            Mock(spec=Session),
+            concurrent_sources=False,
+            session_factory=make_session_factory([]),
+        )
+
+        assert service.concurrent_sources is False
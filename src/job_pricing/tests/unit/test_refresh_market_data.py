@@ -203,9 +203,10 @@ class TestRefreshMarketDataTask:
         # Verify loader was configured correctly
         mock_mercer_loader.assert_called_once_with(
             session=mock_db_session,
-            batch_size=100,
+            batch_size=1000,
             continue_on_error=True,
-            show_progress=False
+            show_progress=False,
+            bulk=True
         )
 
     @patch('job_pricing.core.database.get_db')
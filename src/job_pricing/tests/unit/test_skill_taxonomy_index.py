@@ -0,0 +1,119 @@
+"""
+Unit Tests for the SSG Skill Taxonomy Index
+
+Tests:
+- Trigrams and similarity match pg_trgm
+- Batch skill matching (exact, near-exact, fuzzy, none) without queries
+- Process-wide index is rebuilt when ssg_tsc changes
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from job_pricing.models import SSGTSC
+from job_pricing.services import skill_taxonomy_index
+from job_pricing.services.skill_matching_service import SkillMatchingService
+from job_pricing.services.skill_taxonomy_index import (
+    SkillTaxonomyIndex,
+    get_skill_taxonomy_index,
+    trigrams,
+)
+
+
+def make_index(*titles):
+    return SkillTaxonomyIndex([
+        SSGTSC(id=i, tsc_code=f"TSC-{i}", tsc_title=title, skill_category="Technical")
+        for i, title in enumerate(titles, 1)
+    ])
+
+
+class TestTrigramSimilarity:
+    """Test pg_trgm compatible trigram similarity."""
+
+    def test_trigrams(self):
+        """Test words are padded and lowercased like pg_trgm."""
+        assert trigrams("Word") == {"  w", " wo", "wor", "ord", "rd "}
+        assert trigrams("a-b") == {"  a", " a ", "  b", " b "}
+
+    def test_similarity_matches_pg_trgm(self):
+        """Test similarity('word', 'two words') from the pg_trgm docs."""
+        index = make_index("two words", "unrelated")
+
+        scores = index.similarities(["word"])
+
+        assert scores.shape == (1, 2)
+        assert scores[0, 0] == pytest.approx(4 / 11)
+        assert scores[0, 1] == 0.0
+
+
+class TestBatchSkillMatching:
+    """Test SkillMatchingService against the in-process index."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.session = Mock(spec=Session)
+        self.index = make_index("Data Analytics", "Python Programming", "Stakeholder Management")
+        self.service = SkillMatchingService(self.session, index=self.index)
+
+    def test_batch_match(self):
+        """Test confidence semantics for each strategy."""
+        matches = self.service.match_skills_batch([
+            ("data analytics", None),
+            ("Stakeholder Managemen", None),
+            ("python programs", None),
+            ("Underwater Welding", "Trade"),
+        ])
+
+        assert [(m.match_method, m.matched_tsc_code) for m in matches] == [
+            ("exact", "TSC-1"),
+            ("exact", "TSC-3"),
+            ("fuzzy", "TSC-2"),
+            ("none", None),
+        ]
+        assert matches[0].confidence == 1.0
+        assert matches[1].confidence == 0.95
+        assert 0.3 <= matches[2].confidence < 0.95
+        assert matches[3].skill_name == "Underwater Welding"
+        assert matches[3].skill_category == "Trade"
+        self.session.query.assert_not_called()
+        self.session.execute.assert_not_called()
+
+    def test_single_skill(self):
+        """Test match_skill uses the same path."""
+        assert self.service.match_skill("DATA ANALYTICS").matched_tsc_title == "Data Analytics"
+
+
+class TestProcessWideIndex:
+    """Test signature-based refresh of the shared index."""
+
+    def teardown_method(self):
+        skill_taxonomy_index.invalidate_skill_taxonomy_index()
+
+    def test_rebuilt_when_table_changes(self):
+        """Test the index is reloaded only when the signature changes."""
+        signatures = iter([(1, 1, "t1"), (2, 2, "t2")])
+        loads = []
+
+        def load(session):
+            loads.append(session)
+            return SkillTaxonomyIndex([], signature=(len(loads), len(loads), f"t{len(loads)}"))
+
+        with patch.object(SkillTaxonomyIndex, "table_signature", side_effect=lambda s: next(signatures)), \
+                patch.object(SkillTaxonomyIndex, "load", side_effect=load), \
+                patch.object(skill_taxonomy_index, "REFRESH_CHECK_SECONDS", 0.0):
+            session = Mock(spec=Session)
+            first = get_skill_taxonomy_index(session)   # build
+            second = get_skill_taxonomy_index(session)  # unchanged signature
+            third = get_skill_taxonomy_index(session)   # changed signature
+
+        assert first is second
+        assert third is not second
+        assert len(loads) == 2
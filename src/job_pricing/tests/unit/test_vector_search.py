@@ -0,0 +1,104 @@
+"""
+Unit Tests for Mercer Vector Search
+
+Tests:
+- Query vectors are bound parameters (statement text never changes)
+- Family/level filters rank the filtered subset exactly
+- ANN settings are applied once per pooled connection, not per query
+"""
+
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from job_pricing.services.job_matching_service import (
+    SIMILAR_JOBS_FILTERED_SQL,
+    SIMILAR_JOBS_SQL,
+    JobMatchingService,
+)
+from job_pricing.utils.db_optimization import configure_vector_search
+
+
+@pytest.fixture
+def matching_service(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    service = JobMatchingService(Mock(spec=Session))
+    service.session.execute.return_value.fetchall.return_value = [
+        (11, "HRM.01", "HR Manager", "", "Human Resources", "HRBP", "M4", 0.9),
+    ]
+    return service
+
+
+def compile_sql(statement):
+    return str(statement.compile(dialect=postgresql.psycopg2.dialect()))
+
+
+class TestFindSimilarJobs:
+    """Test the single-query vector search."""
+
+    def test_vector_is_bound(self, matching_service):
+        """Test the same statement runs for different query vectors."""
+        embeddings = iter([[0.1] * 1536, [0.2] * 1536])
+        matching_service.generate_query_embedding = Mock(side_effect=lambda *args: next(embeddings))
+
+        matching_service.find_similar_jobs("HR Manager", top_k=3)
+        matches = matching_service.find_similar_jobs("Payroll Lead", top_k=3)
+
+        calls = matching_service.session.execute.call_args_list
+        assert len(calls) == 2  # no SET statements per query
+        assert calls[0].args[0] is calls[1].args[0] is SIMILAR_JOBS_SQL
+        assert calls[1].args[1] == {"embedding": [0.2] * 1536, "limit": 3}
+        assert "embedding <=> %(embedding)s" in compile_sql(SIMILAR_JOBS_SQL)
+        assert matches[0]["job_code"] == "HRM.01"
+        assert matches[0]["similarity_score"] == 0.9
+
+    def test_filters_rank_subset_exactly(self, matching_service):
+        """Test filtered searches select the subset before ranking."""
+        matching_service.generate_query_embedding = Mock(return_value=[0.1] * 1536)
+
+        matching_service.find_similar_jobs("HR Manager", job_family="Human Resources", top_k=5)
+
+        statement, params = matching_service.session.execute.call_args.args
+        assert statement is SIMILAR_JOBS_FILTERED_SQL
+        assert params == {
+            "embedding": [0.1] * 1536, "limit": 5,
+            "family": "Human Resources", "career_level": None,
+        }
+        assert "WITH candidates AS MATERIALIZED" in compile_sql(SIMILAR_JOBS_FILTERED_SQL)
+
+
+class TestConnectionSettings:
+    """Test per-connection ANN settings."""
+
+    def test_set_on_connect(self):
+        """Test settings are applied in autocommit mode on each new connection."""
+        engine = create_engine("postgresql+psycopg2://user@localhost/db")
+        configure_vector_search(engine, hnsw_ef_search=80, ivfflat_probes=10)
+
+        dbapi_conn = Mock(autocommit=False)
+        cursor = dbapi_conn.cursor.return_value
+        cursor.execute.side_effect = lambda sql: statements.append((sql, dbapi_conn.autocommit))
+        statements = []
+
+        [listener] = [fn for fn in engine.pool.dispatch.connect if fn.__name__ == "set_vector_search_params"]
+        listener(dbapi_conn, Mock())
+
+        assert statements == [("SET hnsw.ef_search = 80", True), ("SET ivfflat.probes = 10", True)]
+        assert dbapi_conn.autocommit is False
+
+    def test_other_dialects_untouched(self):
+        """Test non-PostgreSQL engines get no listener."""
+        engine = create_engine("sqlite://")
+        listeners = len(engine.pool.dispatch.connect)
+        configure_vector_search(engine, hnsw_ef_search=80, ivfflat_probes=10)
+
+        assert len(engine.pool.dispatch.connect) == listeners
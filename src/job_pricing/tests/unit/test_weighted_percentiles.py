@@ -0,0 +1,171 @@
+"""
+Unit Tests for weighted percentile calculation
+
+Tests:
+- Equal weights match statistics.quantiles (exclusive method)
+- Fractional weights shift percentiles towards heavier points
+- Small samples and edge cases
+- Quantile sketches reproduce the percentiles they are built from
+- V3 aggregation uses exact per-point weights
+"""
+
+import statistics
+from decimal import Decimal
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy.orm import Session
+
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from job_pricing.utils.weighted_percentiles import (
+    quantile_sketch,
+    weighted_percentiles,
+    weighted_quantiles,
+)
+from job_pricing.services.pricing_calculation_service_v3 import (
+    PricingCalculationServiceV3,
+    DataSourceContribution,
+)
+
+
+class TestWeightedQuantiles:
+    """Test the weighted quantile definition."""
+
+    def test_equal_weights_match_statistics_quantiles(self):
+        """Test equal weights reproduce statistics.quantiles."""
+        data = [4200, 4800, 5100, 5600, 6000, 6300, 6500, 7100, 7600, 8000, 8800, 9400]
+        deciles = statistics.quantiles(data, n=10)
+        quartiles = statistics.quantiles(data, n=4)
+
+        result = weighted_percentiles(data)
+
+        assert result["p10"] == pytest.approx(deciles[0])
+        assert result["p25"] == pytest.approx(quartiles[0])
+        assert result["p50"] == pytest.approx(statistics.median(data))
+        assert result["p75"] == pytest.approx(quartiles[2])
+        assert result["p90"] == pytest.approx(deciles[8])
+
+    def test_unsorted_input(self):
+        """Test values do not need to be sorted."""
+        assert weighted_percentiles([9, 1, 5])["p50"] == 5
+
+    def test_heavier_points_pull_percentiles(self):
+        """Test fractional weights move the median towards heavier points."""
+        values = [5000, 6000, 7000, 8000]
+
+        light = weighted_quantiles(values, [0.1, 0.1, 0.1, 0.1], [0.5])[0]
+        heavy_top = weighted_quantiles(values, [0.1, 0.1, 0.1, 0.34], [0.5])[0]
+
+        assert light == pytest.approx(6500)
+        assert heavy_top > light
+
+    def test_weights_are_scale_invariant(self):
+        """Test multiplying all weights by a constant changes nothing."""
+        values = [3000, 4500, 5200, 6100, 9000]
+        weights = [0.34, 0.1875, 0.1875, 0.12, 0.04]
+
+        assert weighted_quantiles(values, weights, [0.1, 0.5, 0.9]) == pytest.approx(
+            weighted_quantiles(values, [w * 100 for w in weights], [0.1, 0.5, 0.9])
+        )
+
+    def test_small_samples_clamp_to_observed_range(self):
+        """Test outer percentiles never extrapolate past min/max."""
+        assert weighted_percentiles([5000]) == {
+            "p10": 5000, "p25": 5000, "p50": 5000, "p75": 5000, "p90": 5000
+        }
+        assert weighted_percentiles([4000, 6000]) == {
+            "p10": 4000, "p25": 4000, "p50": 5000, "p75": 6000, "p90": 6000
+        }
+
+    def test_zero_weight_points_ignored(self):
+        """Test points with zero weight do not contribute."""
+        assert weighted_percentiles([1000, 5000, 6000, 7000], [0, 1, 1, 1]) == \
+            weighted_percentiles([5000, 6000, 7000])
+
+    def test_invalid_input(self):
+        """Test error handling."""
+        with pytest.raises(ValueError):
+            weighted_quantiles([], None, [0.5])
+        with pytest.raises(ValueError):
+            weighted_quantiles([1, 2], [1], [0.5])
+        with pytest.raises(ValueError):
+            weighted_quantiles([1, 2], [1, -1], [0.5])
+
+
+class TestQuantileSketch:
+    """Test point sketches of a distribution given by its percentiles."""
+
+    PERCENTILES = {"p10": 60000, "p25": 70000, "p50": 80000, "p75": 95000, "p90": 120000}
+
+    def test_sketch_reproduces_percentiles(self):
+        """Test the sketch's percentiles are the input percentiles."""
+        sketch = quantile_sketch(self.PERCENTILES, 99)
+
+        assert len(sketch) == 99
+        assert weighted_percentiles(sketch) == pytest.approx(self.PERCENTILES)
+
+    def test_sketch_is_not_wider_than_the_input(self):
+        """Test the sketch stays within P10-P90, unlike five equal points."""
+        sketch = quantile_sketch(self.PERCENTILES, 40)
+        five_points = weighted_percentiles(list(self.PERCENTILES.values()))
+
+        assert sketch.min() == 60000 and sketch.max() == 120000
+        assert five_points["p25"] < weighted_percentiles(sketch)["p25"]
+
+    def test_invalid_input(self):
+        """Test error handling."""
+        with pytest.raises(ValueError):
+            quantile_sketch({}, 10)
+        with pytest.raises(ValueError):
+            quantile_sketch(self.PERCENTILES, 0)
+
+
+class TestV3WeightedAggregation:
+    """Test V3 aggregation with exact weights."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.service = PricingCalculationServiceV3(Mock(spec=Session), concurrent_sources=False)
+
+    def make_contribution(self, source_name, points, match_quality):
+        return DataSourceContribution(
+            source_name=source_name,
+            weight=PricingCalculationServiceV3.WEIGHTS[source_name],
+            sample_size=len(points),
+            data_points=[Decimal(p) for p in points],
+            match_quality=match_quality,
+        )
+
+    def test_weights_are_exact_not_repeated(self):
+        """Test each point appears once with weight * match_quality."""
+        contributions = [
+            self.make_contribution("mercer", [6000, 7000], 0.85),
+            self.make_contribution("my_careers_future", [5000, 5500, 9000], 0.75),
+            self.make_contribution("glassdoor", [1000], 0.5),  # Below threshold
+        ]
+
+        values, weights = self.service._apply_weights_and_aggregate(contributions)
+
+        assert values.tolist() == [6000, 7000, 5000, 5500, 9000]
+        assert weights.tolist() == pytest.approx([0.34, 0.34, 0.1875, 0.1875, 0.1875])
+
+    def test_percentiles_are_decimals(self):
+        """Test percentiles come back as Decimal in P10-P90 order."""
+        percentiles = self.service._calculate_percentiles(
+            [Decimal("5000"), Decimal("6000"), Decimal("7000"), Decimal("8000")],
+            [0.34, 0.34, 0.1875, 0.1875],
+        )
+
+        assert list(percentiles) == ["p10", "p25", "p50", "p75", "p90"]
+        assert all(isinstance(v, Decimal) for v in percentiles.values())
+        assert percentiles["p10"] <= percentiles["p50"] <= percentiles["p90"]
+
+    def test_no_data_points(self):
+        """Test empty input raises."""
+        with pytest.raises(ValueError):
+            self.service._calculate_percentiles([])
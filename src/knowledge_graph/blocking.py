@@ -0,0 +1,131 @@
+"""
+Candidate Blocking for Relationship Inference
+
+Generates the product pairs worth evaluating instead of all n^2/2 pairs:
+- Blocks: products sharing a key (brand, category, voltage). Small blocks
+  contribute all their pairs; blocks larger than max_block_size contribute
+  each member's nearest neighbours within the block.
+- Nearest neighbours: top-k rows by cosine similarity over L2-normalised
+  vectors (TF-IDF or embeddings), computed in row chunks.
+
+Pairs are returned as two index arrays (i, j) with i < j, de-duplicated.
+"""
+
+from typing import Iterable, Optional, Tuple, Union
+
+import numpy as np
+from scipy import sparse
+
+Pairs = Tuple[np.ndarray, np.ndarray]
+Vectors = Union[np.ndarray, sparse.csr_matrix]
+
+EMPTY_PAIRS: Pairs = (np.array([], dtype=np.int64), np.array([], dtype=np.int64))
+
+
+def encode_keys(values: Iterable[Optional[str]]) -> np.ndarray:
+    """Integer code per value (case-insensitive); -1 for missing values"""
+    codes = {}
+    result = []
+    for value in values:
+        if not value:
+            result.append(-1)
+            continue
+        key = str(value).lower()
+        result.append(codes.setdefault(key, len(codes)))
+    return np.array(result, dtype=np.int64)
+
+
+def merge_pairs(n: int, *pair_sets: Pairs) -> Pairs:
+    """Union of pair sets as (i, j) with i < j, without duplicates or self-pairs"""
+    sets = [pairs for pairs in pair_sets if len(pairs[0])]
+    if not sets:
+        return EMPTY_PAIRS
+
+    i = np.concatenate([pairs[0] for pairs in sets]).astype(np.int64)
+    j = np.concatenate([pairs[1] for pairs in sets]).astype(np.int64)
+    low, high = np.minimum(i, j), np.maximum(i, j)
+    keep = low != high
+
+    keys = np.unique(low[keep] * n + high[keep])
+    return keys // n, keys % n
+
+
+def nearest_neighbor_pairs(
+    vectors: Vectors,
+    k: int,
+    min_similarity: float = 0.0,
+    chunk_size: int = 256
+) -> Pairs:
+    """
+    Each row paired with its k most similar rows
+
+    Args:
+        vectors: L2-normalised rows (dense array or CSR)
+        k: Neighbours per row
+        min_similarity: Neighbours at or below this similarity are dropped
+        chunk_size: Rows per similarity block (memory is chunk_size x n)
+    """
+    n = vectors.shape[0]
+    k = min(k, n - 1)
+    if k <= 0:
+        return EMPTY_PAIRS
+
+    transposed = vectors.T
+    rows, cols = [], []
+    for start in range(0, n, chunk_size):
+        end = min(start + chunk_size, n)
+        block = vectors[start:end] @ transposed
+        block = block.toarray() if sparse.issparse(block) else np.asarray(block)
+        block = block.astype(np.float32, copy=False)
+        block[np.arange(end - start), np.arange(start, end)] = -np.inf
+
+        top = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        similarity = np.take_along_axis(block, top, axis=1)
+        keep = similarity > min_similarity
+
+        rows.append(np.repeat(np.arange(start, end), k)[keep.ravel()])
+        cols.append(top[keep])
+
+    return np.concatenate(rows), np.concatenate(cols)
+
+
+def block_pairs(
+    codes: np.ndarray,
+    vectors: Vectors,
+    max_block_size: int = 200,
+    k: int = 10
+) -> Pairs:
+    """
+    Pairs of products that share a block code (codes < 0 are not blocked)
+
+    Blocks up to max_block_size yield all their pairs; larger blocks yield
+    each member's k nearest neighbours within the block.
+    """
+    valid = np.flatnonzero(codes >= 0)
+    if len(valid) < 2:
+        return EMPTY_PAIRS
+
+    order = valid[np.argsort(codes[valid], kind='stable')]
+    boundaries = np.flatnonzero(np.diff(codes[order])) + 1
+
+    rows, cols = [], []
+    for members in np.split(order, boundaries):
+        if len(members) < 2:
+            continue
+        if len(members) <= max_block_size:
+            a, b = np.triu_indices(len(members), 1)
+        else:
+            a, b = nearest_neighbor_pairs(vectors[members], k)
+        rows.append(members[a])
+        cols.append(members[b])
+
+    if not rows:
+        return EMPTY_PAIRS
+    return np.concatenate(rows), np.concatenate(cols)
+
+
+def row_dot(vectors: Vectors, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+    """Dot product of rows i[k] and j[k] for every k (cosine for normalised rows)"""
+    if sparse.issparse(vectors):
+        return np.asarray(vectors[i].multiply(vectors[j]).sum(axis=1)).ravel()
+    return np.einsum('ij,ij->i', vectors[i], vectors[j])
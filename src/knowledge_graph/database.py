@@ -398,6 +398,57 @@ class GraphDatabase:
             
         return False
     
+    def bulk_create_relationships(
+        self,
+        relationships: List[SemanticRelationship],
+        batch_size: int = 1000
+    ) -> Dict[str, int]:
+        """
+        Bulk create relationships with batched UNWIND queries.
+        
+        Relationship types cannot be query parameters, so relationships are
+        grouped by type and each group is written in batches of batch_size.
+        
+        Args:
+            relationships: SemanticRelationship instances
+            batch_size: Relationships per query
+            
+        Returns:
+            Number of relationships written, by relationship type
+        """
+        by_type: Dict[str, List[Dict[str, Any]]] = {}
+        for relationship in relationships:
+            by_type.setdefault(relationship.relationship_type.value, []).append({
+                "from_id": relationship.from_product_id,
+                "to_id": relationship.to_product_id,
+                "properties": relationship.to_neo4j_properties()
+            })
+        
+        created: Dict[str, int] = {}
+        
+        try:
+            with self.conn.session() as session:
+                for rel_type, rows in by_type.items():
+                    query = f"""
+                    UNWIND $rows as row
+                    MATCH (from:Product {{product_id: row.from_id}})
+                    MATCH (to:Product {{product_id: row.to_id}})
+                    MERGE (from)-[r:{rel_type}]->(to)
+                    SET r += row.properties
+                    RETURN count(r) as created
+                    """
+                    
+                    for start in range(0, len(rows), batch_size):
+                        result = session.run(query, {"rows": rows[start:start + batch_size]}).single()
+                        created[rel_type] = created.get(rel_type, 0) + (result["created"] if result else 0)
+                
+                self.logger.info(f"Bulk created {sum(created.values())} relationships")
+                
+        except Exception as e:
+            self.logger.error(f"Bulk relationship creation failed: {e}")
+            
+        return created
+    
     def get_product_relationships(
         self, 
         product_id: int, 
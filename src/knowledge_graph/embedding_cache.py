@@ -0,0 +1,240 @@
+"""
+Embedding Cache
+
+Content-hash keyed cache for the embeddings used by semantic search and
+relationship inference, so repeated queries and unchanged product texts are
+not re-embedded.
+
+- Key: (model, dimensions, sha256(normalised text)); normalisation is Unicode
+  NFC plus whitespace collapsing, so cosmetic differences still hit
+- Tier 1: process-wide LRU of float32 vectors (shared by all engines)
+- Tier 2: Redis (REDIS_URL, binary float32 values with a TTL), so embeddings
+  survive restarts; optional and fail-open
+- Lookups are batched: one round-trip per tier for a whole list of texts,
+  duplicate texts are embedded once
+
+Keys and values use the same layout as the main application's cache, so both
+share entries when they point at the same Redis.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "embedding"
+
+# Default tier sizes: 4096 x 1536 float32 is ~25 MB per process
+DEFAULT_LRU_ENTRIES = 4096
+DEFAULT_REDIS_TTL = 30 * 24 * 3600
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form of a text for hashing (NFC, collapsed whitespace)"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text or "")).strip()
+
+
+def text_hash(text: str) -> str:
+    """SHA-256 hex digest of the normalised text"""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class LRUEmbeddingTier:
+    """Thread-safe in-process LRU of embeddings keyed by (model, dimensions, hash)"""
+
+    def __init__(self, max_entries: int = DEFAULT_LRU_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+            return vector
+
+    def put(self, key: tuple, vector: np.ndarray) -> None:
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Shared by every EmbeddingCache in the process unless one is passed explicitly
+_shared_lru = LRUEmbeddingTier()
+
+
+def create_redis_client() -> Optional[Any]:
+    """redis.asyncio client for REDIS_URL (None if redis is not available)"""
+    try:
+        import redis.asyncio as aioredis
+
+        redis_url = os.getenv("REDIS_URL", "redis://:horme_redis_2024@localhost:6380/0")
+        return aioredis.from_url(redis_url)
+    except Exception as e:
+        logger.warning(f"Redis embedding cache not available: {e}")
+        return None
+
+
+class EmbeddingCache:
+    """
+    LRU + Redis embedding cache.
+
+    Usage:
+        cache = EmbeddingCache()
+        vectors = await cache.get_or_embed(
+            "text-embedding-ada-002", 1536, texts, embed_uncached_texts
+        )
+    """
+
+    def __init__(
+        self,
+        redis_client: Optional[Any] = None,
+        lru: Optional[LRUEmbeddingTier] = None,
+        redis_ttl: int = DEFAULT_REDIS_TTL,
+        use_redis: bool = True
+    ):
+        """
+        Args:
+            redis_client: redis.asyncio client returning bytes (created from
+                REDIS_URL on first use if not provided)
+            lru: In-process tier (default: the process-wide shared LRU)
+            redis_ttl: Expiry of Redis entries in seconds
+            use_redis: Set False for an LRU-only cache
+        """
+        self._redis = redis_client
+        self._use_redis = use_redis
+        self.lru = lru if lru is not None else _shared_lru
+        self.redis_ttl = redis_ttl
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def redis(self) -> Optional[Any]:
+        """Redis tier, connected lazily (None = disabled)"""
+        if self._redis is None and self._use_redis:
+            self._redis = create_redis_client()
+            self._use_redis = self._redis is not None
+        return self._redis
+
+    async def get_or_embed(
+        self,
+        model: str,
+        dimensions: int,
+        texts: Sequence[str],
+        embed: Callable[[List[str]], Awaitable[List[List[float]]]]
+    ) -> List[List[float]]:
+        """
+        Embeddings for texts, calling embed() only for texts not cached.
+
+        Args:
+            model: Embedding model name
+            dimensions: Embedding dimensions
+            texts: Texts to embed (duplicates are embedded once)
+            embed: Async provider call for the uncached texts, in order
+
+        Returns:
+            One embedding per input text, in input order
+        """
+        hashes = [text_hash(text) for text in texts]
+        found = await self.get_many(model, dimensions, hashes)
+
+        missing: Dict[str, str] = {}
+        for text, digest in zip(texts, hashes):
+            if digest not in found and digest not in missing:
+                missing[digest] = text
+
+        self.hits += len(texts) - sum(1 for digest in hashes if digest in missing)
+        self.misses += len(missing)
+
+        if missing:
+            embeddings = await embed(list(missing.values()))
+            created = {
+                digest: np.asarray(embedding, dtype=np.float32)
+                for digest, embedding in zip(missing.keys(), embeddings)
+            }
+            await self.put_many(model, dimensions, created)
+            found.update(created)
+
+        return [found[digest].tolist() for digest in hashes]
+
+    async def get_many(
+        self,
+        model: str,
+        dimensions: int,
+        hashes: Sequence[str]
+    ) -> Dict[str, np.ndarray]:
+        """Look hashes up in the LRU, then Redis; Redis hits are promoted to the LRU"""
+        found: Dict[str, np.ndarray] = {}
+        for digest in hashes:
+            vector = self.lru.get((model, dimensions, digest))
+            if vector is not None:
+                found[digest] = vector
+
+        pending = [digest for digest in dict.fromkeys(hashes) if digest not in found]
+        if not pending or self.redis is None:
+            return found
+
+        try:
+            values = await self.redis.mget(
+                [self._redis_key(model, dimensions, digest) for digest in pending]
+            )
+        except Exception as e:
+            logger.warning(f"Redis embedding cache lookup failed: {e}")
+            return found
+
+        for digest, value in zip(pending, values):
+            if value is not None:
+                vector = np.frombuffer(value, dtype=np.float32)
+                self.lru.put((model, dimensions, digest), vector)
+                found[digest] = vector
+        return found
+
+    async def put_many(
+        self,
+        model: str,
+        dimensions: int,
+        vectors: Dict[str, np.ndarray]
+    ) -> None:
+        """Store embeddings in the LRU and Redis"""
+        if not vectors:
+            return
+        for digest, vector in vectors.items():
+            self.lru.put((model, dimensions, digest), vector)
+
+        if self.redis is None:
+            return
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for digest, vector in vectors.items():
+                    pipe.setex(
+                        self._redis_key(model, dimensions, digest),
+                        self.redis_ttl,
+                        vector.tobytes()
+                    )
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Redis embedding cache write failed: {e}")
+
+    @staticmethod
+    def _redis_key(model: str, dimensions: int, digest: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:{model}:{dimensions}:{digest}"
@@ -3,28 +3,65 @@ Relationship Inference Engine
 
 This module implements AI-powered algorithms to infer product relationships
 based on specifications, descriptions, usage patterns, and domain knowledge.
+
+Full-catalogue inference blocks candidate pairs first (shared brand, category
+or voltage, TF-IDF and embedding nearest neighbours - see blocking.py),
+evaluates every rule over all candidate pairs as array operations, and writes
+accepted relationships with batched UNWIND queries.
 """
 
 import re
 import logging
 from typing import List, Dict, Any, Optional, Tuple, Set
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 import json
 from collections import defaultdict
 import numpy as np
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import openai
 
+from .blocking import (
+    Pairs, block_pairs, encode_keys, merge_pairs, nearest_neighbor_pairs, row_dot
+)
 from .database import Neo4jConnection, GraphDatabase
+from .embedding_cache import EmbeddingCache
 from .models import (
-    SemanticRelationship, RelationshipType, ConfidenceSource,
+    ProductNode, SemanticRelationship, RelationshipType, ConfidenceSource,
     BRAND_ECOSYSTEM_COMPATIBILITY, PROJECT_TOOL_REQUIREMENTS
 )
 
 logger = logging.getLogger(__name__)
 
+# Project keyword lists (project_keyword_match condition)
+PROJECT_KEYWORDS = {
+    'bathroom': ['drill', 'saw', 'tile', 'grout', 'plumbing'],
+    'kitchen': ['drill', 'saw', 'router', 'cabinet', 'countertop'],
+    'deck': ['saw', 'drill', 'level', 'framing', 'outdoor'],
+    'electrical': ['wire', 'electrical', 'circuit', 'voltage', 'amp']
+}
+
+# Keyword x project matrix: keyword presence @ matrix = project match score
+PROJECT_TERMS = sorted({keyword for keywords in PROJECT_KEYWORDS.values() for keyword in keywords})
+PROJECT_TERM_WEIGHTS = np.array([
+    [(term in keywords) / len(keywords) for keywords in PROJECT_KEYWORDS.values()]
+    for term in PROJECT_TERMS
+])
+
+# Name indicators for kit relationships (kit_in_name condition)
+KIT_KEYWORDS = ['kit', 'combo', 'set', 'bundle', 'pack']
+
+# Numeric specifications compared for upgrades; lower weight is better
+UPGRADE_SPECS = ['power', 'torque', 'speed', 'capacity', 'runtime', 'weight']
+
+SIZE_DIMENSIONS = ['length', 'width', 'height']
+
+# Embedding model for the semantic similarity rule
+EMBEDDING_MODEL = "text-embedding-ada-002"
+EMBEDDING_DIMENSIONS = 1536
+
 
 @dataclass
 class InferenceRule:
@@ -37,6 +74,31 @@ class InferenceRule:
     requires_ai: bool = False
 
 
+@dataclass
+class ProductFeatureTable:
+    """
+    Per-product features used by vectorised rule evaluation.
+
+    Row r of every array describes products[r]. Missing values are -1 in
+    code arrays and NaN in numeric arrays.
+    """
+    products: List[ProductNode]
+    brand_codes: np.ndarray
+    category_codes: np.ndarray
+    voltage_codes: np.ndarray
+    category_terms: Dict[str, np.ndarray]
+    prices: np.ndarray
+    dimensions: np.ndarray
+    specs: np.ndarray
+    is_kit: np.ndarray
+    project_terms: np.ndarray
+    text_vectors: sparse.csr_matrix
+    embeddings: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+
 class RelationshipInferenceEngine:
     """
     AI-powered engine for inferring product relationships.
@@ -79,7 +141,7 @@ class RelationshipInferenceEngine:
         
         # Caches for expensive operations
         self._product_cache = {}
-        self._embedding_cache = {}
+        self._embedding_cache = EmbeddingCache()
         
     def _initialize_inference_rules(self) -> List[InferenceRule]:
         """Initialize predefined inference rules"""
@@ -186,15 +248,24 @@ class RelationshipInferenceEngine:
         self,
         batch_size: int = 500,
         max_products: int = None,
-        min_confidence: float = 0.5
+        min_confidence: float = 0.5,
+        neighbors: int = 10,
+        max_block_size: int = 200,
+        pair_chunk_size: int = 50000
     ) -> Dict[str, int]:
         """
         Run comprehensive relationship inference on all products.
         
+        Candidate pairs come from blocking over the whole catalogue, so pairs
+        are compared regardless of where the products sit in the listing.
+        
         Args:
-            batch_size: Number of products to process in each batch
+            batch_size: Relationships written per UNWIND query
             max_products: Maximum number of products to process (for testing)
             min_confidence: Minimum confidence threshold for relationships
+            neighbors: Nearest neighbours per product (and within large blocks)
+            max_block_size: Blocks up to this size contribute all their pairs
+            pair_chunk_size: Candidate pairs evaluated per chunk
             
         Returns:
             Dictionary with counts of relationships created by type
@@ -209,17 +280,25 @@ class RelationshipInferenceEngine:
         
         logger.info(f"Running inference on {len(products)} products")
         
+        features = await self._build_feature_table(products)
+        pair_i, pair_j = self._generate_candidate_pairs(features, neighbors, max_block_size)
+        
+        total_pairs = len(products) * (len(products) - 1) // 2
+        logger.info(f"Blocking kept {len(pair_i)} of {total_pairs} product pairs")
+        
         results = defaultdict(int)
         
-        # Process in batches to manage memory
-        for i in range(0, len(products), batch_size):
-            batch = products[i:i + batch_size]
-            logger.info(f"Processing batch {i//batch_size + 1}: products {i+1}-{min(i+batch_size, len(products))}")
+        for start in range(0, len(pair_i), pair_chunk_size):
+            end = start + pair_chunk_size
+            relationships = self._infer_pair_relationships(
+                features, pair_i[start:end], pair_j[start:end], min_confidence
+            )
             
-            batch_results = await self._infer_batch_relationships(batch, min_confidence)
+            # Create relationships in Neo4j
+            created = self.graph_db.bulk_create_relationships(relationships, batch_size=batch_size)
             
             # Accumulate results
-            for rel_type, count in batch_results.items():
+            for rel_type, count in created.items():
                 results[rel_type] += count
         
         logger.info(f"Relationship inference completed: {dict(results)}")
@@ -514,7 +593,7 @@ class RelationshipInferenceEngine:
             dim2 = product2.dimensions
             
             similarities = []
-            for dim in ['length', 'width', 'height']:
+            for dim in SIZE_DIMENSIONS:
                 if dim1.get(dim) and dim2.get(dim):
                     ratio = min(dim1[dim], dim2[dim]) / max(dim1[dim], dim2[dim])
                     similarities.append(ratio)
@@ -565,9 +644,7 @@ class RelationshipInferenceEngine:
         comparisons = 0
         
         # Define numeric specification comparisons
-        numeric_specs = ['power', 'torque', 'speed', 'capacity', 'runtime', 'weight']
-        
-        for spec in numeric_specs:
+        for spec in UPGRADE_SPECS:
             val1 = self._extract_numeric_spec(product1.specifications, spec)
             val2 = self._extract_numeric_spec(product2.specifications, spec)
             
@@ -598,13 +675,11 @@ class RelationshipInferenceEngine:
     
     def _detect_kit_relationship(self, product1: Any, product2: Any) -> bool:
         """Detect if products are part of a kit"""
-        kit_keywords = ['kit', 'combo', 'set', 'bundle', 'pack']
-        
         name1 = product1.name.lower()
         name2 = product2.name.lower()
         
         # Check if either product name contains kit indicators
-        for keyword in kit_keywords:
+        for keyword in KIT_KEYWORDS:
             if keyword in name1 or keyword in name2:
                 return True
         
@@ -612,17 +687,10 @@ class RelationshipInferenceEngine:
     
     def _check_project_keywords(self, product1: Any, product2: Any) -> float:
         """Check if products match project requirements"""
-        project_keywords = {
-            'bathroom': ['drill', 'saw', 'tile', 'grout', 'plumbing'],
-            'kitchen': ['drill', 'saw', 'router', 'cabinet', 'countertop'],
-            'deck': ['saw', 'drill', 'level', 'framing', 'outdoor'],
-            'electrical': ['wire', 'electrical', 'circuit', 'voltage', 'amp']
-        }
-        
         product_text = f"{product1.name} {product2.name} {product1.description or ''} {product2.description or ''}".lower()
         
         max_score = 0.0
-        for project, keywords in project_keywords.items():
+        for project, keywords in PROJECT_KEYWORDS.items():
             matches = sum(1 for keyword in keywords if keyword in product_text)
             score = matches / len(keywords)
             max_score = max(max_score, score)
@@ -657,51 +725,306 @@ class RelationshipInferenceEngine:
     
     async def _get_embedding(self, text: str) -> Optional[List[float]]:
         """Get text embedding from OpenAI API with caching"""
-        if text in self._embedding_cache:
-            return self._embedding_cache[text]
-        
         try:
-            response = await openai.Embedding.acreate(
-                model="text-embedding-ada-002",
-                input=text
+            embeddings = await self._embedding_cache.get_or_embed(
+                EMBEDDING_MODEL, EMBEDDING_DIMENSIONS, [text], self._request_embeddings
             )
-            
-            embedding = response['data'][0]['embedding']
-            self._embedding_cache[text] = embedding
-            return embedding
+            return embeddings[0]
             
         except Exception as e:
             logger.warning(f"Embedding generation failed: {e}")
             return None
     
+    async def _request_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts with the OpenAI API (cache miss path)"""
+        response = await openai.Embedding.acreate(
+            model=EMBEDDING_MODEL,
+            input=texts
+        )
+        return [item['embedding'] for item in response['data']]
+    
     # ===========================================
     # BATCH PROCESSING METHODS
     # ===========================================
     
-    async def _infer_batch_relationships(
+    async def _build_feature_table(self, products: List[ProductNode]) -> ProductFeatureTable:
+        """Extract the features every rule needs, once per product"""
+        n = len(products)
+        
+        category_terms = {
+            term: np.array([term in str(p.category_name).lower() for p in products])
+            for rule in self.rules
+            for term in rule.conditions.get("category_contains", [])
+        }
+        
+        # Project keyword presence per product
+        project_texts = [f"{p.name} {p.description or ''}".lower() for p in products]
+        project_terms = np.array(
+            [[term in text for term in PROJECT_TERMS] for text in project_texts],
+            dtype=bool
+        ).reshape(n, len(PROJECT_TERMS))
+        
+        # Function text vectors (TF-IDF fitted once on the catalogue, L2-normalised rows)
+        function_texts = [
+            f"{p.name} {p.description or ''} {' '.join(p.keywords or [])}" for p in products
+        ]
+        try:
+            text_vectors = TfidfVectorizer(stop_words='english', max_features=50000).fit_transform(function_texts)
+        except ValueError:
+            # Empty vocabulary
+            text_vectors = sparse.csr_matrix((n, 1))
+        
+        def numeric(value: Any) -> float:
+            try:
+                return float(value) if value else np.nan
+            except (TypeError, ValueError):
+                return np.nan
+        
+        return ProductFeatureTable(
+            products=products,
+            brand_codes=encode_keys(p.brand_name for p in products),
+            category_codes=encode_keys(p.category_name for p in products),
+            voltage_codes=encode_keys(self._extract_voltage(p) for p in products),
+            category_terms=category_terms,
+            prices=np.array([numeric(p.price) for p in products], dtype=float),
+            dimensions=np.array([
+                [numeric((p.dimensions or {}).get(dim)) for dim in SIZE_DIMENSIONS]
+                for p in products
+            ], dtype=float).reshape(n, len(SIZE_DIMENSIONS)),
+            specs=np.array([
+                [numeric(self._extract_numeric_spec(p.specifications, spec)) if p.specifications else np.nan
+                 for spec in UPGRADE_SPECS]
+                for p in products
+            ], dtype=float).reshape(n, len(UPGRADE_SPECS)),
+            is_kit=np.array([
+                any(keyword in p.name.lower() for keyword in KIT_KEYWORDS) for p in products
+            ], dtype=bool),
+            project_terms=project_terms,
+            text_vectors=text_vectors.tocsr(),
+            embeddings=await self._embed_products(products) if self.enable_ai else None
+        )
+    
+    async def _embed_products(self, products: List[ProductNode], chunk_size: int = 500) -> Optional[np.ndarray]:
+        """L2-normalised embeddings of all products (batched, cached)"""
+        texts = [f"{p.name}. {p.description or ''}" for p in products]
+        
+        try:
+            vectors = []
+            for start in range(0, len(texts), chunk_size):
+                vectors.extend(await self._embedding_cache.get_or_embed(
+                    EMBEDDING_MODEL, EMBEDDING_DIMENSIONS,
+                    texts[start:start + chunk_size], self._request_embeddings
+                ))
+            
+            embeddings = np.asarray(vectors, dtype=np.float32)
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            return embeddings / np.where(norms > 0, norms, 1.0)
+            
+        except Exception as e:
+            logger.warning(f"Product embedding failed, semantic rule disabled: {e}")
+            return None
+    
+    def _generate_candidate_pairs(
+        self,
+        features: ProductFeatureTable,
+        neighbors: int,
+        max_block_size: int
+    ) -> Pairs:
+        """Blocked candidate pairs (i < j) over the whole catalogue"""
+        text_vectors = features.text_vectors
+        candidate_sets = [
+            block_pairs(features.brand_codes, text_vectors, max_block_size, neighbors),
+            block_pairs(features.category_codes, text_vectors, max_block_size, neighbors),
+            block_pairs(features.voltage_codes, text_vectors, max_block_size, neighbors),
+            nearest_neighbor_pairs(text_vectors, neighbors)
+        ]
+        if features.embeddings is not None:
+            candidate_sets.append(nearest_neighbor_pairs(features.embeddings, neighbors))
+        
+        return merge_pairs(len(features), *candidate_sets)
+    
+    def _infer_pair_relationships(
         self,
-        products: List[Any],
+        features: ProductFeatureTable,
+        pair_i: np.ndarray,
+        pair_j: np.ndarray,
         min_confidence: float
-    ) -> Dict[str, int]:
-        """Process a batch of products for relationship inference"""
-        results = defaultdict(int)
+    ) -> List[SemanticRelationship]:
+        """Apply every rule to all pairs at once; build relationships for accepted pairs"""
+        relationships = []
+        threshold = max(min_confidence, 0.5)
         
-        # Create relationships between all product pairs in batch
-        for i, product1 in enumerate(products):
-            for j, product2 in enumerate(products[i+1:], i+1):
+        for rule in self.rules:
+            confidence = self._evaluate_rule_vectorized(features, pair_i, pair_j, rule)
+            accepted = np.flatnonzero(confidence >= threshold)
+            
+            for index in accepted:
+                product1 = features.products[pair_i[index]]
+                product2 = features.products[pair_j[index]]
                 
-                # Apply all inference rules
-                for rule in self.rules:
-                    relationship = await self._apply_rule(product1, product2, rule)
-                    
-                    if relationship and relationship.confidence >= min_confidence:
-                        # Create relationship in Neo4j
-                        success = self.graph_db.create_relationship(relationship)
-                        
-                        if success:
-                            results[relationship.relationship_type.value] += 1
+                relationship = SemanticRelationship(
+                    from_product_id=product1.product_id,
+                    to_product_id=product2.product_id,
+                    relationship_type=rule.relationship_type,
+                    confidence=float(confidence[index]),
+                    source=ConfidenceSource.AI_INFERENCE,
+                    created_by=f"inference_rule_{rule.name}",
+                    notes=f"Inferred by rule: {rule.name}"
+                )
+                relationship.compatibility_type = self._determine_compatibility_type(product1, product2, rule)
+                relationship.evidence = self._collect_evidence(product1, product2, rule)
+                relationships.append(relationship)
+        
+        return relationships
+    
+    def _evaluate_rule_vectorized(
+        self,
+        features: ProductFeatureTable,
+        i: np.ndarray,
+        j: np.ndarray,
+        rule: InferenceRule
+    ) -> np.ndarray:
+        """
+        Vectorised _evaluate_rule_conditions over pairs (i[k], j[k]).
+        
+        Returns:
+            Confidence per pair, NaN where the rule conditions are not met
+        """
+        conditions = rule.conditions
+        met = np.ones(len(i), dtype=bool)
+        confidence_factors = []
+        
+        def add_factor(present: np.ndarray, value):
+            confidence_factors.append(np.where(present, value, np.nan))
+        
+        def compare(codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+            both = (codes[i] >= 0) & (codes[j] >= 0)
+            return both, codes[i] == codes[j]
+        
+        def ratio(values: np.ndarray) -> np.ndarray:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return np.minimum(values[i], values[j]) / np.maximum(values[i], values[j])
+        
+        # Brand compatibility checks
+        if conditions.get("same_brand") or conditions.get("different_brands"):
+            both, same = compare(features.brand_codes)
+            if conditions.get("same_brand"):
+                met &= ~(both & ~same)
+                add_factor(both & same, 0.9)
+            if conditions.get("different_brands"):
+                met &= ~(both & same)
+                add_factor(both & ~same, 0.8)
+        
+        # Voltage compatibility
+        if conditions.get("same_voltage"):
+            both, same = compare(features.voltage_codes)
+            met &= ~(both & ~same)
+            add_factor(both & same, 0.85)
+        
+        if conditions.get("contains_voltage"):
+            add_factor((features.voltage_codes[i] >= 0) | (features.voltage_codes[j] >= 0), 0.7)
+        
+        # Category relationships
+        if conditions.get("same_category") or conditions.get("different_categories"):
+            both, same = compare(features.category_codes)
+            if conditions.get("same_category"):
+                met &= ~(both & ~same)
+                add_factor(both & same, 0.8)
+            if conditions.get("different_categories"):
+                add_factor(both & ~same, 0.7)
+        
+        # Category content checks
+        if conditions.get("category_contains"):
+            required_terms = conditions["category_contains"]
+            matches = sum(
+                (features.category_terms[term][i] | features.category_terms[term][j]).astype(int)
+                for term in required_terms
+            )
+            met &= matches > 0
+            add_factor(matches > 0, matches / len(required_terms))
+        
+        # Size compatibility
+        if conditions.get("size_match"):
+            with np.errstate(invalid='ignore', divide='ignore'):
+                dimension_ratios = np.minimum(features.dimensions[i], features.dimensions[j]) / np.maximum(
+                    features.dimensions[i], features.dimensions[j]
+                )
+            compared = ~np.isnan(dimension_ratios)
+            size_compatibility = np.where(
+                compared.any(axis=1),
+                np.nansum(dimension_ratios, axis=1) / np.maximum(compared.sum(axis=1), 1),
+                0.0
+            )
+            met &= size_compatibility > 0
+            add_factor(size_compatibility > 0, size_compatibility)
+        
+        # Price similarity for alternatives
+        if conditions.get("similar_price_range"):
+            price_similarity = np.nan_to_num(ratio(features.prices), nan=0.0)
+            met &= price_similarity > 0.5
+            add_factor(price_similarity > 0.5, price_similarity)
+        
+        # Function similarity
+        if conditions.get("similar_function"):
+            function_similarity = row_dot(features.text_vectors, i, j)
+            met &= function_similarity > 0.6
+            add_factor(function_similarity > 0.6, function_similarity)
+        
+        # Specification comparisons
+        if conditions.get("higher_specs"):
+            specs1, specs2 = features.specs[i], features.specs[j]
+            compared = ~np.isnan(specs1) & ~np.isnan(specs2)
+            better = np.where(
+                np.array([spec == 'weight' for spec in UPGRADE_SPECS]),
+                specs2 < specs1,
+                specs2 > specs1
+            ) & compared
+            comparisons = compared.sum(axis=1)
+            spec_comparison = np.where(comparisons > 0, better.sum(axis=1) / np.maximum(comparisons, 1), 0.0)
+            met &= spec_comparison > 0
+            add_factor(spec_comparison > 0, spec_comparison)
+        
+        # Kit detection
+        if conditions.get("kit_in_name"):
+            kit_detected = features.is_kit[i] | features.is_kit[j]
+            met &= kit_detected
+            add_factor(kit_detected, 0.9)
+        
+        # Project keyword matching
+        if conditions.get("project_keyword_match"):
+            present = features.project_terms[i] | features.project_terms[j]
+            project_match = (present @ PROJECT_TERM_WEIGHTS).max(axis=1)
+            met &= project_match > 0
+            add_factor(project_match > 0, project_match)
+        
+        # AI-powered semantic similarity
+        if conditions.get("semantic_similarity") and self.enable_ai:
+            threshold = conditions["semantic_similarity"]
+            if features.embeddings is None:
+                met &= False
+            else:
+                similarity = row_dot(features.embeddings, i, j)
+                met &= similarity >= threshold
+                add_factor(similarity >= threshold, similarity)
         
-        return results
+        # Calculate final confidence
+        if not confidence_factors:
+            return np.full(len(i), np.nan)
+        
+        factors = np.column_stack(confidence_factors)
+        has_factor = ~np.isnan(factors).all(axis=1)
+        met &= has_factor
+        
+        # Weight the confidence factors
+        mean_factor = np.nansum(factors, axis=1) / np.maximum((~np.isnan(factors)).sum(axis=1), 1)
+        confidence = np.minimum(rule.confidence_base * mean_factor * rule.weight, 1.0)
+        
+        return np.where(met, confidence, np.nan)
+    
+    def _to_product_node(self, node_data: Dict[str, Any]) -> ProductNode:
+        """ProductNode from Neo4j node properties (unknown properties ignored)"""
+        known_fields = {f.name for f in fields(ProductNode)}
+        return ProductNode(**{k: v for k, v in node_data.items() if k in known_fields})
     
     async def _get_all_products(self, max_products: int = None) -> List[Any]:
         """Get all products for inference"""
@@ -720,8 +1043,7 @@ class RelationshipInferenceEngine:
                 products = []
                 
                 for record in results:
-                    product_data = dict(record["p"])
-                    products.append(product_data)
+                    products.append(self._to_product_node(dict(record["p"])))
                 
                 return products
                 
@@ -756,8 +1078,7 @@ class RelationshipInferenceEngine:
                 
                 products = []
                 for record in results:
-                    product_data = dict(record["p"])
-                    products.append(product_data)
+                    products.append(self._to_product_node(dict(record["p"])))
                 
                 return products
                 
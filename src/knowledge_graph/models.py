@@ -291,9 +291,9 @@ class BrandNode:
 @dataclass
 class ProjectNode:
     """DIY project node for use-case based recommendations"""
-    project_id: int = field(default_factory=lambda: int(uuid.uuid4().int))
     name: str
     slug: str
+    project_id: int = field(default_factory=lambda: int(uuid.uuid4().int))
     description: Optional[str] = None
     difficulty_level: str = "beginner"  # beginner, intermediate, advanced
     estimated_duration: Optional[str] = None
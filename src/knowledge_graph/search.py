@@ -23,6 +23,7 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
 from .database import Neo4jConnection, GraphDatabase
+from .embedding_cache import EmbeddingCache
 from .models import SemanticSearchQuery, RelationshipType
 
 logger = logging.getLogger(__name__)
@@ -109,6 +110,10 @@ class SemanticSearchEngine:
         if openai_api_key:
             openai.api_key = openai_api_key
         
+        # Repeated texts (queries, unchanged product documents) are served
+        # from the shared content-hash embedding cache
+        self.embedding_cache = EmbeddingCache()
+
         self.sentence_transformer = None
         if use_sentence_transformers:
             try:
@@ -663,24 +668,40 @@ class SemanticSearchEngine:
         # Try sentence transformer first (faster, local)
         if self.sentence_transformer:
             try:
-                embedding = self.sentence_transformer.encode(text)
-                return embedding.tolist()
+                embeddings = await self.embedding_cache.get_or_embed(
+                    'all-MiniLM-L6-v2',
+                    self.sentence_transformer.get_sentence_embedding_dimension(),
+                    [text],
+                    self._encode_sentence_transformer
+                )
+                return embeddings[0]
             except Exception as e:
                 logger.warning(f"Sentence transformer failed: {e}")
         
         # Fallback to OpenAI embeddings
         if self.openai_api_key:
             try:
-                response = await openai.Embedding.acreate(
-                    model="text-embedding-ada-002",
-                    input=text
+                embeddings = await self.embedding_cache.get_or_embed(
+                    'text-embedding-ada-002', 1536, [text], self._encode_openai
                 )
-                return response['data'][0]['embedding']
+                return embeddings[0]
             except Exception as e:
                 logger.warning(f"OpenAI embedding failed: {e}")
         
         return None
     
+    async def _encode_sentence_transformer(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts with the local sentence transformer (cache miss path)"""
+        return self.sentence_transformer.encode(texts).tolist()
+    
+    async def _encode_openai(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts with OpenAI (cache miss path)"""
+        response = await openai.Embedding.acreate(
+            model="text-embedding-ada-002",
+            input=texts
+        )
+        return [item['embedding'] for item in response['data']]
+    
     def _build_chromadb_filters(self, filters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Build ChromaDB where filters from search filters"""
         if not filters:
@@ -0,0 +1,48 @@
+"""
+Tests for candidate pair blocking
+
+Only knowledge_graph.blocking is imported, so these tests need no Neo4j,
+ChromaDB or OpenAI setup.
+"""
+
+import numpy as np
+
+from knowledge_graph.blocking import block_pairs, encode_keys, merge_pairs, nearest_neighbor_pairs
+
+
+class TestCandidateBlocking:
+    """Test candidate pair generation for inference"""
+    
+    def test_encode_keys_is_case_insensitive(self):
+        """Missing values get -1, case variants share a code"""
+        codes = encode_keys(["Makita", "makita", None, "DeWalt"])
+        assert codes.tolist() == [0, 0, -1, 1]
+    
+    def test_small_blocks_yield_all_pairs(self):
+        """Blocks under the size limit contribute every pair"""
+        codes = np.array([0, 1, 0, 0, -1])
+        vectors = np.eye(5)
+        pair_i, pair_j = merge_pairs(5, block_pairs(codes, vectors, max_block_size=10))
+        
+        assert list(zip(pair_i.tolist(), pair_j.tolist())) == [(0, 2), (0, 3), (2, 3)]
+    
+    def test_large_blocks_use_nearest_neighbors(self):
+        """Oversized blocks contribute only nearest-neighbour pairs"""
+        rng = np.random.default_rng(0)
+        vectors = rng.normal(size=(50, 8))
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        codes = np.zeros(50, dtype=int)
+        
+        pair_i, pair_j = merge_pairs(50, block_pairs(codes, vectors, max_block_size=10, k=3))
+        
+        assert 0 < len(pair_i) <= 50 * 3
+        assert (pair_i < pair_j).all()
+    
+    def test_nearest_neighbor_pairs(self):
+        """Each row is paired with its most similar row"""
+        vectors = np.array([[1.0, 0.0], [0.99, 0.14], [0.0, 1.0], [0.14, 0.99]])
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        
+        pair_i, pair_j = merge_pairs(4, nearest_neighbor_pairs(vectors, k=1))
+        
+        assert list(zip(pair_i.tolist(), pair_j.tolist())) == [(0, 1), (2, 3)]
@@ -0,0 +1,107 @@
+"""
+Tests for the knowledge graph embedding cache
+
+Redis is replaced by an in-memory fake; no external services are needed.
+"""
+
+import asyncio
+
+from knowledge_graph.embedding_cache import EmbeddingCache, LRUEmbeddingTier, text_hash
+
+
+class FakeRedis:
+    """Just enough of redis.asyncio for the cache"""
+
+    def __init__(self):
+        self.values = {}
+        self.ttls = {}
+
+    async def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def setex(self, key, ttl, value):
+        self.commands.append((key, ttl, value))
+
+    async def execute(self):
+        for key, ttl, value in self.commands:
+            self.redis.values[key] = value
+            self.redis.ttls[key] = ttl
+
+
+class CountingProvider:
+    """Records the texts sent to the provider"""
+
+    def __init__(self):
+        self.requests = []
+
+    async def embed(self, texts):
+        self.requests.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+class TestEmbeddingCache:
+    """Test LRU and Redis tiers of the embedding cache"""
+
+    def test_whitespace_differences_share_a_hash(self):
+        """Test cosmetic text differences map to one key"""
+        assert text_hash("Cordless  drill\n 18V ") == text_hash("Cordless drill 18V")
+
+    def test_repeated_texts_are_embedded_once(self):
+        """Test duplicates and repeats are served from the LRU"""
+        cache = EmbeddingCache(lru=LRUEmbeddingTier(), use_redis=False)
+        provider = CountingProvider()
+
+        first = asyncio.run(cache.get_or_embed("m", 2, ["a", "bb", "a"], provider.embed))
+        second = asyncio.run(cache.get_or_embed("m", 2, ["bb"], provider.embed))
+
+        assert provider.requests == [["a", "bb"]]
+        assert first == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+        assert second == [[2.0, 1.0]]
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_embeddings_survive_a_restart_through_redis(self):
+        """Test a fresh process (empty LRU) is served from Redis"""
+        redis = FakeRedis()
+        provider = CountingProvider()
+        asyncio.run(
+            EmbeddingCache(redis_client=redis, lru=LRUEmbeddingTier())
+            .get_or_embed("m", 2, ["drill"], provider.embed)
+        )
+
+        restarted = EmbeddingCache(redis_client=redis, lru=LRUEmbeddingTier())
+        embeddings = asyncio.run(restarted.get_or_embed("m", 2, ["drill"], provider.embed))
+
+        assert provider.requests == [["drill"]]
+        assert embeddings == [[5.0, 1.0]]
+        assert len(restarted.lru) == 1
+        assert list(redis.ttls.values()) == [restarted.redis_ttl]
+
+    def test_redis_errors_fall_back_to_the_provider(self):
+        """Test the cache fails open when Redis is down"""
+        class BrokenRedis(FakeRedis):
+            async def mget(self, keys):
+                raise ConnectionError("redis down")
+
+            def pipeline(self, transaction=True):
+                raise ConnectionError("redis down")
+
+        cache = EmbeddingCache(redis_client=BrokenRedis(), lru=LRUEmbeddingTier())
+        provider = CountingProvider()
+
+        assert asyncio.run(cache.get_or_embed("m", 2, ["a"], provider.embed)) == [[1.0, 1.0]]
+        assert provider.requests == [["a"]]
@@ -19,15 +19,22 @@ import jwt
 from fastapi import FastAPI, HTTPException, Depends, Request, BackgroundTasks, File, UploadFile, Form
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, ValidationError
 import structlog
 from contextlib import asynccontextmanager
 
 # Import our production services
-from src.services.document_processor import DocumentProcessor
-from src.services.product_matcher import ProductMatcher
-from src.services.quotation_generator import QuotationGenerator
+from src.services.document_pipeline import PIPELINE_SCHEMA_SQL, enqueue_document
+from src.services.product_search import ProductSearchEngine
+from src.services.upload_storage import (
+    DOCUMENT_CONTENT_HASH_SQL,
+    UploadTooLargeError,
+    find_processed_duplicate,
+    max_upload_bytes,
+    stream_upload,
+)
 
 # Pydantic models for request/response
 class LoginCredentials(BaseModel):
@@ -258,6 +265,7 @@ class NexusBackendAPI:
             ai_status VARCHAR(50) DEFAULT 'pending',
             ai_extracted_data TEXT,
             ai_confidence_score DECIMAL(3,2),
+            content_hash CHAR(64),
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         );
@@ -278,6 +286,12 @@ class NexusBackendAPI:
         async with self.db_pool.acquire() as conn:
             await conn.execute(create_tables_sql)
 
+            # Upload dedup by content (documents created before content_hash existed)
+            await conn.execute(DOCUMENT_CONTENT_HASH_SQL)
+
+            # Document processing job queue (worked by src.services.document_pipeline)
+            await conn.execute(PIPELINE_SCHEMA_SQL)
+
             # Create admin user from environment variables (secure)
             admin_email = os.getenv("ADMIN_EMAIL")
             admin_password_hash = os.getenv("ADMIN_PASSWORD_HASH")
@@ -295,6 +309,12 @@ class NexusBackendAPI:
             else:
                 logger.warning("Admin user credentials not configured - skipping admin user creation. Set ADMIN_EMAIL and ADMIN_PASSWORD_HASH environment variables.")
 
+        # Index-backed product search (stored tsvector + pg_trgm GIN indexes)
+        try:
+            await ProductSearchEngine(self.db_pool).ensure_indexes()
+        except Exception as e:
+            logger.warning("Product search indexes not created", error=str(e))
+
         logger.info("Database tables created/verified successfully")
 
 
@@ -382,6 +402,19 @@ async def track_requests(request: Request, call_next):
         logger.error("Request failed", request_id=request_id, error=str(e))
         raise
 
+# Reject oversized uploads from Content-Length before the body is read
+UPLOAD_PATH = "/api/files/upload"
+UPLOAD_FORM_OVERHEAD_BYTES = 64 * 1024  # multipart boundaries and form fields
+
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    if request.method == "POST" and request.url.path == UPLOAD_PATH:
+        content_length = request.headers.get("content-length")
+        limit = max_upload_bytes()
+        if content_length and content_length.isdigit() and int(content_length) > limit + UPLOAD_FORM_OVERHEAD_BYTES:
+            return JSONResponse(status_code=413, content={"detail": str(UploadTooLargeError(limit))})
+    return await call_next(request)
+
 # Authentication dependency
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer())):
     """Get current authenticated user"""
@@ -407,92 +440,6 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(H
         raise HTTPException(status_code=401, detail="Invalid token")
 
 
-# ============================================================================
-# Background Processing Pipeline
-# ============================================================================
-
-async def process_document_pipeline(document_id: int, file_path: str):
-    """
-    Complete document processing pipeline
-    NO SHORTCUTS - Real AI extraction, product matching, quotation generation
-
-    Flow: Document Upload → Text Extraction → Requirement Analysis →
-          Product Matching → Quotation Generation → PDF Creation
-    """
-    logger.info(f"Starting processing pipeline for document {document_id}")
-
-    try:
-        # Initialize services
-        doc_processor = DocumentProcessor()
-        product_matcher = ProductMatcher()
-        quotation_generator = QuotationGenerator()
-
-        # Step 1: Process document and extract requirements
-        logger.info(f"Step 1/4: Processing document {document_id}")
-        processing_result = await doc_processor.process_document(
-            document_id,
-            file_path,
-            api_instance.db_pool
-        )
-
-        requirements = processing_result.get('requirements', {})
-
-        if not requirements.get('items'):
-            logger.warning(f"No items found in document {document_id}")
-            return
-
-        logger.info(f"Extracted {len(requirements['items'])} requirement items")
-
-        # Step 2: Match products from database
-        logger.info(f"Step 2/4: Matching products for document {document_id}")
-        matched_products = await product_matcher.match_products(
-            requirements,
-            api_instance.db_pool
-        )
-
-        if not matched_products:
-            logger.error(f"No products matched for document {document_id}")
-            return
-
-        logger.info(f"Matched {len(matched_products)} products")
-
-        # Step 3: Calculate pricing
-        logger.info(f"Step 3/4: Calculating pricing for document {document_id}")
-        pricing = await product_matcher.calculate_pricing(matched_products)
-
-        logger.info(f"Total quotation value: {pricing['currency']} {pricing['total']}")
-
-        # Step 4: Generate quotation
-        logger.info(f"Step 4/4: Generating quotation for document {document_id}")
-        quotation_id = await quotation_generator.generate_quotation(
-            document_id,
-            requirements,
-            matched_products,
-            pricing,
-            api_instance.db_pool
-        )
-
-        logger.info(f"Created quotation {quotation_id} for document {document_id}")
-
-        # Step 5: Generate PDF
-        logger.info(f"Generating PDF for quotation {quotation_id}")
-        pdf_path = await quotation_generator.generate_pdf(
-            quotation_id,
-            api_instance.db_pool
-        )
-
-        logger.info(f"✅ Pipeline complete for document {document_id}")
-        logger.info(f"   - Requirements: {len(requirements['items'])} items")
-        logger.info(f"   - Products matched: {len(matched_products)}")
-        logger.info(f"   - Quotation ID: {quotation_id}")
-        logger.info(f"   - Total value: {pricing['currency']} {pricing['total']}")
-        logger.info(f"   - PDF: {pdf_path}")
-
-    except Exception as e:
-        logger.error(f"❌ Pipeline failed for document {document_id}: {str(e)}", exc_info=True)
-        # Error already logged in individual services
-
-
 # Health check endpoint
 @app.get("/api/health")
 async def health_check():
@@ -1027,9 +974,35 @@ async def get_document(document_id: int):
         logger.error("Failed to get document", error=str(e))
         raise HTTPException(status_code=500, detail="Failed to get document")
 
+@app.get("/api/documents/{document_id}/pipeline")
+async def get_document_pipeline(document_id: int):
+    """Processing job status and per-stage timings - PUBLIC endpoint for demo/POC"""
+    try:
+        async with api_instance.db_pool.acquire() as conn:
+            job = await conn.fetchrow("""
+                SELECT id, stage, status, attempts, max_attempts, run_after,
+                       stage_timings, last_error, created_at, updated_at
+                FROM document_pipeline_jobs
+                WHERE document_id = $1
+                ORDER BY id DESC
+                LIMIT 1
+            """, document_id)
+
+            if not job:
+                raise HTTPException(status_code=404, detail="No processing job for document")
+
+            result = dict(job)
+            result['stage_timings'] = json.loads(result['stage_timings'] or '{}')
+            return result
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Failed to get document pipeline", error=str(e))
+        raise HTTPException(status_code=500, detail="Failed to get document pipeline")
+
 @app.post("/api/files/upload")
 async def upload_file(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     customer_id: Optional[int] = Form(None),
     document_type: str = Form(...),
@@ -1037,33 +1010,46 @@ async def upload_file(
 ):
     """
     Upload file and create document record
-    PRODUCTION: Triggers real background processing with AI
+    PRODUCTION: Queues the document for the pipeline workers (real AI processing)
     NO AUTHENTICATION REQUIRED - For demo/POC use
     """
     try:
-        # Save file to uploads directory
+        # Stream file to uploads directory (constant memory, hashed while copying)
         upload_dir = "/app/uploads"
-        os.makedirs(upload_dir, exist_ok=True)
-
-        file_path = os.path.join(upload_dir, f"{uuid.uuid4().hex}_{file.filename}")
-
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+        try:
+            stored = await stream_upload(file, upload_dir, file.filename)
+        except UploadTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
 
         # Use demo user for uploads (no authentication required)
         demo_user_id = 1  # Default admin user
         demo_user_email = "demo@horme.com"
 
-        # Create document record
-        async with api_instance.db_pool.acquire() as conn:
+        # Create document record and its pipeline job together
+        async with api_instance.db_pool.acquire() as conn, conn.transaction():
+            # Identical content uploaded before: reuse its file and extraction results
+            duplicate = await find_processed_duplicate(conn, stored.sha256)
+            if duplicate:
+                await asyncio.to_thread(os.remove, stored.path)
+                file_path = duplicate['file_path']
+                ai_status = "completed"
+                ai_extracted_data = duplicate['ai_extracted_data']
+                ai_confidence_score = duplicate['ai_confidence_score']
+            else:
+                file_path = stored.path
+                ai_status = "pending"
+                ai_extracted_data = None
+                ai_confidence_score = None
+
             document_id = await conn.fetchval("""
                 INSERT INTO documents (name, type, category, file_path, file_size,
-                                     mime_type, customer_id, uploaded_by, ai_status)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+                                     mime_type, customer_id, uploaded_by, ai_status,
+                                     ai_extracted_data, ai_confidence_score, content_hash)
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
                 RETURNING id
-            """, file.filename, document_type, category, file_path, len(content),
-                file.content_type, customer_id, demo_user_id, "pending")
+            """, file.filename, document_type, category, file_path, stored.size,
+                file.content_type, customer_id, demo_user_id, ai_status,
+                ai_extracted_data, ai_confidence_score, stored.sha256)
 
             # Log activity
             await conn.execute("""
@@ -1072,23 +1058,24 @@ async def upload_file(
             """, "document", document_id, "uploaded", demo_user_id,
                 demo_user_email, f"Document '{file.filename}' uploaded")
 
-        # PRODUCTION: Trigger background processing
-        # This will: extract text → analyze requirements → match products → generate quotation
-        background_tasks.add_task(
-            process_document_pipeline,
-            document_id,
-            file_path
-        )
+            # PRODUCTION: Queue processing for the pipeline workers
+            # This will: extract text → analyze requirements → match products → generate quotation
+            job_id = await enqueue_document(conn, document_id, file_path)
+
+        if duplicate:
+            logger.info(f"Document {document_id} matches document {duplicate['id']}, reusing extraction results")
 
-        logger.info(f"Document {document_id} uploaded, background processing started")
+        logger.info(f"Document {document_id} uploaded, queued as pipeline job {job_id}")
 
         return {
-            "message": "File uploaded successfully. Processing started.",
+            "message": "File uploaded successfully. Processing queued.",
             "document_id": document_id,
             "filename": file.filename,  # Frontend expects "filename" not "file_name"
-            "status": "pending"
+            "status": ai_status
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Failed to upload file", error=str(e))
         raise HTTPException(status_code=500, detail="Failed to upload file")
@@ -20,6 +20,7 @@ from openai import AsyncOpenAI
 import asyncpg
 
 from src.services.embedding_service import EmbeddingService
+from src.services.product_search import ProductSearchEngine
 from src.core.neo4j_knowledge_graph import Neo4jKnowledgeGraph
 
 logger = logging.getLogger(__name__)
@@ -42,6 +43,7 @@ class AISalesSpecialistService:
         self.db_pool = db_pool
         self.openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
         self.embedding_service = EmbeddingService(db_pool)
+        self.product_search = ProductSearchEngine(db_pool)
 
         # Initialize knowledge graph (optional - graceful degradation if not available)
         try:
@@ -376,11 +378,11 @@ class AISalesSpecialistService:
         try:
             # Try hybrid search first (semantic + keyword)
             async with self.db_pool.acquire() as conn:
-                embedding_count = await conn.fetchval(
-                    "SELECT COUNT(*) FROM products WHERE embedding IS NOT NULL"
+                has_embeddings = await conn.fetchval(
+                    "SELECT EXISTS (SELECT 1 FROM products WHERE embedding IS NOT NULL)"
                 )
 
-            if embedding_count > 0:
+            if has_embeddings:
                 # Use semantic hybrid search
                 products = await self.embedding_service.hybrid_search(
                     query=query,
@@ -398,29 +400,12 @@ class AISalesSpecialistService:
             return await self._keyword_search(query, limit)
 
     async def _keyword_search(self, query: str, limit: int) -> List[Dict]:
-        """Keyword-based search fallback"""
-        async with self.db_pool.acquire() as conn:
-            products_raw = await conn.fetch("""
-                SELECT
-                    id, name, description, category, brand, sku,
-                    price, stock_quantity, specifications
-                FROM products
-                WHERE
-                    (LOWER(name) LIKE '%' || $1 || '%' OR
-                     LOWER(description) LIKE '%' || $1 || '%' OR
-                     LOWER(category) LIKE '%' || $1 || '%')
-                    AND stock_quantity > 0
-                ORDER BY
-                    CASE
-                        WHEN LOWER(name) LIKE '%' || $1 || '%' THEN 1
-                        WHEN LOWER(category) LIKE '%' || $1 || '%' THEN 2
-                        ELSE 3
-                    END,
-                    price ASC NULLS LAST
-                LIMIT $2
-            """, query.lower(), limit)
-
-            return [dict(p) for p in products_raw]
+        """Keyword-based search fallback (index-backed, in-stock products only)"""
+        return await self.product_search.search(
+            query,
+            filters={"in_stock_only": True},
+            k=limit
+        )
 
     async def _get_knowledge_graph_insights(
         self,
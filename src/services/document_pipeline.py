@@ -0,0 +1,511 @@
+"""
+Document Pipeline Job Queue
+===========================
+
+Durable, stage-based processing of uploaded RFQ documents, run by dedicated
+worker processes instead of FastAPI BackgroundTasks on the API workers.
+
+Flow: extract (DocumentProcessor) → match (ProductMatcher + pricing) →
+      quote (QuotationGenerator) → pdf
+
+- One row per document in document_pipeline_jobs records the next stage to
+  run and the outputs of completed stages, so a restarted worker resumes from
+  the last completed stage instead of starting over (or losing the document)
+- Workers claim jobs per stage with FOR UPDATE SKIP LOCKED; each stage has its
+  own pool of concurrent workers (PIPELINE_WORKERS_<STAGE>) and processes can
+  be dedicated to some stages only (--stages extract)
+- A failed stage is retried with exponential backoff up to max_attempts
+- Each worker refreshes locked_at on its running jobs every heartbeat
+  interval and then touches a heartbeat file (the container healthcheck);
+  jobs whose lock has not been refreshed for several intervals belong to a
+  dead or stuck worker and are requeued
+- Time spent in each stage is stored in stage_timings (milliseconds)
+
+Run a worker:
+    python -m src.services.document_pipeline [--stages extract match quote pdf]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('extract', 'match', 'quote', 'pdf')
+DONE = 'done'
+
+DEFAULT_STAGE_WORKERS = {'extract': 2, 'match': 4, 'quote': 2, 'pdf': 2}
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_BASE_SECONDS = 30
+DEFAULT_STAGE_TIMEOUT_SECONDS = 900
+DEFAULT_POLL_INTERVAL_SECONDS = 1.0
+DEFAULT_HEARTBEAT_INTERVAL_SECONDS = 30.0
+DEFAULT_HEARTBEAT_FILE = '/tmp/document-pipeline-heartbeat'
+
+# A job is reclaimed after this many missed heartbeats
+MISSED_HEARTBEATS_BEFORE_RECLAIM = 4
+
+PIPELINE_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS document_pipeline_jobs (
+    id BIGSERIAL PRIMARY KEY,
+    document_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    file_path VARCHAR(500) NOT NULL,
+    stage VARCHAR(20) NOT NULL DEFAULT 'extract',
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    run_after TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    locked_by VARCHAR(100),
+    locked_at TIMESTAMP,
+    state JSONB NOT NULL DEFAULT '{}',
+    stage_timings JSONB NOT NULL DEFAULT '{}',
+    last_error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT check_pipeline_job_status CHECK (status IN ('queued', 'running', 'completed', 'failed'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_pipeline_jobs_ready
+    ON document_pipeline_jobs (stage, run_after) WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS idx_pipeline_jobs_running
+    ON document_pipeline_jobs (locked_at) WHERE status = 'running';
+CREATE INDEX IF NOT EXISTS idx_pipeline_jobs_document
+    ON document_pipeline_jobs (document_id);
+"""
+
+ENQUEUE_SQL = """
+INSERT INTO document_pipeline_jobs (document_id, file_path, max_attempts)
+VALUES ($1, $2, $3)
+RETURNING id
+"""
+
+CLAIM_SQL = """
+UPDATE document_pipeline_jobs
+SET status = 'running', locked_by = $2, locked_at = NOW(),
+    attempts = attempts + 1, updated_at = NOW()
+WHERE id = (
+    SELECT id FROM document_pipeline_jobs
+    WHERE status = 'queued' AND stage = $1 AND run_after <= NOW()
+    ORDER BY run_after, id
+    LIMIT 1
+    FOR UPDATE SKIP LOCKED
+)
+RETURNING id, document_id, file_path, stage, attempts, max_attempts, state
+"""
+
+COMPLETE_STAGE_SQL = """
+UPDATE document_pipeline_jobs
+SET stage = $3, status = $4, attempts = 0, run_after = NOW(),
+    state = state || $5::jsonb,
+    stage_timings = stage_timings || jsonb_build_object($2::text, $6::int),
+    locked_by = NULL, locked_at = NULL, last_error = NULL, updated_at = NOW()
+WHERE id = $1 AND locked_by = $7
+"""
+
+FAIL_STAGE_SQL = """
+UPDATE document_pipeline_jobs
+SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END,
+    run_after = NOW() + make_interval(secs => $2),
+    last_error = $3, locked_by = NULL, locked_at = NULL, updated_at = NOW()
+WHERE id = $1 AND locked_by = $4
+RETURNING status
+"""
+
+HEARTBEAT_SQL = """
+UPDATE document_pipeline_jobs
+SET locked_at = NOW()
+WHERE status = 'running' AND locked_by = $1
+"""
+
+RECLAIM_SQL = """
+UPDATE document_pipeline_jobs
+SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END,
+    last_error = 'Worker lost while running stage ' || stage,
+    locked_by = NULL, locked_at = NULL, run_after = NOW(), updated_at = NOW()
+WHERE status = 'running' AND locked_at < NOW() - make_interval(secs => $1)
+RETURNING id
+"""
+
+
+async def enqueue_document(
+    conn: asyncpg.Connection,
+    document_id: int,
+    file_path: str,
+    max_attempts: Optional[int] = None,
+) -> int:
+    """Queue a document for processing; returns the job ID"""
+    return await conn.fetchval(
+        ENQUEUE_SQL,
+        document_id,
+        file_path,
+        max_attempts or int(os.getenv('PIPELINE_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS)),
+    )
+
+
+class PipelineStop(Exception):
+    """Raised by a stage when the document needs no further processing"""
+
+
+@dataclass
+class PipelineJob:
+    """A claimed job"""
+    id: int
+    document_id: int
+    file_path: str
+    stage: str
+    attempts: int
+    max_attempts: int
+    state: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_row(cls, row) -> 'PipelineJob':
+        state = row['state']
+        return cls(
+            id=row['id'],
+            document_id=row['document_id'],
+            file_path=row['file_path'],
+            stage=row['stage'],
+            attempts=row['attempts'],
+            max_attempts=row['max_attempts'],
+            state=json.loads(state) if isinstance(state, str) else dict(state or {}),
+        )
+
+
+def next_stage(stage: str) -> str:
+    """Stage that follows the given one (DONE after the last)"""
+    index = STAGES.index(stage)
+    return STAGES[index + 1] if index + 1 < len(STAGES) else DONE
+
+
+class DocumentPipelineQueue:
+    """Claims and advances jobs in document_pipeline_jobs"""
+
+    def __init__(
+        self,
+        db_pool: asyncpg.Pool,
+        worker_id: Optional[str] = None,
+        retry_base_seconds: Optional[float] = None,
+    ):
+        self.db_pool = db_pool
+        self.worker_id = worker_id or f"pipeline-{uuid.uuid4().hex[:8]}"
+        self.retry_base_seconds = retry_base_seconds if retry_base_seconds is not None else float(
+            os.getenv('PIPELINE_RETRY_BASE_SECONDS', DEFAULT_RETRY_BASE_SECONDS)
+        )
+
+    async def claim(self, stage: str) -> Optional[PipelineJob]:
+        """Lock the next ready job waiting for this stage, if any"""
+        async with self.db_pool.acquire() as conn:
+            row = await conn.fetchrow(CLAIM_SQL, stage, self.worker_id)
+        return PipelineJob.from_row(row) if row else None
+
+    async def complete_stage(self, job: PipelineJob, output: Dict[str, Any], elapsed_ms: int):
+        """Record the stage output and hand the job to the next stage"""
+        stage = next_stage(job.stage)
+        await self._advance(job, stage, 'completed' if stage == DONE else 'queued', output, elapsed_ms)
+
+    async def stop(self, job: PipelineJob, reason: str, elapsed_ms: int):
+        """Finish the job early (nothing left to do)"""
+        await self._advance(job, DONE, 'completed', {'stopped': reason}, elapsed_ms)
+
+    async def _advance(self, job: PipelineJob, stage: str, status: str, output: Dict[str, Any], elapsed_ms: int):
+        async with self.db_pool.acquire() as conn:
+            await conn.execute(
+                COMPLETE_STAGE_SQL, job.id, job.stage, stage, status,
+                json.dumps(output, default=str), elapsed_ms, self.worker_id,
+            )
+
+    async def fail_stage(self, job: PipelineJob, error: str) -> str:
+        """Schedule a retry with exponential backoff, or fail the job; returns the new status"""
+        backoff = self.retry_base_seconds * (2 ** (job.attempts - 1))
+        async with self.db_pool.acquire() as conn:
+            status = await conn.fetchval(FAIL_STAGE_SQL, job.id, backoff, error[:2000], self.worker_id)
+        return status or 'failed'
+
+    async def heartbeat(self):
+        """Refresh the lock of every job this worker is running"""
+        async with self.db_pool.acquire() as conn:
+            await conn.execute(HEARTBEAT_SQL, self.worker_id)
+
+    async def reclaim_stale(self, lock_timeout_seconds: float) -> int:
+        """Requeue jobs whose worker stopped heartbeating (crash, restart, stuck)"""
+        async with self.db_pool.acquire() as conn:
+            rows = await conn.fetch(RECLAIM_SQL, lock_timeout_seconds)
+        if rows:
+            logger.warning(f"Reclaimed {len(rows)} pipeline jobs from lost workers")
+        return len(rows)
+
+
+class DocumentPipelineStages:
+    """The pipeline stages, wrapping the existing services"""
+
+    def __init__(self, db_pool: asyncpg.Pool, doc_processor=None, product_matcher=None, quotation_generator=None):
+        self.db_pool = db_pool
+        self._doc_processor = doc_processor
+        self._product_matcher = product_matcher
+        self._quotation_generator = quotation_generator
+
+    @property
+    def doc_processor(self):
+        if self._doc_processor is None:
+            from src.services.document_processor import DocumentProcessor
+            self._doc_processor = DocumentProcessor()
+        return self._doc_processor
+
+    @property
+    def product_matcher(self):
+        if self._product_matcher is None:
+            from src.services.product_matcher import ProductMatcher
+            self._product_matcher = ProductMatcher()
+        return self._product_matcher
+
+    @property
+    def quotation_generator(self):
+        if self._quotation_generator is None:
+            from src.services.quotation_generator import QuotationGenerator
+            self._quotation_generator = QuotationGenerator()
+        return self._quotation_generator
+
+    def handler(self, stage: str) -> Callable[[PipelineJob], Awaitable[Dict[str, Any]]]:
+        return getattr(self, stage)
+
+    async def extract(self, job: PipelineJob) -> Dict[str, Any]:
+        """Text extraction and requirement analysis"""
+        # Already processed (re-sent duplicate upload, or a retry after the
+        # results were saved): reuse the stored results
+        async with self.db_pool.acquire() as conn:
+            row = await conn.fetchrow(
+                "SELECT ai_status, ai_extracted_data FROM documents WHERE id = $1", job.document_id
+            )
+
+        if row and row['ai_status'] == 'completed' and row['ai_extracted_data']:
+            logger.info(f"Reusing extraction results for document {job.document_id}")
+            processing_result = json.loads(row['ai_extracted_data'])
+        else:
+            processing_result = await self.doc_processor.process_document(
+                job.document_id, job.file_path, self.db_pool
+            )
+
+        requirements = processing_result.get('requirements', {})
+        if not requirements.get('items'):
+            raise PipelineStop("No items found in document")
+
+        logger.info(f"Extracted {len(requirements['items'])} requirement items from document {job.document_id}")
+        return {'requirements': requirements}
+
+    async def match(self, job: PipelineJob) -> Dict[str, Any]:
+        """Product matching and pricing"""
+        matched_products = await self.product_matcher.match_products(job.state['requirements'], self.db_pool)
+        if not matched_products:
+            raise PipelineStop("No products matched")
+
+        pricing = await self.product_matcher.calculate_pricing(matched_products)
+        logger.info(
+            f"Matched {len(matched_products)} products for document {job.document_id}, "
+            f"total {pricing['currency']} {pricing['total']}"
+        )
+        return {'matched_products': matched_products, 'pricing': pricing}
+
+    async def quote(self, job: PipelineJob) -> Dict[str, Any]:
+        """Quotation record"""
+        # A retry after the quotation was written must not create a second one
+        async with self.db_pool.acquire() as conn:
+            quotation_id = await conn.fetchval(
+                "SELECT quotation_id FROM documents WHERE id = $1", job.document_id
+            )
+
+        if quotation_id is None:
+            quotation_id = await self.quotation_generator.generate_quotation(
+                job.document_id,
+                job.state['requirements'],
+                job.state['matched_products'],
+                job.state['pricing'],
+                self.db_pool
+            )
+
+        logger.info(f"Quotation {quotation_id} for document {job.document_id}")
+        return {'quotation_id': quotation_id}
+
+    async def pdf(self, job: PipelineJob) -> Dict[str, Any]:
+        """Quotation PDF"""
+        pdf_path = await self.quotation_generator.generate_pdf(job.state['quotation_id'], self.db_pool)
+        logger.info(f"✅ Pipeline complete for document {job.document_id}: {pdf_path}")
+        return {'pdf_path': pdf_path}
+
+
+class DocumentPipelineWorker:
+    """Runs per-stage worker pools against the job queue"""
+
+    def __init__(
+        self,
+        stage_workers: Optional[Dict[str, int]] = None,
+        db_pool: Optional[asyncpg.Pool] = None,
+        stages: Optional[DocumentPipelineStages] = None,
+        queue: Optional[DocumentPipelineQueue] = None,
+        poll_interval: Optional[float] = None,
+        stage_timeout: Optional[float] = None,
+        heartbeat_interval: Optional[float] = None,
+        heartbeat_file: Optional[str] = None,
+    ):
+        self.stage_workers = stage_workers or parse_stage_workers(STAGES)
+        self.poll_interval = poll_interval or float(
+            os.getenv('PIPELINE_POLL_INTERVAL_SECONDS', DEFAULT_POLL_INTERVAL_SECONDS)
+        )
+        self.stage_timeout = stage_timeout or float(
+            os.getenv('PIPELINE_STAGE_TIMEOUT_SECONDS', DEFAULT_STAGE_TIMEOUT_SECONDS)
+        )
+        self.heartbeat_interval = heartbeat_interval or float(
+            os.getenv('PIPELINE_HEARTBEAT_INTERVAL_SECONDS', DEFAULT_HEARTBEAT_INTERVAL_SECONDS)
+        )
+        self.heartbeat_file = heartbeat_file or os.getenv('PIPELINE_HEARTBEAT_FILE', DEFAULT_HEARTBEAT_FILE)
+
+        self.db_pool = db_pool
+        self.stages = stages
+        self.queue = queue
+        self._stopping = asyncio.Event()
+
+    async def initialize(self):
+        """Connect to the database"""
+        if self.db_pool is None:
+            database_url = os.getenv("DATABASE_URL")
+            if not database_url:
+                raise ValueError("DATABASE_URL environment variable required")
+            pool_size = sum(self.stage_workers.values()) + 2
+            self.db_pool = await asyncpg.create_pool(
+                database_url, min_size=2, max_size=pool_size, command_timeout=60
+            )
+            async with self.db_pool.acquire() as conn:
+                await conn.execute(PIPELINE_SCHEMA_SQL)
+
+        self.stages = self.stages or DocumentPipelineStages(self.db_pool)
+        self.queue = self.queue or DocumentPipelineQueue(self.db_pool)
+
+    async def cleanup(self):
+        if self.db_pool:
+            await self.db_pool.close()
+
+    async def run_once(self, stage: str) -> bool:
+        """Claim and run one job for the stage; False if none was ready"""
+        job = await self.queue.claim(stage)
+        if job is None:
+            return False
+
+        logger.info(f"Stage {stage} for document {job.document_id} (job {job.id}, attempt {job.attempts})")
+        started = time.perf_counter()
+        try:
+            output = await asyncio.wait_for(self.stages.handler(stage)(job), timeout=self.stage_timeout)
+        except PipelineStop as stop:
+            logger.warning(f"Pipeline stopped for document {job.document_id} at {stage}: {stop}")
+            await self.queue.stop(job, str(stop), self._elapsed_ms(started))
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+            status = await self.queue.fail_stage(job, error)
+            logger.error(
+                f"❌ Stage {stage} failed for document {job.document_id} "
+                f"(attempt {job.attempts}/{job.max_attempts}, now {status}): {error}"
+            )
+        else:
+            await self.queue.complete_stage(job, output, self._elapsed_ms(started))
+        return True
+
+    @staticmethod
+    def _elapsed_ms(started: float) -> int:
+        return int((time.perf_counter() - started) * 1000)
+
+    async def _stage_loop(self, stage: str):
+        while not self._stopping.is_set():
+            try:
+                if await self.run_once(stage):
+                    continue
+            except Exception as e:
+                logger.error(f"Pipeline {stage} worker error: {e}", exc_info=True)
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def heartbeat(self):
+        """Refresh this worker's job locks, then touch the heartbeat file"""
+        await self.queue.heartbeat()
+        with open(self.heartbeat_file, 'a'):
+            os.utime(self.heartbeat_file)
+
+    async def _heartbeat_loop(self):
+        lock_timeout = self.heartbeat_interval * MISSED_HEARTBEATS_BEFORE_RECLAIM
+        while not self._stopping.is_set():
+            try:
+                await self.heartbeat()
+                await self.queue.reclaim_stale(lock_timeout)
+            except Exception as e:
+                # A stale heartbeat file marks the container unhealthy
+                logger.error(f"Pipeline heartbeat failed: {e}")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.heartbeat_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self):
+        """Finish the jobs in progress, then return from run()"""
+        self._stopping.set()
+
+    async def run(self):
+        """Run all stage worker pools until stopped"""
+        await self.initialize()
+        logger.info(f"Document pipeline worker {self.queue.worker_id} starting: {self.stage_workers}")
+
+        tasks = [
+            asyncio.create_task(self._stage_loop(stage))
+            for stage, count in self.stage_workers.items()
+            for _ in range(count)
+        ]
+        tasks.append(asyncio.create_task(self._heartbeat_loop()))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            await self.cleanup()
+
+
+def parse_stage_workers(stages: Sequence[str]) -> Dict[str, int]:
+    """Worker counts for the selected stages (from PIPELINE_WORKERS_<STAGE>)"""
+    return {
+        stage: int(os.getenv(f'PIPELINE_WORKERS_{stage.upper()}', DEFAULT_STAGE_WORKERS[stage]))
+        for stage in stages
+    }
+
+
+# Entry point for standalone execution
+if __name__ == "__main__":
+    import signal
+
+    parser = argparse.ArgumentParser(description="Document pipeline worker")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES),
+                        help="Stages this process works on (default: all)")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO"),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[logging.StreamHandler(sys.stdout)]
+    )
+
+    worker = DocumentPipelineWorker(stage_workers=parse_stage_workers(args.stages))
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, worker.stop)
+        await worker.run()
+
+    try:
+        asyncio.run(main())
+    except Exception as e:
+        print(f"Document pipeline worker crashed: {e}")
+        sys.exit(1)
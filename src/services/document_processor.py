@@ -9,12 +9,15 @@ import json
 import logging
 import time
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional
 from datetime import datetime
 
 from openai import AsyncOpenAI
 import asyncpg
 
+from src.services.pdf_extraction import get_pdf_extraction_engine
+from src.services.requirement_extraction import ChunkedRequirementExtractor, OpenAIRequirementLLM
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,6 +31,10 @@ class DocumentProcessor:
 
         self.openai_client = AsyncOpenAI(api_key=openai_api_key)
         self.openai_model = os.getenv('OPENAI_MODEL', 'gpt-4-turbo-preview')
+        self.requirement_extractor = ChunkedRequirementExtractor(
+            OpenAIRequirementLLM(self.openai_client, self.openai_model)
+        )
+        self.pdf_engine = get_pdf_extraction_engine()
 
     async def process_document(self, document_id: int, file_path: str, db_pool: asyncpg.Pool) -> Dict[str, Any]:
         """
@@ -159,100 +166,16 @@ class DocumentProcessor:
 
     async def _extract_pdf(self, file_path: str) -> tuple[str, str]:
         """
-        Extract text and tables from PDF file using cascading strategy
+        Extract text and tables from PDF file, page range by page range
 
-        Strategy order:
-        1. Camelot (best for PDFs with bordered tables)
-        2. PDFPlumber (good for text and borderless tables)
-        3. PyPDF2 (fallback for simple text extraction)
+        Pages are extracted in parallel worker processes. Table detection
+        (Camelot, then PDFPlumber) only runs on pages with ruling lines;
+        PyPDF2 is the text-only fallback. See src/services/pdf_extraction.py.
 
         Returns:
             tuple: (extracted_text, extraction_method)
         """
-
-        # Strategy 1: Try Camelot for table extraction first
-        try:
-            import camelot
-
-            logger.info("Trying Camelot PDF table extraction")
-            tables = camelot.read_pdf(file_path, pages='all', flavor='lattice')
-
-            # If we found tables with good accuracy, use Camelot
-            if len(tables) > 0 and tables[0].accuracy > 50:
-                logger.info(f"Camelot found {len(tables)} tables with good accuracy")
-                content_parts = []
-
-                # Also get text from pdfplumber for context
-                try:
-                    import pdfplumber
-                    with pdfplumber.open(file_path) as pdf:
-                        for page_num, page in enumerate(pdf.pages, 1):
-                            text = page.extract_text()
-                            if text:
-                                content_parts.append(f"=== PAGE {page_num} TEXT ===")
-                                content_parts.append(text)
-                except:
-                    pass
-
-                # Add Camelot tables
-                for i, table in enumerate(tables):
-                    content_parts.append(f"\n=== TABLE {i+1} START (Page {table.page}) ===")
-                    content_parts.append(self._format_camelot_table(table))
-                    content_parts.append(f"=== TABLE {i+1} END ===\n")
-
-                return ('\n'.join(content_parts), 'pdf_camelot')
-
-        except Exception as e:
-            logger.info(f"Camelot extraction failed: {e}, trying PDFPlumber")
-
-        # Strategy 2: Try PDFPlumber (good for text and tables)
-        try:
-            import pdfplumber
-
-            logger.info("Trying PDFPlumber extraction")
-            content_parts = []
-
-            with pdfplumber.open(file_path) as pdf:
-                for page_num, page in enumerate(pdf.pages, 1):
-                    # Extract text
-                    text = page.extract_text()
-                    if text:
-                        content_parts.append(f"=== PAGE {page_num} ===")
-                        content_parts.append(text)
-
-                    # Extract tables
-                    tables = page.extract_tables()
-                    if tables:
-                        for table_num, table in enumerate(tables, 1):
-                            content_parts.append(f"\n=== TABLE START (Page {page_num}, Table {table_num}) ===")
-                            content_parts.append(self._format_list_table(table))
-                            content_parts.append("=== TABLE END ===\n")
-
-            result_text = '\n'.join(content_parts)
-            if result_text.strip():
-                return (result_text, 'pdf_pdfplumber')
-
-        except Exception as e:
-            logger.warning(f"PDFPlumber extraction failed: {e}, trying PyPDF2")
-
-        # Strategy 3: Fallback to PyPDF2 for simple text extraction
-        try:
-            import PyPDF2
-
-            logger.info("Using PyPDF2 fallback")
-            text_parts = []
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page_num, page in enumerate(pdf_reader.pages, 1):
-                    text = page.extract_text()
-                    if text:
-                        text_parts.append(f"=== PAGE {page_num} ===")
-                        text_parts.append(text)
-
-            return ('\n'.join(text_parts), 'pdf_pypdf2')
-
-        except ImportError:
-            raise ImportError("No PDF library available (install camelot-py, pdfplumber, or PyPDF2)")
+        return await self.pdf_engine.extract(file_path)
 
     async def _extract_docx(self, file_path: str) -> str:
         """Extract text AND tables from DOCX file"""
@@ -349,143 +272,13 @@ class DocumentProcessor:
             logger.error(f"Error extracting Excel file: {e}")
             raise ValueError(f"Failed to extract Excel file: {str(e)}")
 
-    def _format_camelot_table(self, table) -> str:
-        """
-        Format Camelot table object to text
-
-        Args:
-            table: Camelot table object
-
-        Returns:
-            Formatted table as text with HEADERS and ROW markers
-        """
-        try:
-            # Convert to DataFrame
-            df = table.df
-
-            # First row is headers
-            headers = df.iloc[0].tolist()
-            content_parts = ["HEADERS: " + " | ".join(str(h) for h in headers)]
-
-            # Remaining rows are data
-            for idx in range(1, len(df)):
-                row = df.iloc[idx].tolist()
-                content_parts.append("ROW: " + " | ".join(str(cell) for cell in row))
-
-            return '\n'.join(content_parts)
-        except Exception as e:
-            logger.warning(f"Error formatting Camelot table: {e}")
-            return "(Table formatting error)"
-
-    def _format_list_table(self, table: List[List]) -> str:
-        """
-        Format list-of-lists table to text
-
-        Args:
-            table: List of lists representing table rows
-
-        Returns:
-            Formatted table as text with HEADERS and ROW markers
-        """
-        if not table or len(table) == 0:
-            return "(Empty table)"
-
-        content_parts = []
-
-        # First row is usually headers
-        if table[0]:
-            headers = [str(cell) if cell else "" for cell in table[0]]
-            content_parts.append("HEADERS: " + " | ".join(headers))
-
-        # Remaining rows are data
-        for row in table[1:]:
-            if row:  # Skip empty rows
-                row_data = [str(cell) if cell else "" for cell in row]
-                content_parts.append("ROW: " + " | ".join(row_data))
-
-        return '\n'.join(content_parts)
-
     async def _analyze_requirements(self, text: str) -> Dict[str, Any]:
         """
         Analyze document text using OpenAI to extract structured requirements
         NO FALLBACK DATA - If AI fails, we return error
         """
-
-        prompt = f"""Analyze this Request for Quotation (RFQ) document and extract ALL product line items.
-
-Document text:
-{text[:8000]}
-
-IMPORTANT INSTRUCTIONS - Product Extraction:
-1. TABLES: Look for tables marked with "=== TABLE START ===" and "=== TABLE END ==="
-   - Each "ROW:" line represents ONE product item - extract ALL of them
-   - Table columns typically include: Product Description, Brand, Quantity, Unit
-
-2. BULLETED LISTS: Look for product lists with bullet points (-, *, •)
-   - Extract each bulleted item as a separate product
-   - Parse quantity and description from each line
-
-3. NUMBERED LISTS: Look for numbered lists (1., 2., etc.)
-   - Extract each numbered item as a separate product
-   - Parse quantity and description from each line
-
-4. TEXT DESCRIPTIONS: Look for product specifications in paragraphs
-   - Extract any mentioned product names, quantities, and specifications
-   - Look for patterns like "10 pieces of...", "50 units of...", etc.
-
-5. MULTIPLE SHEETS/PAGES: Document may have multiple sheets or pages
-   - Extract products from ALL sheets/pages, not just the first
-   - Look for "=== SHEET N:" or "=== PAGE N ===" markers
-
-EXTRACTION RULES:
-- Extract EVERY single product mentioned - do NOT summarize or group
-- If there are 15 line items, return 15 separate items
-- Parse quantities from text (e.g., "10 pcs" → quantity: 10, unit: "pcs")
-- If quantity is not specified, use 1 as default
-- Include brand names in specifications if mentioned
-
-Extract and return a JSON object with this exact structure:
-{{
-    "customer_name": "company name from the RFQ header",
-    "project_name": "project name from the document",
-    "deadline": "quotation due date in YYYY-MM-DD format or null",
-    "items": [
-        {{
-            "description": "exact product name/description",
-            "quantity": actual_number_or_1_if_not_specified,
-            "unit": "unit (pieces, boxes, units, pcs, etc.)",
-            "specifications": ["brand name if available", "model", "other specs"],
-            "category": "infer from product name (tools, cleaning, safety, electrical, hardware, etc.)"
-        }}
-        // ... one object for EACH product item found
-    ],
-    "additional_requirements": ["payment terms", "delivery terms", "warranty", "certifications", etc],
-    "delivery_address": "delivery location if mentioned",
-    "contact_email": "contact email from document"
-}}
-
-CRITICAL: Extract EVERY product from ALL formats (tables, lists, text). No summaries - individual items only.
-Return valid JSON only."""
-
         try:
-            response = await self.openai_client.chat.completions.create(
-                model=self.openai_model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert at analyzing RFPs and extracting structured product requirements. Always return valid JSON."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.1,
-                response_format={"type": "json_object"}
-            )
-
-            requirements_json = response.choices[0].message.content
-            requirements = json.loads(requirements_json)
+            requirements = await self.requirement_extractor.extract(text)
 
             logger.info(f"OpenAI extracted {len(requirements.get('items', []))} requirement items")
 
@@ -0,0 +1,415 @@
+"""
+Product Embedding Backfill
+==========================
+
+Resumable bulk (re-)embedding of the products catalogue.
+
+- Streams products by keyset pagination (WHERE id > last_id ORDER BY id)
+  instead of loading the catalogue or a fixed 1000-row window
+- Embeds each page as concurrent provider batches with a bounded number of
+  in-flight requests
+- Writes each page with COPY into a temp staging table followed by a single
+  UPDATE ... FROM, in the same transaction as the checkpoint row, so a crash
+  resumes from the last committed page
+- Products of failed provider batches are kept in the checkpoint row
+  (failed_ids) and retried first when the run is resumed; a run that ends
+  with failures keeps its checkpoint until they succeed
+- While one page is being written the next page is already being embedded
+- Each embedding is stored with products.embedding_source_hash; products
+  whose text (and model) is unchanged since their last embedding are skipped
+
+The embedding provider is pluggable: anything with embedding_model,
+embedding_dimensions and an async generate_batch_embeddings(texts) works.
+EmbeddingService is the production provider; LocalEmbeddingProvider is a
+deterministic offline stand-in for tests and benchmarks.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import asyncpg
+import numpy as np
+
+from src.services.embedding_cache import PRODUCT_SOURCE_HASH_SQL, source_hash
+from src.services.embedding_service import to_vector_literal
+
+logger = logging.getLogger(__name__)
+
+
+CHECKPOINT_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS embedding_backfill_checkpoints (
+    job_name VARCHAR(200) PRIMARY KEY,
+    last_id BIGINT NOT NULL,
+    processed INTEGER NOT NULL DEFAULT 0,
+    failed_ids BIGINT[] NOT NULL DEFAULT '{}',
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+ALTER TABLE embedding_backfill_checkpoints
+    ADD COLUMN IF NOT EXISTS failed_ids BIGINT[] NOT NULL DEFAULT '{}'
+"""
+
+STAGING_TABLE_SQL = """
+CREATE TEMP TABLE IF NOT EXISTS embedding_backfill_staging (
+    id INTEGER PRIMARY KEY,
+    embedding TEXT NOT NULL,
+    source_hash CHAR(64) NOT NULL
+) ON COMMIT DELETE ROWS
+"""
+
+PRODUCT_TEXT_COLUMNS = (
+    "id, name, description, category, subcategory, brand, sku, "
+    "product_code, specifications, embedding_source_hash, "
+    "embedding IS NOT NULL AS has_embedding"
+)
+
+
+class LocalEmbeddingProvider:
+    """
+    Deterministic offline embedding provider (no API calls).
+
+    Produces a unit vector seeded from the SHA-256 of each text, so the same
+    text always gets the same embedding. Used by tests and benchmarks.
+    """
+
+    def __init__(self, dimensions: int = 1536, model: str = "local-hash"):
+        self.embedding_model = model
+        self.embedding_dimensions = dimensions
+        self.calls = 0
+
+    async def generate_batch_embeddings(self, texts: List[str]) -> List[List[float]]:
+        self.calls += 1
+        embeddings = []
+        for text in texts:
+            seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "little")
+            vector = np.random.default_rng(seed).standard_normal(self.embedding_dimensions)
+            embeddings.append((vector / np.linalg.norm(vector)).tolist())
+        return embeddings
+
+
+class ProductEmbeddingBackfill:
+    """
+    Keyset-paginated, checkpointed embedding backfill for the products table.
+
+    Usage:
+        backfill = ProductEmbeddingBackfill(db_pool, embedding_service,
+                                            embedding_service.create_product_text)
+        summary = await backfill.run(force_regenerate=True)
+    """
+
+    def __init__(
+        self,
+        db_pool: asyncpg.Pool,
+        provider: Any,
+        text_builder: Callable[[Dict[str, Any]], str],
+        batch_size: int = 100,
+        max_in_flight: int = 4
+    ):
+        """
+        Args:
+            db_pool: AsyncPG connection pool
+            provider: Embedding provider (see module docstring)
+            text_builder: Builds the embedding text from a product row dict
+            batch_size: Texts per provider request
+            max_in_flight: Concurrent provider requests; a page is
+                batch_size * max_in_flight products
+        """
+        self.db_pool = db_pool
+        self.provider = provider
+        self.text_builder = text_builder
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+        self.page_size = batch_size * max_in_flight
+
+    def checkpoint_name(self, force_regenerate: bool) -> str:
+        """Checkpoint key; a model change never resumes another model's run"""
+        scope = "all" if force_regenerate else "missing"
+        return f"products:{self.provider.embedding_model}:{scope}"
+
+    async def run(
+        self,
+        force_regenerate: bool = False,
+        product_ids: Optional[List[int]] = None,
+        max_products: Optional[int] = None,
+        resume: bool = True,
+        skip_unchanged: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Embed products and store the vectors.
+
+        Args:
+            force_regenerate: Re-embed products that already have an embedding
+            product_ids: Restrict to these products (not checkpointed)
+            max_products: Stop after this many products
+            resume: Continue from the last checkpoint of an interrupted run
+            skip_unchanged: With force_regenerate, skip products whose
+                embedding_source_hash matches their current text and model
+
+        Returns:
+            Summary of the backfill
+        """
+        started = time.perf_counter()
+        checkpointed = product_ids is None
+        job_name = self.checkpoint_name(force_regenerate)
+
+        async with self.db_pool.acquire() as conn:
+            await conn.execute(CHECKPOINT_TABLE_SQL)
+            await conn.execute(PRODUCT_SOURCE_HASH_SQL)
+            if checkpointed and not resume:
+                await conn.execute(
+                    "DELETE FROM embedding_backfill_checkpoints WHERE job_name = $1", job_name
+                )
+            checkpoint = None
+            if checkpointed:
+                checkpoint = await conn.fetchrow(
+                    "SELECT last_id, processed, failed_ids FROM embedding_backfill_checkpoints "
+                    "WHERE job_name = $1",
+                    job_name
+                )
+
+        last_id = checkpoint["last_id"] if checkpoint else 0
+        resumed_from = last_id if checkpoint else None
+        already_processed = checkpoint["processed"] if checkpoint else 0
+        retry_ids = sorted(checkpoint["failed_ids"] or []) if checkpoint else []
+        if checkpoint:
+            logger.info(
+                f"Resuming embedding backfill '{job_name}' after id {last_id} "
+                f"({len(retry_ids)} failed products to retry)"
+            )
+
+        fetched = 0
+        exhausted = False
+        embeddings_generated = 0
+        unchanged_skipped = 0
+        errors: List[Dict[str, Any]] = []
+        failed_ids: Set[int] = set()
+        write_task: Optional[asyncio.Task] = None
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+
+        # Products that failed in the interrupted run come first; the ones
+        # that fail again stay recorded for the next run
+        if retry_ids:
+            rows = await self._fetch_page(0, len(retry_ids), True, retry_ids)
+            records, unchanged = await self._embed_page(
+                rows, semaphore, errors, skip_unchanged, failed_ids
+            )
+            unchanged_skipped += unchanged
+            embeddings_generated += await self._write_page(
+                records, job_name, last_id, already_processed, sorted(failed_ids)
+            )
+
+        try:
+            while max_products is None or fetched < max_products:
+                limit = self.page_size
+                if max_products is not None:
+                    limit = min(limit, max_products - fetched)
+
+                rows = await self._fetch_page(last_id, limit, force_regenerate, product_ids)
+                if not rows:
+                    exhausted = True
+                    break
+
+                fetched += len(rows)
+                last_id = rows[-1]["id"]
+                records, unchanged = await self._embed_page(
+                    rows, semaphore, errors, skip_unchanged, failed_ids
+                )
+                unchanged_skipped += unchanged
+
+                # Writes stay ordered so checkpoints only move forward
+                if write_task is not None:
+                    embeddings_generated += await write_task
+                write_task = asyncio.create_task(
+                    self._write_page(
+                        records,
+                        job_name if checkpointed else None,
+                        last_id,
+                        already_processed + fetched,
+                        sorted(failed_ids)
+                    )
+                )
+
+            if write_task is not None:
+                embeddings_generated += await write_task
+                write_task = None
+        finally:
+            if write_task is not None:
+                await asyncio.gather(write_task, return_exceptions=True)
+
+        # A finished run clears its checkpoint; a run stopped by max_products,
+        # or one with products still failing, keeps it for the next run
+        if checkpointed and exhausted and failed_ids:
+            logger.warning(
+                f"Embedding backfill '{job_name}' finished with {len(failed_ids)} failed "
+                f"products; they are retried when the run is resumed"
+            )
+        elif checkpointed and exhausted:
+            async with self.db_pool.acquire() as conn:
+                await conn.execute(
+                    "DELETE FROM embedding_backfill_checkpoints WHERE job_name = $1", job_name
+                )
+
+        duration = time.perf_counter() - started
+        logger.info(
+            f"Embedding backfill '{job_name}': {embeddings_generated}/{fetched} products "
+            f"embedded in {duration:.1f}s ({unchanged_skipped} unchanged, "
+            f"{len(errors)} failed batches)"
+        )
+
+        return {
+            "products_processed": fetched,
+            "embeddings_generated": embeddings_generated,
+            "unchanged_skipped": unchanged_skipped,
+            "errors": len(errors),
+            "error_details": errors if errors else None,
+            "failed_product_ids": sorted(failed_ids),
+            "status": (
+                "No products to process" if not fetched
+                else "completed" if exhausted else "paused"
+            ),
+            "resumed_from_id": resumed_from,
+            "duration_seconds": round(duration, 2),
+            "embedding_model": self.provider.embedding_model,
+            "embedding_dimensions": self.provider.embedding_dimensions
+        }
+
+    async def _fetch_page(
+        self,
+        last_id: int,
+        limit: int,
+        force_regenerate: bool,
+        product_ids: Optional[List[int]]
+    ) -> List[asyncpg.Record]:
+        """Next page of products after last_id (keyset pagination)"""
+        conditions = ["id > $1"]
+        params: List[Any] = [last_id, limit]
+        if not force_regenerate and product_ids is None:
+            conditions.append("embedding IS NULL")
+        if product_ids is not None:
+            params.append(product_ids)
+            conditions.append(f"id = ANY(${len(params)}::int[])")
+
+        async with self.db_pool.acquire() as conn:
+            return await conn.fetch(
+                f"""
+                SELECT {PRODUCT_TEXT_COLUMNS}
+                FROM products
+                WHERE {' AND '.join(conditions)}
+                ORDER BY id
+                LIMIT $2
+                """,
+                *params
+            )
+
+    async def _embed_page(
+        self,
+        rows: List[asyncpg.Record],
+        semaphore: asyncio.Semaphore,
+        errors: List[Dict[str, Any]],
+        skip_unchanged: bool = True,
+        failed_ids: Optional[Set[int]] = None
+    ) -> Tuple[List[Tuple[int, str, str]], int]:
+        """
+        Embed a page as concurrent provider batches.
+
+        Failed batches are appended to errors and their product ids added to
+        failed_ids; ids of the page that succeed are removed from it.
+
+        Returns:
+            ((id, vector literal, source hash) records, number of products
+            skipped because their embedding source hash is unchanged)
+        """
+        failed_ids = failed_ids if failed_ids is not None else set()
+        pending = []
+        unchanged = 0
+        for row in rows:
+            text = self.text_builder(dict(row))
+            digest = source_hash(
+                self.provider.embedding_model, self.provider.embedding_dimensions, text
+            )
+            if (
+                skip_unchanged
+                and row["has_embedding"]
+                and row["embedding_source_hash"] == digest
+            ):
+                unchanged += 1
+                continue
+            pending.append((row, text, digest))
+
+        async def embed_batch(batch: List[Tuple[asyncpg.Record, str, str]]) -> List[Tuple[int, str, str]]:
+            texts = [text for _, text, _ in batch]
+            first_id, last_id = batch[0][0]["id"], batch[-1][0]["id"]
+            try:
+                async with semaphore:
+                    embeddings = await self.provider.generate_batch_embeddings(texts)
+            except Exception as e:
+                logger.error(f"Embedding batch {first_id}-{last_id} failed: {e}")
+                errors.append({
+                    "first_id": first_id,
+                    "last_id": last_id,
+                    "error": str(e)
+                })
+                failed_ids.update(row["id"] for row, _, _ in batch)
+                return []
+            failed_ids.difference_update(row["id"] for row, _, _ in batch)
+            return [
+                (row["id"], to_vector_literal(embedding), digest)
+                for (row, _, digest), embedding in zip(batch, embeddings)
+            ]
+
+        batches = [
+            pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)
+        ]
+        results = await asyncio.gather(*(embed_batch(batch) for batch in batches))
+        return [record for batch_records in results for record in batch_records], unchanged
+
+    async def _write_page(
+        self,
+        records: List[Tuple[int, str, str]],
+        job_name: Optional[str],
+        last_id: int,
+        processed: int,
+        failed_ids: Optional[List[int]] = None
+    ) -> int:
+        """COPY a page into staging, apply it with one UPDATE and move the checkpoint"""
+        async with self.db_pool.acquire() as conn:
+            async with conn.transaction():
+                updated = 0
+                if records:
+                    await conn.execute(STAGING_TABLE_SQL)
+                    await conn.copy_records_to_table(
+                        "embedding_backfill_staging",
+                        records=records,
+                        columns=["id", "embedding", "source_hash"]
+                    )
+                    status = await conn.execute(
+                        """
+                        UPDATE products p
+                        SET embedding = s.embedding::vector,
+                            embedding_source_hash = s.source_hash,
+                            updated_at = NOW()
+                        FROM embedding_backfill_staging s
+                        WHERE p.id = s.id
+                        """
+                    )
+                    updated = int(status.split()[-1])
+
+                if job_name is not None:
+                    await conn.execute(
+                        """
+                        INSERT INTO embedding_backfill_checkpoints
+                            (job_name, last_id, processed, failed_ids, updated_at)
+                        VALUES ($1, $2, $3, $4::bigint[], NOW())
+                        ON CONFLICT (job_name) DO UPDATE
+                        SET last_id = EXCLUDED.last_id,
+                            processed = EXCLUDED.processed,
+                            failed_ids = EXCLUDED.failed_ids,
+                            updated_at = EXCLUDED.updated_at
+                        """,
+                        job_name, last_id, processed, failed_ids or []
+                    )
+
+        logger.info(f"Stored {updated} embeddings (checkpoint id {last_id})")
+        return updated
@@ -0,0 +1,296 @@
+"""
+Embedding Cache
+===============
+
+Content-hash keyed cache for text embeddings, shared by every caller that
+embeds text (EmbeddingService, knowledge graph search and inference).
+
+- Key: (model, dimensions, sha256(normalised text)); normalisation is Unicode
+  NFC plus whitespace collapsing, so cosmetic differences still hit
+- Tier 1: process-wide LRU of float32 vectors (shared by all instances)
+- Tier 2: Postgres table `embedding_cache` and/or Redis, when configured
+- Lookups are batched: one round-trip per tier for a whole list of texts,
+  duplicate texts are embedded once
+- products.embedding_source_hash stores the hash a product's embedding was
+  built from, so backfills skip products whose text has not changed
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+# Persistent tier
+EMBEDDING_CACHE_SQL = """
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    model VARCHAR(100) NOT NULL,
+    dimensions INTEGER NOT NULL,
+    text_hash CHAR(64) NOT NULL,
+    embedding REAL[] NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (model, dimensions, text_hash)
+)
+"""
+
+# Hash of the text/model a product's stored embedding was built from
+PRODUCT_SOURCE_HASH_SQL = """
+ALTER TABLE products ADD COLUMN IF NOT EXISTS embedding_source_hash CHAR(64)
+"""
+
+REDIS_KEY_PREFIX = "embedding"
+
+# Default tier sizes: 4096 x 1536 float32 is ~25 MB per process
+DEFAULT_LRU_ENTRIES = 4096
+DEFAULT_REDIS_TTL = 30 * 24 * 3600
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form of a text for hashing (NFC, collapsed whitespace)"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text or "")).strip()
+
+
+def text_hash(text: str) -> str:
+    """SHA-256 hex digest of the normalised text"""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def source_hash(model: str, dimensions: int, text: str) -> str:
+    """
+    Hash of everything an embedding depends on.
+
+    Stored in products.embedding_source_hash; a change of text, model or
+    dimensions changes the hash and forces a re-embed.
+    """
+    return hashlib.sha256(
+        f"{model}:{dimensions}:{text_hash(text)}".encode("utf-8")
+    ).hexdigest()
+
+
+class LRUEmbeddingTier:
+    """Thread-safe in-process LRU of embeddings keyed by (model, dimensions, hash)"""
+
+    def __init__(self, max_entries: int = DEFAULT_LRU_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+            return vector
+
+    def put(self, key: tuple, vector: np.ndarray) -> None:
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Shared by every EmbeddingCache in the process unless one is passed explicitly
+_shared_lru = LRUEmbeddingTier()
+
+
+def shared_lru() -> LRUEmbeddingTier:
+    """The process-wide LRU tier"""
+    return _shared_lru
+
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache.
+
+    Usage:
+        cache = EmbeddingCache(db_pool=pool)
+        vectors = await cache.get_or_embed(
+            "text-embedding-3-small", 1536, texts, embed_uncached_texts
+        )
+    """
+
+    def __init__(
+        self,
+        db_pool: Optional[Any] = None,
+        redis_client: Optional[Any] = None,
+        lru: Optional[LRUEmbeddingTier] = None,
+        redis_ttl: int = DEFAULT_REDIS_TTL
+    ):
+        """
+        Args:
+            db_pool: AsyncPG pool for the Postgres tier (None = disabled)
+            redis_client: redis.asyncio client for the Redis tier (None = disabled)
+            lru: In-process tier (default: the process-wide shared LRU)
+            redis_ttl: Expiry of Redis entries in seconds
+        """
+        self.db_pool = db_pool
+        self.redis = redis_client
+        self.lru = lru if lru is not None else _shared_lru
+        self.redis_ttl = redis_ttl
+        self.hits = 0
+        self.misses = 0
+        self._schema_ready = False
+
+    async def ensure_schema(self) -> None:
+        """Create the embedding_cache table and products.embedding_source_hash"""
+        if self.db_pool is None or self._schema_ready:
+            return
+        async with self.db_pool.acquire() as conn:
+            await conn.execute(EMBEDDING_CACHE_SQL)
+            await conn.execute(PRODUCT_SOURCE_HASH_SQL)
+        self._schema_ready = True
+        logger.info("Embedding cache table created/verified")
+
+    async def get_or_embed(
+        self,
+        model: str,
+        dimensions: int,
+        texts: Sequence[str],
+        embed: Callable[[List[str]], Awaitable[List[List[float]]]]
+    ) -> List[List[float]]:
+        """
+        Embeddings for texts, calling embed() only for texts not cached.
+
+        Args:
+            model: Embedding model name
+            dimensions: Embedding dimensions
+            texts: Texts to embed (duplicates are embedded once)
+            embed: Async provider call for the uncached texts, in order
+
+        Returns:
+            One embedding per input text, in input order
+        """
+        hashes = [text_hash(text) for text in texts]
+        found = await self.get_many(model, dimensions, hashes)
+
+        missing: Dict[str, str] = {}
+        for text, digest in zip(texts, hashes):
+            if digest not in found and digest not in missing:
+                missing[digest] = text
+
+        self.hits += len(texts) - sum(1 for digest in hashes if digest in missing)
+        self.misses += len(missing)
+
+        if missing:
+            embeddings = await embed(list(missing.values()))
+            created = {
+                digest: np.asarray(embedding, dtype=np.float32)
+                for digest, embedding in zip(missing.keys(), embeddings)
+            }
+            await self.put_many(model, dimensions, created)
+            found.update(created)
+
+        return [found[digest].tolist() for digest in hashes]
+
+    async def get_many(
+        self,
+        model: str,
+        dimensions: int,
+        hashes: Sequence[str]
+    ) -> Dict[str, np.ndarray]:
+        """Look hashes up tier by tier; lower-tier hits are promoted to the LRU"""
+        found: Dict[str, np.ndarray] = {}
+        for digest in hashes:
+            vector = self.lru.get((model, dimensions, digest))
+            if vector is not None:
+                found[digest] = vector
+
+        pending = [digest for digest in dict.fromkeys(hashes) if digest not in found]
+
+        if pending and self.redis is not None:
+            try:
+                values = await self.redis.mget(
+                    [self._redis_key(model, dimensions, digest) for digest in pending]
+                )
+                for digest, value in zip(pending, values):
+                    if value is not None:
+                        found[digest] = np.frombuffer(value, dtype=np.float32)
+            except Exception as e:
+                logger.warning(f"Redis embedding cache lookup failed: {e}")
+            pending = [digest for digest in pending if digest not in found]
+
+        if pending and self.db_pool is not None:
+            try:
+                await self.ensure_schema()
+                async with self.db_pool.acquire() as conn:
+                    rows = await conn.fetch(
+                        """
+                        SELECT text_hash, embedding
+                        FROM embedding_cache
+                        WHERE model = $1 AND dimensions = $2
+                        AND text_hash = ANY($3::char(64)[])
+                        """,
+                        model, dimensions, pending
+                    )
+                for row in rows:
+                    found[row["text_hash"]] = np.asarray(row["embedding"], dtype=np.float32)
+            except Exception as e:
+                logger.warning(f"Postgres embedding cache lookup failed: {e}")
+
+        for digest, vector in found.items():
+            self.lru.put((model, dimensions, digest), vector)
+        return found
+
+    async def put_many(
+        self,
+        model: str,
+        dimensions: int,
+        vectors: Dict[str, np.ndarray]
+    ) -> None:
+        """Store embeddings in every configured tier"""
+        if not vectors:
+            return
+        for digest, vector in vectors.items():
+            self.lru.put((model, dimensions, digest), vector)
+
+        if self.redis is not None:
+            try:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for digest, vector in vectors.items():
+                        pipe.setex(
+                            self._redis_key(model, dimensions, digest),
+                            self.redis_ttl,
+                            vector.tobytes()
+                        )
+                    await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Redis embedding cache write failed: {e}")
+
+        if self.db_pool is not None:
+            try:
+                await self.ensure_schema()
+                async with self.db_pool.acquire() as conn:
+                    await conn.executemany(
+                        """
+                        INSERT INTO embedding_cache (model, dimensions, text_hash, embedding)
+                        VALUES ($1, $2, $3, $4)
+                        ON CONFLICT DO NOTHING
+                        """,
+                        [
+                            (model, dimensions, digest, vector.tolist())
+                            for digest, vector in vectors.items()
+                        ]
+                    )
+            except Exception as e:
+                logger.warning(f"Postgres embedding cache write failed: {e}")
+
+    @staticmethod
+    def _redis_key(model: str, dimensions: int, digest: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:{model}:{dimensions}:{digest}"
@@ -12,6 +12,10 @@ Performance:
 - Embedding generation: ~100ms per product
 - Similarity search: <50ms for 10,000+ products with IVFFlat index
 - Batch operations: 100+ products per API call
+- Embedding cache: repeated texts are served from an in-process LRU /
+  Postgres cache keyed by content hash (see embedding_cache.py)
+- Backfill: keyset-paginated, concurrent, COPY-based and resumable
+  (see embedding_backfill.py)
 """
 
 import os
@@ -20,11 +24,19 @@ from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
 from openai import AsyncOpenAI
 import asyncpg
-from datetime import datetime
 import logging
+import re
+
+from src.services.embedding_cache import EmbeddingCache
+from src.services.product_search import ProductSearchEngine
 
 logger = logging.getLogger(__name__)
 
+# Product columns returned by hybrid search
+HYBRID_RESULT_COLUMNS = (
+    "id, name, description, category, brand, sku, price, stock_quantity, specifications"
+)
+
 
 class EmbeddingService:
     """
@@ -32,21 +44,26 @@ class EmbeddingService:
     Uses OpenAI's text-embedding-3-small model (1536 dimensions).
     """
 
-    def __init__(self, db_pool: asyncpg.Pool):
+    def __init__(self, db_pool: asyncpg.Pool, redis_client: Optional[Any] = None):
         """
         Initialize embedding service with database connection pool.
 
         Args:
             db_pool: AsyncPG connection pool for database operations
+            redis_client: Optional redis.asyncio client (binary responses) for
+                the shared embedding cache tier
         """
         self.db_pool = db_pool
         self.openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
         self.embedding_model = "text-embedding-3-small"  # 1536 dimensions
         self.embedding_dimensions = 1536
+        self.keyword_search_engine = ProductSearchEngine(db_pool, columns=("id",))
+        self.embedding_cache = EmbeddingCache(db_pool=db_pool, redis_client=redis_client)
 
     async def generate_text_embedding(self, text: str) -> List[float]:
         """
         Generate embedding for a single text using OpenAI API.
+        Served from the embedding cache when the same text was embedded before.
 
         Args:
             text: Text to embed
@@ -57,25 +74,14 @@ class EmbeddingService:
         Raises:
             Exception: If OpenAI API call fails
         """
-        try:
-            response = await self.openai_client.embeddings.create(
-                model=self.embedding_model,
-                input=text,
-                encoding_format="float"
-            )
-
-            embedding = response.data[0].embedding
-            logger.info(f"Generated embedding for text: {text[:50]}... (dim={len(embedding)})")
-            return embedding
-
-        except Exception as e:
-            logger.error(f"Failed to generate embedding: {e}")
-            raise
+        embeddings = await self.generate_batch_embeddings([text])
+        return embeddings[0]
 
     async def generate_batch_embeddings(self, texts: List[str]) -> List[List[float]]:
         """
-        Generate embeddings for multiple texts in a single API call.
-        OpenAI supports up to 100 inputs per request.
+        Generate embeddings for multiple texts.
+        Cached texts are served from the embedding cache; the rest are sent
+        to OpenAI (up to 100 inputs per request).
 
         Args:
             texts: List of texts to embed
@@ -83,6 +89,15 @@ class EmbeddingService:
         Returns:
             List of embedding vectors
         """
+        return await self.embedding_cache.get_or_embed(
+            self.embedding_model,
+            self.embedding_dimensions,
+            texts,
+            self._request_embeddings
+        )
+
+    async def _request_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts with the OpenAI API, bypassing the cache"""
         try:
             # OpenAI allows up to 100 inputs per request
             batch_size = 100
@@ -105,7 +120,7 @@ class EmbeddingService:
             return all_embeddings
 
         except Exception as e:
-            logger.error(f"Failed to generate batch embeddings: {e}")
+            logger.error(f"Failed to generate embeddings: {e}")
             raise
 
     def create_product_text(self, product: Dict[str, Any]) -> str:
@@ -158,112 +173,49 @@ class EmbeddingService:
         self,
         product_ids: Optional[List[int]] = None,
         batch_size: int = 100,
-        force_regenerate: bool = False
+        force_regenerate: bool = False,
+        max_in_flight: int = 4,
+        max_products: Optional[int] = None,
+        resume: bool = True,
+        skip_unchanged: bool = True
     ) -> Dict[str, Any]:
         """
         Generate embeddings for products and store in database.
 
+        Runs a ProductEmbeddingBackfill: keyset-paginated over the whole
+        catalogue, concurrent embedding requests, COPY + single UPDATE per
+        page, and a checkpoint so an interrupted run resumes where it stopped.
+        Products whose text has not changed since they were embedded are skipped.
+
         Args:
             product_ids: Specific product IDs to process (None = all products)
-            batch_size: Number of products to process per batch
+            batch_size: Number of products per embedding request
             force_regenerate: If True, regenerate even if embedding exists
+            max_in_flight: Concurrent embedding requests
+            max_products: Stop after this many products (None = no limit)
+            resume: Resume an interrupted run from its checkpoint
+            skip_unchanged: Skip products whose text is unchanged since their
+                last embedding (products.embedding_source_hash)
 
         Returns:
             Summary of generation operation
         """
-        async with self.db_pool.acquire() as conn:
-            # Build query to fetch products
-            if product_ids:
-                where_clause = "WHERE id = ANY($1)"
-                products = await conn.fetch(
-                    f"""
-                    SELECT id, name, description, category, subcategory, brand, sku,
-                           product_code, specifications, embedding
-                    FROM products
-                    {where_clause}
-                    ORDER BY id
-                    """,
-                    product_ids
-                )
-            else:
-                # Get products without embeddings or force regenerate
-                if force_regenerate:
-                    where_clause = ""
-                else:
-                    where_clause = "WHERE embedding IS NULL"
-
-                products = await conn.fetch(
-                    f"""
-                    SELECT id, name, description, category, subcategory, brand, sku,
-                           product_code, specifications, embedding
-                    FROM products
-                    {where_clause}
-                    ORDER BY id
-                    LIMIT $1
-                    """,
-                    1000  # Limit to 1000 products at a time
-                )
-
-            if not products:
-                logger.info("No products found to generate embeddings")
-                return {
-                    "products_processed": 0,
-                    "embeddings_generated": 0,
-                    "status": "No products to process"
-                }
-
-            logger.info(f"Generating embeddings for {len(products)} products")
-
-            # Process in batches
-            embeddings_generated = 0
-            errors = []
-
-            for i in range(0, len(products), batch_size):
-                batch = products[i:i+batch_size]
-
-                try:
-                    # Create text representations
-                    product_texts = [self.create_product_text(dict(p)) for p in batch]
-                    product_ids_batch = [p["id"] for p in batch]
-
-                    # Generate embeddings via OpenAI
-                    embeddings = await self.generate_batch_embeddings(product_texts)
-
-                    # Store embeddings in database
-                    for product_id, embedding in zip(product_ids_batch, embeddings):
-                        await conn.execute(
-                            """
-                            UPDATE products
-                            SET embedding = $1::vector,
-                                updated_at = $2
-                            WHERE id = $3
-                            """,
-                            embedding,
-                            datetime.utcnow(),
-                            product_id
-                        )
-
-                    embeddings_generated += len(embeddings)
-                    logger.info(
-                        f"Batch {i//batch_size + 1}: Generated and stored {len(embeddings)} embeddings"
-                    )
-
-                except Exception as e:
-                    logger.error(f"Error processing batch {i//batch_size + 1}: {e}")
-                    errors.append({
-                        "batch": i//batch_size + 1,
-                        "error": str(e)
-                    })
-
-            return {
-                "products_processed": len(products),
-                "embeddings_generated": embeddings_generated,
-                "errors": len(errors),
-                "error_details": errors if errors else None,
-                "status": "completed",
-                "embedding_model": self.embedding_model,
-                "embedding_dimensions": self.embedding_dimensions
-            }
+        from src.services.embedding_backfill import ProductEmbeddingBackfill
+
+        backfill = ProductEmbeddingBackfill(
+            self.db_pool,
+            provider=self,
+            text_builder=self.create_product_text,
+            batch_size=batch_size,
+            max_in_flight=max_in_flight
+        )
+        return await backfill.run(
+            force_regenerate=force_regenerate,
+            product_ids=product_ids,
+            max_products=max_products,
+            resume=resume,
+            skip_unchanged=skip_unchanged
+        )
 
     async def semantic_product_search(
         self,
@@ -392,31 +344,138 @@ class EmbeddingService:
         query: str,
         limit: int = 10,
         semantic_weight: float = 0.7,
-        keyword_weight: float = 0.3
+        keyword_weight: float = 0.3,
+        mode: str = "fusion",
+        candidates: int = 100,
+        fusion: str = "rrf"
     ) -> List[Dict[str, Any]]:
         """
         Hybrid search combining semantic similarity and keyword matching.
         Provides more robust results by using both approaches.
 
+        Modes:
+        - "fusion" (default): pull the top-N candidates from the pgvector index
+          (ORDER BY embedding <=> q LIMIT N) and the top-N from the text index
+          concurrently, fuse the two ranked lists, then hydrate only the final
+          `limit` product rows. Latency scales with N, not catalogue size.
+        - "exhaustive": score every product on both signals (keywords by the
+          original per-row regex match on name/description/category) and sort
+          the whole catalogue. Original behaviour, kept as the baseline for
+          tests/performance/benchmark_hybrid_search.py.
+
         Args:
             query: User's search query
             limit: Maximum number of results
             semantic_weight: Weight for semantic similarity score (0-1)
             keyword_weight: Weight for keyword matching score (0-1)
+            mode: "fusion" or "exhaustive"
+            candidates: Candidates taken from each index in fusion mode (N)
+            fusion: "rrf" (reciprocal rank fusion) or "weighted" (score fusion)
 
         Returns:
             List of products ranked by hybrid score
         """
+        if mode == "exhaustive":
+            return await self._hybrid_search_exhaustive(
+                query, limit, semantic_weight, keyword_weight
+            )
+
+        # Generate query embedding
+        query_embedding = await self.generate_text_embedding(query)
+        n_candidates = max(candidates, limit)
+
+        semantic_candidates, keyword_candidates = await asyncio.gather(
+            self._semantic_candidates(query_embedding, n_candidates),
+            self.keyword_search_engine.search(query, k=n_candidates)
+        )
+
+        semantic_scores = {row["id"]: float(row["semantic_score"]) for row in semantic_candidates}
+        keyword_scores = {row["id"]: float(row["relevance"]) for row in keyword_candidates}
+
+        fused = fuse_rankings(
+            [row["id"] for row in semantic_candidates],
+            [row["id"] for row in keyword_candidates],
+            semantic_weight=semantic_weight,
+            keyword_weight=keyword_weight,
+            method=fusion,
+            semantic_scores=semantic_scores,
+            keyword_scores=keyword_scores
+        )[:limit]
+
+        if not fused:
+            logger.info(f"Hybrid search for '{query}': Found 0 products")
+            return []
+
+        # Hydrate only the final result rows
+        async with self.db_pool.acquire() as conn:
+            rows = await conn.fetch(
+                f"""
+                SELECT {HYBRID_RESULT_COLUMNS}
+                FROM products
+                WHERE id = ANY($1::int[])
+                """,
+                [product_id for product_id, _ in fused]
+            )
+
+        rows_by_id = {row["id"]: dict(row) for row in rows}
+        products = []
+        for product_id, hybrid_score in fused:
+            product = rows_by_id.get(product_id)
+            if product is None:
+                continue
+            product["semantic_score"] = round(semantic_scores.get(product_id, 0.0), 4)
+            product["keyword_score"] = round(keyword_scores.get(product_id, 0.0), 4)
+            product["hybrid_score"] = round(hybrid_score, 4)
+            products.append(product)
+
+        logger.info(
+            f"Hybrid search for '{query}': Found {len(products)} products "
+            f"(fusion={fusion}, candidates={n_candidates}, "
+            f"semantic_weight={semantic_weight}, keyword_weight={keyword_weight})"
+        )
+
+        return products
+
+    async def _semantic_candidates(
+        self,
+        query_embedding: List[float],
+        n_candidates: int
+    ) -> List[asyncpg.Record]:
+        """Top-N nearest products by cosine distance (served by the pgvector index)"""
+        async with self.db_pool.acquire() as conn:
+            return await conn.fetch(
+                """
+                SELECT id, 1 - (embedding <=> $1::vector) AS semantic_score
+                FROM products
+                WHERE embedding IS NOT NULL
+                ORDER BY embedding <=> $1::vector
+                LIMIT $2
+                """,
+                to_vector_literal(query_embedding),
+                n_candidates
+            )
+
+    async def _hybrid_search_exhaustive(
+        self,
+        query: str,
+        limit: int,
+        semantic_weight: float,
+        keyword_weight: float
+    ) -> List[Dict[str, Any]]:
+        """Score every product on both signals and sort the full catalogue"""
         # Generate query embedding
         query_embedding = await self.generate_text_embedding(query)
 
-        # Extract keywords from query
-        keywords = query.lower().split()
-        keyword_pattern = '|'.join(keywords)
+        # Keyword scores use the original unindexed regex match on every row,
+        # so this mode stays the pre-fusion baseline for benchmarks
+        keyword_pattern = '|'.join(re.escape(keyword) for keyword in query.lower().split())
+        result_columns = ", ".join(
+            f"p.{column.strip()}" for column in HYBRID_RESULT_COLUMNS.split(",")
+        )
 
         async with self.db_pool.acquire() as conn:
             results = await conn.fetch(
-                """
+                f"""
                 WITH semantic_scores AS (
                     SELECT
                         id,
@@ -436,15 +495,7 @@ class EmbeddingService:
                     FROM products
                 )
                 SELECT
-                    p.id,
-                    p.name,
-                    p.description,
-                    p.category,
-                    p.brand,
-                    p.model_number,
-                    p.unit_price,
-                    p.stock_quantity,
-                    p.specifications,
+                    {result_columns},
                     COALESCE(ss.semantic_score, 0) AS semantic_score,
                     COALESCE(ks.keyword_score, 0) AS keyword_score,
                     (
@@ -460,7 +511,7 @@ class EmbeddingService:
                 ORDER BY hybrid_score DESC
                 LIMIT $5
                 """,
-                query_embedding,
+                to_vector_literal(query_embedding),
                 keyword_pattern,
                 semantic_weight,
                 keyword_weight,
@@ -476,8 +527,60 @@ class EmbeddingService:
                 products.append(product)
 
             logger.info(
-                f"Hybrid search for '{query}': Found {len(products)} products "
+                f"Hybrid search (exhaustive) for '{query}': Found {len(products)} products "
                 f"(semantic_weight={semantic_weight}, keyword_weight={keyword_weight})"
             )
 
             return products
+
+
+def to_vector_literal(embedding: List[float]) -> str:
+    """Format an embedding as a pgvector text literal for a $n::vector parameter"""
+    return "[" + ",".join(repr(float(x)) for x in embedding) + "]"
+
+
+def fuse_rankings(
+    semantic_ids: List[Any],
+    keyword_ids: List[Any],
+    semantic_weight: float = 0.7,
+    keyword_weight: float = 0.3,
+    method: str = "rrf",
+    rrf_k: int = 60,
+    semantic_scores: Optional[Dict[Any, float]] = None,
+    keyword_scores: Optional[Dict[Any, float]] = None
+) -> List[Tuple[Any, float]]:
+    """
+    Fuse two ranked candidate lists into one ranking.
+
+    Args:
+        semantic_ids: Candidate ids ordered by semantic similarity (best first)
+        keyword_ids: Candidate ids ordered by keyword relevance (best first)
+        semantic_weight: Weight of the semantic list
+        keyword_weight: Weight of the keyword list
+        method: "rrf" - weighted reciprocal rank fusion, sum(w / (rrf_k + rank));
+                "weighted" - weighted sum of raw scores (missing score = 0)
+        rrf_k: RRF damping constant
+        semantic_scores: id -> similarity (required for "weighted")
+        keyword_scores: id -> relevance (required for "weighted")
+
+    Returns:
+        (id, fused_score) pairs, best first
+    """
+    fused: Dict[Any, float] = {}
+
+    if method == "weighted":
+        semantic_scores = semantic_scores or {}
+        keyword_scores = keyword_scores or {}
+        for product_id in list(semantic_ids) + list(keyword_ids):
+            fused[product_id] = (
+                semantic_scores.get(product_id, 0.0) * semantic_weight
+                + keyword_scores.get(product_id, 0.0) * keyword_weight
+            )
+    elif method == "rrf":
+        for weight, ranked_ids in ((semantic_weight, semantic_ids), (keyword_weight, keyword_ids)):
+            for rank, product_id in enumerate(ranked_ids, start=1):
+                fused[product_id] = fused.get(product_id, 0.0) + weight / (rrf_k + rank)
+    else:
+        raise ValueError(f"Unknown fusion method: {method}")
+
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
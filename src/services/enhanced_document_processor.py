@@ -11,19 +11,22 @@ FEATURES:
 NO MOCK DATA - All processing uses real files and AI
 """
 
+import asyncio
 import os
 import json
 import logging
 import time
-import base64
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
-from io import BytesIO
 
 from openai import AsyncOpenAI
 import asyncpg
 
+from src.services.pdf_extraction import get_pdf_extraction_engine
+from src.services.requirement_extraction import ChunkedRequirementExtractor, OpenAIRequirementLLM
+from src.services.vision_rasterizer import VisionRasterizer
+
 logger = logging.getLogger(__name__)
 
 
@@ -38,6 +41,11 @@ class EnhancedDocumentProcessor:
         self.openai_client = AsyncOpenAI(api_key=openai_api_key)
         self.openai_model = os.getenv('OPENAI_MODEL', 'gpt-4-turbo-preview')
         self.vision_model = os.getenv('OPENAI_VISION_MODEL', 'gpt-4o')
+        self.requirement_extractor = ChunkedRequirementExtractor(
+            OpenAIRequirementLLM(self.openai_client, self.openai_model)
+        )
+        self.pdf_engine = get_pdf_extraction_engine()
+        self.vision_rasterizer = VisionRasterizer()
 
         # Strategy configuration
         self.confidence_threshold = float(os.getenv('EXTRACTION_CONFIDENCE_THRESHOLD', '0.85'))
@@ -310,95 +318,70 @@ class EnhancedDocumentProcessor:
         - Processes entire page as context
 
         Best for: Complex layouts, scanned RFPs, unusual formats
+
+        Pages are rendered lazily and sent with bounded concurrency; pages
+        with a text layer skip rendering and go through text analysis, one
+        call per run of consecutive text pages. Items from both paths are
+        merged in page order.
         """
         logger.info("Using GPT-4 Vision for document extraction")
 
-        # Convert document to images
-        images = await self._convert_document_to_images(file_path)
-
-        if not images:
-            raise ValueError("Could not convert document to images")
-
-        logger.info(f"Converted document to {len(images)} images")
-
-        # Process each page with GPT-4 Vision
-        all_items = []
-        extracted_text_parts = []
-
-        for page_num, image_base64 in enumerate(images, 1):
-            logger.info(f"Processing page {page_num}/{len(images)} with GPT-4 Vision")
-
-            response = await self.openai_client.chat.completions.create(
-                model=self.vision_model,
-                messages=[{
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": f"""Extract ALL product line items from this RFP page (Page {page_num} of {len(images)}).
-
-Look for:
-- Tables with product descriptions, quantities, units
-- Bulleted or numbered lists of items
-- Text paragraphs describing materials needed
-- Headers, footers, and annotations
+        async with self.vision_rasterizer.open(file_path) as document:
+            if not document.page_count:
+                raise ValueError("Could not convert document to images")
 
-Return JSON with:
-{{
-    "page_text": "all text visible on this page",
-    "items": [
-        {{
-            "description": "full product name",
-            "quantity": number,
-            "unit": "pieces/boxes/meters/etc",
-            "specifications": ["brand", "model", "specs"],
-            "category": "inferred category"
-        }}
-    ]
-}}
-
-Extract EVERY product mentioned - no summaries."""
-                        },
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:image/png;base64,{image_base64}",
-                                "detail": "high"  # High detail for tables
-                            }
-                        }
-                    ]
-                }],
-                temperature=0.1,
-                max_tokens=2000,
-                response_format={"type": "json_object"}
+            logger.info(
+                f"Vision extraction: {len(document.vision_pages)} of {document.page_count} pages to render, "
+                f"{len(document.text_pages)} with a text layer"
             )
 
-            page_data = json.loads(response.choices[0].message.content)
-
-            # Collect text and items
-            extracted_text_parts.append(f"=== PAGE {page_num} ===")
-            extracted_text_parts.append(page_data.get('page_text', ''))
-
-            page_items = page_data.get('items', [])
-            all_items.extend(page_items)
-
-            logger.info(f"Page {page_num}: extracted {len(page_items)} items")
+            async def process_page(page_num: int, image_base64: str) -> Dict[str, Any]:
+                return await self._vision_page(page_num, document.page_count, image_base64)
 
-        # Combine all results
-        full_text = '\n'.join(extracted_text_parts)
+            vision_results, text_results = await asyncio.gather(
+                self.vision_rasterizer.map_pages(document, process_page),
+                self._analyze_text_runs(document.text_pages),
+            )
+            text_pages = document.text_pages
+            page_count = document.page_count
 
         requirements = {
             'customer_name': None,
             'project_name': None,
             'deadline': None,
-            'items': all_items,
+            'items': [],
             'additional_requirements': [],
             'delivery_address': None,
             'contact_email': None
         }
 
+        # Collect text and items in page order
+        all_items = requirements['items']
+        extracted_text_parts = []
+
+        for page_num in range(1, page_count + 1):
+            extracted_text_parts.append(f"=== PAGE {page_num} ===")
+            if page_num in text_pages:
+                extracted_text_parts.append(text_pages[page_num])
+                # Text runs are keyed by their first page
+                text_requirements = text_results.get(page_num, {})
+                all_items.extend(text_requirements.get('items', []))
+                requirements['additional_requirements'].extend(
+                    text_requirements.get('additional_requirements', [])
+                )
+                for key, value in text_requirements.items():
+                    if key not in ('items', 'additional_requirements') and value and not requirements.get(key):
+                        requirements[key] = value
+            else:
+                page_data = vision_results[page_num]
+                extracted_text_parts.append(page_data.get('page_text', ''))
+                all_items.extend(page_data.get('items', []))
+
+        # Combine all results
+        full_text = '\n'.join(extracted_text_parts)
+
         # Try to extract metadata from first page
-        if all_items and extracted_text_parts:
+        if all_items and extracted_text_parts and not requirements['customer_name']:
             # Use AI to extract metadata from combined text
             metadata_prompt = f"""From this RFP text, extract metadata:
 
@@ -430,9 +413,82 @@ Return JSON with:
             'text': full_text,
             'requirements': requirements,
             'method': 'vision',
-            'pages_processed': len(images)
+            'pages_processed': page_count
         }
 
+    async def _analyze_text_runs(self, text_pages: Dict[int, str]) -> Dict[int, Dict[str, Any]]:
+        """Analyse each run of consecutive text-layer pages; results keyed by the run's first page"""
+        runs: List[List[int]] = []
+        for page_num in sorted(text_pages):
+            if runs and runs[-1][-1] == page_num - 1:
+                runs[-1].append(page_num)
+            else:
+                runs.append([page_num])
+
+        semaphore = asyncio.Semaphore(self.vision_rasterizer.max_concurrency)
+
+        async def analyze_run(run: List[int]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._analyze_requirements(
+                    '\n'.join(f"=== PAGE {page_num} ===\n{text_pages[page_num]}" for page_num in run)
+                )
+
+        results = await asyncio.gather(*[analyze_run(run) for run in runs])
+        return {run[0]: result for run, result in zip(runs, results)}
+
+    async def _vision_page(self, page_num: int, page_count: int, image_base64: str) -> Dict[str, Any]:
+        """Extract page text and line items from one rendered page"""
+        logger.info(f"Processing page {page_num}/{page_count} with GPT-4 Vision")
+
+        response = await self.openai_client.chat.completions.create(
+            model=self.vision_model,
+            messages=[{
+                "role": "user",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": f"""Extract ALL product line items from this RFP page (Page {page_num} of {page_count}).
+
+Look for:
+- Tables with product descriptions, quantities, units
+- Bulleted or numbered lists of items
+- Text paragraphs describing materials needed
+- Headers, footers, and annotations
+
+Return JSON with:
+{{
+    "page_text": "all text visible on this page",
+    "items": [
+        {{
+            "description": "full product name",
+            "quantity": number,
+            "unit": "pieces/boxes/meters/etc",
+            "specifications": ["brand", "model", "specs"],
+            "category": "inferred category"
+        }}
+    ]
+}}
+
+Extract EVERY product mentioned - no summaries."""
+                    },
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:image/jpeg;base64,{image_base64}",
+                            "detail": "high"  # High detail for tables
+                        }
+                    }
+                ]
+            }],
+            temperature=0.1,
+            max_tokens=2000,
+            response_format={"type": "json_object"}
+        )
+
+        page_data = json.loads(response.choices[0].message.content)
+        logger.info(f"Page {page_num}: extracted {len(page_data.get('items', []))} items")
+        return page_data
+
     async def _try_basic_extraction(self, file_path: str) -> Dict[str, Any]:
         """
         Strategy 4: Basic text extraction + advanced AI prompt
@@ -464,83 +520,6 @@ Return JSON with:
 
     # ==================== Helper Methods ====================
 
-    async def _convert_document_to_images(self, file_path: str) -> List[str]:
-        """
-        Convert document to high-quality images for vision processing
-
-        Returns:
-            List of base64-encoded PNG images (one per page)
-        """
-        file_ext = Path(file_path).suffix.lower()
-
-        try:
-            if file_ext == '.pdf':
-                from pdf2image import convert_from_path
-
-                # Convert PDF to images at 200 DPI for quality
-                images = convert_from_path(file_path, dpi=200, fmt='PNG')
-
-            elif file_ext in ['.docx', '.doc']:
-                # Convert Word to PDF first, then to images
-                # This requires libreoffice or similar
-                try:
-                    import subprocess
-                    import tempfile
-
-                    with tempfile.TemporaryDirectory() as tmpdir:
-                        # Convert to PDF using libreoffice
-                        subprocess.run([
-                            'libreoffice',
-                            '--headless',
-                            '--convert-to', 'pdf',
-                            '--outdir', tmpdir,
-                            file_path
-                        ], check=True, capture_output=True)
-
-                        pdf_path = Path(tmpdir) / f"{Path(file_path).stem}.pdf"
-
-                        from pdf2image import convert_from_path
-                        images = convert_from_path(str(pdf_path), dpi=200, fmt='PNG')
-                except Exception as e:
-                    logger.warning(f"Could not convert Word to images: {e}")
-                    return []
-
-            elif file_ext in ['.xlsx', '.xls']:
-                # For Excel, we'd need to screenshot each sheet
-                # This is complex - for now, skip vision for Excel
-                logger.warning("Vision extraction not supported for Excel files")
-                return []
-
-            elif file_ext in ['.png', '.jpg', '.jpeg', '.gif', '.bmp']:
-                # Already an image
-                from PIL import Image
-                images = [Image.open(file_path)]
-
-            else:
-                logger.warning(f"Vision extraction not supported for {file_ext}")
-                return []
-
-            # Convert images to base64
-            base64_images = []
-            for img in images:
-                buffer = BytesIO()
-                img.save(buffer, format='PNG')
-                buffer.seek(0)
-                img_base64 = base64.b64encode(buffer.read()).decode('utf-8')
-                base64_images.append(img_base64)
-
-            return base64_images
-
-        except ImportError as e:
-            logger.error(
-                f"Missing dependency for image conversion: {e}\n"
-                "Install with: pip install pdf2image pillow"
-            )
-            return []
-        except Exception as e:
-            logger.error(f"Error converting document to images: {e}")
-            return []
-
     def _calculate_confidence(self, result: Dict[str, Any]) -> float:
         """
         Calculate confidence score for extraction result
@@ -595,72 +574,8 @@ Return JSON with:
             return f.read()
 
     async def _extract_pdf_specialized(self, file_path: str) -> Tuple[str, str]:
-        """Extract PDF with Camelot + PDFPlumber (Phase 1 implementation)"""
-        # Try Camelot first
-        try:
-            import camelot
-            tables = camelot.read_pdf(file_path, pages='all', flavor='lattice')
-
-            if len(tables) > 0 and tables[0].accuracy > 50:
-                content_parts = []
-
-                # Get text from pdfplumber
-                try:
-                    import pdfplumber
-                    with pdfplumber.open(file_path) as pdf:
-                        for page_num, page in enumerate(pdf.pages, 1):
-                            text = page.extract_text()
-                            if text:
-                                content_parts.append(f"=== PAGE {page_num} TEXT ===")
-                                content_parts.append(text)
-                except:
-                    pass
-
-                # Add tables
-                for i, table in enumerate(tables):
-                    content_parts.append(f"\n=== TABLE {i+1} (Page {table.page}) ===")
-                    content_parts.append(self._format_camelot_table(table))
-                    content_parts.append(f"=== TABLE {i+1} END ===\n")
-
-                return ('\n'.join(content_parts), 'pdf_camelot')
-        except Exception as e:
-            logger.info(f"Camelot failed: {e}")
-
-        # Try PDFPlumber
-        try:
-            import pdfplumber
-            content_parts = []
-
-            with pdfplumber.open(file_path) as pdf:
-                for page_num, page in enumerate(pdf.pages, 1):
-                    text = page.extract_text()
-                    if text:
-                        content_parts.append(f"=== PAGE {page_num} ===")
-                        content_parts.append(text)
-
-                    tables = page.extract_tables()
-                    if tables:
-                        for table_num, table in enumerate(tables, 1):
-                            content_parts.append(f"\n=== TABLE (Page {page_num}, Table {table_num}) ===")
-                            content_parts.append(self._format_list_table(table))
-                            content_parts.append("=== TABLE END ===\n")
-
-            return ('\n'.join(content_parts), 'pdf_pdfplumber')
-        except Exception as e:
-            logger.warning(f"PDFPlumber failed: {e}")
-
-        # Fallback to PyPDF2
-        import PyPDF2
-        text_parts = []
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page_num, page in enumerate(pdf_reader.pages, 1):
-                text = page.extract_text()
-                if text:
-                    text_parts.append(f"=== PAGE {page_num} ===")
-                    text_parts.append(text)
-
-        return ('\n'.join(text_parts), 'pdf_pypdf2')
+        """Extract PDF per page range: Camelot/PDFPlumber tables on ruled pages only (Phase 1 implementation)"""
+        return await self.pdf_engine.extract(file_path)
 
     async def _extract_pdf_basic(self, file_path: str) -> Tuple[str, str]:
         """Basic PDF text extraction for fallback"""
@@ -728,119 +643,13 @@ Return JSON with:
 
         return '\n'.join(content_parts)
 
-    def _format_camelot_table(self, table) -> str:
-        """Format Camelot table to text"""
-        try:
-            df = table.df
-            headers = df.iloc[0].tolist()
-            content_parts = ["HEADERS: " + " | ".join(str(h) for h in headers)]
-
-            for idx in range(1, len(df)):
-                row = df.iloc[idx].tolist()
-                content_parts.append("ROW: " + " | ".join(str(cell) for cell in row))
-
-            return '\n'.join(content_parts)
-        except Exception as e:
-            logger.warning(f"Error formatting Camelot table: {e}")
-            return "(Table formatting error)"
-
-    def _format_list_table(self, table: List[List]) -> str:
-        """Format list-of-lists table to text"""
-        if not table:
-            return "(Empty table)"
-
-        content_parts = []
-        if table[0]:
-            headers = [str(cell) if cell else "" for cell in table[0]]
-            content_parts.append("HEADERS: " + " | ".join(headers))
-
-        for row in table[1:]:
-            if row:
-                row_data = [str(cell) if cell else "" for cell in row]
-                content_parts.append("ROW: " + " | ".join(row_data))
-
-        return '\n'.join(content_parts)
-
     async def _analyze_requirements(self, text: str) -> Dict[str, Any]:
         """
         Analyze document text using OpenAI to extract structured requirements
         Enhanced prompt for better extraction across all document types
         """
-        prompt = f"""Analyze this Request for Quotation (RFQ) document and extract ALL product line items.
-
-Document text:
-{text[:8000]}
-
-IMPORTANT INSTRUCTIONS - Product Extraction:
-1. TABLES: Look for tables marked with "=== TABLE START ===" and "=== TABLE END ==="
-   - Each "ROW:" line represents ONE product item - extract ALL of them
-   - Table columns typically include: Product Description, Brand, Quantity, Unit
-
-2. BULLETED LISTS: Look for product lists with bullet points (-, *, •)
-   - Extract each bulleted item as a separate product
-   - Parse quantity and description from each line
-
-3. NUMBERED LISTS: Look for numbered lists (1., 2., etc.)
-   - Extract each numbered item as a separate product
-   - Parse quantity and description from each line
-
-4. TEXT DESCRIPTIONS: Look for product specifications in paragraphs
-   - Extract any mentioned product names, quantities, and specifications
-   - Look for patterns like "10 pieces of...", "50 units of...", etc.
-
-5. MULTIPLE SHEETS/PAGES: Document may have multiple sheets or pages
-   - Extract products from ALL sheets/pages, not just the first
-   - Look for "=== SHEET N:" or "=== PAGE N ===" markers
-
-EXTRACTION RULES:
-- Extract EVERY single product mentioned - do NOT summarize or group
-- If there are 15 line items, return 15 separate items
-- Parse quantities from text (e.g., "10 pcs" → quantity: 10, unit: "pcs")
-- If quantity is not specified, use 1 as default
-- Include brand names in specifications if mentioned
-
-Extract and return a JSON object with this exact structure:
-{{
-    "customer_name": "company name from the RFQ header",
-    "project_name": "project name from the document",
-    "deadline": "quotation due date in YYYY-MM-DD format or null",
-    "items": [
-        {{
-            "description": "exact product name/description",
-            "quantity": actual_number_or_1_if_not_specified,
-            "unit": "unit (pieces, boxes, units, pcs, etc.)",
-            "specifications": ["brand name if available", "model", "other specs"],
-            "category": "infer from product name (tools, cleaning, safety, electrical, hardware, etc.)"
-        }}
-        // ... one object for EACH product item found
-    ],
-    "additional_requirements": ["payment terms", "delivery terms", "warranty", "certifications", etc],
-    "delivery_address": "delivery location if mentioned",
-    "contact_email": "contact email from document"
-}}
-
-CRITICAL: Extract EVERY product from ALL formats (tables, lists, text). No summaries - individual items only.
-Return valid JSON only."""
-
         try:
-            response = await self.openai_client.chat.completions.create(
-                model=self.openai_model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert at analyzing RFPs and extracting structured product requirements. Always return valid JSON."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.1,
-                response_format={"type": "json_object"}
-            )
-
-            requirements_json = response.choices[0].message.content
-            requirements = json.loads(requirements_json)
+            requirements = await self.requirement_extractor.extract(text)
 
             logger.info(f"OpenAI extracted {len(requirements.get('items', []))} requirement items")
 
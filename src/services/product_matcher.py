@@ -1,33 +1,55 @@
 """
 Product Matching Service
-Matches RFP requirements to real products in database using semantic search
+Matches RFP requirements to real products in database using indexed search
 NO MOCK DATA - All matches from real product database
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import asyncpg
 
+from src.services.product_search import ProductSearchEngine
+
 logger = logging.getLogger(__name__)
 
 
 class ProductMatcher:
     """Matches requirements to products using database search"""
 
-    def __init__(self):
-        pass
+    def __init__(
+        self,
+        batch_size: int = 100,
+        max_concurrent_batches: int = 4,
+        candidates_per_item: int = 5
+    ):
+        """
+        Args:
+            batch_size: Line items sent to the database per batched query
+            max_concurrent_batches: Pool connections used concurrently for chunks
+            candidates_per_item: Top-k candidates returned for each line item
+        """
+        self.batch_size = batch_size
+        self.max_concurrent_batches = max_concurrent_batches
+        self.candidates_per_item = candidates_per_item
 
     async def match_products(
         self,
         requirements: Dict[str, Any],
-        db_pool: asyncpg.Pool
+        db_pool: asyncpg.Pool,
+        batched: bool = True
     ) -> List[Dict[str, Any]]:
         """
         Match requirement items to products in database
 
+        In batched mode (default) all line items are matched with a small number
+        of search_many round-trips run concurrently across the pool, so matching
+        time stays roughly flat as the RFQ grows. Set batched=False to fall back
+        to one query per line item.
+
         Args:
             requirements: Extracted requirements from document
             db_pool: Database connection pool
+            batched: Match all items in chunked set-based queries
 
         Returns:
             List of matched products with pricing and quantities
@@ -39,11 +61,21 @@ class ProductMatcher:
             logger.warning("No items to match")
             return []
 
+        candidates_by_item = None
+        if batched:
+            try:
+                candidates_by_item = await self.find_product_matches_batch(items, db_pool)
+            except Exception as e:
+                logger.error(f"Batched matching failed, falling back to per-item matching: {str(e)}")
+
         matched_products = []
 
         for idx, item in enumerate(items):
             try:
-                matches = await self._find_product_matches(item, db_pool)
+                if candidates_by_item is not None:
+                    matches = candidates_by_item.get(idx, [])
+                else:
+                    matches = await self._find_product_matches(item, db_pool)
 
                 if matches:
                     # Take best match
@@ -107,73 +139,129 @@ class ProductMatcher:
         """
         Find matching products in database
 
-        Uses keyword matching on product name, description, and category
+        Uses the shared index-backed product search (tsvector + trigram)
         Returns top matches ordered by relevance
         """
-        description = requirement_item.get('description', '').lower()
-        category = requirement_item.get('category', '').lower()
-
-        # Extract search keywords
-        keywords = self._extract_keywords(description)
+        query, keywords, category = self._build_search_query(requirement_item)
 
         if not keywords:
             return []
 
         logger.info(f"Searching for products with keywords: {keywords}")
 
-        async with db_pool.acquire() as conn:
-            # Search products by keywords in name and description
-            # Using PostgreSQL full-text search or simple ILIKE for now
-            search_query = """
-                SELECT
-                    id,
-                    name,
-                    product_code,
-                    description,
-                    category,
-                    price,
-                    currency,
-                    supplier,
-                    stock_quantity,
-                    (
-                        CASE
-                            WHEN LOWER(name) LIKE $1 THEN 1.0
-                            WHEN LOWER(description) LIKE $1 THEN 0.8
-                            WHEN LOWER(category) LIKE $2 THEN 0.6
-                            ELSE 0.4
-                        END
-                    ) as confidence
-                FROM products
-                WHERE
-                    LOWER(name) LIKE $1
-                    OR LOWER(description) LIKE $1
-                    OR LOWER(category) LIKE $2
-                ORDER BY confidence DESC, price ASC
-                LIMIT 5
-            """
-
-            # Create LIKE patterns
-            name_pattern = f"%{keywords[0]}%"
-            category_pattern = f"%{category}%" if category else f"%{keywords[0]}%"
-
-            rows = await conn.fetch(search_query, name_pattern, category_pattern)
-
-            matches = []
-            for row in rows:
-                matches.append({
-                    'id': row['id'],
-                    'name': row['name'],
-                    'product_code': row['product_code'],
-                    'description': row['description'],
-                    'category': row['category'],
-                    'price': row['price'],
-                    'currency': row['currency'],
-                    'supplier': row['supplier'],
-                    'stock_quantity': row['stock_quantity'],
-                    'confidence': float(row['confidence'])
-                })
-
-            return matches
+        engine = ProductSearchEngine(db_pool)
+        products = await engine.search(query, k=self.candidates_per_item)
+
+        return self._rank_matches(products, keywords, category)
+
+    async def find_product_matches_batch(
+        self,
+        items: List[Dict[str, Any]],
+        db_pool: asyncpg.Pool
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Find top-k candidate products for many requirement items at once
+
+        Items are sent to ProductSearchEngine.search_many, which matches a chunk
+        of batch_size items per round-trip and runs chunks concurrently (bounded
+        by max_concurrent_batches). All extracted keywords of an item are used.
+
+        Args:
+            items: Requirement line items
+            db_pool: Database connection pool
+
+        Returns:
+            Mapping of item index (position in items) to ranked candidate list.
+            Items without keywords or matches are absent from the mapping.
+        """
+        searchable = []
+        for idx, item in enumerate(items):
+            query, keywords, category = self._build_search_query(item)
+            if keywords:
+                searchable.append((idx, query, keywords, category))
+
+        if not searchable:
+            return {}
+
+        engine = ProductSearchEngine(
+            db_pool,
+            batch_size=self.batch_size,
+            max_concurrency=self.max_concurrent_batches
+        )
+        results = await engine.search_many(
+            [query for _, query, _, _ in searchable],
+            k=self.candidates_per_item
+        )
+
+        candidates_by_item: Dict[int, List[Dict[str, Any]]] = {}
+        for (idx, _, keywords, category), products in zip(searchable, results):
+            if products:
+                candidates_by_item[idx] = self._rank_matches(products, keywords, category)
+
+        logger.info(
+            f"Batched matching: {len(items)} items, "
+            f"{len(candidates_by_item)} items with candidates"
+        )
+
+        return candidates_by_item
+
+    def _build_search_query(self, item: Dict[str, Any]) -> Tuple[str, List[str], str]:
+        """Build the search text for a line item from its keywords and category"""
+        description = (item.get('description') or '').lower()
+        category = (item.get('category') or '').lower()
+
+        keywords = self._extract_keywords(description)
+        query = ' '.join(keywords + ([category] if category else []))
+
+        return query, keywords, category
+
+    def _rank_matches(
+        self,
+        products: List[Dict[str, Any]],
+        keywords: List[str],
+        category: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Assign match confidence to search results
+
+        Confidence keeps the matcher's tiers: keyword in product name (1.0),
+        in description (0.8), category match (0.6), otherwise 0.4. Ties are
+        broken by search relevance, then price.
+        """
+        matches = []
+        for product in products:
+            name = (product.get('name') or '').lower()
+            description = (product.get('description') or '').lower()
+            product_category = (product.get('category') or '').lower()
+
+            if any(kw in name for kw in keywords):
+                confidence = 1.0
+            elif any(kw in description for kw in keywords):
+                confidence = 0.8
+            elif product_category and (
+                (category and category in product_category)
+                or any(kw in product_category for kw in keywords)
+            ):
+                confidence = 0.6
+            else:
+                confidence = 0.4
+
+            matches.append({
+                'id': product['id'],
+                'name': product['name'],
+                'product_code': product.get('product_code'),
+                'description': product.get('description'),
+                'category': product.get('category'),
+                'price': product.get('price'),
+                'currency': product.get('currency'),
+                'supplier': product.get('supplier'),
+                'stock_quantity': product.get('stock_quantity'),
+                'confidence': confidence,
+                'relevance': product.get('relevance', 0.0)
+            })
+
+        matches.sort(key=lambda m: (-m['confidence'], -m['relevance'], float(m['price'] or 0)))
+        return matches
 
     def _extract_keywords(self, description: str) -> List[str]:
         """Extract meaningful keywords from description"""
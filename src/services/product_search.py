@@ -0,0 +1,361 @@
+"""
+Product Search Engine
+=====================
+
+Shared, index-backed keyword search over the products catalogue.
+
+Every keyword lookup (RFQ line matching, chat keyword fallback, hybrid search,
+catalogue search) goes through this module instead of re-implementing
+LOWER(col) LIKE '%x%' or regex scans. The module owns its indexes:
+- search_vector: stored tsvector over name, sku/product_code, brand, category
+  and description (weighted A/A/B/B/C) with a GIN index
+- GIN pg_trgm index on LOWER(name) for typo-tolerant / partial name matches
+
+Both predicates are index-backed, so a lookup touches only matching rows
+instead of scanning the full catalogue.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+
+# Columns returned for each matched product
+PRODUCT_COLUMNS: Tuple[str, ...] = (
+    "id",
+    "name",
+    "sku",
+    "product_code",
+    "description",
+    "category",
+    "brand",
+    "price",
+    "currency",
+    "supplier",
+    "stock_quantity",
+    "specifications",
+)
+
+# Creates the stored tsvector column and both GIN indexes. The tsvector is built
+# only from the text columns present in this deployment's products table.
+PRODUCT_SEARCH_INDEX_SQL = """
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+DO $$
+DECLARE
+    parts text[] := ARRAY[]::text[];
+    col record;
+BEGIN
+    IF NOT EXISTS (
+        SELECT FROM information_schema.columns
+        WHERE table_schema = current_schema()
+        AND table_name = 'products'
+        AND column_name = 'search_vector'
+    ) THEN
+        FOR col IN
+            SELECT c.column_name, w.weight
+            FROM (VALUES
+                ('name', 'A'), ('sku', 'A'), ('product_code', 'A'),
+                ('brand', 'B'), ('category', 'B'), ('description', 'C')
+            ) AS w(column_name, weight)
+            JOIN information_schema.columns c
+                ON c.column_name = w.column_name
+                AND c.table_schema = current_schema()
+                AND c.table_name = 'products'
+        LOOP
+            parts := parts || format(
+                'setweight(to_tsvector(''english'', COALESCE(%I::text, '''')), %L)',
+                col.column_name, col.weight
+            );
+        END LOOP;
+
+        EXECUTE format(
+            'ALTER TABLE products ADD COLUMN search_vector tsvector '
+            'GENERATED ALWAYS AS (%s) STORED',
+            array_to_string(parts, ' || ')
+        );
+
+        RAISE NOTICE 'Added search_vector column to products table';
+    END IF;
+END$$;
+
+CREATE INDEX IF NOT EXISTS idx_products_search_vector
+    ON products USING GIN (search_vector);
+
+CREATE INDEX IF NOT EXISTS idx_products_name_trgm
+    ON products USING GIN (LOWER(name) gin_trgm_ops);
+"""
+
+# OR-semantics tsquery: a product matching more query terms ranks higher, but
+# a product does not have to match every word of a long RFQ description.
+TSQUERY_SQL = "replace(plainto_tsquery('english', {query})::text, '&', '|')::tsquery"
+
+# Index-backed match predicate (GIN tsvector OR GIN trigram word similarity)
+MATCH_SQL = "(p.search_vector @@ {tsq} OR {raw} <% LOWER(p.name))"
+
+# Relevance in [0, 1]: normalised cover density rank blended with name similarity
+RELEVANCE_SQL = (
+    "((ts_rank_cd(p.search_vector, {tsq}, 32) "
+    "+ word_similarity({raw}, LOWER(p.name))) / 2)"
+)
+
+
+def build_filter_sql(filters: Optional[Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
+    """
+    Build AND-ed filter conditions with named placeholders.
+
+    Supported filters: category, brand, category_id, brand_id, status,
+    min_price, max_price, in_stock_only, active_only.
+
+    Returns:
+        (sql fragment starting with " AND ..." or "", named parameters)
+    """
+    if not filters:
+        return "", {}
+
+    conditions: List[str] = []
+    params: Dict[str, Any] = {}
+
+    for key, column in (
+        ("category", "category"),
+        ("brand", "brand"),
+        ("category_id", "category_id"),
+        ("brand_id", "brand_id"),
+        ("status", "status"),
+    ):
+        if filters.get(key) is not None:
+            conditions.append(f"p.{column} = {{f_{key}}}")
+            params[f"f_{key}"] = filters[key]
+
+    if filters.get("min_price") is not None:
+        conditions.append("p.price >= {f_min_price}")
+        params["f_min_price"] = filters["min_price"]
+
+    if filters.get("max_price") is not None:
+        conditions.append("p.price <= {f_max_price}")
+        params["f_max_price"] = filters["max_price"]
+
+    if filters.get("in_stock_only"):
+        conditions.append("p.stock_quantity > 0")
+
+    if filters.get("active_only"):
+        conditions.append("p.is_active = TRUE")
+
+    if not conditions:
+        return "", {}
+
+    return " AND " + " AND ".join(conditions), params
+
+
+def render_sql(
+    template: str,
+    params: Dict[str, Any],
+    paramstyle: str = "asyncpg"
+) -> Tuple[str, Any]:
+    """
+    Render a template with {name} placeholders for a specific driver.
+
+    Args:
+        template: SQL with {name} placeholders
+        params: Named parameter values
+        paramstyle: "asyncpg" ($1, $2 ... positional) or "pyformat" (psycopg2)
+
+    Returns:
+        (sql, parameters) ready to pass to the driver
+    """
+    if paramstyle == "pyformat":
+        escaped = template.replace("%", "%%")
+        return escaped.format(**{name: f"%({name})s" for name in params}), params
+
+    names = list(params)
+    sql = template.format(**{name: f"${i + 1}" for i, name in enumerate(names)})
+    return sql, [params[name] for name in names]
+
+
+def build_search_query(
+    query: str,
+    filters: Optional[Dict[str, Any]] = None,
+    k: int = 10,
+    columns: Sequence[str] = PRODUCT_COLUMNS,
+    paramstyle: str = "asyncpg"
+) -> Tuple[str, Any]:
+    """Build the ranked single-query search SQL for the given driver"""
+    filter_sql, filter_params = build_filter_sql(filters)
+    select_cols = ", ".join(f"p.{c}" for c in columns)
+
+    template = f"""
+        WITH q AS (
+            SELECT {TSQUERY_SQL} AS tsq, LOWER({{query}}) AS raw
+        )
+        SELECT
+            {select_cols},
+            {RELEVANCE_SQL.format(tsq='q.tsq', raw='q.raw')} AS relevance
+        FROM products p, q
+        WHERE {MATCH_SQL.format(tsq='q.tsq', raw='q.raw')}{filter_sql}
+        ORDER BY relevance DESC, p.id
+        LIMIT {{k}}
+    """
+    params = {"query": query, **filter_params, "k": k}
+    return render_sql(template, params, paramstyle)
+
+
+def build_search_many_query(
+    filters: Optional[Dict[str, Any]] = None,
+    columns: Sequence[str] = PRODUCT_COLUMNS,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Build the template for matching many queries in one round-trip.
+
+    Queries are passed as a text[] and expanded with unnest() WITH ORDINALITY;
+    each one gets its own top-k through a LATERAL subquery.
+
+    Returns:
+        (template with {queries}, {k} and filter placeholders, filter parameters)
+    """
+    filter_sql, filter_params = build_filter_sql(filters)
+    select_cols = ", ".join(f"p.{c}" for c in columns)
+
+    template = f"""
+        WITH queries AS (
+            SELECT
+                (u.ord - 1)::int AS query_idx,
+                {TSQUERY_SQL.format(query='u.query_text')} AS tsq,
+                LOWER(u.query_text) AS raw
+            FROM unnest({{queries}}::text[]) WITH ORDINALITY AS u(query_text, ord)
+        )
+        SELECT queries.query_idx, m.*
+        FROM queries
+        CROSS JOIN LATERAL (
+            SELECT
+                {select_cols},
+                {RELEVANCE_SQL.format(tsq='queries.tsq', raw='queries.raw')} AS relevance
+            FROM products p
+            WHERE {MATCH_SQL.format(tsq='queries.tsq', raw='queries.raw')}{filter_sql}
+            ORDER BY relevance DESC, p.id
+            LIMIT {{k}}
+        ) m
+        ORDER BY queries.query_idx, m.relevance DESC
+    """
+    return template, filter_params
+
+
+class ProductSearchEngine:
+    """
+    Ranked, index-backed product keyword search shared by all matchers.
+
+    Usage:
+        engine = ProductSearchEngine(db_pool)
+        products = await engine.search("cordless drill", {"in_stock_only": True}, k=10)
+        per_line = await engine.search_many(["safety gloves", "ladder 3m"], k=5)
+    """
+
+    def __init__(
+        self,
+        db_pool: asyncpg.Pool,
+        batch_size: int = 100,
+        max_concurrency: int = 4,
+        columns: Sequence[str] = PRODUCT_COLUMNS
+    ):
+        """
+        Args:
+            db_pool: AsyncPG connection pool
+            batch_size: Queries sent per round-trip in search_many
+            max_concurrency: Pool connections used concurrently by search_many
+            columns: Product columns returned with each match
+        """
+        self.db_pool = db_pool
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.columns = tuple(columns)
+
+    async def ensure_indexes(self) -> None:
+        """Create the search_vector column and GIN indexes if missing"""
+        async with self.db_pool.acquire() as conn:
+            await conn.execute(PRODUCT_SEARCH_INDEX_SQL)
+        logger.info("Product search indexes created/verified")
+
+    async def search(
+        self,
+        query: str,
+        filters: Optional[Dict[str, Any]] = None,
+        k: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Ranked keyword search for a single query.
+
+        Args:
+            query: Free-text query (product name, description, SKU, ...)
+            filters: Optional filters (see build_filter_sql)
+            k: Maximum number of results
+
+        Returns:
+            Products ordered by relevance (0-1), best first
+        """
+        if not query or not query.strip():
+            return []
+
+        sql, params = build_search_query(query, filters, k, self.columns)
+
+        async with self.db_pool.acquire() as conn:
+            rows = await conn.fetch(sql, *params)
+
+        products = [self._row_to_product(row) for row in rows]
+        logger.debug(f"Product search for '{query[:50]}': {len(products)} results")
+        return products
+
+    async def search_many(
+        self,
+        queries: List[str],
+        k: int = 5,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Ranked keyword search for many queries at once.
+
+        Queries are split into chunks of batch_size; each chunk is a single
+        unnest()/LATERAL round-trip and chunks run concurrently across the pool.
+
+        Args:
+            queries: Free-text queries
+            k: Maximum results per query
+            filters: Optional filters applied to every query
+
+        Returns:
+            One ranked result list per query, in input order
+        """
+        results: List[List[Dict[str, Any]]] = [[] for _ in queries]
+        if not queries:
+            return results
+
+        template, filter_params = build_search_many_query(filters, self.columns)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run_chunk(offset: int, chunk: List[str]) -> None:
+            params = {"queries": chunk, **filter_params, "k": k}
+            sql, args = render_sql(template, params)
+            async with semaphore:
+                async with self.db_pool.acquire() as conn:
+                    rows = await conn.fetch(sql, *args)
+            for row in rows:
+                results[offset + row["query_idx"]].append(self._row_to_product(row))
+
+        chunks = [
+            (start, [q or "" for q in queries[start:start + self.batch_size]])
+            for start in range(0, len(queries), self.batch_size)
+        ]
+        await asyncio.gather(*(run_chunk(offset, chunk) for offset, chunk in chunks))
+
+        logger.info(
+            f"Product search_many: {len(queries)} queries in {len(chunks)} round-trips"
+        )
+        return results
+
+    def _row_to_product(self, row) -> Dict[str, Any]:
+        """Convert a result row to a product dict"""
+        product = {column: row[column] for column in self.columns}
+        product["relevance"] = round(float(row["relevance"] or 0), 4)
+        return product
@@ -0,0 +1,382 @@
+"""
+Requirement Extraction
+======================
+
+Map-reduce extraction of RFQ line items with an LLM, so long tenders are
+read in full instead of being cut at the first 8000 characters.
+
+- Split: the extracted document text is cut on page/sheet/table markers and
+  paragraph breaks into chunks of at most REQUIREMENT_CHUNK_CHARS; tables
+  larger than a chunk are split by rows with the HEADERS line repeated
+- Overlap: each chunk starts with the last REQUIREMENT_CHUNK_OVERLAP
+  characters (whole lines) of the previous one, so items on a boundary are
+  seen whole at least once
+- Map: chunks are sent to the LLM concurrently, at most
+  REQUIREMENT_MAX_CONCURRENCY calls in flight
+- Reduce: header fields are taken from the first chunk that has them;
+  items repeated by adjacent chunks (the overlap) are kept once
+
+Documents that fit in one chunk are sent as a single prompt, as before.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Protocol, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_CHARS = 8000
+DEFAULT_CHUNK_OVERLAP = 500
+DEFAULT_MAX_CONCURRENCY = 4
+
+HEADER_FIELDS = ('customer_name', 'project_name', 'deadline', 'delivery_address', 'contact_email')
+
+SYSTEM_PROMPT = (
+    "You are an expert at analyzing RFPs and extracting structured product requirements. "
+    "Always return valid JSON."
+)
+
+REQUIREMENTS_PROMPT = """Analyze this Request for Quotation (RFQ) document and extract ALL product line items.
+{part_note}
+Document text:
+{document_text}
+
+IMPORTANT INSTRUCTIONS - Product Extraction:
+1. TABLES: Look for tables marked with "=== TABLE START ===" and "=== TABLE END ==="
+   - Each "ROW:" line represents ONE product item - extract ALL of them
+   - Table columns typically include: Product Description, Brand, Quantity, Unit
+
+2. BULLETED LISTS: Look for product lists with bullet points (-, *, •)
+   - Extract each bulleted item as a separate product
+   - Parse quantity and description from each line
+
+3. NUMBERED LISTS: Look for numbered lists (1., 2., etc.)
+   - Extract each numbered item as a separate product
+   - Parse quantity and description from each line
+
+4. TEXT DESCRIPTIONS: Look for product specifications in paragraphs
+   - Extract any mentioned product names, quantities, and specifications
+   - Look for patterns like "10 pieces of...", "50 units of...", etc.
+
+5. MULTIPLE SHEETS/PAGES: Document may have multiple sheets or pages
+   - Extract products from ALL sheets/pages, not just the first
+   - Look for "=== SHEET N:" or "=== PAGE N ===" markers
+
+EXTRACTION RULES:
+- Extract EVERY single product mentioned - do NOT summarize or group
+- If there are 15 line items, return 15 separate items
+- Parse quantities from text (e.g., "10 pcs" → quantity: 10, unit: "pcs")
+- If quantity is not specified, use 1 as default
+- Include brand names in specifications if mentioned
+
+Extract and return a JSON object with this exact structure:
+{{
+    "customer_name": "company name from the RFQ header",
+    "project_name": "project name from the document",
+    "deadline": "quotation due date in YYYY-MM-DD format or null",
+    "items": [
+        {{
+            "description": "exact product name/description",
+            "quantity": actual_number_or_1_if_not_specified,
+            "unit": "unit (pieces, boxes, units, pcs, etc.)",
+            "specifications": ["brand name if available", "model", "other specs"],
+            "category": "infer from product name (tools, cleaning, safety, electrical, hardware, etc.)"
+        }}
+        // ... one object for EACH product item found
+    ],
+    "additional_requirements": ["payment terms", "delivery terms", "warranty", "certifications", etc],
+    "delivery_address": "delivery location if mentioned",
+    "contact_email": "contact email from document"
+}}
+
+CRITICAL: Extract EVERY product from ALL formats (tables, lists, text). No summaries - individual items only.
+Return valid JSON only."""
+
+PART_NOTE = """
+This is part {part} of {parts} of a longer document. Extract the items in this part only.
+Use null for header fields (customer, project, deadline, address, email) not shown in this part.
+"""
+
+_TABLE_START = re.compile(r'^=== TABLE\b(?!.*\bEND\b).*===$')
+_TABLE_END = re.compile(r'^=== TABLE\b.*\bEND ===$')
+_NON_WORD = re.compile(r'[^\w]+')
+
+
+class RequirementLLM(Protocol):
+    """A chat model that answers with a JSON object"""
+
+    async def complete_json(self, system: str, prompt: str) -> Dict[str, Any]:
+        ...
+
+
+class OpenAIRequirementLLM:
+    """RequirementLLM backed by the OpenAI chat completions API"""
+
+    def __init__(self, client, model: str):
+        self.client = client
+        self.model = model
+
+    async def complete_json(self, system: str, prompt: str) -> Dict[str, Any]:
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.1,
+            response_format={"type": "json_object"}
+        )
+        return json.loads(response.choices[0].message.content)
+
+
+def build_requirements_prompt(document_text: str, part: Optional[int] = None, parts: Optional[int] = None) -> str:
+    """Requirement extraction prompt for a whole document or one part of it"""
+    part_note = PART_NOTE.format(part=part, parts=parts) if parts and parts > 1 else ""
+    return REQUIREMENTS_PROMPT.format(part_note=part_note, document_text=document_text)
+
+
+# ==================== Split ====================
+
+@dataclass
+class Chunk:
+    """A part of the document text sent in one LLM call"""
+    index: int
+    text: str
+
+
+def _split_blocks(text: str) -> List[Tuple[bool, List[str]]]:
+    """Cut text into (is_table, lines) blocks at markers and blank lines"""
+    blocks: List[Tuple[bool, List[str]]] = []
+    current: List[str] = []
+    table: Optional[List[str]] = None
+
+    def flush():
+        nonlocal current
+        if current:
+            blocks.append((False, current))
+            current = []
+
+    for line in text.splitlines():
+        stripped = line.strip()
+
+        if table is not None:
+            table.append(line)
+            if _TABLE_END.match(stripped):
+                blocks.append((True, table))
+                table = None
+            continue
+
+        if _TABLE_START.match(stripped):
+            flush()
+            table = [line]
+        elif stripped.startswith('=== '):
+            flush()
+            current.append(line)
+        elif not stripped:
+            current.append(line)
+            flush()
+        else:
+            current.append(line)
+
+    flush()
+    if table is not None:
+        blocks.append((True, table))
+    return blocks
+
+
+def _split_lines(lines: List[str], max_chars: int) -> List[List[str]]:
+    """Cut a text block into pieces of at most max_chars (overlong lines are cut)"""
+    pieces: List[List[str]] = []
+    current: List[str] = []
+    size = 0
+
+    for line in lines:
+        for start in range(0, max(len(line), 1), max_chars):
+            part = line[start:start + max_chars]
+            if current and size + len(part) + 1 > max_chars:
+                pieces.append(current)
+                current, size = [], 0
+            current.append(part)
+            size += len(part) + 1
+
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def _split_table(lines: List[str], max_chars: int) -> List[List[str]]:
+    """Cut a table into sub-tables by rows, repeating the start marker and HEADERS"""
+    start = lines[0]
+    terminated = len(lines) > 1 and bool(_TABLE_END.match(lines[-1].strip()))
+    end = lines[-1] if terminated else "=== TABLE END ==="
+    body = lines[1:-1] if terminated else lines[1:]
+
+    header = [start]
+    if body and body[0].strip().startswith('HEADERS:'):
+        header.append(body[0])
+        body = body[1:]
+
+    overhead = sum(len(line) + 1 for line in header) + len(end) + 1
+    return [
+        header + rows + [end]
+        for rows in _split_lines(body, max(max_chars - overhead, 1))
+    ]
+
+
+def split_into_chunks(text: str, max_chars: int, overlap_chars: int) -> List[Chunk]:
+    """
+    Split document text into chunks on section and table boundaries.
+
+    A chunk holds at most max_chars of new text plus up to overlap_chars
+    repeated from the end of the previous chunk.
+    """
+    pieces: List[List[str]] = []
+    for is_table, lines in _split_blocks(text):
+        if len('\n'.join(lines)) <= max_chars:
+            pieces.append(lines)
+        elif is_table:
+            pieces.extend(_split_table(lines, max_chars))
+        else:
+            pieces.extend(_split_lines(lines, max_chars))
+
+    chunks: List[Chunk] = []
+    current: List[str] = []
+    fresh = 0  # chars of new (non-overlap) text in current
+
+    def emit():
+        chunks.append(Chunk(index=len(chunks), text='\n'.join(current)))
+
+    for piece in pieces:
+        size = len('\n'.join(piece)) + 1
+        if fresh and fresh + size > max_chars:
+            emit()
+            overlap: List[str] = []
+            overlap_size = 0
+            for line in reversed(current):
+                if overlap_size + len(line) + 1 > overlap_chars:
+                    break
+                overlap.insert(0, line)
+                overlap_size += len(line) + 1
+            current, fresh = overlap, 0
+        current.extend(piece)
+        fresh += size
+
+    if fresh:
+        emit()
+    return chunks
+
+
+# ==================== Reduce ====================
+
+def _item_key(item: Dict[str, Any]) -> Optional[Tuple[str, Any, str]]:
+    description = _NON_WORD.sub(' ', str(item.get('description') or '')).strip().lower()
+    if not description:
+        return None
+
+    quantity = item.get('quantity')
+    try:
+        quantity = float(quantity)
+    except (TypeError, ValueError):
+        quantity = str(quantity or '').strip().lower()
+
+    return (description, quantity, str(item.get('unit') or '').strip().lower())
+
+
+def merge_requirements(partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Reduce per-chunk requirements (in document order) into one result.
+
+    An item is dropped as an overlap duplicate when the previous chunk
+    returned the same (description, quantity, unit), at most as many times
+    as it occurred there; repeats further apart are real line items.
+    """
+    merged: Dict[str, Any] = {field: None for field in HEADER_FIELDS}
+    items: List[Dict[str, Any]] = []
+    additional: List[str] = []
+    seen_additional = set()
+    previous: Counter = Counter()
+
+    for partial in partials:
+        for field in HEADER_FIELDS:
+            if merged[field] is None and partial.get(field):
+                merged[field] = partial[field]
+
+        for requirement in partial.get('additional_requirements') or []:
+            key = _NON_WORD.sub(' ', str(requirement)).strip().lower()
+            if key and key not in seen_additional:
+                seen_additional.add(key)
+                additional.append(requirement)
+
+        duplicates = Counter(previous)
+        current: Counter = Counter()
+        for item in partial.get('items') or []:
+            if not isinstance(item, dict):
+                continue
+            key = _item_key(item)
+            if key is not None:
+                current[key] += 1
+                if duplicates[key] > 0:
+                    duplicates[key] -= 1
+                    continue
+            items.append(item)
+        previous = current
+
+    merged['items'] = items
+    merged['additional_requirements'] = additional
+    return merged
+
+
+# ==================== Extractor ====================
+
+class ChunkedRequirementExtractor:
+    """Extracts requirements from document text of any length"""
+
+    def __init__(
+        self,
+        llm: RequirementLLM,
+        chunk_chars: Optional[int] = None,
+        overlap_chars: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        self.llm = llm
+        self.chunk_chars = chunk_chars or int(os.getenv('REQUIREMENT_CHUNK_CHARS', DEFAULT_CHUNK_CHARS))
+        self.overlap_chars = overlap_chars if overlap_chars is not None else int(
+            os.getenv('REQUIREMENT_CHUNK_OVERLAP', DEFAULT_CHUNK_OVERLAP)
+        )
+        self.max_concurrency = max_concurrency or int(
+            os.getenv('REQUIREMENT_MAX_CONCURRENCY', DEFAULT_MAX_CONCURRENCY)
+        )
+
+    async def extract(self, text: str) -> Dict[str, Any]:
+        """
+        Extract requirements from the whole text.
+
+        Raises:
+            Exception: whatever the LLM raised for any chunk (no partial results)
+        """
+        if len(text) <= self.chunk_chars:
+            return await self.llm.complete_json(SYSTEM_PROMPT, build_requirements_prompt(text))
+
+        chunks = split_into_chunks(text, self.chunk_chars, self.overlap_chars)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def extract_chunk(chunk: Chunk) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.llm.complete_json(
+                    SYSTEM_PROMPT,
+                    build_requirements_prompt(chunk.text, part=chunk.index + 1, parts=len(chunks))
+                )
+
+        partials = await asyncio.gather(*[extract_chunk(chunk) for chunk in chunks])
+        merged = merge_requirements(partials)
+
+        logger.info(
+            f"Extracted {len(merged['items'])} items from {len(chunks)} chunks "
+            f"({sum(len(p.get('items') or []) for p in partials)} before merge)"
+        )
+        return merged
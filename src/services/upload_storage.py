@@ -0,0 +1,140 @@
+"""
+Upload Storage
+==============
+
+Streams uploaded files to disk in fixed-size chunks, hashing as it goes.
+
+- Memory per upload is one chunk (UPLOAD_CHUNK_BYTES), whatever the file size;
+  disk writes run in a worker thread so the event loop never blocks on I/O
+- SHA-256 and size are computed while streaming; uploads over
+  MAX_UPLOAD_SIZE_MB are rejected from the declared size before any copying,
+  or as soon as the stream passes the limit
+- The file is written to a temporary name and renamed into place when
+  complete, so a failed upload never leaves a partial file behind
+- documents.content_hash lets a re-sent document reuse the extraction results
+  of an earlier upload with the same content
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Protocol
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+DEFAULT_MAX_UPLOAD_SIZE_MB = 50
+
+DOCUMENT_CONTENT_HASH_SQL = """
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS content_hash CHAR(64);
+CREATE INDEX IF NOT EXISTS idx_documents_content_hash ON documents(content_hash);
+"""
+
+
+def max_upload_bytes() -> int:
+    """Upload size limit from MAX_UPLOAD_SIZE_MB"""
+    return int(os.getenv('MAX_UPLOAD_SIZE_MB', DEFAULT_MAX_UPLOAD_SIZE_MB)) * 1024 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the size limit"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        super().__init__(f"File exceeds the {limit // (1024 * 1024)} MB upload limit")
+
+
+class AsyncReadable(Protocol):
+    """What is needed from an upload (fastapi.UploadFile satisfies it)"""
+
+    async def read(self, size: int = -1) -> bytes:
+        ...
+
+
+@dataclass
+class StoredUpload:
+    """A fully written upload"""
+    path: str
+    size: int
+    sha256: str
+
+
+async def stream_upload(
+    source: AsyncReadable,
+    upload_dir: str,
+    filename: str,
+    max_bytes: Optional[int] = None,
+    chunk_size: int = UPLOAD_CHUNK_BYTES,
+) -> StoredUpload:
+    """
+    Copy an upload to upload_dir chunk by chunk.
+
+    Raises:
+        UploadTooLargeError: declared or streamed size is over max_bytes
+    """
+    max_bytes = max_bytes or max_upload_bytes()
+
+    declared_size = getattr(source, 'size', None)
+    if declared_size is not None and declared_size > max_bytes:
+        raise UploadTooLargeError(max_bytes)
+
+    await asyncio.to_thread(os.makedirs, upload_dir, exist_ok=True)
+    fd, temp_path = await asyncio.to_thread(tempfile.mkstemp, dir=upload_dir, suffix='.part')
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = await source.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(max_bytes)
+                digest.update(chunk)
+                await asyncio.to_thread(out.write, chunk)
+
+        final_path = os.path.join(upload_dir, f"{uuid.uuid4().hex}_{os.path.basename(filename or 'upload')}")
+        await asyncio.to_thread(os.replace, temp_path, final_path)
+
+    except BaseException:
+        await asyncio.to_thread(_remove_quietly, temp_path)
+        raise
+
+    return StoredUpload(path=final_path, size=size, sha256=digest.hexdigest())
+
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+async def find_processed_duplicate(conn: asyncpg.Connection, content_hash: str) -> Optional[Dict[str, Any]]:
+    """
+    Most recent successfully processed document with the same content.
+
+    Returns the row (id, file_path, ai_extracted_data, ai_confidence_score)
+    only while its file still exists on disk.
+    """
+    row = await conn.fetchrow("""
+        SELECT id, file_path, ai_extracted_data, ai_confidence_score
+        FROM documents
+        WHERE content_hash = $1
+          AND ai_status = 'completed'
+          AND ai_extracted_data IS NOT NULL
+        ORDER BY id DESC
+        LIMIT 1
+    """, content_hash)
+
+    if row and row['file_path'] and await asyncio.to_thread(os.path.exists, row['file_path']):
+        return dict(row)
+    return None
@@ -0,0 +1,214 @@
+"""
+Vision Page Rasteriser
+======================
+
+Streams document pages to the vision extraction strategy.
+
+- Pages are rendered one at a time (pdf2image first_page/last_page) just
+  before their vision call, inside the concurrency limit, so memory holds at
+  most one image per call in flight instead of the whole document
+- Pages that already have a text layer are not rendered; their text is
+  returned for ordinary requirement analysis
+- Images are downsampled to what the model looks at with "high" detail
+  (within 2048px, shortest side 768px) and sent as JPEG
+- map_pages() dispatches the rendered pages concurrently and returns the
+  results by page number
+
+Configuration (environment):
+    VISION_DPI                    render resolution before downsampling (default: 150)
+    VISION_MAX_LONG_EDGE          longest image side in px (default: 2048)
+    VISION_MAX_SHORT_EDGE         shortest image side in px (default: 768)
+    VISION_JPEG_QUALITY           JPEG quality (default: 85)
+    VISION_TEXT_LAYER_MIN_CHARS   pages with this much text are not rendered
+                                  (default: 200; 0 renders every page)
+    VISION_MAX_CONCURRENCY        vision calls in flight (default: 4)
+"""
+
+import asyncio
+import base64
+import logging
+import os
+import subprocess
+import tempfile
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from io import BytesIO
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.bmp')
+
+DEFAULT_DPI = 150
+DEFAULT_MAX_LONG_EDGE = 2048
+DEFAULT_MAX_SHORT_EDGE = 768
+DEFAULT_JPEG_QUALITY = 85
+DEFAULT_TEXT_LAYER_MIN_CHARS = 200
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+def fit_size(width: int, height: int, max_long_edge: int, max_short_edge: int) -> Tuple[int, int]:
+    """Largest size within both edge limits (never upscales)"""
+    scale = min(1.0, max_long_edge / max(width, height), max_short_edge / min(width, height))
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def encode_image(image, max_long_edge: int, max_short_edge: int, quality: int) -> str:
+    """Downsample a PIL image and return it as base64 JPEG"""
+    size = fit_size(image.width, image.height, max_long_edge, max_short_edge)
+    if size != (image.width, image.height):
+        image.thumbnail(size)
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+
+    buffer = BytesIO()
+    image.save(buffer, format='JPEG', quality=quality, optimize=True)
+    return base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def page_text_layers(file_path: str) -> List[str]:
+    """Text layer of every page of a PDF ('' where there is none)"""
+    try:
+        import pdfplumber
+        with pdfplumber.open(file_path) as pdf:
+            return [page.extract_text() or '' for page in pdf.pages]
+    except ImportError:
+        pass
+
+    try:
+        import PyPDF2
+        with open(file_path, 'rb') as file:
+            return [page.extract_text() or '' for page in PyPDF2.PdfReader(file).pages]
+    except ImportError:
+        pass
+
+    from pdf2image import pdfinfo_from_path
+    return [''] * int(pdfinfo_from_path(file_path)['Pages'])
+
+
+def convert_to_pdf(file_path: str, output_dir: str) -> str:
+    """Convert a Word document to PDF with LibreOffice"""
+    subprocess.run([
+        'libreoffice',
+        '--headless',
+        '--convert-to', 'pdf',
+        '--outdir', output_dir,
+        file_path
+    ], check=True, capture_output=True)
+    return str(Path(output_dir) / f"{Path(file_path).stem}.pdf")
+
+
+@dataclass
+class RasterDocument:
+    """A document opened for vision extraction"""
+    page_count: int
+    vision_pages: List[int]
+    render_page: Callable[[int], str]
+    text_pages: Dict[int, str] = field(default_factory=dict)
+
+    async def render(self, page: int) -> str:
+        """Render one page (base64 JPEG) in a worker thread"""
+        return await asyncio.to_thread(self.render_page, page)
+
+
+class VisionRasterizer:
+    """Opens documents for vision extraction and dispatches their pages"""
+
+    def __init__(
+        self,
+        dpi: Optional[int] = None,
+        max_long_edge: Optional[int] = None,
+        max_short_edge: Optional[int] = None,
+        jpeg_quality: Optional[int] = None,
+        text_layer_min_chars: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        self.dpi = dpi or int(os.getenv('VISION_DPI', DEFAULT_DPI))
+        self.max_long_edge = max_long_edge or int(os.getenv('VISION_MAX_LONG_EDGE', DEFAULT_MAX_LONG_EDGE))
+        self.max_short_edge = max_short_edge or int(os.getenv('VISION_MAX_SHORT_EDGE', DEFAULT_MAX_SHORT_EDGE))
+        self.jpeg_quality = jpeg_quality or int(os.getenv('VISION_JPEG_QUALITY', DEFAULT_JPEG_QUALITY))
+        self.text_layer_min_chars = text_layer_min_chars if text_layer_min_chars is not None else int(
+            os.getenv('VISION_TEXT_LAYER_MIN_CHARS', DEFAULT_TEXT_LAYER_MIN_CHARS)
+        )
+        self.max_concurrency = max_concurrency or int(os.getenv('VISION_MAX_CONCURRENCY', DEFAULT_MAX_CONCURRENCY))
+
+    def has_text_layer(self, text: str) -> bool:
+        return self.text_layer_min_chars > 0 and len(text.strip()) >= self.text_layer_min_chars
+
+    @asynccontextmanager
+    async def open(self, file_path: str) -> AsyncIterator[RasterDocument]:
+        """
+        Open a PDF, Word document or image for page rendering.
+
+        Raises:
+            ValueError: file type has no vision support
+            ImportError: pdf2image/Pillow missing
+        """
+        file_ext = Path(file_path).suffix.lower()
+
+        if file_ext == '.pdf':
+            yield await asyncio.to_thread(self._open_pdf, file_path)
+
+        elif file_ext in ['.docx', '.doc']:
+            # Rendered through a PDF copy that lives as long as the document
+            with tempfile.TemporaryDirectory() as tmpdir:
+                pdf_path = await asyncio.to_thread(convert_to_pdf, file_path, tmpdir)
+                yield await asyncio.to_thread(self._open_pdf, pdf_path)
+
+        elif file_ext in IMAGE_EXTENSIONS:
+            yield RasterDocument(page_count=1, vision_pages=[1], render_page=lambda page: self._render_image(file_path))
+
+        else:
+            raise ValueError(f"Vision extraction not supported for {file_ext} files")
+
+    def _open_pdf(self, file_path: str) -> RasterDocument:
+        texts = page_text_layers(file_path)
+        text_pages = {
+            page: text for page, text in enumerate(texts, 1) if self.has_text_layer(text)
+        }
+        return RasterDocument(
+            page_count=len(texts),
+            vision_pages=[page for page in range(1, len(texts) + 1) if page not in text_pages],
+            text_pages=text_pages,
+            render_page=lambda page: self._render_pdf_page(file_path, page),
+        )
+
+    def _render_pdf_page(self, file_path: str, page: int) -> str:
+        from pdf2image import convert_from_path
+
+        [image] = convert_from_path(file_path, dpi=self.dpi, first_page=page, last_page=page)
+        try:
+            return self.encode(image)
+        finally:
+            image.close()
+
+    def _render_image(self, file_path: str) -> str:
+        from PIL import Image
+
+        with Image.open(file_path) as image:
+            return self.encode(image)
+
+    def encode(self, image) -> str:
+        return encode_image(image, self.max_long_edge, self.max_short_edge, self.jpeg_quality)
+
+    async def map_pages(
+        self,
+        document: RasterDocument,
+        handler: Callable[[int, str], Awaitable[Any]],
+    ) -> Dict[int, Any]:
+        """
+        Render each vision page and pass it to handler(page, image_base64).
+
+        At most max_concurrency pages are rendered or in a handler at once;
+        an image is dropped as soon as its handler returns.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def process_page(page: int) -> Tuple[int, Any]:
+            async with semaphore:
+                image_base64 = await document.render(page)
+                return page, await handler(page, image_base64)
+
+        results = await asyncio.gather(*[process_page(page) for page in document.vision_pages])
+        return dict(results)
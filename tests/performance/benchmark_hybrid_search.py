@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Hybrid Search Benchmark - Fusion vs Exhaustive
+Compares EmbeddingService.hybrid_search modes on a synthetic products table
+
+- Builds a synthetic catalogue (default 100,000 products) in an isolated schema
+  so the real products table is never touched
+- Creates the pgvector ANN index and the shared product search indexes
+- Times both hybrid search modes over the same query set and reports
+  mean / p50 / p95 latency plus top-k overlap between the two modes
+
+Requires PostgreSQL with pgvector and pg_trgm (DATABASE_URL).
+Query embeddings come from a deterministic local embedder - no OpenAI calls.
+
+Usage:
+    DATABASE_URL=postgresql://... python tests/performance/benchmark_hybrid_search.py
+    python tests/performance/benchmark_hybrid_search.py --products 20000 --dimensions 384
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import asyncpg
+import numpy as np
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.services.embedding_service import EmbeddingService
+from src.services.product_search import ProductSearchEngine
+
+BENCH_SCHEMA = "hybrid_search_bench"
+
+NOUNS = [
+    "drill", "hammer", "saw", "gloves", "helmet", "ladder", "screwdriver", "wrench",
+    "cable", "pipe", "valve", "paint", "brush", "tape", "adhesive", "bolt", "nut",
+    "washer", "anchor", "grinder", "sander", "vacuum", "mop", "bucket", "goggles",
+]
+ADJECTIVES = [
+    "cordless", "heavy duty", "industrial", "compact", "stainless", "galvanised",
+    "nitrile", "aluminium", "brushless", "waterproof", "insulated", "adjustable",
+]
+BRANDS = ["Makita", "Bosch", "DeWalt", "3M", "Stanley", "Ansell", "Werner", "Hitachi"]
+CATEGORIES = ["Power Tools", "Hand Tools", "Safety Products", "Cleaning Products", "Fasteners"]
+
+QUERIES = [
+    "cordless drill", "safety gloves nitrile", "aluminium ladder", "heavy duty hammer",
+    "stainless bolt m8", "waterproof tape", "industrial vacuum", "brushless grinder",
+    "insulated screwdriver set", "galvanised anchor", "paint brush", "safety goggles",
+]
+
+
+def local_embedding(text: str, dimensions: int) -> List[float]:
+    """Deterministic unit vector derived from the text (stand-in for the provider)"""
+    seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(dimensions).astype(np.float32)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+async def build_catalogue(pool: asyncpg.Pool, n_products: int, dimensions: int, index: str):
+    """Create and populate the synthetic products table"""
+    async with pool.acquire() as conn:
+        await conn.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+        await conn.execute(f"CREATE SCHEMA {BENCH_SCHEMA}")
+        await conn.execute(f"""
+            CREATE TABLE products (
+                id SERIAL PRIMARY KEY,
+                sku VARCHAR(50),
+                product_code VARCHAR(50),
+                name VARCHAR(500) NOT NULL,
+                description TEXT,
+                category VARCHAR(200),
+                brand VARCHAR(200),
+                supplier VARCHAR(200) DEFAULT 'Horme Hardware',
+                price DECIMAL(10, 2),
+                currency VARCHAR(10) DEFAULT 'SGD',
+                stock_quantity INTEGER DEFAULT 0,
+                specifications JSONB,
+                embedding vector({dimensions})
+            )
+        """)
+
+        started = time.perf_counter()
+        await conn.execute(
+            f"""
+            INSERT INTO products (sku, product_code, name, description, category, brand,
+                                  price, stock_quantity, embedding)
+            SELECT
+                'SKU-' || g,
+                'P-' || g,
+                adj[1 + g % array_length(adj, 1)] || ' ' || noun[1 + (g / 7) % array_length(noun, 1)]
+                    || ' ' || brand[1 + (g / 3) % array_length(brand, 1)] || ' ' || g,
+                'Synthetic ' || noun[1 + (g / 11) % array_length(noun, 1)] || ' for '
+                    || cat[1 + g % array_length(cat, 1)],
+                cat[1 + g % array_length(cat, 1)],
+                brand[1 + (g / 3) % array_length(brand, 1)],
+                round((random() * 500)::numeric, 2),
+                (random() * 100)::int,
+                (SELECT array_agg(random() - 0.5)::vector({dimensions})
+                 FROM generate_series(1, {dimensions}) WHERE g > 0)
+            FROM generate_series(1, $1) AS g,
+                 (SELECT $2::text[] AS adj, $3::text[] AS noun,
+                         $4::text[] AS brand, $5::text[] AS cat) AS vocab
+            """,
+            n_products, ADJECTIVES, NOUNS, BRANDS, CATEGORIES
+        )
+        print(f"  Inserted {n_products:,} products in {time.perf_counter() - started:.1f}s")
+
+        started = time.perf_counter()
+        if index == "hnsw":
+            await conn.execute(
+                "CREATE INDEX ON products USING hnsw (embedding vector_cosine_ops)"
+            )
+        elif index == "ivfflat":
+            lists = max(10, int(n_products ** 0.5))
+            await conn.execute(
+                "CREATE INDEX ON products USING ivfflat (embedding vector_cosine_ops) "
+                f"WITH (lists = {lists})"
+            )
+        print(f"  Built {index} vector index in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    await ProductSearchEngine(pool).ensure_indexes()
+    async with pool.acquire() as conn:
+        await conn.execute("ANALYZE products")
+    print(f"  Built text search indexes in {time.perf_counter() - started:.1f}s")
+
+
+async def time_mode(
+    service: EmbeddingService,
+    mode: str,
+    queries: List[str],
+    repeats: int,
+    limit: int
+) -> Dict[str, object]:
+    """Run every query `repeats` times in one mode and collect latencies"""
+    latencies = []
+    results = {}
+    for _ in range(repeats):
+        for query in queries:
+            started = time.perf_counter()
+            products = await service.hybrid_search(query, limit=limit, mode=mode)
+            latencies.append((time.perf_counter() - started) * 1000)
+            results[query] = [p["id"] for p in products]
+
+    latencies.sort()
+    return {
+        "mean_ms": statistics.mean(latencies),
+        "p50_ms": latencies[len(latencies) // 2],
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "results": results,
+    }
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark hybrid search modes")
+    parser.add_argument("--products", type=int, default=100_000, help="Synthetic catalogue size")
+    parser.add_argument("--dimensions", type=int, default=1536, help="Embedding dimensions")
+    parser.add_argument("--index", choices=["hnsw", "ivfflat", "none"], default="hnsw")
+    parser.add_argument("--repeats", type=int, default=3, help="Passes over the query set")
+    parser.add_argument("--limit", type=int, default=10, help="Results per query")
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark schema")
+    args = parser.parse_args()
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        print("❌ ERROR: DATABASE_URL environment variable not set")
+        return 1
+
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark-not-used")
+
+    pool = await asyncpg.create_pool(
+        database_url,
+        min_size=2,
+        max_size=4,
+        server_settings={"search_path": f"{BENCH_SCHEMA},public"}
+    )
+
+    try:
+        print(f"Building synthetic catalogue ({args.products:,} products, dim={args.dimensions})")
+        await build_catalogue(pool, args.products, args.dimensions, args.index)
+
+        service = EmbeddingService(pool)
+
+        async def embed(text: str) -> List[float]:
+            return local_embedding(text, args.dimensions)
+
+        service.generate_text_embedding = embed
+
+        # Warm-up so both modes run against a hot cache
+        for query in QUERIES[:3]:
+            await service.hybrid_search(query, limit=args.limit, mode="fusion")
+            await service.hybrid_search(query, limit=args.limit, mode="exhaustive")
+
+        print("\nMode         mean ms    p50 ms    p95 ms")
+        print("-" * 44)
+        report = {}
+        for mode in ("exhaustive", "fusion"):
+            report[mode] = await time_mode(service, mode, QUERIES, args.repeats, args.limit)
+            stats = report[mode]
+            print(f"{mode:<12} {stats['mean_ms']:>8.1f} {stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f}")
+
+        overlaps = [
+            len(set(report["fusion"]["results"][q]) & set(report["exhaustive"]["results"][q]))
+            / max(1, len(report["exhaustive"]["results"][q]))
+            for q in QUERIES
+        ]
+        speedup = report["exhaustive"]["mean_ms"] / max(report["fusion"]["mean_ms"], 1e-9)
+        print(f"\nSpeedup (mean): {speedup:.1f}x")
+        print(f"Top-{args.limit} overlap with exhaustive: {statistics.mean(overlaps):.0%}")
+
+    finally:
+        if not args.keep:
+            async with pool.acquire() as conn:
+                await conn.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+        await pool.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
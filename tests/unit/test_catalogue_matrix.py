@@ -0,0 +1,169 @@
+"""Unit tests for the precomputed catalogue matrix and ContentBasedFilter ranking.
+
+Tier 1 (Unit) Requirements:
+- Fast execution (<1 second per test)
+- No external dependencies (databases, APIs, files)
+"""
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src.ai.catalogue_matrix import (
+    CURRENT_FILE,
+    CatalogueMatrix,
+    CatalogueMatrixStore,
+    build_catalogue_matrix,
+    top_k_indices,
+)
+from src.ai.content_based_filter import ContentBasedFilter
+
+
+PRODUCTS = [
+    {'id': 1, 'name': 'Cordless Drill', 'description': 'battery powered drill for wood and metal', 'category': 'Power Tools'},
+    {'id': 2, 'name': 'Orbital Sander', 'description': 'sander for smooth wood finishing', 'category': 'Power Tools'},
+    {'id': 3, 'name': 'Safety Goggles', 'description': 'eye protection for workshop use', 'category': 'Safety'},
+    {'id': 4, 'name': 'Paint Roller', 'description': 'roller for interior wall painting', 'category': 'Painting'},
+]
+
+
+class FakeEmbeddingModel:
+    """Bag-of-letters encoder that counts encode() calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True,
+               normalize_embeddings=False, show_progress_bar=False):
+        self.calls += 1
+        vectors = np.array([
+            [text.lower().count(letter) for letter in "abcdefghijklmnopqrstuvwxyz"]
+            for text in texts
+        ], dtype=float) + 1e-9
+        if normalize_embeddings:
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors
+
+
+def _text(product):
+    return ' '.join(str(product[key]) for key in ('name', 'description', 'category'))
+
+
+@pytest.fixture
+def matrix_dir(tmp_path):
+    build_catalogue_matrix(PRODUCTS, str(tmp_path), _text, FakeEmbeddingModel(), 'fake-model')
+    return tmp_path
+
+
+def _make_filter(matrix_dir=None, model_name='fake-model'):
+    content_filter = object.__new__(ContentBasedFilter)
+    content_filter.tfidf_vectorizer = TfidfVectorizer(stop_words='english', lowercase=True)
+    content_filter.embedding_model = FakeEmbeddingModel()
+    content_filter.embedding_model_name = model_name
+    content_filter.embedding_cache = {}
+    content_filter.catalogue_store = CatalogueMatrixStore(str(matrix_dir)) if matrix_dir else None
+    return content_filter
+
+
+class TestTopK:
+    """Tests for argpartition-based top-k selection."""
+
+    def test_returns_best_first(self):
+        scores = np.array([0.1, 0.9, 0.5, 0.7])
+        assert top_k_indices(scores, 2).tolist() == [1, 3]
+
+    def test_k_larger_than_scores(self):
+        scores = np.array([0.2, 0.8])
+        assert top_k_indices(scores, 10).tolist() == [1, 0]
+
+    def test_empty(self):
+        assert top_k_indices(np.array([]), 5).tolist() == []
+
+
+class TestCatalogueMatrixBuild:
+    """Tests for building, loading and publishing matrix versions."""
+
+    def test_build_publishes_current_version(self, matrix_dir):
+        version = (matrix_dir / CURRENT_FILE).read_text()
+        matrix = CatalogueMatrix.load(matrix_dir / version)
+
+        assert len(matrix) == 4
+        assert matrix.embedding_model == 'fake-model'
+        assert isinstance(matrix.embeddings, np.memmap)
+        assert matrix.rows_for([3, 99, None]) == [2, None, None]
+
+    def test_scores_rank_matching_product(self, matrix_dir):
+        matrix = CatalogueMatrixStore(str(matrix_dir)).get()
+        scores = matrix.tfidf_scores('wood sander')
+
+        assert scores.shape == (4,)
+        assert int(np.argmax(scores)) == 1
+        np.testing.assert_allclose(
+            np.linalg.norm(np.asarray(matrix.embeddings), axis=1), 1.0, rtol=1e-5
+        )
+
+    def test_empty_catalogue_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            build_catalogue_matrix([], str(tmp_path), _text, FakeEmbeddingModel(), 'fake-model')
+
+    def test_store_reloads_new_version_and_prunes(self, matrix_dir):
+        store = CatalogueMatrixStore(str(matrix_dir), check_interval=0)
+        first = store.get()
+
+        build_catalogue_matrix(PRODUCTS[:2], str(matrix_dir), _text, FakeEmbeddingModel(),
+                               'fake-model', keep_versions=0)
+        second = store.get()
+
+        assert second is not first
+        assert len(second) == 2
+        versions = [p for p in matrix_dir.iterdir() if p.is_dir()]
+        assert len(versions) == 1
+
+    def test_store_without_build_returns_none(self, tmp_path):
+        assert CatalogueMatrixStore(str(tmp_path)).get() is None
+
+
+class TestContentBasedFilterRanking:
+    """Tests for vectorised ranking in ContentBasedFilter."""
+
+    def test_rank_catalogue_uses_single_encode(self, matrix_dir):
+        content_filter = _make_filter(matrix_dir)
+
+        results = content_filter.rank_catalogue('wood sander', limit=2)
+
+        assert [r['product_id'] for r in results][0] == 2
+        assert len(results) == 2
+        assert results[0]['score'] >= results[1]['score']
+        assert content_filter.embedding_model.calls == 1
+
+    def test_rank_catalogue_requires_matrix(self):
+        with pytest.raises(RuntimeError):
+            _make_filter().rank_catalogue('wood sander')
+
+    def test_model_mismatch_ignores_matrix(self, matrix_dir):
+        content_filter = _make_filter(matrix_dir, model_name='other-model')
+        with pytest.raises(RuntimeError):
+            content_filter.rank_catalogue('wood sander')
+
+    def test_rank_products_with_matrix_and_unknown_products(self, matrix_dir):
+        content_filter = _make_filter(matrix_dir)
+        new_product = {'id': 50, 'name': 'Belt Sander', 'description': 'heavy sander for wood'}
+        products = PRODUCTS + [new_product]
+
+        ranked = content_filter.rank_products_by_similarity(products, 'wood sander', limit=3)
+
+        assert len(ranked) == 3
+        assert {p['id'] for p, _ in ranked[:2]} == {2, 50}
+        assert [s for _, s in ranked] == sorted((s for _, s in ranked), reverse=True)
+        assert content_filter.embedding_model.calls == 1
+
+    def test_rank_products_without_matrix(self):
+        content_filter = _make_filter()
+
+        ranked = content_filter.rank_products_by_similarity(PRODUCTS, 'safety goggles', limit=2)
+
+        assert ranked[0][0]['id'] == 3
+        assert content_filter.embedding_model.calls == 1
+
+    def test_rank_products_empty(self):
+        assert _make_filter().rank_products_by_similarity([], 'anything') == []
@@ -0,0 +1,347 @@
+"""Unit tests for the document pipeline job queue and workers.
+
+Tier 1 (Unit) Requirements:
+- Fast execution (<1 second per test)
+- No external dependencies (an in-memory queue stands in for PostgreSQL)
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+
+from src.services.document_pipeline import (
+    CLAIM_SQL,
+    DONE,
+    HEARTBEAT_SQL,
+    DocumentPipelineQueue,
+    DocumentPipelineStages,
+    DocumentPipelineWorker,
+    PipelineJob,
+    PipelineStop,
+    enqueue_document,
+    next_stage,
+)
+
+
+class InMemoryQueue:
+    """Same contract as DocumentPipelineQueue, held in a dict"""
+
+    def __init__(self):
+        self.worker_id = "test-worker"
+        self.jobs = {}
+
+    def add(self, document_id, stage='extract', state=None, max_attempts=3):
+        job_id = len(self.jobs) + 1
+        self.jobs[job_id] = {
+            'id': job_id, 'document_id': document_id, 'file_path': f"/app/uploads/{document_id}.pdf",
+            'stage': stage, 'status': 'queued', 'attempts': 0, 'max_attempts': max_attempts,
+            'state': dict(state or {}), 'stage_timings': {}, 'last_error': None,
+        }
+        return self.jobs[job_id]
+
+    async def claim(self, stage):
+        for row in self.jobs.values():
+            if row['status'] == 'queued' and row['stage'] == stage:
+                row['status'] = 'running'
+                row['attempts'] += 1
+                return PipelineJob.from_row(row)
+        return None
+
+    async def complete_stage(self, job, output, elapsed_ms):
+        row = self.jobs[job.id]
+        row['stage'] = next_stage(job.stage)
+        row['status'] = 'completed' if row['stage'] == DONE else 'queued'
+        row['attempts'] = 0
+        row['state'].update(json.loads(json.dumps(output, default=str)))
+        row['stage_timings'][job.stage] = elapsed_ms
+
+    async def stop(self, job, reason, elapsed_ms):
+        row = self.jobs[job.id]
+        row.update(stage=DONE, status='completed')
+        row['state']['stopped'] = reason
+        row['stage_timings'][job.stage] = elapsed_ms
+
+    async def fail_stage(self, job, error):
+        row = self.jobs[job.id]
+        row['status'] = 'failed' if row['attempts'] >= row['max_attempts'] else 'queued'
+        row['last_error'] = error
+        return row['status']
+
+
+class RecordingStages:
+    """Stage handlers that record calls; a stage can be made to fail N times"""
+
+    def __init__(self, failures=None):
+        self.calls = []
+        self.failures = dict(failures or {})
+
+    def handler(self, stage):
+        async def run(job):
+            self.calls.append((stage, job.document_id))
+            if self.failures.get(stage):
+                self.failures[stage] -= 1
+                raise RuntimeError(f"{stage} unavailable")
+            return {
+                'extract': {'requirements': {'items': [{'description': 'Drill'}]}},
+                'match': {'matched_products': [{'id': 1}], 'pricing': {'total': 10}},
+                'quote': {'quotation_id': 7},
+                'pdf': {'pdf_path': '/app/pdfs/quotation_7.pdf'},
+            }[stage]
+        return run
+
+
+def worker_for(queue, stages, **kwargs):
+    return DocumentPipelineWorker(
+        stage_workers={'extract': 1, 'match': 1, 'quote': 1, 'pdf': 1},
+        db_pool=object(), stages=stages, queue=queue, poll_interval=0.01, **kwargs
+    )
+
+
+async def drain(worker, stages=('extract', 'match', 'quote', 'pdf')):
+    """Run jobs stage by stage until no stage has ready work"""
+    while True:
+        ran = [await worker.run_once(stage) for stage in stages]
+        if not any(ran):
+            return
+
+
+class TestDocumentPipelineWorker:
+    """Test stage progression, retries and resume."""
+
+    def test_job_runs_every_stage_in_order(self):
+        queue, stages = InMemoryQueue(), RecordingStages()
+        row = queue.add(document_id=42)
+
+        asyncio.run(drain(worker_for(queue, stages)))
+
+        assert [stage for stage, _ in stages.calls] == ['extract', 'match', 'quote', 'pdf']
+        assert row['status'] == 'completed' and row['stage'] == DONE
+        assert row['state']['quotation_id'] == 7
+        assert set(row['stage_timings']) == {'extract', 'match', 'quote', 'pdf'}
+
+    def test_resume_from_last_completed_stage(self):
+        queue, stages = InMemoryQueue(), RecordingStages()
+        queue.add(document_id=42, stage='quote', state={
+            'requirements': {'items': [{'description': 'Drill'}]},
+            'matched_products': [{'id': 1}], 'pricing': {'total': 10},
+        })
+
+        asyncio.run(drain(worker_for(queue, stages)))
+
+        assert [stage for stage, _ in stages.calls] == ['quote', 'pdf']
+
+    def test_failed_stage_is_retried_then_continues(self):
+        queue, stages = InMemoryQueue(), RecordingStages(failures={'match': 2})
+        row = queue.add(document_id=42)
+
+        asyncio.run(drain(worker_for(queue, stages)))
+
+        assert [stage for stage, _ in stages.calls].count('match') == 3
+        assert [stage for stage, _ in stages.calls].count('extract') == 1
+        assert row['status'] == 'completed'
+
+    def test_job_fails_after_max_attempts(self):
+        queue, stages = InMemoryQueue(), RecordingStages(failures={'extract': 5})
+        row = queue.add(document_id=42, max_attempts=3)
+
+        asyncio.run(drain(worker_for(queue, stages)))
+
+        assert len(stages.calls) == 3
+        assert row['status'] == 'failed' and row['stage'] == 'extract'
+        assert row['last_error'] == "RuntimeError: extract unavailable"
+
+    def test_stage_timeout_counts_as_failure(self):
+        class SlowStages(RecordingStages):
+            def handler(self, stage):
+                async def run(job):
+                    await asyncio.sleep(1)
+                return run
+
+        queue = InMemoryQueue()
+        row = queue.add(document_id=42, max_attempts=1)
+
+        asyncio.run(worker_for(queue, SlowStages(), stage_timeout=0.01).run_once('extract'))
+
+        assert row['status'] == 'failed'
+        assert row['last_error'] == 'TimeoutError'
+
+    def test_pipeline_stop_completes_job_early(self):
+        class NoItems(RecordingStages):
+            def handler(self, stage):
+                async def run(job):
+                    raise PipelineStop("No items found in document")
+                return run
+
+        queue = InMemoryQueue()
+        row = queue.add(document_id=42)
+
+        asyncio.run(drain(worker_for(queue, NoItems())))
+
+        assert row['status'] == 'completed' and row['stage'] == DONE
+        assert row['state']['stopped'] == "No items found in document"
+
+    def test_stage_pools_work_concurrently(self):
+        class SlowExtract(RecordingStages):
+            in_flight = max_in_flight = 0
+
+            def handler(self, stage):
+                async def run(job):
+                    SlowExtract.in_flight += 1
+                    SlowExtract.max_in_flight = max(SlowExtract.max_in_flight, SlowExtract.in_flight)
+                    await asyncio.sleep(0.02)
+                    SlowExtract.in_flight -= 1
+                    raise PipelineStop("done")
+                return run
+
+        queue = InMemoryQueue()
+        for document_id in range(12):
+            queue.add(document_id)
+        worker = DocumentPipelineWorker(
+            stage_workers={'extract': 4}, db_pool=object(), stages=SlowExtract(), queue=queue, poll_interval=0.01
+        )
+
+        async def run_until_drained():
+            loops = [asyncio.create_task(worker._stage_loop('extract')) for _ in range(4)]
+            while any(row['status'] != 'completed' for row in queue.jobs.values()):
+                await asyncio.sleep(0.01)
+            worker.stop()
+            await asyncio.gather(*loops)
+
+        asyncio.run(run_until_drained())
+
+        assert SlowExtract.max_in_flight == 4
+
+
+class FakeConnection:
+    def __init__(self, fetchrow=None, fetchval=None):
+        self.calls = []
+        self._fetchrow = fetchrow
+        self._fetchval = fetchval
+
+    async def fetchrow(self, sql, *args):
+        self.calls.append((sql, args))
+        return self._fetchrow
+
+    async def fetchval(self, sql, *args):
+        self.calls.append((sql, args))
+        return self._fetchval
+
+    async def execute(self, sql, *args):
+        self.calls.append((sql, args))
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+class TestDocumentPipelineQueue:
+    """Test the SQL contract of the Postgres queue."""
+
+    def test_claim_skips_locked_rows(self):
+        conn = FakeConnection(fetchrow={
+            'id': 1, 'document_id': 42, 'file_path': '/app/uploads/a.pdf', 'stage': 'match',
+            'attempts': 1, 'max_attempts': 3, 'state': '{"requirements": {"items": []}}',
+        })
+        queue = DocumentPipelineQueue(FakePool(conn), worker_id='w1')
+
+        job = asyncio.run(queue.claim('match'))
+
+        assert "FOR UPDATE SKIP LOCKED" in CLAIM_SQL
+        assert conn.calls[0][1] == ('match', 'w1')
+        assert job.state == {'requirements': {'items': []}}
+
+    def test_retry_backoff_is_exponential(self):
+        conn = FakeConnection(fetchval='queued')
+        queue = DocumentPipelineQueue(FakePool(conn), worker_id='w1', retry_base_seconds=10)
+        job = PipelineJob(id=1, document_id=42, file_path='a.pdf', stage='extract', attempts=3, max_attempts=5)
+
+        assert asyncio.run(queue.fail_stage(job, "boom")) == 'queued'
+        assert conn.calls[0][1] == (1, 40, "boom", 'w1')
+
+    def test_complete_stage_advances_and_records_timing(self):
+        conn = FakeConnection()
+        queue = DocumentPipelineQueue(FakePool(conn), worker_id='w1')
+        job = PipelineJob(id=1, document_id=42, file_path='a.pdf', stage='pdf', attempts=1, max_attempts=3)
+
+        asyncio.run(queue.complete_stage(job, {'pdf_path': '/app/pdfs/q.pdf'}, 1234))
+
+        assert conn.calls[0][1] == (1, 'pdf', DONE, 'completed', '{"pdf_path": "/app/pdfs/q.pdf"}', 1234, 'w1')
+
+    def test_heartbeat_refreshes_own_locks(self):
+        conn = FakeConnection()
+        queue = DocumentPipelineQueue(FakePool(conn), worker_id='w1')
+
+        asyncio.run(queue.heartbeat())
+
+        assert conn.calls == [(HEARTBEAT_SQL, ('w1',))]
+
+    def test_heartbeat_file_is_touched_only_after_lock_refresh(self, tmp_path):
+        class BrokenConnection(FakeConnection):
+            async def execute(self, sql, *args):
+                raise ConnectionError("database down")
+
+        heartbeat_file = tmp_path / "heartbeat"
+        worker = worker_for(
+            DocumentPipelineQueue(FakePool(BrokenConnection()), worker_id='w1'), RecordingStages(),
+            heartbeat_file=str(heartbeat_file)
+        )
+
+        with pytest.raises(ConnectionError):
+            asyncio.run(worker.heartbeat())
+        assert not heartbeat_file.exists()
+
+        worker.queue = DocumentPipelineQueue(FakePool(FakeConnection()), worker_id='w1')
+        asyncio.run(worker.heartbeat())
+        assert heartbeat_file.exists()
+
+    def test_enqueue_is_a_single_insert(self):
+        conn = FakeConnection(fetchval=9)
+
+        assert asyncio.run(enqueue_document(conn, 42, '/app/uploads/a.pdf', max_attempts=2)) == 9
+        assert len(conn.calls) == 1
+        assert conn.calls[0][1] == (42, '/app/uploads/a.pdf', 2)
+
+
+class TestDocumentPipelineStages:
+    """Test stage idempotency on retry."""
+
+    def test_quote_stage_reuses_existing_quotation(self):
+        class NoQuotes:
+            async def generate_quotation(self, *args):
+                raise AssertionError("quotation created twice")
+
+        stages = DocumentPipelineStages(FakePool(FakeConnection(fetchval=55)), quotation_generator=NoQuotes())
+        job = PipelineJob(id=1, document_id=42, file_path='a.pdf', stage='quote', attempts=2, max_attempts=3)
+
+        assert asyncio.run(stages.quote(job)) == {'quotation_id': 55}
+
+    def test_extract_reuses_completed_results(self):
+        extracted = {'requirements': {'items': [{'description': 'Drill'}]}}
+        conn = FakeConnection(fetchrow={'ai_status': 'completed', 'ai_extracted_data': json.dumps(extracted)})
+
+        class NoProcessing:
+            async def process_document(self, *args):
+                raise AssertionError("document processed twice")
+
+        stages = DocumentPipelineStages(FakePool(conn), doc_processor=NoProcessing())
+        job = PipelineJob(id=1, document_id=42, file_path='a.pdf', stage='extract', attempts=1, max_attempts=3)
+
+        assert asyncio.run(stages.extract(job)) == extracted
+
+    def test_extract_without_items_stops(self):
+        class EmptyProcessor:
+            async def process_document(self, *args):
+                return {'requirements': {'items': []}}
+
+        stages = DocumentPipelineStages(FakePool(FakeConnection()), doc_processor=EmptyProcessor())
+        job = PipelineJob(id=1, document_id=42, file_path='a.pdf', stage='extract', attempts=1, max_attempts=3)
+
+        with pytest.raises(PipelineStop):
+            asyncio.run(stages.extract(job))
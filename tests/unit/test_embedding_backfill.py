@@ -0,0 +1,121 @@
+"""Unit tests for the checkpointed product embedding backfill.
+
+Tier 1 (Unit) Requirements:
+- Fast execution (<1 second per test)
+- No external dependencies (an in-memory pool stands in for PostgreSQL)
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+from src.services.embedding_backfill import LocalEmbeddingProvider, ProductEmbeddingBackfill
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+        self.staging = []
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def execute(self, sql, *args):
+        if "DELETE FROM embedding_backfill_checkpoints" in sql:
+            self.db.checkpoints.pop(args[0], None)
+        elif "INSERT INTO embedding_backfill_checkpoints" in sql:
+            job_name, last_id, processed, failed_ids = args
+            self.db.checkpoints[job_name] = {
+                "last_id": last_id, "processed": processed, "failed_ids": list(failed_ids)
+            }
+        elif "UPDATE products" in sql:
+            for product_id, embedding, digest in self.staging:
+                self.db.embedded[product_id] = digest
+            updated, self.staging = len(self.staging), []
+            return f"UPDATE {updated}"
+        return "OK"
+
+    async def fetchrow(self, sql, *args):
+        return self.db.checkpoints.get(args[0])
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.staging.extend(records)
+
+
+class FakeDatabase:
+    def __init__(self, n_products):
+        self.products = [
+            {"id": n, "name": f"Product {n}", "embedding_source_hash": None, "has_embedding": False}
+            for n in range(1, n_products + 1)
+        ]
+        self.embedded = {}
+        self.checkpoints = {}
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield FakeConnection(self)
+
+    async def fetch_page(self, last_id, limit, force_regenerate, product_ids):
+        rows = [
+            product for product in self.products
+            if product["id"] > last_id and (product_ids is None or product["id"] in product_ids)
+        ]
+        return rows[:limit]
+
+
+class FlakyProvider(LocalEmbeddingProvider):
+    """Fails every batch containing one of the given product names"""
+
+    def __init__(self, fail_for=()):
+        super().__init__(dimensions=4)
+        self.fail_for = set(fail_for)
+
+    async def generate_batch_embeddings(self, texts):
+        if self.fail_for.intersection(texts):
+            raise RuntimeError("rate limited")
+        return await super().generate_batch_embeddings(texts)
+
+
+def make_backfill(db, provider):
+    backfill = ProductEmbeddingBackfill(
+        db, provider, text_builder=lambda row: row["name"], batch_size=10, max_in_flight=2
+    )
+    backfill._fetch_page = db.fetch_page
+    return backfill
+
+
+class TestProductEmbeddingBackfill:
+    """Test checkpointing of failed batches."""
+
+    def test_failed_batches_are_kept_in_the_checkpoint(self):
+        db = FakeDatabase(n_products=60)
+
+        summary = asyncio.run(
+            make_backfill(db, FlakyProvider({"Product 25"})).run(force_regenerate=True)
+        )
+
+        assert summary["failed_product_ids"] == list(range(21, 31))
+        assert sorted(db.embedded) == [n for n in range(1, 61) if not 21 <= n <= 30]
+        [checkpoint] = db.checkpoints.values()
+        assert checkpoint["last_id"] == 60
+        assert checkpoint["failed_ids"] == list(range(21, 31))
+
+    def test_resumed_run_retries_failed_products(self):
+        db = FakeDatabase(n_products=60)
+        asyncio.run(make_backfill(db, FlakyProvider({"Product 25"})).run(force_regenerate=True))
+        db.embedded.clear()
+
+        summary = asyncio.run(make_backfill(db, FlakyProvider()).run(force_regenerate=True))
+
+        assert sorted(db.embedded) == list(range(21, 31))
+        assert summary["failed_product_ids"] == []
+        assert db.checkpoints == {}
+
+    def test_clean_run_clears_its_checkpoint(self):
+        db = FakeDatabase(n_products=25)
+
+        summary = asyncio.run(make_backfill(db, FlakyProvider()).run(force_regenerate=True))
+
+        assert summary["embeddings_generated"] == 25
+        assert summary["status"] == "completed"
+        assert db.checkpoints == {}
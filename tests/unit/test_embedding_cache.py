@@ -0,0 +1,86 @@
+"""Unit tests for the content-hash keyed embedding cache.
+
+Tier 1 (Unit) Requirements:
+- Fast execution (<1 second per test)
+- No external dependencies (databases, APIs, files)
+"""
+
+import asyncio
+
+import pytest
+
+from src.services.embedding_cache import (
+    EmbeddingCache,
+    LRUEmbeddingTier,
+    source_hash,
+    text_hash,
+)
+
+
+class CountingProvider:
+    """Records the texts sent to the provider."""
+
+    def __init__(self):
+        self.requests = []
+
+    async def embed(self, texts):
+        self.requests.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+class TestHashing:
+    """Test text normalisation and hash keys."""
+
+    def test_whitespace_differences_share_a_hash(self):
+        assert text_hash("Cordless  drill\n 18V ") == text_hash("Cordless drill 18V")
+
+    def test_source_hash_depends_on_model(self):
+        assert source_hash("model-a", 1536, "drill") != source_hash("model-b", 1536, "drill")
+
+
+class TestEmbeddingCache:
+    """Test LRU-tier caching and deduplication."""
+
+    def test_repeated_texts_are_embedded_once(self):
+        cache = EmbeddingCache(lru=LRUEmbeddingTier())
+        provider = CountingProvider()
+
+        first = asyncio.run(cache.get_or_embed("m", 2, ["a", "bb", "a"], provider.embed))
+        second = asyncio.run(cache.get_or_embed("m", 2, ["bb"], provider.embed))
+
+        assert provider.requests == [["a", "bb"]]
+        assert first == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+        assert second == [[2.0, 1.0]]
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_model_is_part_of_the_key(self):
+        cache = EmbeddingCache(lru=LRUEmbeddingTier())
+        provider = CountingProvider()
+
+        asyncio.run(cache.get_or_embed("m1", 2, ["a"], provider.embed))
+        asyncio.run(cache.get_or_embed("m2", 2, ["a"], provider.embed))
+
+        assert len(provider.requests) == 2
+
+    def test_lru_evicts_least_recently_used(self):
+        tier = LRUEmbeddingTier(max_entries=2)
+        cache = EmbeddingCache(lru=tier)
+        provider = CountingProvider()
+
+        asyncio.run(cache.get_or_embed("m", 2, ["a", "b"], provider.embed))
+        asyncio.run(cache.get_or_embed("m", 2, ["a"], provider.embed))
+        asyncio.run(cache.get_or_embed("m", 2, ["c"], provider.embed))
+        asyncio.run(cache.get_or_embed("m", 2, ["a", "b"], provider.embed))
+
+        assert provider.requests[-1] == ["b"]
+        assert len(tier) == 2
+
+    def test_provider_errors_propagate(self):
+        cache = EmbeddingCache(lru=LRUEmbeddingTier())
+
+        async def failing(texts):
+            raise RuntimeError("provider down")
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(cache.get_or_embed("m", 2, ["a"], failing))
+        assert len(cache.lru) == 0
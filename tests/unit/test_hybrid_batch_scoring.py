@@ -0,0 +1,146 @@
+"""Unit tests for batch scoring in HybridRecommendationEngine.
+
+Tier 1 (Unit) Requirements:
+- Fast execution (<1 second per test)
+- No external dependencies (databases, APIs, files)
+"""
+
+from datetime import timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.ai.hybrid_recommendation_engine import HybridRecommendationEngine
+
+
+class FakeEmbeddingModel:
+    """Bag-of-letters encoder that counts encode() calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True, normalize_embeddings=False):
+        self.calls += 1
+        vectors = np.array([
+            [text.lower().count(letter) for letter in "abcdefghijklmnopqrstuvwxyz"]
+            for text in texts
+        ], dtype=float) + 1e-9
+        if normalize_embeddings:
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors
+
+
+class FakeKnowledgeGraph:
+    """Counts queries; task-1 lists product 1 (required) and 3 (optional)."""
+
+    def __init__(self):
+        self.task_queries = 0
+        self.compatibility_queries = 0
+
+    def get_products_for_task(self, task_id, limit=50):
+        self.task_queries += 1
+        return [
+            {'product_id': 1, 'necessity': 'required'},
+            {'product_id': 3, 'necessity': 'optional'},
+        ]
+
+    def count_compatible_products(self, product_ids, limit=10):
+        self.compatibility_queries += 1
+        return {1: 10, 2: 1}
+
+
+class FakeOpenAI:
+    """Returns a JSON score object for every product listed in the prompt."""
+
+    def __init__(self):
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, temperature, max_tokens):
+        self.calls += 1
+        count = messages[-1]['content'].count('] ')
+        content = '{' + ', '.join(f'"{i}": 0.{i}' for i in range(1, count + 1)) + '}'
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@pytest.fixture
+def engine():
+    engine = object.__new__(HybridRecommendationEngine)
+    engine.embedding_model = FakeEmbeddingModel()
+    engine.knowledge_graph = FakeKnowledgeGraph()
+    engine.openai_client = FakeOpenAI()
+    engine.openai_model = 'test-model'
+    engine.cache_enabled = False
+    engine.llm_scoring_batch_size = 2
+    engine.catalogue_tfidf_ttl = timedelta(hours=6)
+    engine._catalogue_vectorizer = None
+    engine._catalogue_vectorizer_fitted_at = None
+    engine._task_keywords = {'drill': 'task-1'}
+    engine._get_catalogue_vectorizer = lambda: None
+    return engine
+
+
+@pytest.fixture
+def candidates():
+    return [
+        {'id': 1, 'name': 'Cordless drill', 'description': 'Drill for concrete'},
+        {'id': 2, 'name': 'Safety gloves', 'description': 'Cut resistant gloves'},
+        {'id': 3, 'name': 'Hammer drill', 'description': 'Masonry drill'},
+    ]
+
+
+class TestBatchScoring:
+    """Test that all candidates are scored with one call per model."""
+
+    def test_scores_are_arrays_in_candidate_order(self, engine, candidates):
+        scores = engine._score_candidates(candidates, 'need a drill', ['drill'], None)
+
+        assert set(scores) == {'collaborative', 'content_based', 'knowledge_graph', 'llm_analysis'}
+        for values in scores.values():
+            assert isinstance(values, np.ndarray)
+            assert values.shape == (3,)
+        assert scores['collaborative'].tolist() == [0.0, 0.0, 0.0]
+
+    def test_embedding_model_called_once(self, engine, candidates):
+        engine._content_based_scores(
+            candidates,
+            [engine._prepare_product_text(p) for p in candidates],
+            'need a drill',
+            ['drill']
+        )
+
+        assert engine.embedding_model.calls == 1
+
+    def test_knowledge_graph_queries_shared_by_candidates(self, engine, candidates):
+        scores = engine._knowledge_graph_scores(candidates, ['drill'])
+
+        assert engine.knowledge_graph.task_queries == 1
+        assert engine.knowledge_graph.compatibility_queries == 1
+        assert scores.tolist() == pytest.approx([1.0, 0.05, 0.4])
+
+    def test_llm_scores_candidates_in_batches(self, engine, candidates):
+        scores = engine._llm_analysis_scores(candidates, ['drill'])
+
+        assert engine.openai_client.calls == 2
+        assert scores.tolist() == pytest.approx([0.1, 0.2, 0.1])
+
+    def test_keyword_matches(self, engine):
+        scores = engine._calculate_keyword_matches(
+            ['Cordless Drill 18V', 'Gloves'], ['drill', '18v']
+        )
+
+        assert scores.tolist() == [1.0, 0.0]
+
+
+class TestParseLlmBatchScores:
+    """Test parsing of batch LLM scoring responses."""
+
+    def test_json_response(self, engine):
+        assert engine._parse_llm_batch_scores('{"1": 0.9, "2": 1.4}', 2) == [0.9, 1.0]
+
+    def test_line_response(self, engine):
+        assert engine._parse_llm_batch_scores('1: 0.25\n2: 0.75', 2) == [0.25, 0.75]
+
+    def test_missing_score_returns_none(self, engine):
+        assert engine._parse_llm_batch_scores('{"1": 0.9}', 2) is None
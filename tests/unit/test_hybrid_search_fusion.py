@@ -0,0 +1,44 @@
+"""Unit tests for hybrid search candidate fusion.
+
+Tier 1 (Unit) Requirements:
+- Fast execution (<1 second per test)
+- No external dependencies (databases, APIs, files)
+"""
+
+import pytest
+
+from src.services.embedding_service import fuse_rankings, to_vector_literal
+
+
+class TestFuseRankings:
+    """Test fusion of semantic and keyword candidate lists."""
+
+    def test_rrf_rewards_candidates_in_both_lists(self):
+        fused = fuse_rankings([1, 2, 3], [3, 4], semantic_weight=0.5, keyword_weight=0.5)
+
+        ids = [product_id for product_id, _ in fused]
+        assert ids[0] == 3
+        assert set(ids) == {1, 2, 3, 4}
+
+    def test_rrf_respects_weights(self):
+        fused = fuse_rankings([1], [2], semantic_weight=0.7, keyword_weight=0.3)
+
+        assert [product_id for product_id, _ in fused] == [1, 2]
+
+    def test_weighted_uses_raw_scores(self):
+        fused = fuse_rankings(
+            [1, 2], [2],
+            method="weighted",
+            semantic_scores={1: 0.9, 2: 0.5},
+            keyword_scores={2: 1.0},
+        )
+
+        assert fused[0] == (2, pytest.approx(0.5 * 0.7 + 1.0 * 0.3))
+        assert fused[1] == (1, pytest.approx(0.9 * 0.7))
+
+    def test_unknown_method_raises(self):
+        with pytest.raises(ValueError):
+            fuse_rankings([1], [1], method="borda")
+
+    def test_vector_literal(self):
+        assert to_vector_literal([0.5, -1, 2.0]) == "[0.5,-1.0,2.0]"
@@ -0,0 +1,145 @@
+"""Unit tests for the collaborative filtering interaction matrix.
+
+Tier 1 (Unit) Requirements:
+- Fast execution (<1 second per test)
+- No external dependencies (databases, APIs, files)
+"""
+
+import numpy as np
+import pytest
+
+from src.ai.interaction_matrix import InteractionMatrix, InteractionMatrixStore
+
+
+# (quotation_id, user_id, product_id)
+INTERACTIONS = [
+    (1, 'alice', 10), (1, 'alice', 11), (1, 'alice', 12),
+    (2, 'bob', 10), (2, 'bob', 11),
+    (3, 'carol', 12), (3, 'carol', 13),
+    (4, 'bob', 14),
+]
+
+
+def _jaccard(a, b):
+    return len(a & b) / len(a | b) if a | b else 0.0
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params):
+        self.after_id = params[0]
+        self.connection.queries += 1
+
+    def fetchall(self):
+        return [
+            {'quotation_id': q, 'customer_email': u, 'product_id': p}
+            for q, u, p in self.connection.rows if q > self.after_id
+        ]
+
+
+class FakeConnection:
+    """psycopg2-style connection over an in-memory interactions list."""
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.queries = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+
+class TestInteractionMatrix:
+    """Tests for similarity and co-purchase scoring."""
+
+    def test_user_similarity_matches_set_jaccard(self):
+        matrix = InteractionMatrix.from_interactions(INTERACTIONS)
+
+        alice, bob = matrix.user_products('alice'), matrix.user_products('bob')
+        assert alice == {10, 11, 12}
+        assert matrix.user_similarity('alice', 'bob') == pytest.approx(_jaccard(alice, bob))
+        assert matrix.user_similarity('alice', 'nobody') == 0.0
+
+    def test_similar_users_sorted_and_thresholded(self):
+        matrix = InteractionMatrix.from_interactions(INTERACTIONS)
+
+        similar = matrix.similar_users('alice', min_similarity=0.3, limit=5)
+
+        assert [user for user, _ in similar] == ['bob']
+        assert similar[0][1] == pytest.approx(0.5)
+
+    def test_item_similarity_and_neighbors(self):
+        matrix = InteractionMatrix.from_interactions(INTERACTIONS)
+
+        # 10 and 11 were both bought by alice and bob
+        assert matrix.item_similarity(10, 11) == pytest.approx(1.0)
+        assert matrix.similar_items(10, limit=1) == [(11, pytest.approx(1.0))]
+        assert matrix.similar_items(13, min_similarity=0.9) == []
+
+    def test_copurchase_uses_quotation_baskets(self):
+        matrix = InteractionMatrix.from_interactions(INTERACTIONS)
+
+        scores = dict(matrix.copurchase_scores([10], limit=10))
+
+        # 14 was bought by bob, but in a different quotation
+        assert scores == {11: 1.0, 12: 0.5}
+
+    def test_weighted_user_items_excludes_owned(self):
+        matrix = InteractionMatrix.from_interactions(INTERACTIONS)
+
+        scores = matrix.weighted_user_items([('bob', 0.5), ('carol', 0.25)], exclude={10, 11, 12}, limit=5)
+
+        assert scores == [(14, 0.5), (13, 0.25)]
+
+    def test_incremental_update_matches_full_build(self):
+        incremental = InteractionMatrix.from_interactions(INTERACTIONS[:5])
+        incremental = incremental.with_interactions(INTERACTIONS[5:])
+        full = InteractionMatrix.from_interactions(INTERACTIONS)
+
+        assert incremental.last_quotation_id == 4
+        for item_id in full.item_ids:
+            assert incremental.similar_items(item_id) == full.similar_items(item_id)
+        assert incremental.statistics() == full.statistics()
+
+    def test_snapshot_round_trip(self, tmp_path):
+        matrix = InteractionMatrix.from_interactions(INTERACTIONS)
+        path = str(tmp_path / 'cf.npz')
+
+        matrix.save(path)
+        loaded = InteractionMatrix.load(path)
+
+        assert loaded.user_ids == matrix.user_ids
+        assert loaded.last_quotation_id == 4
+        assert loaded.similar_users('alice', 0.1, 5) == matrix.similar_users('alice', 0.1, 5)
+        np.testing.assert_array_equal(loaded.copurchase.toarray(), matrix.copurchase.toarray())
+
+
+class TestInteractionMatrixStore:
+    """Tests for building and refreshing from the database."""
+
+    def test_refresh_applies_only_new_quotations(self):
+        connection = FakeConnection(INTERACTIONS[:5])
+        store = InteractionMatrixStore(connection, refresh_interval=0)
+
+        assert store.get().user_products('bob') == {10, 11}
+
+        connection.rows.extend(INTERACTIONS[5:])
+        matrix = store.get()
+
+        assert matrix.user_products('bob') == {10, 11, 14}
+        assert matrix.last_quotation_id == 4
+        assert connection.queries == 2
+
+    def test_cached_between_refreshes(self):
+        connection = FakeConnection(INTERACTIONS)
+        store = InteractionMatrixStore(connection, refresh_interval=3600)
+
+        assert store.get() is store.get()
+        assert connection.queries == 1
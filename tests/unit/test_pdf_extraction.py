@@ -0,0 +1,169 @@
+"""Unit tests for the per-page PDF extraction engine.
+
+Tier 1 (Unit) Requirements:
+- Fast execution (<1 second per test)
+- No external dependencies (PDF libraries are replaced with in-memory fakes)
+"""
+
+import asyncio
+import sys
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.services.pdf_extraction import (
+    PDFExtractionEngine,
+    extract_page_range,
+    merge_pages,
+    split_page_ranges,
+)
+
+GRID = [{'orientation': 'h'}] * 3 + [{'orientation': 'v'}] * 3
+
+
+class FakePage:
+    def __init__(self, text, edges=(), tables=()):
+        self.text = text
+        self.edges = list(edges)
+        self.tables = list(tables)
+        self.table_calls = 0
+
+    def extract_text(self):
+        return self.text
+
+    def extract_tables(self):
+        self.table_calls += 1
+        return self.tables
+
+
+class FakePDF:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeCamelotTable:
+    def __init__(self, page, accuracy=90.0):
+        self.page = str(page)
+        self.accuracy = accuracy
+
+
+@pytest.fixture
+def fake_pdf(monkeypatch):
+    """Install fake pdfplumber/camelot modules serving the given pages"""
+    camelot_calls = []
+    document = {}
+
+    pdfplumber = types.ModuleType('pdfplumber')
+    pdfplumber.open = lambda path: FakePDF(document['pages'])
+
+    def read_pdf(path, pages, flavor):
+        camelot_calls.append(pages)
+        return [FakeCamelotTable(n) for n in document.get('camelot_pages', []) if str(n) in pages.split(',')]
+
+    camelot = types.ModuleType('camelot')
+    camelot.read_pdf = read_pdf
+
+    monkeypatch.setitem(sys.modules, 'pdfplumber', pdfplumber)
+    monkeypatch.setitem(sys.modules, 'camelot', camelot)
+    monkeypatch.setattr('src.services.pdf_extraction.format_camelot_table', lambda table: "HEADERS: Item | Qty\nROW: Drill | 5")
+
+    def load(pages, camelot_pages=()):
+        document['pages'] = pages
+        document['camelot_pages'] = list(camelot_pages)
+        return camelot_calls
+
+    return load
+
+
+class TestSplitPageRanges:
+    """Test page range splitting."""
+
+    def test_ranges_cover_all_pages_in_order(self):
+        assert split_page_ranges(10, workers=8, max_pages_per_range=4) == [
+            (1, 2), (3, 4), (5, 6), (7, 8), (9, 10)
+        ]
+
+    def test_range_size_is_capped(self):
+        assert split_page_ranges(60, workers=2, max_pages_per_range=4)[:2] == [(1, 4), (5, 8)]
+        assert len(split_page_ranges(60, workers=2, max_pages_per_range=4)) == 15
+
+    def test_empty_document(self):
+        assert split_page_ranges(0, workers=4, max_pages_per_range=4) == []
+
+
+class TestExtractPageRange:
+    """Test per-page table detection decisions."""
+
+    def test_table_detection_only_on_ruled_pages(self, fake_pdf):
+        text_page = FakePage("Terms and conditions")
+        ruled_page = FakePage("Bill of quantities", edges=GRID)
+        calls = fake_pdf([text_page, ruled_page, FakePage("Delivery")], camelot_pages=[2])
+
+        pages = extract_page_range("rfq.pdf", 1, 3)
+
+        assert calls == ["2"]
+        assert [page['ruled'] for page in pages] == [False, True, False]
+        assert pages[1]['table_method'] == 'camelot'
+        assert text_page.table_calls == 0
+
+    def test_pdfplumber_tables_when_camelot_finds_nothing(self, fake_pdf):
+        ruled_page = FakePage("Items", edges=GRID, tables=[[["Item", "Qty"], ["Gloves", "20"]]])
+        fake_pdf([ruled_page])
+
+        [page] = extract_page_range("rfq.pdf", 1, 1)
+
+        assert page['table_method'] == 'pdfplumber'
+        assert page['tables'] == ["HEADERS: Item | Qty\nROW: Gloves | 20"]
+
+    def test_pypdf2_fallback(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, 'pdfplumber', None)
+        pypdf2 = types.ModuleType('PyPDF2')
+        pypdf2.PdfReader = lambda file: types.SimpleNamespace(pages=[FakePage("one"), FakePage("two")])
+        monkeypatch.setitem(sys.modules, 'PyPDF2', pypdf2)
+        monkeypatch.setattr('src.services.pdf_extraction.open', lambda *args: FakePDF([]), raising=False)
+
+        pages = extract_page_range("rfq.pdf", 2, 2)
+
+        assert pages == [{
+            'page': 2, 'text': 'two', 'tables': [], 'table_method': None, 'ruled': False, 'reader': 'pypdf2'
+        }]
+        assert merge_pages(pages)[1] == 'pdf_pypdf2'
+
+
+class TestPDFExtractionEngine:
+    """Test parallel extraction and ordered merging."""
+
+    def test_ranges_are_merged_in_page_order(self, fake_pdf):
+        pages = [FakePage(f"page {n} text") for n in range(1, 11)]
+        pages[6] = FakePage("page 7 text", edges=GRID)
+        fake_pdf(pages, camelot_pages=[7])
+
+        engine = PDFExtractionEngine(
+            max_workers=4, pages_per_range=2, min_pages_for_pool=2,
+            executor=ThreadPoolExecutor(max_workers=4),
+        )
+        text, method = asyncio.run(engine.extract("rfq.pdf"))
+
+        positions = [text.index(f"=== PAGE {n} ===") for n in range(1, 11)]
+        assert positions == sorted(positions)
+        assert text.index("=== TABLE START (Page 7, Table 1) ===") > text.index("page 7 text")
+        assert text.index("=== TABLE START (Page 7, Table 1) ===") < text.index("=== PAGE 8 ===")
+        assert method == 'pdf_camelot'
+
+    def test_small_documents_skip_the_pool(self, fake_pdf):
+        fake_pdf([FakePage("only page")])
+        executor = ThreadPoolExecutor(max_workers=1)
+        executor.submit = None  # any pool use would fail
+
+        engine = PDFExtractionEngine(max_workers=4, executor=executor)
+        text, method = asyncio.run(engine.extract("rfq.pdf"))
+
+        assert text == "=== PAGE 1 ===\nonly page"
+        assert method == 'pdf_pdfplumber'
@@ -0,0 +1,108 @@
+"""Unit tests for batched requirement-to-product matching.
+
+Tier 1 (Unit) Requirements:
+- Fast execution (<1 second per test)
+- No external dependencies (databases, APIs, files)
+- Database pool is replaced with an in-memory fake
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+from src.services.product_matcher import ProductMatcher
+
+
+class FakeConnection:
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def fetch(self, query, *args):
+        self.pool.calls.append(args)
+        queries = args[0]
+        rows = []
+        for idx, text in enumerate(queries):
+            rows.append({
+                'query_idx': idx,
+                'id': 1000 + idx,
+                'name': f"Product {text}",
+                'sku': f"SKU-{idx}",
+                'product_code': f"P-{idx}",
+                'description': "",
+                'category': "tools",
+                'brand': "Horme",
+                'price': 10.0,
+                'currency': 'SGD',
+                'supplier': 'Horme',
+                'stock_quantity': 5,
+                'specifications': None,
+                'relevance': 0.5,
+            })
+        return rows
+
+
+class FakePool:
+    def __init__(self):
+        self.calls = []
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield FakeConnection(self)
+
+
+class TestBatchedProductMatching:
+    """Test that line items are matched in chunked search_many round-trips."""
+
+    def test_items_are_matched_in_chunks(self):
+        pool = FakePool()
+        matcher = ProductMatcher(batch_size=50)
+        items = [
+            {'description': f"cordless drill model{i}", 'quantity': 2}
+            for i in range(120)
+        ]
+
+        matched = asyncio.run(matcher.match_products({'items': items}, pool))
+
+        # 120 items / 50 per chunk -> 3 round-trips instead of 120
+        assert len(pool.calls) == 3
+        assert len(matched) == 120
+        assert [m['line_number'] for m in matched] == list(range(1, 121))
+        assert matched[7]['product_id'] == 1007
+        assert matched[7]['line_total'] == 20.0
+        assert matched[7]['match_confidence'] == 1.0
+
+    def test_all_keywords_are_sent(self):
+        pool = FakePool()
+        matcher = ProductMatcher()
+        items = [{'description': "heavy duty safety gloves", 'category': "PPE"}]
+
+        asyncio.run(matcher.find_product_matches_batch(items, pool))
+
+        queries, k = pool.calls[0]
+        assert queries == ["heavy duty safety ppe"]
+        assert k == matcher.candidates_per_item
+
+    def test_items_without_keywords_need_review(self):
+        pool = FakePool()
+        matcher = ProductMatcher()
+        items = [{'description': "a an"}, {'description': "ladder aluminium"}]
+
+        matched = asyncio.run(matcher.match_products({'items': items}, pool))
+
+        assert matched[0]['needs_review'] is True
+        # Only the item with keywords is sent to the database
+        assert pool.calls[0][0] == ["ladder aluminium"]
+        assert matched[1]['product_id'] == 1000
+
+    def test_confidence_tiers_are_preserved(self):
+        matcher = ProductMatcher()
+        products = [
+            {'id': 1, 'name': "Gloves box", 'description': "", 'category': "ppe",
+             'price': 5, 'relevance': 0.2},
+            {'id': 2, 'name': "Nitrile", 'description': "disposable gloves", 'category': "",
+             'price': 3, 'relevance': 0.9},
+        ]
+
+        ranked = matcher._rank_matches(products, ["gloves"], "")
+
+        assert [m['id'] for m in ranked] == [1, 2]
+        assert [m['confidence'] for m in ranked] == [1.0, 0.8]
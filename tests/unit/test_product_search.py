@@ -0,0 +1,58 @@
+"""Unit tests for the shared product search query builder.
+
+Tier 1 (Unit) Requirements:
+- Fast execution (<1 second per test)
+- No external dependencies (databases, APIs, files)
+"""
+
+from src.services.product_search import (
+    build_filter_sql,
+    build_search_many_query,
+    build_search_query,
+    render_sql,
+)
+
+
+class TestProductSearchQueries:
+    """Test SQL generation for index-backed product search."""
+
+    def test_search_uses_indexed_predicates_only(self):
+        sql, params = build_search_query("cordless drill", k=5)
+
+        assert "search_vector @@" in sql
+        assert "<% LOWER(p.name)" in sql
+        assert "LIKE" not in sql
+        assert " ~ " not in sql
+        assert params == ["cordless drill", 5]
+
+    def test_filters_are_parameterised(self):
+        sql, params = build_search_query(
+            "gloves",
+            {"category": "Safety", "max_price": 20, "in_stock_only": True},
+            k=10,
+        )
+
+        assert "p.category = $2" in sql
+        assert "p.price <= $3" in sql
+        assert "p.stock_quantity > 0" in sql
+        assert "LIMIT $4" in sql
+        assert params == ["gloves", "Safety", 20, 10]
+
+    def test_pyformat_rendering_escapes_percent(self):
+        sql, params = build_search_query("ladder", k=3, paramstyle="pyformat")
+
+        assert "%(query)s" in sql
+        assert "<%% LOWER(p.name)" in sql
+        assert params == {"query": "ladder", "k": 3}
+
+    def test_search_many_is_single_statement(self):
+        template, filter_params = build_search_many_query({"brand": "Bosch"})
+        sql, args = render_sql(template, {"queries": ["a", "b"], **filter_params, "k": 2})
+
+        assert "unnest($1::text[]) WITH ORDINALITY" in sql
+        assert "CROSS JOIN LATERAL" in sql
+        assert args == [["a", "b"], "Bosch", 2]
+
+    def test_empty_filters(self):
+        assert build_filter_sql(None) == ("", {})
+        assert build_filter_sql({"in_stock_only": False}) == ("", {})
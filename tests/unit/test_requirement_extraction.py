@@ -0,0 +1,148 @@
+"""Unit tests for chunked (map-reduce) requirement extraction.
+
+Tier 1 (Unit) Requirements:
+- Fast execution (<1 second per test)
+- No external dependencies (a deterministic local LLM stands in for OpenAI)
+"""
+
+import asyncio
+import re
+
+import pytest
+
+from src.services.requirement_extraction import (
+    ChunkedRequirementExtractor,
+    merge_requirements,
+    split_into_chunks,
+)
+
+ROW = re.compile(r'^ROW: (?P<description>[^|]+) \| (?P<quantity>\d+) \| (?P<unit>\w+)$')
+
+
+class StubRequirementLLM:
+    """Deterministic LLM: reads "ROW: description | qty | unit" lines from the prompt"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def complete_json(self, system, prompt):
+        self.prompts.append(prompt)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+        document = prompt.split("Document text:\n", 1)[1].split("\n\nIMPORTANT INSTRUCTIONS", 1)[0]
+        customer = re.search(r'^Customer: (.+)$', document, re.MULTILINE)
+        return {
+            'customer_name': customer.group(1) if customer else None,
+            'items': [
+                {'description': m['description'], 'quantity': int(m['quantity']), 'unit': m['unit']}
+                for m in (ROW.match(line) for line in document.splitlines()) if m
+            ],
+            'additional_requirements': ['Delivery within 14 days'],
+        }
+
+
+def tender(rows, customer="Acme Builders"):
+    """An RFQ text with one table of numbered line items spread over pages"""
+    lines = ["=== PAGE 1 ===", f"Customer: {customer}", "Please quote for the items below.", ""]
+    lines.append("\n=== TABLE START (Page 1, Table 1) ===")
+    lines.append("HEADERS: Description | Qty | Unit")
+    lines.extend(f"ROW: Item {n:04d} safety gloves size L | {n % 7 + 1} | pcs" for n in range(rows))
+    lines.append("=== TABLE END ===\n")
+    return '\n'.join(lines)
+
+
+class TestSplitIntoChunks:
+    """Test section- and table-aware splitting."""
+
+    def test_chunks_respect_size_and_repeat_headers(self):
+        chunks = split_into_chunks(tender(400), max_chars=2000, overlap_chars=200)
+
+        assert len(chunks) > 5
+        for chunk in chunks[1:]:
+            assert len(chunk.text) <= 2000 + 200
+            assert "HEADERS: Description | Qty | Unit" in chunk.text
+
+    def test_small_text_is_one_chunk(self):
+        assert [c.text for c in split_into_chunks("short\ntext", 100, 10)] == ["short\ntext"]
+
+    def test_overlap_repeats_previous_tail(self):
+        text = '\n\n'.join(f"Paragraph {n} " + "x" * 80 for n in range(20))
+        chunks = split_into_chunks(text, max_chars=500, overlap_chars=120)
+
+        for previous, chunk in zip(chunks, chunks[1:]):
+            first_line = chunk.text.split('\n')[0] or chunk.text.split('\n')[1]
+            assert first_line in previous.text
+
+
+class TestMergeRequirements:
+    """Test the reduce step."""
+
+    def test_overlap_duplicates_dropped_distant_repeats_kept(self):
+        gloves = {'description': 'Safety gloves, size L', 'quantity': 10, 'unit': 'pcs'}
+        helmet = {'description': 'Helmet', 'quantity': 2}
+        partials = [
+            {'customer_name': 'Acme', 'items': [gloves]},
+            {'customer_name': None, 'items': [dict(gloves, description='safety gloves size L'), helmet]},
+            {'customer_name': 'Other', 'items': [dict(helmet)], 'additional_requirements': ['Net 30', 'net 30']},
+            {'items': [dict(gloves)]},
+        ]
+
+        merged = merge_requirements(partials)
+
+        assert merged['customer_name'] == 'Acme'
+        assert [item['description'] for item in merged['items']] == ['Safety gloves, size L', 'Helmet', 'Safety gloves, size L']
+        assert merged['additional_requirements'] == ['Net 30']
+
+
+class TestChunkedRequirementExtractor:
+    """Test map-reduce extraction end to end with the stub LLM."""
+
+    def test_short_documents_use_one_prompt(self):
+        llm = StubRequirementLLM()
+        result = asyncio.run(ChunkedRequirementExtractor(llm, chunk_chars=8000).extract(tender(5)))
+
+        assert len(llm.prompts) == 1
+        assert "This is part" not in llm.prompts[0]
+        assert len(result['items']) == 5
+
+    @pytest.mark.parametrize("rows", [50, 400, 1200])
+    def test_completeness_does_not_depend_on_length(self, rows):
+        llm = StubRequirementLLM()
+        extractor = ChunkedRequirementExtractor(llm, chunk_chars=3000, overlap_chars=300, max_concurrency=4)
+
+        result = asyncio.run(extractor.extract(tender(rows)))
+
+        assert [item['description'] for item in result['items']] == [
+            f"Item {n:04d} safety gloves size L" for n in range(rows)
+        ]
+        assert result['customer_name'] == "Acme Builders"
+        assert result['additional_requirements'] == ['Delivery within 14 days']
+
+    def test_in_flight_calls_are_bounded(self):
+        llm = StubRequirementLLM(delay=0.01)
+        extractor = ChunkedRequirementExtractor(llm, chunk_chars=2000, overlap_chars=0, max_concurrency=3)
+
+        asyncio.run(extractor.extract(tender(500)))
+
+        assert len(llm.prompts) > 10
+        assert llm.max_in_flight == 3
+
+    def test_chunk_failure_propagates(self):
+        class FailingLLM(StubRequirementLLM):
+            async def complete_json(self, system, prompt):
+                if "part 2 of" in prompt:
+                    raise RuntimeError("rate limited")
+                return await super().complete_json(system, prompt)
+
+        extractor = ChunkedRequirementExtractor(FailingLLM(), chunk_chars=2000, overlap_chars=0)
+
+        with pytest.raises(RuntimeError, match="rate limited"):
+            asyncio.run(extractor.extract(tender(200)))
@@ -0,0 +1,105 @@
+"""Unit tests for streaming upload storage.
+
+Tier 1 (Unit) Requirements:
+- Fast execution (<1 second per test)
+- No external dependencies (files go to a pytest tmp_path, database is mocked)
+"""
+
+import asyncio
+import hashlib
+import os
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.services.upload_storage import (
+    UploadTooLargeError,
+    find_processed_duplicate,
+    stream_upload,
+)
+
+
+class ChunkedSource:
+    """Async readable that records the read sizes requested"""
+
+    def __init__(self, data, size=None):
+        self.data = data
+        self.position = 0
+        self.reads = []
+        if size is not None:
+            self.size = size
+
+    async def read(self, size=-1):
+        self.reads.append(size)
+        if size < 0:
+            size = len(self.data) - self.position
+        chunk = self.data[self.position:self.position + size]
+        self.position += len(chunk)
+        return chunk
+
+
+class TestStreamUpload:
+    """Test chunked copying, hashing and limits."""
+
+    def test_streams_in_chunks_and_hashes(self, tmp_path):
+        data = os.urandom(300_000)
+        source = ChunkedSource(data)
+
+        stored = asyncio.run(stream_upload(source, str(tmp_path), "rfq.pdf", max_bytes=10**6, chunk_size=65536))
+
+        assert set(source.reads) == {65536}  # never a whole-file read
+        assert stored.size == len(data)
+        assert stored.sha256 == hashlib.sha256(data).hexdigest()
+        assert stored.path.endswith("_rfq.pdf")
+        with open(stored.path, 'rb') as f:
+            assert f.read() == data
+        assert os.listdir(tmp_path) == [os.path.basename(stored.path)]
+
+    def test_declared_size_rejected_before_reading(self, tmp_path):
+        source = ChunkedSource(b"x" * 10, size=2 * 1024 * 1024)
+
+        with pytest.raises(UploadTooLargeError):
+            asyncio.run(stream_upload(source, str(tmp_path), "big.pdf", max_bytes=1024 * 1024))
+
+        assert source.reads == []
+
+    def test_stream_over_limit_leaves_no_file(self, tmp_path):
+        source = ChunkedSource(b"x" * 5000)
+
+        with pytest.raises(UploadTooLargeError):
+            asyncio.run(stream_upload(source, str(tmp_path), "big.pdf", max_bytes=4096, chunk_size=1024))
+
+        assert source.reads == [1024] * 5
+        assert os.listdir(tmp_path) == []
+
+    def test_filename_cannot_escape_upload_dir(self, tmp_path):
+        stored = asyncio.run(stream_upload(ChunkedSource(b"data"), str(tmp_path), "../../etc/passwd", max_bytes=100))
+
+        assert os.path.dirname(stored.path) == str(tmp_path)
+
+
+class TestFindProcessedDuplicate:
+    """Test reuse of earlier extraction results."""
+
+    def test_returns_row_when_file_exists(self, tmp_path):
+        existing = tmp_path / "abc_rfq.pdf"
+        existing.write_bytes(b"data")
+        conn = AsyncMock()
+        conn.fetchrow.return_value = {
+            'id': 7, 'file_path': str(existing), 'ai_extracted_data': '{"requirements": {}}',
+            'ai_confidence_score': 0.9,
+        }
+
+        duplicate = asyncio.run(find_processed_duplicate(conn, "f" * 64))
+
+        assert duplicate['id'] == 7
+        assert conn.fetchrow.call_args.args[1] == "f" * 64
+
+    def test_ignores_rows_whose_file_is_gone(self, tmp_path):
+        conn = AsyncMock()
+        conn.fetchrow.return_value = {
+            'id': 7, 'file_path': str(tmp_path / "deleted.pdf"), 'ai_extracted_data': '{}',
+            'ai_confidence_score': None,
+        }
+
+        assert asyncio.run(find_processed_duplicate(conn, "f" * 64)) is None
@@ -0,0 +1,129 @@
+"""Unit tests for batched Redis writes in collaborative filtering.
+
+Tier 1 (Unit) Requirements:
+- Fast execution (<1 second per test)
+- No external dependencies (databases, APIs, files)
+"""
+
+import pytest
+
+from src.ai.collaborative_filter import CollaborativeFilter
+from src.ai.view_event_buffer import ViewEventBuffer
+
+
+class FakePipeline:
+    """Records queued commands; execute() counts as one round-trip."""
+
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args):
+            self.commands.append((name, args))
+            return self
+        return queue
+
+    def execute(self):
+        if self.redis_client.fail:
+            raise ConnectionError("redis down")
+        self.redis_client.round_trips += 1
+        self.redis_client.executed.extend(self.commands)
+        self.commands = []
+        return []
+
+
+class FakeRedis:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.round_trips = 0
+        self.executed = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+@pytest.fixture
+def buffer():
+    view_buffer = ViewEventBuffer(FakeRedis(), trending_key="trending", flush_interval_ms=60000)
+    yield view_buffer
+    view_buffer.close()
+
+
+class TestViewEventBuffer:
+    """Tests for coalescing and flushing view events."""
+
+    def test_add_does_no_network_io(self, buffer):
+        buffer.add("alice", 1)
+        buffer.add("alice", 1)
+
+        assert buffer.redis_client.round_trips == 0
+        assert len(buffer) == 1
+
+    def test_flush_coalesces_into_one_pipeline(self, buffer):
+        for _ in range(3):
+            buffer.add("alice", 1)
+        buffer.add("bob", 1)
+        buffer.add("bob", 2)
+
+        assert buffer.flush() == 5
+
+        commands = buffer.redis_client.executed
+        assert buffer.redis_client.round_trips == 1
+        assert ("zincrby", ("user_views:alice", 3, "1")) in commands
+        assert ("zincrby", ("trending", 4, "1")) in commands
+        assert ("zincrby", ("trending", 1, "2")) in commands
+        assert [c for c in commands if c[0] == "zremrangebyrank"] == [
+            ("zremrangebyrank", ("user_recent_views:alice", 0, -101)),
+            ("zremrangebyrank", ("user_recent_views:bob", 0, -101)),
+        ]
+        assert len(buffer) == 0
+
+    def test_flush_failure_drops_events(self):
+        view_buffer = ViewEventBuffer(FakeRedis(fail=True), trending_key="trending", flush_interval_ms=60000)
+        view_buffer.add("alice", 1)
+
+        assert view_buffer.flush() == 0
+        assert view_buffer.flush_errors == 1
+        assert len(view_buffer) == 0
+
+        view_buffer.redis_client.fail = False
+        view_buffer.close()
+
+    def test_close_flushes_pending(self):
+        view_buffer = ViewEventBuffer(FakeRedis(), trending_key="trending", flush_interval_ms=60000)
+        view_buffer.add("alice", 7)
+
+        view_buffer.close()
+
+        assert view_buffer.flushed_events == 1
+
+
+class TestRecordPurchase:
+    """Tests for pipelined purchase recording."""
+
+    def test_whole_order_in_one_round_trip(self, monkeypatch):
+        monkeypatch.setenv("CF_MIN_USER_SIMILARITY", "0.3")
+        monkeypatch.setenv("CF_MIN_ITEM_SIMILARITY", "0.4")
+        redis_client = FakeRedis()
+        cf = CollaborativeFilter(database_connection=object(), redis_client=redis_client)
+
+        cf.record_purchase("alice", [1, 2, 3])
+        cf.view_buffer.close()
+
+        incr_keys = [args[0] for name, args in redis_client.executed if name == "incr"]
+        assert redis_client.round_trips == 1
+        assert len(incr_keys) == 6
+        assert "copurchase:3:1" in incr_keys
+        assert {name for name, args in redis_client.executed} == {"incr"}
+
+    def test_single_product_order_skips_redis(self, monkeypatch):
+        monkeypatch.setenv("CF_MIN_USER_SIMILARITY", "0.3")
+        monkeypatch.setenv("CF_MIN_ITEM_SIMILARITY", "0.4")
+        redis_client = FakeRedis()
+        cf = CollaborativeFilter(database_connection=object(), redis_client=redis_client)
+
+        cf.record_purchase("alice", [1, 1])
+        cf.view_buffer.close()
+
+        assert redis_client.round_trips == 0
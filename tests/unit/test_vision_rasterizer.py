@@ -0,0 +1,239 @@
+"""Unit tests for lazy page rasterisation in the vision extraction path.
+
+Tier 1 (Unit) Requirements:
+- Fast execution (<1 second per test)
+- No external dependencies (pdfplumber, pdf2image and OpenAI are replaced with in-memory fakes)
+"""
+
+import asyncio
+import base64
+import json
+import sys
+import types
+
+import pytest
+
+from src.services.vision_rasterizer import VisionRasterizer, fit_size
+
+SCANNED = ""
+TYPED = "Bill of quantities " * 20
+
+
+class FakeImage:
+    """Just enough of PIL.Image for encoding"""
+
+    live = 0
+
+    def __init__(self, width, height, mode='RGB'):
+        self.width, self.height, self.mode = width, height, mode
+        self.saved = None
+        FakeImage.live += 1
+
+    def thumbnail(self, size):
+        self.width, self.height = size
+
+    def convert(self, mode):
+        return FakeImage(self.width, self.height, mode)
+
+    def save(self, buffer, format, **kwargs):
+        self.saved = (format, kwargs['quality'])
+        buffer.write(f"{format}:{self.width}x{self.height}".encode())
+
+    def close(self):
+        FakeImage.live -= 1
+
+
+@pytest.fixture
+def fake_pdf(monkeypatch):
+    """Install fake pdfplumber/pdf2image modules serving pages with the given text layers"""
+    rendered = []
+    document = {}
+
+    class PDF:
+        def __init__(self, path):
+            self.pages = [types.SimpleNamespace(extract_text=lambda text=text: text) for text in document['texts']]
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    def convert_from_path(path, dpi, first_page, last_page):
+        rendered.append((first_page, last_page, dpi))
+        return [FakeImage(int(8.27 * dpi), int(11.69 * dpi))]
+
+    pdfplumber = types.ModuleType('pdfplumber')
+    pdfplumber.open = PDF
+    pdf2image = types.ModuleType('pdf2image')
+    pdf2image.convert_from_path = convert_from_path
+
+    monkeypatch.setitem(sys.modules, 'pdfplumber', pdfplumber)
+    monkeypatch.setitem(sys.modules, 'pdf2image', pdf2image)
+    FakeImage.live = 0
+
+    def load(texts):
+        document['texts'] = texts
+        return rendered
+
+    return load
+
+
+def rasterizer(**kwargs):
+    options = dict(dpi=150, max_long_edge=2048, max_short_edge=768, jpeg_quality=80,
+                   text_layer_min_chars=200, max_concurrency=3)
+    options.update(kwargs)
+    return VisionRasterizer(**options)
+
+
+class TestFitSize:
+    """Test downsampling to what the vision model looks at."""
+
+    def test_a4_page_is_fitted_to_short_edge(self):
+        assert fit_size(1240, 1754, 2048, 768) == (768, 1086)
+
+    def test_long_edge_limit(self):
+        assert fit_size(4000, 1000, 2048, 768) == (2048, 512)
+
+    def test_small_images_are_not_upscaled(self):
+        assert fit_size(300, 400, 2048, 768) == (300, 400)
+
+
+class TestVisionRasterizer:
+    """Test lazy, bounded page rendering."""
+
+    def test_text_layer_pages_are_not_rendered(self, fake_pdf):
+        rendered = fake_pdf([TYPED, SCANNED, TYPED, SCANNED])
+
+        async def run():
+            async with rasterizer().open("rfq.pdf") as document:
+                results = await rasterizer().map_pages(document, lambda page, image: asyncio.sleep(0, image))
+                return document, results
+
+        document, results = asyncio.run(run())
+
+        assert document.page_count == 4
+        assert document.vision_pages == [2, 4]
+        assert sorted(document.text_pages) == [1, 3]
+        assert sorted(rendered) == [(2, 2, 150), (4, 4, 150)]
+        assert results[2] == results[4]
+
+    def test_rendered_pages_are_small_jpegs(self, fake_pdf):
+        fake_pdf([SCANNED])
+
+        async def run():
+            async with rasterizer().open("scan.pdf") as document:
+                return await document.render(1)
+
+        assert base64.b64decode(asyncio.run(run())) == b"JPEG:768x1086"
+        assert FakeImage.live == 0
+
+    def test_zero_min_chars_renders_every_page(self, fake_pdf):
+        fake_pdf([TYPED, SCANNED])
+
+        async def run():
+            async with rasterizer(text_layer_min_chars=0).open("rfq.pdf") as document:
+                return document.vision_pages
+
+        assert asyncio.run(run()) == [1, 2]
+
+    def test_images_in_flight_are_bounded_by_concurrency(self, fake_pdf):
+        fake_pdf([SCANNED] * 40)
+        in_flight = {'now': 0, 'max': 0}
+
+        async def vision_call(page, image):
+            in_flight['now'] += 1
+            in_flight['max'] = max(in_flight['max'], in_flight['now'])
+            await asyncio.sleep(0.01)
+            in_flight['now'] -= 1
+            return {'page_text': f"page {page}"}
+
+        async def run():
+            vision = rasterizer(max_concurrency=4)
+            async with vision.open("scan.pdf") as document:
+                return await vision.map_pages(document, vision_call)
+
+        results = asyncio.run(run())
+
+        assert in_flight['max'] == 4
+        assert [results[page]['page_text'] for page in range(1, 41)] == [f"page {n}" for n in range(1, 41)]
+
+    def test_unsupported_files_raise(self):
+        async def run():
+            async with rasterizer().open("prices.xlsx"):
+                pass
+
+        with pytest.raises(ValueError, match="not supported for .xlsx"):
+            asyncio.run(run())
+
+
+class TestVisionExtraction:
+    """Test the vision strategy of the enhanced processor with fakes."""
+
+    @pytest.fixture
+    def processor(self, monkeypatch, fake_pdf):
+        monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+        from src.services.enhanced_document_processor import EnhancedDocumentProcessor
+
+        processor = EnhancedDocumentProcessor()
+        processor.vision_rasterizer = rasterizer()
+        calls = []
+
+        async def create(model, messages, **kwargs):
+            content = messages[0]['content']
+            if isinstance(content, list):
+                page = int(content[0]['text'].split("(Page ")[1].split(" ")[0])
+                calls.append(('vision', page, content[1]['image_url']['url'].split(',')[0]))
+                body = {'page_text': f"scanned page {page}", 'items': [{'description': f"Item from page {page}"}]}
+            else:
+                calls.append(('metadata',))
+                body = {'customer_name': 'Acme'}
+            return types.SimpleNamespace(
+                choices=[types.SimpleNamespace(message=types.SimpleNamespace(content=json.dumps(body)))]
+            )
+
+        processor.openai_client = types.SimpleNamespace(
+            chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create))
+        )
+
+        async def extract(text):
+            first_page = int(text.split("=== PAGE ")[1].split(" ")[0])
+            calls.append(('text', first_page, text.count("=== PAGE")))
+            return {
+                'items': [{'description': f"Typed item from page {first_page}"}],
+                'customer_name': None,
+                'additional_requirements': [f"Note on page {first_page}"],
+            }
+
+        processor.requirement_extractor = types.SimpleNamespace(extract=extract)
+        return processor, calls
+
+    def test_mixed_document(self, processor, fake_pdf):
+        processor, calls = processor
+        fake_pdf([SCANNED, TYPED, TYPED, SCANNED])
+
+        result = asyncio.run(processor._try_vision_extraction("rfq.pdf"))
+
+        assert sorted(call for call in calls if call[0] == 'vision') == [
+            ('vision', 1, 'data:image/jpeg;base64'), ('vision', 4, 'data:image/jpeg;base64')
+        ]
+        assert [call for call in calls if call[0] == 'text'] == [('text', 2, 2)]
+        assert result['pages_processed'] == 4
+        assert result['text'].index("scanned page 1") < result['text'].index("Bill of quantities")
+        assert result['text'].index("Bill of quantities") < result['text'].index("scanned page 4")
+        assert [item['description'] for item in result['requirements']['items']] == [
+            'Item from page 1', 'Typed item from page 2', 'Item from page 4'
+        ]
+        assert result['requirements']['customer_name'] == 'Acme'
+
+    def test_items_are_merged_in_page_order(self, processor, fake_pdf):
+        processor, calls = processor
+        fake_pdf([TYPED, SCANNED, TYPED, SCANNED])
+
+        result = asyncio.run(processor._try_vision_extraction("rfq.pdf"))
+
+        assert sorted(call for call in calls if call[0] == 'text') == [('text', 1, 1), ('text', 3, 1)]
+        assert [item['description'] for item in result['requirements']['items']] == [
+            'Typed item from page 1', 'Item from page 2', 'Typed item from page 3', 'Item from page 4'
+        ]
+        assert result['requirements']['additional_requirements'] == ["Note on page 1", "Note on page 3"]